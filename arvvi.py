@@ -5,16 +5,184 @@ Analyzes RVV instruction usage in RISC-V binaries for AI model optimization
 """
 
 import argparse
+import contextlib
+import fnmatch
+import io
+import os
 import subprocess
 import re
+import struct
 import sys
-from collections import defaultdict
+import tempfile
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
 
+from arvvi_cache import DEFAULT_MAX_BYTES, ResultCache, objdump_version, print_cache_info
+from arvvi_loops import BRANCH_MNEMONICS, DEFAULT_LOOP_WEIGHT, branch_target, loop_depths, weighted_counts
+from arvvi_cost import CostModel, top_consumers
+from arvvi_db import record_run
+from arvvi_opcodes import operand_category, width_class
+from arvvi_profile import NULL_PROFILER, Profiler, aggregate_reports, print_profile, write_profile
+from arvvi_trace import TRACE_FORMATS, StaticIndex, TraceCounter
+from arvvi_watch import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE, watch_models
+from arvvi_vtype import UNKNOWN_VTYPE, is_redundant_vset, parse_vset, sew_lmul
+
+# Chart file formats (arvvi_visualizer.CHART_FORMATS; matplotlib is imported only with --visualize)
+CHART_FORMATS = ('png', 'svg', 'pdf')
+
 # Default toolchain path
 DEFAULT_OBJDUMP = "/home/ymchang/AndeSight-v5_4_0/toolchains-bin/nds64le-elf-newlib-v5d/bin/riscv64-elf-objdump"
 
+# Pipe buffer size used when streaming objdump output
+STREAM_BUFFER_SIZE = 1 << 20
+
+# Bump whenever a change alters the statistics produced for the same input
+# (invalidates cached results)
+ANALYZER_VERSION = 4
+
+# Disassembly engines: external objdump or the built-in ELF decoder (arvvi_native)
+ENGINES = ('objdump', 'native')
+
+# Lines/records kept from each end of a shard's output to resolve boundaries
+SHARD_HEAD_LINES = 64
+SHARD_HEAD_RECORDS = 4
+SHARD_TAIL_LINES = 16
+
+
+class AnalyzerError(Exception):
+    """Analysis of a binary failed (objdump missing or failing, undecodable ELF, unreadable trace)"""
+
+
+class RVVClassifier:
+    """
+    Constant-time RVV mnemonic classifier compiled from a list of patterns
+
+    Plain word patterns become a frozen lookup table of lowercase mnemonics;
+    the numbered forms (vle<N>, vse<N>, vlse<N>, ...) are folded into one
+    compiled alternation. Results are memoized per mnemonic, so each distinct
+    mnemonic is classified once per process.
+
+    Matching is equivalent to trying every pattern with
+    re.match(pattern, mnemonic, re.IGNORECASE).
+    """
+
+    # Upper bound on memoized mnemonics (objdump emits a few hundred at most)
+    CACHE_LIMIT = 65536
+
+    _WORD_RE = re.compile(r'\w*')
+
+    def __init__(self, patterns):
+        literals = set()
+        numbered = []
+        for pattern in patterns:
+            body = pattern
+            if body.startswith(r'\b') and body.endswith(r'\b'):
+                body = body[2:-2]
+            if re.escape(body) == body:
+                literals.add(body.lower())
+            else:
+                numbered.append(body)
+
+        self.literals = frozenset(literals)
+        self.numbered_re = None
+        if numbered:
+            self.numbered_re = re.compile('|'.join(f'(?:{p})' for p in numbered), re.IGNORECASE)
+        self._cache = {}
+
+    def is_rvv(self, mnemonic):
+        """Return True if the mnemonic is an RVV instruction"""
+        result = self._cache.get(mnemonic)
+        if result is None:
+            result = self._classify(mnemonic)
+            if len(self._cache) < self.CACHE_LIMIT:
+                self._cache[mnemonic] = result
+        return result
+
+    def _classify(self, mnemonic):
+        # Every pattern is anchored by \b on both sides, so only the leading
+        # run of word characters can take part in a match
+        token = self._WORD_RE.match(mnemonic).group(0).lower()
+        if token in self.literals:
+            return True
+        return self.numbered_re is not None and self.numbered_re.fullmatch(token) is not None
+
+
+class FunctionFilter:
+    """
+    Function name selection from a list of specs
+
+    Each spec is a glob pattern (e.g. "main", "conv2d_*") or, with a "re:"
+    prefix, a regular expression searched in the name (e.g. "re:^matmul").
+    Results are memoized per name.
+    """
+
+    GLOB_CHARS = frozenset('*?[')
+
+    def __init__(self, specs):
+        self.specs = list(specs)
+        globs = [s for s in self.specs if not s.startswith('re:')]
+        regexes = [s[3:] for s in self.specs if s.startswith('re:')]
+        self._glob_re = re.compile('|'.join(fnmatch.translate(g) for g in globs)) if globs else None
+        self._regex_re = re.compile('|'.join(f'(?:{r})' for r in regexes)) if regexes else None
+        self._cache = {}
+
+    @property
+    def exact_name(self):
+        """The function name if the filter is a single plain name, else None"""
+        if len(self.specs) == 1:
+            spec = self.specs[0]
+            if not spec.startswith('re:') and not self.GLOB_CHARS.intersection(spec):
+                return spec
+        return None
+
+    def __call__(self, name):
+        result = self._cache.get(name)
+        if result is None:
+            result = ((self._glob_re is not None and self._glob_re.match(name) is not None)
+                      or (self._regex_re is not None and self._regex_re.search(name) is not None))
+            self._cache[name] = result
+        return result
+
+
+def new_function_stats():
+    """Empty per-function statistics entry"""
+    return {'total_instructions': 0, 'rvv_instructions': 0, 'instruction_stats': defaultdict(int),
+            'vtype_instruction_stats': new_vtype_instruction_stats()}
+
+
+def new_vtype_instruction_stats():
+    """SEW×LMUL -> mnemonic -> vector instructions executed under it"""
+    return defaultdict(lambda: defaultdict(int))
+
+
+def vtype_instruction_dict(vtype_instruction_stats):
+    """Plain-dict form of new_vtype_instruction_stats() counts, without empty vtypes"""
+    return {vtype: dict(counts) for vtype, counts in vtype_instruction_stats.items() if counts}
+
+
+def merge_vtype_instructions(vtype_instruction_stats, other):
+    """Add vtype_instruction_dict() counts into new_vtype_instruction_stats() counts"""
+    for vtype, counts in other.items():
+        target = vtype_instruction_stats[vtype]
+        for instruction, count in counts.items():
+            target[instruction] += count
+
+
+def _move_unknown_vtype(vtype_instruction_stats, instructions, vtype):
+    """Re-attribute {mnemonic: count} of vtype_instruction_dict() counts from the unknown vtype to vtype"""
+    unknown = vtype_instruction_stats[UNKNOWN_VTYPE]
+    target = vtype_instruction_stats.setdefault(vtype, {})
+    for instruction, count in instructions.items():
+        unknown[instruction] -= count
+        if not unknown[instruction]:
+            del unknown[instruction]
+        target[instruction] = target.get(instruction, 0) + count
+    if not unknown:
+        del vtype_instruction_stats[UNKNOWN_VTYPE]
+
 
 class RVVAnalyzer:
     """Analyzer for RISC-V Vector instructions"""
@@ -98,84 +266,655 @@ class RVVAnalyzer:
         r'\bvsetvl\b', r'\bvsetvli\b', r'\bvsetivli\b',
     ]
 
-    def __init__(self, objdump_path=DEFAULT_OBJDUMP, functions=None, sections=None):
+    # Precompiled line matchers for objdump output
+    SECTION_RE = re.compile(r'Disassembly of section (.+):')
+    INSTRUCTION_RE = re.compile(r'\s*[0-9a-f]+:\s+[0-9a-f]+\s+(\w+)')
+    ADDRESSED_INSTRUCTION_RE = re.compile(r'\s*([0-9a-f]+):\s+([0-9a-f]+)\s+(\w+)')
+    # Symbol header, e.g. "0000000000020000 <vector_code>:" or "<vector_code+0x40>:" mid-symbol
+    FUNCTION_RE = re.compile(r'[0-9a-f]+ <(.+?)(?:\+0x[0-9a-f]+)?>:$')
+    # objdump -h row, e.g. "  3 .data  0001f3a0  0000000000020000  0000000000020000  00001000  2**3"
+    SECTION_HEADER_RE = re.compile(r'\s*\d+\s+(\S+)\s+([0-9a-f]+)\s+([0-9a-f]+)\s+[0-9a-f]+\s+[0-9a-f]+\s+2\*\*\d+')
+
+    # Sections smaller than this are never split into shards
+    MIN_SHARD_BYTES = 1 << 16
+
+    def __init__(self, objdump_path=DEFAULT_OBJDUMP, functions=None, sections=None, engine='objdump',
+                 shards=1, cache=None, detailed=False, loops=False, loop_weight=DEFAULT_LOOP_WEIGHT,
+                 cost_model=None, records=False, profiler=None):
         self.objdump_path = objdump_path
-        self.functions = functions  # List of function names to analyze
+        self.engine = engine
+        self.shards = shards  # Number of address-range shards for objdump (1 = no sharding)
+        self.cache = cache  # Optional ResultCache
+        self.from_cache = False  # Set by analyze() on a cache hit
+        self.classifier = get_classifier()
+        self.functions = functions  # List of function names, globs or "re:" regexes to analyze
+        self.function_filter = FunctionFilter(functions) if functions else None
         self.sections = sections  # List of sections to analyze
+        self.detailed = detailed  # Also count full mnemonics (vadd.vv) and masked forms
+        self.loops = loops  # Detect loops from back edges and weight counts by nesting depth
+        self.loop_weight = loop_weight  # Assumed iterations per loop level
+        self.cost_model = cost_model  # Optional CostModel: add cycle estimates (cost_stats)
+        self.profiler = profiler or NULL_PROFILER  # Stage timing and counters (--profile)
+        self.records = None  # Optional RecordWriter: keep every parsed instruction (objdump engine)
+        if records:
+            from arvvi_records import RecordWriter
+            self.records = RecordWriter()
         self.instruction_stats = defaultdict(int)
         self.section_stats = defaultdict(int)  # Track RVV instructions per section
+        self.function_stats = {}  # Function -> instruction counts (see new_function_stats)
+        self.vtype_stats = defaultdict(int)  # SEW×LMUL ("e32,m1") -> vector instructions executed under it
+        self.vtype_instruction_stats = new_vtype_instruction_stats()  # The same split by mnemonic
+        self.vset_configs = defaultdict(int)  # Full vtype ("e32,m1,ta,ma") -> vset{i}vl{i} count
+        self.avl_immediates = defaultdict(int)  # vsetivli AVL immediate -> count
+        self.vset_count = 0
+        self.redundant_vsets = 0  # vset{i}vl{i} that re-establish the active configuration
+        # Detailed mode: coarse mnemonic -> full mnemonic -> [unmasked, masked]
+        self.detailed_stats = {}
+        self._detail_counters = {}  # full mnemonic -> the same [unmasked, masked] lists
+        self.trace_info = None  # Set by analyze_trace()
+        # Loop mode: nesting depth -> [instructions, rvv_instructions]
+        self.loop_depths = defaultdict(lambda: [0, 0])
+        self.loop_count = 0
+        # Boundary state of the last parsed range (used by analyze_sharded)
+        self.range_head = (None, {}, None)
+        self.range_tail = (None, None, None, False)
         self.total_instructions = 0
         self.rvv_instructions = 0
 
-    def run_objdump(self, binary_path):
-        """Run objdump on the binary file"""
-        try:
-            cmd = [self.objdump_path, '-D']  # Use -D to disassemble ALL sections
+    def objdump_command(self, binary_path, start_address=None, stop_address=None):
+        """Build the objdump command line for the binary file"""
+        cmd = [self.objdump_path, '-D']  # Use -D to disassemble ALL sections
 
-            # Add -j <section> for each specified section (for speed optimization)
-            if self.sections:
-                for section in self.sections:
-                    cmd.append('-j')
-                    cmd.append(section)
+        # Restrict to an address range (used by sharded analysis)
+        if start_address is not None:
+            cmd.append(f'--start-address=0x{start_address:x}')
+        if stop_address is not None:
+            cmd.append(f'--stop-address=0x{stop_address:x}')
 
-            # Add --disassemble=<function> for each specified function
-            if self.functions:
-                for func in self.functions:
-                    cmd.append(f'--disassemble={func}')
+        # Add -j <section> for each specified section (for speed optimization)
+        if self.sections:
+            for section in self.sections:
+                cmd.append('-j')
+                cmd.append(section)
 
-            cmd.append(binary_path)
+        # A single plain function name is filtered by objdump itself; several
+        # names, globs and regexes are filtered while parsing (one objdump run)
+        if self.function_filter is not None and self.function_filter.exact_name:
+            cmd.append(f'--disassemble={self.function_filter.exact_name}')
 
+        cmd.append(str(binary_path))
+        return cmd
+
+    def run_objdump(self, binary_path):
+        """Run objdump on the binary file"""
+        return self._run_tool(self.objdump_command(binary_path))
+
+    def _run_tool(self, cmd):
+        """Run an objdump command and return its stdout"""
+        try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             return result.stdout
         except subprocess.CalledProcessError as e:
-            print(f"Error running objdump: {e}", file=sys.stderr)
-            print(f"stderr: {e.stderr}", file=sys.stderr)
-            sys.exit(1)
-        except FileNotFoundError:
-            print(f"Error: objdump not found at {self.objdump_path}", file=sys.stderr)
-            print("Please check your toolchain installation", file=sys.stderr)
-            sys.exit(1)
+            raise AnalyzerError(f"objdump failed: {e}\nstderr: {e.stderr}") from e
+        except FileNotFoundError as e:
+            raise AnalyzerError(f"objdump not found at {self.objdump_path}\n"
+                                "Please check your toolchain installation") from e
+
+    def iter_objdump(self, binary_path, start_address=None, stop_address=None):
+        """
+        Run objdump on the binary file and yield its output line by line
+
+        stdout is read incrementally through a pipe, so memory use does not
+        grow with the size of the disassembly. stderr goes to a temporary
+        file to avoid blocking objdump on a full pipe.
+        """
+        cmd = self.objdump_command(binary_path, start_address, stop_address)
+        with tempfile.TemporaryFile(mode='w+') as stderr_file:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                        text=True, bufsize=STREAM_BUFFER_SIZE)
+            except FileNotFoundError as e:
+                raise AnalyzerError(f"objdump not found at {self.objdump_path}\n"
+                                    "Please check your toolchain installation") from e
+
+            try:
+                for line in proc.stdout:
+                    yield line
+                proc.stdout.close()
+                returncode = proc.wait()
+            finally:
+                # Consumer stopped early (or raised): don't leave objdump running
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+
+            if returncode != 0:
+                stderr_file.seek(0)
+                raise AnalyzerError(f"objdump failed: {subprocess.CalledProcessError(returncode, cmd)}\n"
+                                    f"stderr: {stderr_file.read()}")
+
+    def run_native(self, binary_path):
+        """Analyze the binary file with the built-in ELF decoder instead of objdump"""
+        try:
+            from arvvi_native import analyze_elf
+        except ImportError as e:
+            raise AnalyzerError("the native engine requires NumPy. Install with: pip install numpy") from e
+
+        try:
+            stats = analyze_elf(binary_path, sections=self.sections, functions=self.functions,
+                                classifier=self.classifier, detailed=self.detailed, loops=self.loops,
+                                loop_weight=self.loop_weight)
+        except (OSError, ValueError, struct.error) as e:
+            raise AnalyzerError(f"Cannot decode {binary_path}: {e}") from e
+        self.merge_statistics(stats)
+
+    def analyze(self, binary_path, stream=False):
+        """
+        Disassemble and parse the binary file
+
+        Args:
+            binary_path: Path to the binary file
+            stream: If True, parse objdump output as it is produced instead of
+                    capturing it in memory first (bounded memory use).
+                    Ignored by the native engine, which memory-maps the file.
+        """
+        profiler = self.profiler
+        if self.cache is not None:
+            with profiler.stage('cache_lookup'):
+                key = self.cache.key(binary_path, self.cache_options())
+                # The cache holds counters only; per-instruction records need a real run
+                cached = self.cache.get(key) if self.records is None else None
+            if cached is not None:
+                self.merge_statistics(cached)
+                self.from_cache = True
+                return
+
+        self._analyze_uncached(binary_path, stream)
+
+        if self.cache is not None:
+            # Cycle estimates are derived from the counts; cache only the counts
+            with profiler.stage('cache_store'):
+                payload = self.get_statistics()
+                payload.pop('cost_stats', None)
+                self.cache.put(key, payload)
+
+    def _analyze_uncached(self, binary_path, stream):
+        profiler = self.profiler
+        total, rvv = self.total_instructions, self.rvv_instructions
+        if self.engine == 'native':
+            with profiler.stage('native'):
+                self.run_native(binary_path)
+        elif self.use_shards():
+            with profiler.stage('sharded'):
+                self.analyze_sharded(binary_path)
+        elif stream:
+            # objdump and parsing overlap, so they are one stage
+            with profiler.stage('stream'):
+                self.parse_lines(profiler.tap(self.iter_objdump(binary_path)))
+        else:
+            with profiler.stage('objdump'):
+                disassembly = self.run_objdump(binary_path)
+            if profiler.enabled:
+                profiler.count('objdump_bytes', len(disassembly))
+                profiler.count('lines', disassembly.count('\n') + 1)
+            with profiler.stage('parse'):
+                self.parse_disassembly(disassembly)
+        profiler.count('instructions', self.total_instructions - total)
+        profiler.count('rvv_instructions', self.rvv_instructions - rvv)
+
+    def analyze_trace(self, binary_path, trace_path, trace_format='auto', offset=0):
+        """
+        Execution-weighted analysis: join a simulator trace to the static disassembly
+
+        The objdump output is streamed into a PC-indexed table of the RVV
+        instructions, then the trace is streamed against it (see arvvi_trace),
+        so memory does not depend on the trace size.
+
+        Args:
+            binary_path: Path to the binary file the trace was recorded from
+            trace_path: Spike or QEMU log (.gz allowed, '-' for stdin)
+            trace_format: 'auto', 'spike' or 'qemu'
+            offset: Load offset subtracted from trace PCs
+        """
+        with self.profiler.stage('stream'):
+            index = StaticIndex(self.classifier, self.function_filter).add_lines(
+                self.profiler.tap(self.iter_objdump(binary_path)), self.ADDRESSED_INSTRUCTION_RE, self.SECTION_RE,
+                self.FUNCTION_RE)
+        counter = TraceCounter(index, offset)
+        try:
+            with self.profiler.stage('trace'):
+                trace_format = counter.count(trace_path, trace_format)
+        except (OSError, EOFError, ValueError) as e:
+            raise AnalyzerError(f"Cannot read trace {trace_path}: {e}") from e
+        self.profiler.count('trace_lines', counter.lines)
+
+        self.merge_statistics(counter.statistics())
+        self.profiler.count('instructions', self.total_instructions)
+        self.trace_info = {
+            'trace': str(trace_path),
+            'format': trace_format,
+            'offset': offset,
+            'lines': counter.lines,
+            'indexed_rvv_pcs': len(index),
+        }
+
+    def use_shards(self):
+        """
+        Whether analyze() splits the objdump run into address-range shards
+
+        Not with a single function (objdump filters it) or in loop mode (a
+        loop may span a shard boundary).
+        """
+        return (self.shards > 1 and not (self.function_filter and self.function_filter.exact_name)
+                and not self.loops and self.records is None)
+
+    def cache_options(self):
+        """Everything besides the binary contents that affects get_statistics() (cache key material)"""
+        options = {
+            'analyzer_version': ANALYZER_VERSION,
+            'engine': self.engine,
+            'sections': self.sections,
+            'functions': self.functions,
+            'detailed': self.detailed,
+            'loops': self.loop_weight if self.loops else None,
+        }
+        if self.engine == 'objdump':
+            options['objdump'] = [self.objdump_path, objdump_version(self.objdump_path)]
+        return options
+
+    def section_table(self, binary_path):
+        """
+        Read the section table with objdump -h
+
+        Returns:
+            List of (name, vma, size) for sections that have contents
+            (the ones objdump -D disassembles), in file order
+        """
+        lines = self._run_tool([self.objdump_path, '-h', str(binary_path)]).split('\n')
+        sections = []
+        for i, line in enumerate(lines):
+            match = self.SECTION_HEADER_RE.match(line)
+            if not match:
+                continue
+            # The flags line follows each row, e.g. "CONTENTS, ALLOC, LOAD, DATA"
+            flags = lines[i + 1] if i + 1 < len(lines) else ''
+            if 'CONTENTS' in flags:
+                name, size, vma = match.groups()
+                sections.append((name, int(vma, 16), int(size, 16)))
+        return sections
+
+    def analyze_sharded(self, binary_path):
+        """
+        Analyze the binary as address-range shards in parallel
+
+        Each section is split into ranges and every range is disassembled by
+        its own objdump process (--start-address/--stop-address) and parsed in
+        a worker process. A shard boundary can fall inside an instruction; the
+        owning shard is the one where the instruction starts, so the decode of
+        the next shard is checked against the true end of the previous one.
+        Bogus instructions decoded from the middle of the straddling
+        instruction are dropped, and a shard that did not resynchronize is
+        re-run from the true boundary.
+        """
+        sections = self.section_table(binary_path)
+        if self.sections:
+            wanted = set(self.sections)
+            sections = [s for s in sections if s[0] in wanted]
+
+        plan = plan_shards(sections, self.shards, self.MIN_SHARD_BYTES)
+        options = {'functions': self.functions, 'detailed': self.detailed}
+        tasks = [(self.objdump_path, str(binary_path), options, name, start, stop)
+                 for name, start, stop in plan]
+        if not tasks:
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.shards, len(tasks))) as executor:
+            outputs = list(executor.map(_shard_worker, tasks))
+
+        prev_section = None
+        prev_end = None
+        prev_tail = None
+        for task, (stats, head, last_end, range_head, range_tail) in zip(tasks, outputs):
+            name, start, stop = task[3:]
+            if name != prev_section:
+                prev_end = prev_tail = None
+            if prev_end is not None and prev_end > start:
+                # The previous shard's last instruction runs past this shard's start
+                bogus = [record for record in head if record[0] < prev_end]
+                if prev_end >= stop:
+                    # Nothing of this shard is left after the straddling instruction
+                    stats, last_end = RVVAnalyzer().get_statistics(), None
+                    range_head, range_tail = (None, {}, None), None
+                elif any(address + length > prev_end for address, length, *_ in bogus):
+                    stats, head, last_end, range_head, range_tail = _shard_worker(task[:4] + (prev_end, stop))
+                else:
+                    discarded = self._discard_instructions(stats, name, bogus)
+                    unknown = {instruction: count - discarded.get(instruction, 0)
+                               for instruction, count in range_head[1].items()}
+                    range_head = (range_head[0], {instruction: count for instruction, count in unknown.items()
+                                                  if count}, range_head[2])
+
+            # Continue the previous shard's vtype into this one
+            if range_tail is None:
+                range_tail = prev_tail
+            elif prev_tail is not None and range_head[0] == prev_tail[0]:
+                self._continue_vtype(stats, prev_tail, range_head)
+                if not range_tail[3]:
+                    range_tail = prev_tail
+
+            self.merge_statistics(stats)
+            prev_section = name
+            prev_end = last_end if last_end is not None else max(prev_end or start, start)
+            prev_tail = range_tail
+
+    @staticmethod
+    def _continue_vtype(stats, prev_tail, range_head):
+        """
+        Re-attribute a shard's leading vector instructions to the configuration
+        active at the end of the previous shard (same function)
+        """
+        _, config, avl, _ = prev_tail
+        function, unknown, first_vset = range_head
+        if config is None:
+            return
+        vtype_stats = stats['vtype_stats']
+        if unknown:
+            vtype = sew_lmul(config)
+            count = sum(unknown.values())
+            vtype_stats[UNKNOWN_VTYPE] -= count
+            if not vtype_stats[UNKNOWN_VTYPE]:
+                del vtype_stats[UNKNOWN_VTYPE]
+            vtype_stats[vtype] = vtype_stats.get(vtype, 0) + count
+            _move_unknown_vtype(stats['vtype_instruction_stats'], unknown, vtype)
+            if function in stats['function_stats']:
+                _move_unknown_vtype(stats['function_stats'][function]['vtype_instruction_stats'], unknown, vtype)
+        if first_vset is not None and is_redundant_vset(first_vset[0], first_vset[1], config, avl):
+            stats['vset_stats']['redundant'] += 1
+
+    def _discard_instructions(self, stats, section, records):
+        """
+        Remove (address, length, mnemonic, function, full mnemonic, masked) records
+        from a statistics dictionary
+
+        The records are the first instructions of a shard, so vector
+        instructions among them were attributed to an unknown vtype. Returns
+        {mnemonic: count} of those removed from vtype_stats.
+        """
+        def decrement(counts, key):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+
+        discarded = defaultdict(int)
+        for _, _, instruction, function, full, masked in records:
+            function_stats = stats['function_stats'].get(function)
+            stats['total_instructions'] -= 1
+            if function_stats is not None:
+                function_stats['total_instructions'] -= 1
+            if self.classifier.is_rvv(instruction):
+                stats['rvv_instructions'] -= 1
+                decrement(stats['instruction_stats'], instruction)
+                decrement(stats['section_stats'], section)
+                if function_stats is not None:
+                    function_stats['rvv_instructions'] -= 1
+                    decrement(function_stats['instruction_stats'], instruction)
+                if 'detailed_stats' in stats:
+                    mnemonics = stats['detailed_stats']['mnemonics']
+                    counter = mnemonics[instruction][full]
+                    counter[masked] -= 1
+                    if not any(counter):
+                        del mnemonics[instruction][full]
+                        if not mnemonics[instruction]:
+                            del mnemonics[instruction]
+                if instruction.startswith('vset'):
+                    stats['vset_stats']['total'] -= 1
+                elif stats['vtype_stats'].get(UNKNOWN_VTYPE):
+                    decrement(stats['vtype_stats'], UNKNOWN_VTYPE)
+                    for by_vtype in (stats['vtype_instruction_stats'],
+                                     function_stats['vtype_instruction_stats'] if function_stats else {}):
+                        if instruction in by_vtype.get(UNKNOWN_VTYPE, {}):
+                            decrement(by_vtype[UNKNOWN_VTYPE], instruction)
+                            if not by_vtype[UNKNOWN_VTYPE]:
+                                del by_vtype[UNKNOWN_VTYPE]
+                    discarded[instruction] += 1
+        return discarded
 
     def parse_disassembly(self, disassembly):
         """Parse objdump output and count RVV instructions"""
-        lines = disassembly.split('\n')
-        current_section = 'unknown'
+        self.parse_lines(disassembly.split('\n'))
 
-        for line in lines:
-            # Detect section headers
-            # Format: "Disassembly of section .text:"
-            section_match = re.match(r'Disassembly of section (.+):', line)
-            if section_match:
-                current_section = section_match.group(1)
-                continue
+    def parse_lines(self, lines):
+        """
+        Parse objdump output lines and count RVV instructions
 
-            # Skip empty lines and file format headers
-            line = line.strip()
-            if not line or line.startswith('file format'):
-                continue
+        Args:
+            lines: Any iterable of lines (trailing newlines are allowed),
+                   e.g. a list, an open file or the iter_objdump() generator
+        """
+        parser = self.line_parser()
+        next(parser)
+        parser.send(lines)
+        with contextlib.suppress(StopIteration):
+            parser.send(None)
 
-            # Match instruction lines (format: address: bytes  instruction operands)
-            # Example: 10000: 02010113  addi  sp,sp,32
-            match = re.match(r'\s*[0-9a-f]+:\s+[0-9a-f]+\s+(\w+)', line)
-            if match:
-                instruction = match.group(1)
-                self.total_instructions += 1
+    def line_parser(self):
+        """
+        Incremental form of parse_lines: a generator that is sent batches of
+        lines (any iterables) and finishes the parse when sent None
 
-                # Check if it's an RVV instruction
-                if self._is_rvv_instruction(instruction):
-                    self.instruction_stats[instruction] += 1
-                    self.section_stats[current_section] += 1
-                    self.rvv_instructions += 1
+        Function, section and vtype state carry over between batches, so the
+        output of one objdump run can be fed as it arrives (arvvi_async).
+        """
+        current_section = 'unknown'
+        section_re = self.SECTION_RE
+        instruction_re = self.INSTRUCTION_RE
+        function_re = self.FUNCTION_RE
+        is_rvv = self.classifier.is_rvv
+        function_filter = self.function_filter
+        detailed = self.detailed
+        detail_counters = self._detail_counters
+        loops = self.loops
+        records = self.records
+
+        # Instructions are attributed to the enclosing <symbol>: block. With a
+        # function filter, instructions outside matching functions are skipped.
+        selected = function_filter is None
+        function_name = None
+        function = None
+        function_instructions = None
+        function_vtypes = None
+        function_total = function_rvv = 0
+
+        # vtype tracking: vector instructions are attributed to the SEW×LMUL
+        # set by the last vset{i}vl{i} of the current function
+        vtype_stats = self.vtype_stats
+        vtype_instruction_stats = self.vtype_instruction_stats
+        vset_configs = self.vset_configs
+        avl_immediates = self.avl_immediates
+        active_config = active_avl = None
+        active_vtype = UNKNOWN_VTYPE
+        # Mnemonic counts of the active vtype, for the model and the current function
+        active_instructions = vtype_instruction_stats[active_vtype]
+        function_active_instructions = None
+
+        # Range boundary state for analyze_sharded: vector instructions before
+        # the first vset{i}vl{i} of the first function may continue the
+        # configuration of the previous shard
+        head_open = True
+        head_total = self.total_instructions
+        head_unknown = dict(vtype_instruction_stats[UNKNOWN_VTYPE])
+        head_function = None
+
+        def head_unknown_instructions():
+            """{mnemonic: count} attributed to the unknown vtype since the start of the range"""
+            unknown = {}
+            for instruction, count in vtype_instruction_stats[UNKNOWN_VTYPE].items():
+                count -= head_unknown.get(instruction, 0)
+                if count:
+                    unknown[instruction] = count
+            return unknown
+
+        # Loop mode: instruction addresses and back edges of the current function
+        addresses = []
+        rvv_addresses = []
+        back_edges = {}
+
+        def flush_function():
+            if function is not None:
+                function['total_instructions'] += function_total
+                function['rvv_instructions'] += function_rvv
+
+        while True:
+            lines = yield
+            if lines is None:
+                break
+            for line in lines:
+                # Detect section headers
+                # Format: "Disassembly of section .text:"
+                section_match = section_re.match(line)
+                if section_match:
+                    current_section = section_match.group(1)
+                    name = None
+                else:
+                    # Skip empty lines and file format headers
+                    line = line.strip()
+                    if not line or line.startswith('file format'):
+                        continue
+
+                    # Match instruction lines (format: address: bytes  instruction operands)
+                    # Example: 10000: 02010113  addi  sp,sp,32
+                    match = instruction_re.match(line)
+                    if match:
+                        if not selected:
+                            continue
+                        instruction = match.group(1)
+                        self.total_instructions += 1
+                        function_total += 1
+                        if records is not None:
+                            records.add(int(line[:line.index(':')], 16), instruction)
+
+                        if loops:
+                            address = int(line[:line.index(':')], 16)
+                            addresses.append(address)
+                            if instruction in BRANCH_MNEMONICS:
+                                target = branch_target(line[match.end():])
+                                if target is not None and addresses[0] <= target <= address and \
+                                        back_edges.get(target, -1) < address:
+                                    back_edges[target] = address
+
+                        # Check if it's an RVV instruction
+                        if is_rvv(instruction):
+                            if loops:
+                                rvv_addresses.append(address)
+                            self.instruction_stats[instruction] += 1
+                            self.section_stats[current_section] += 1
+                            self.rvv_instructions += 1
+                            if function is not None:
+                                function_instructions[instruction] += 1
+                                function_rvv += 1
+
+                            if detailed:
+                                # Full dotted mnemonic ("vadd" + ".vv") and v0.t masking
+                                rest = line[match.end():]
+                                full = instruction + rest.split(None, 1)[0] if rest[:1] == '.' else instruction
+                                counter = detail_counters.get(full)
+                                if counter is None:
+                                    counter = detail_counters[full] = [0, 0]
+                                    self.detailed_stats.setdefault(instruction, {})[full] = counter
+                                counter['v0.t' in rest] += 1
+
+                            if instruction.startswith('vset'):
+                                # All operand text up to any comment: LLVM objdump spaces the operands
+                                operands = line[match.end():].split('#', 1)[0]
+                                config, avl = parse_vset(instruction, operands)
+                                self.vset_count += 1
+                                if config is not None:
+                                    vset_configs[config] += 1
+                                if isinstance(avl, int):
+                                    avl_immediates[avl] += 1
+                                if is_redundant_vset(config, avl, active_config, active_avl):
+                                    self.redundant_vsets += 1
+                                if head_open:
+                                    head_open = False
+                                    self.range_head = (head_function, head_unknown_instructions(), (config, avl))
+                                active_config, active_avl = config, avl
+                                active_vtype = sew_lmul(config)
+                                active_instructions = vtype_instruction_stats[active_vtype]
+                                if function is not None:
+                                    function_active_instructions = function_vtypes[active_vtype]
+                                if records is not None:
+                                    records.set_context(current_section, function_name, active_vtype)
+                            else:
+                                vtype_stats[active_vtype] += 1
+                                active_instructions[instruction] += 1
+                                if function is not None:
+                                    function_active_instructions[instruction] += 1
+                        continue
+
+                    # Symbol headers start a new function
+                    # Format: "0000000000020000 <vector_code>:"
+                    function_match = function_re.match(line)
+                    if not function_match:
+                        continue
+                    name = function_match.group(1)
+
+                flush_function()
+                function_total = function_rvv = 0
+                if name is None:
+                    selected = function_filter is None
+                    function = None
+                else:
+                    selected = function_filter is None or function_filter(name)
+                    if selected:
+                        function = self.function_stats.get(name)
+                        if function is None:
+                            function = self.function_stats[name] = new_function_stats()
+                        function_instructions = function['instruction_stats']
+                        function_vtypes = function['vtype_instruction_stats']
+                    else:
+                        function = None
+
+                # A new function (or section) starts with an unknown configuration;
+                # "<symbol+0x...>:" continuation headers keep it
+                if section_match or name != function_name:
+                    if head_open:
+                        if self.total_instructions > head_total:
+                            head_open = False
+                            self.range_head = (head_function, head_unknown_instructions(), None)
+                        else:
+                            head_function = name
+                    function_name = name
+                    active_config = active_avl = None
+                    active_vtype = UNKNOWN_VTYPE
+                    active_instructions = vtype_instruction_stats[active_vtype]
+                    if addresses:
+                        self._add_loops(addresses, rvv_addresses, back_edges)
+                        addresses, rvv_addresses, back_edges = [], [], {}
+                if function is not None:
+                    function_active_instructions = function_vtypes[active_vtype]
+                if records is not None:
+                    records.set_context(current_section, name, active_vtype)
+
+        flush_function()
+        if addresses:
+            self._add_loops(addresses, rvv_addresses, back_edges)
+        if head_open:
+            self.range_head = (head_function, head_unknown_instructions(), None)
+        self.range_tail = (function_name, active_config, active_avl, not head_open)
+
+    def _add_loops(self, addresses, rvv_addresses, back_edges):
+        """Accumulate one function's instruction counts per loop nesting depth"""
+        self.loop_count += len(back_edges)
+        for depth, (total, rvv) in loop_depths(addresses, rvv_addresses, back_edges).items():
+            counts = self.loop_depths[depth]
+            counts[0] += total
+            counts[1] += rvv
 
     def _is_rvv_instruction(self, instruction):
         """Check if an instruction is an RVV instruction"""
-        # Most RVV instructions start with 'v'
-        for pattern in self.RVV_PATTERNS:
-            if re.match(pattern, instruction, re.IGNORECASE):
-                return True
-        return False
+        return self.classifier.is_rvv(instruction)
 
-    def print_statistics(self, model_name=None):
+    def print_statistics(self, model_name=None, top_functions=10):
         """Print instruction statistics"""
         if model_name:
             print(f"\n{'='*60}")
@@ -187,6 +926,11 @@ class RVVAnalyzer:
         if self.total_instructions > 0:
             percentage = (self.rvv_instructions / self.total_instructions) * 100
             print(f"RVV usage: {percentage:.2f}%")
+        if self.loops and self.loop_depths:
+            weighted_total, weighted_rvv = weighted_counts(self.loop_depths, self.loop_weight)
+            weighted = (weighted_rvv / weighted_total) * 100 if weighted_total else 0
+            print(f"Loop-weighted RVV usage: {weighted:.2f}% "
+                  f"({self.loop_count} loops, max depth {max(self.loop_depths)}, weight {self.loop_weight}^depth)")
 
         # Print section distribution
         if self.section_stats:
@@ -197,6 +941,40 @@ class RVVAnalyzer:
                 percentage = (count / self.rvv_instructions) * 100 if self.rvv_instructions > 0 else 0
                 print(f"{section:30s}: {count:6d} ({percentage:5.1f}%)")
 
+        # Print RVV-dense functions
+        dense_functions = self.top_functions(top_functions)
+        if dense_functions:
+            print(f"\nTop {len(dense_functions)} Functions by RVV Instructions:")
+            print("-" * 60)
+            for name, stats in dense_functions:
+                total = stats['total_instructions']
+                density = (stats['rvv_instructions'] / total) * 100 if total > 0 else 0
+                print(f"{name[:30]:30s}: {stats['rvv_instructions']:6d} / {total:6d} ({density:5.1f}% RVV)")
+
+        # Print SEW×LMUL distribution and vset{i}vl{i} overhead
+        if self.vtype_stats:
+            attributed = sum(self.vtype_stats.values())
+            print("\nVector Instructions by SEW×LMUL:")
+            print("-" * 60)
+            for vtype, count in sorted(self.vtype_stats.items(), key=lambda x: x[1], reverse=True):
+                print(f"{vtype:30s}: {count:6d} ({count / attributed * 100:5.1f}%)")
+        if self.vset_count:
+            redundant = self.redundant_vsets / self.vset_count * 100
+            print(f"vset{{i}}vl{{i}}: {self.vset_count} ({self.redundant_vsets} redundant, {redundant:.1f}%)")
+
+        if self.loops and self.loop_depths:
+            print("\nInstructions by Loop Depth:")
+            print("-" * 60)
+            for depth, (total, rvv) in sorted(self.loop_depths.items()):
+                density = (rvv / total) * 100 if total > 0 else 0
+                print(f"Depth {depth:<24d}: {rvv:6d} / {total:6d} ({density:5.1f}% RVV)")
+
+        if self.detailed:
+            self.print_detailed_statistics()
+
+        if self.cost_model is not None:
+            self.print_cost_statistics(top_functions)
+
         print("\nRVV Instruction Distribution:")
         print("-" * 60)
 
@@ -206,29 +984,360 @@ class RVVAnalyzer:
         for instruction, count in sorted_stats:
             print(f"{instruction:20s}: {count:6d}")
 
+    def print_detailed_statistics(self):
+        """Print the operand-category, masking and widening breakdown (detailed mode)"""
+        summary = self.detailed_summary()
+        total = sum(summary['categories'].values())
+        if not total:
+            return
+        print("\nRVV Instructions by Operand Category:")
+        print("-" * 60)
+        for category, count in sorted(summary['categories'].items(), key=lambda x: x[1], reverse=True):
+            print(f"{category:30s}: {count:6d} ({count / total * 100:5.1f}%)")
+        print(f"Masked (v0.t): {summary['masked']} ({summary['masked'] / total * 100:.1f}%)")
+        print(f"Widening: {summary['widening']}, Narrowing: {summary['narrowing']}")
+
+        print("\nRVV Instruction Forms:")
+        print("-" * 60)
+        forms = [(full, counter) for by_form in self.detailed_stats.values() for full, counter in by_form.items()]
+        for full, (unmasked, masked) in sorted(forms, key=lambda x: sum(x[1]), reverse=True):
+            print(f"{full:20s}: {unmasked + masked:6d} ({masked} masked)")
+
+    def print_cost_statistics(self, top=10):
+        """Print estimated cycles and the top cycle consumers (cost model)"""
+        cost = self.cost_model.estimate(self.get_statistics())
+        total = cost['total_cycles']
+        if not total:
+            return
+        print(f"\nEstimated cycles ({cost['cost_model']}, {cost['metric']}): {total:,}")
+        print(f"RVV: {cost['rvv_cycles']:,} ({cost['rvv_cycles'] / total * 100:.1f}%), "
+              f"scalar: {cost['scalar_cycles']:,}, average LMUL factor: {cost['lmul_factor']}")
+        for title, cycles in (('Functions', cost['function_cycles']),
+                              ('RVV Instructions', cost['instruction_cycles'])):
+            consumers = top_consumers(cycles, top)
+            if not consumers:
+                continue
+            print(f"\nTop {len(consumers)} Cycle Consumers ({title}):")
+            print("-" * 60)
+            for name, count in consumers:
+                print(f"{name[:30]:30s}: {count:10,d} ({count / total * 100:5.1f}%)")
+
+    def detailed_summary(self):
+        """Aggregate detailed_stats by operand category, masking and widening/narrowing"""
+        categories = defaultdict(int)
+        masked = widening = narrowing = 0
+        for by_form in self.detailed_stats.values():
+            for full, (unmasked_count, masked_count) in by_form.items():
+                count = unmasked_count + masked_count
+                categories[operand_category(full) or 'unknown'] += count
+                masked += masked_count
+                width = width_class(full)
+                if width == 'widening':
+                    widening += count
+                elif width == 'narrowing':
+                    narrowing += count
+        return {'categories': dict(categories), 'masked': masked, 'widening': widening, 'narrowing': narrowing}
+
+    def top_functions(self, n=10):
+        """Return the n functions with the most RVV instructions as (name, stats) pairs"""
+        functions = [(name, stats) for name, stats in self.function_stats.items() if stats['rvv_instructions']]
+        functions.sort(key=lambda item: (item[1]['rvv_instructions'],
+                                         item[1]['rvv_instructions'] / item[1]['total_instructions']),
+                       reverse=True)
+        return functions[:n]
+
     def get_statistics(self):
         """Return statistics as a dictionary"""
-        return {
+        stats = {
             'total_instructions': self.total_instructions,
             'rvv_instructions': self.rvv_instructions,
             'instruction_stats': dict(self.instruction_stats),
-            'section_stats': dict(self.section_stats)
+            'section_stats': dict(self.section_stats),
+            'function_stats': {
+                name: {
+                    'total_instructions': stats['total_instructions'],
+                    'rvv_instructions': stats['rvv_instructions'],
+                    'instruction_stats': dict(stats['instruction_stats']),
+                    'vtype_instruction_stats': vtype_instruction_dict(stats['vtype_instruction_stats']),
+                }
+                for name, stats in self.function_stats.items()
+            },
+            'vtype_stats': dict(self.vtype_stats),
+            'vtype_instruction_stats': vtype_instruction_dict(self.vtype_instruction_stats),
+            'vset_stats': {
+                'total': self.vset_count,
+                'redundant': self.redundant_vsets,
+                'configs': dict(self.vset_configs),
+                'avl_immediates': {str(avl): count for avl, count in self.avl_immediates.items()},
+            }
         }
+        if self.trace_info:
+            stats['trace_stats'] = self.trace_info
+        if self.loops:
+            weighted_total, weighted_rvv = weighted_counts(self.loop_depths, self.loop_weight)
+            stats['loop_stats'] = {
+                'loops': self.loop_count,
+                'depths': {str(depth): list(counts) for depth, counts in sorted(self.loop_depths.items())},
+                'loop_weight': self.loop_weight,
+                'weighted_instructions': weighted_total,
+                'weighted_rvv_instructions': weighted_rvv,
+            }
+        if self.detailed:
+            stats['detailed_stats'] = dict(self.detailed_summary(), mnemonics={
+                instruction: {full: list(counter) for full, counter in by_form.items()}
+                for instruction, by_form in self.detailed_stats.items()
+            })
+        if self.cost_model is not None:
+            stats['cost_stats'] = self.cost_model.estimate(stats)
+        return stats
+
+    def merge_statistics(self, stats):
+        """Add a statistics dictionary (get_statistics() format) into this analyzer"""
+        self.total_instructions += stats.get('total_instructions', 0)
+        self.rvv_instructions += stats.get('rvv_instructions', 0)
+        for instruction, count in stats.get('instruction_stats', {}).items():
+            self.instruction_stats[instruction] += count
+        for section, count in stats.get('section_stats', {}).items():
+            self.section_stats[section] += count
+        for name, function_stats in stats.get('function_stats', {}).items():
+            function = self.function_stats.get(name)
+            if function is None:
+                function = self.function_stats[name] = new_function_stats()
+            function['total_instructions'] += function_stats.get('total_instructions', 0)
+            function['rvv_instructions'] += function_stats.get('rvv_instructions', 0)
+            for instruction, count in function_stats.get('instruction_stats', {}).items():
+                function['instruction_stats'][instruction] += count
+            merge_vtype_instructions(function['vtype_instruction_stats'],
+                                     function_stats.get('vtype_instruction_stats', {}))
+        for vtype, count in stats.get('vtype_stats', {}).items():
+            self.vtype_stats[vtype] += count
+        merge_vtype_instructions(self.vtype_instruction_stats, stats.get('vtype_instruction_stats', {}))
+        vset_stats = stats.get('vset_stats', {})
+        self.vset_count += vset_stats.get('total', 0)
+        self.redundant_vsets += vset_stats.get('redundant', 0)
+        for config, count in vset_stats.get('configs', {}).items():
+            self.vset_configs[config] += count
+        for avl, count in vset_stats.get('avl_immediates', {}).items():
+            self.avl_immediates[int(avl)] += count
+        loop_stats = stats.get('loop_stats', {})
+        self.loop_count += loop_stats.get('loops', 0)
+        for depth, (total, rvv) in loop_stats.get('depths', {}).items():
+            counts = self.loop_depths[int(depth)]
+            counts[0] += total
+            counts[1] += rvv
+        for instruction, by_form in stats.get('detailed_stats', {}).get('mnemonics', {}).items():
+            for full, (unmasked, masked) in by_form.items():
+                counter = self._detail_counters.get(full)
+                if counter is None:
+                    counter = self._detail_counters[full] = [0, 0]
+                    self.detailed_stats.setdefault(instruction, {})[full] = counter
+                counter[0] += unmasked
+                counter[1] += masked
 
     def save_json(self, output_path, model_name=None):
         """Save statistics to JSON file"""
-        data = {
-            'model': model_name or 'unknown',
-            'statistics': self.get_statistics()
-        }
+        with self.profiler.stage('json_write'):
+            data = {
+                'model': model_name or 'unknown',
+                'statistics': self.get_statistics()
+            }
 
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+            with open(output_path, 'w') as f:
+                json.dump(data, f, indent=2)
 
         print(f"\nStatistics saved to: {output_path}")
 
+        if self.records is not None:
+            from arvvi_records import records_path
+            path = records_path(output_path)
+            with self.profiler.stage('records_write'):
+                self.records.save(path, self.classifier)
+            print(f"Instruction records saved to: {path} ({len(self.records):,} rows)")
 
-def scan_models(models_dir, objdump_path, sections=None, visualize=False):
+
+def plan_shards(sections, shards, min_bytes=RVVAnalyzer.MIN_SHARD_BYTES):
+    """
+    Split sections into roughly `shards` address ranges of similar size
+
+    Args:
+        sections: List of (name, vma, size) as returned by section_table()
+        shards: Target number of shards
+        min_bytes: Smallest range worth its own objdump process
+
+    Returns:
+        List of (section_name, start_address, stop_address)
+    """
+    total = sum(size for _, _, size in sections)
+    target = max(min_bytes, -(-total // max(shards, 1)))
+    target += -target % 4  # keep boundaries on instruction alignment
+
+    plan = []
+    for name, vma, size in sections:
+        start, end = vma, vma + size
+        while start < end:
+            stop = min(start + target, end)
+            plan.append((name, start, stop))
+            start = stop
+    return plan
+
+
+def _shard_worker(task):
+    """
+    Process-pool entry point for RVVAnalyzer.analyze_sharded
+
+    Returns:
+        (statistics, head, last_end, range_head, range_tail): statistics for the
+        range, the first few (address, length, mnemonic, function, full mnemonic,
+        masked) instruction records, the end address of the last instruction (None if the range had
+        no instructions), and the parser's vtype boundary state
+    """
+    objdump_path, binary_path, options, section, start, stop = task
+    analyzer = RVVAnalyzer(objdump_path=objdump_path, sections=[section], **options)
+
+    head_lines = []
+    tail_lines = deque(maxlen=SHARD_TAIL_LINES)
+
+    def tap(lines):
+        for line in lines:
+            if len(head_lines) < SHARD_HEAD_LINES:
+                head_lines.append(line)
+            tail_lines.append(line)
+            yield line
+
+    analyzer.parse_lines(tap(analyzer.iter_objdump(binary_path, start, stop)))
+
+    def records(lines):
+        function = None
+        for line in lines:
+            line = line.strip()
+            match = analyzer.ADDRESSED_INSTRUCTION_RE.match(line)
+            if match:
+                address, encoding, instruction = match.groups()
+                rest = line[match.end():]
+                full = instruction + rest.split(None, 1)[0] if rest[:1] == '.' else instruction
+                yield int(address, 16), len(encoding) // 2, instruction, function, full, 'v0.t' in rest
+                continue
+            function_match = analyzer.FUNCTION_RE.match(line)
+            if function_match:
+                function = function_match.group(1)
+
+    head = list(records(head_lines))[:SHARD_HEAD_RECORDS]
+    tail = list(records(tail_lines))
+    last_end = tail[-1][0] + tail[-1][1] if tail else None
+    return analyzer.get_statistics(), head, last_end, analyzer.range_head, analyzer.range_tail
+
+
+_classifier = None
+
+
+def get_classifier():
+    """Return the process-wide RVVClassifier, building it on first use"""
+    global _classifier
+    if _classifier is None:
+        _classifier = RVVClassifier(RVVAnalyzer.RVV_PATTERNS)
+    return _classifier
+
+
+def discover_models(models_dir):
+    """
+    Find the models under a models directory
+
+    Returns:
+        Sorted list of (model_basename, adx_path) tuples, one per .mlir file
+        in a direct subdirectory. adx_path may not exist yet.
+    """
+    models_path = Path(models_dir)
+
+    # Find all .mlir files in direct subdirectories only (not recursive)
+    # Pattern: models/*/xxx.mlir (one level deep)
+    mlir_files = []
+    for subdir in sorted(models_path.iterdir()):
+        if subdir.is_dir():
+            # Find .mlir files in this subdirectory (not deeper)
+            mlir_files.extend(sorted(subdir.glob('*.mlir')))
+
+    models = []
+    for mlir_file in mlir_files:
+        # Extract model name (remove .mlir extension)
+        model_basename = mlir_file.stem  # e.g., "bird" or "yolov5n.tosa"
+        model_dir = mlir_file.parent
+
+        # Construct expected .adx path
+        # models/Bird/bird.mlir -> models/Bird/bird/OUTPUT/bird.adx
+        adx_path = model_dir / model_basename / "OUTPUT" / f"{model_basename}.adx"
+        models.append((model_basename, adx_path))
+    return models
+
+
+def analyze_model(model_basename, adx_path, analyzer_options, stream=False, profile=False):
+    """
+    Analyze one discovered model and write its JSON next to the .adx
+
+    Charts are rendered for all models afterwards by scan_models (render_charts).
+
+    Args:
+        analyzer_options: Keyword arguments for RVVAnalyzer
+                          (objdump_path, sections, engine, ...)
+        profile: Add the model's stage timings ('profile') to the result
+
+    Returns:
+        Result dictionary, or None if the model was skipped or failed
+        (errors, AnalyzerError included, are reported and only fail this model)
+    """
+    if not adx_path.exists():
+        print(f"  ⚠️  Skipping: {adx_path} not found")
+        return None
+
+    try:
+        # Analyze the model
+        profiler = Profiler(model_basename) if profile else None
+        analyzer = RVVAnalyzer(profiler=profiler, **analyzer_options)
+
+        print(f"  📊 Analyzing: {adx_path}")
+        analyzer.analyze(str(adx_path), stream=stream)
+        if analyzer.from_cache:
+            print("  ⚡ Cache hit")
+
+        # Save JSON to OUTPUT directory
+        output_dir = adx_path.parent
+        json_path = output_dir / f"{model_basename}_rvv_stats.json"
+        analyzer.save_json(str(json_path), model_basename)
+
+        print(f"  ✅ Complete: {analyzer.rvv_instructions} RVV instructions\n")
+        result = {
+            'model': model_basename,
+            'adx_path': str(adx_path),
+            'json_path': str(json_path),
+            'stats': analyzer.get_statistics()
+        }
+        if profiler is not None:
+            result['profile'] = profiler.report()
+        return result
+
+    except Exception as e:
+        print(f"  ❌ Error analyzing {model_basename}: {e}\n")
+        return None
+
+
+def _scan_worker(task):
+    """
+    Process-pool entry point for scan_models
+
+    Runs analyze_model with stdout/stderr captured, so the parent can print
+    each model's log as one block in discovery order.
+    """
+    header, model_basename, adx_path, analyzer_options, stream, profile = task
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        print(header)
+        result = analyze_model(model_basename, adx_path, analyzer_options, stream=stream, profile=profile)
+    return result, stdout.getvalue(), stderr.getvalue()
+
+
+def scan_models(models_dir, objdump_path, sections=None, visualize=False, stream=False, engine='objdump',
+                jobs=1, shards=1, cache=None, detailed=False, loops=False, loop_weight=DEFAULT_LOOP_WEIGHT,
+                cost_model=None, records=False, chart_format='png', dpi=None, preview=False, html=False,
+                profile=None, db=None, run_label=None):
     """
     Scan a directory for IREE models and analyze all .adx files
 
@@ -243,93 +1352,111 @@ def scan_models(models_dir, objdump_path, sections=None, visualize=False):
     └── YOLOv5n/
         ├── yolov5n.tosa.mlir
         └── yolov5n.tosa/OUTPUT/yolov5n.tosa.adx
+
+    With jobs > 1 models are analyzed in a process pool; logs and results
+    are still reported in discovery order. Charts (visualize) are rendered
+    after the analysis, in a process pool of the same size, in chart_format
+    at dpi (or the low preview resolution). With html, an interactive
+    <model>_rvv_report.html is written next to each JSON.
+
+    With profile (a .json or .ndjson path), per-model stage timings and
+    their sum over the scan are printed and saved there. With db (an SQLite
+    path), the analyzed models are added to it as one run (arvvi_db).
     """
     models_path = Path(models_dir)
     if not models_path.exists():
         print(f"Error: Directory not found: {models_dir}", file=sys.stderr)
         return []
 
-    # Find all .mlir files in direct subdirectories only (not recursive)
-    # Pattern: models/*/xxx.mlir (one level deep)
-    mlir_files = []
-    for subdir in models_path.iterdir():
-        if subdir.is_dir():
-            # Find .mlir files in this subdirectory (not deeper)
-            mlir_files.extend(subdir.glob('*.mlir'))
+    started = time.perf_counter()
+    scan_profiler = Profiler('scan') if profile else NULL_PROFILER
+    with scan_profiler.stage('discover'):
+        models = discover_models(models_path)
 
-    if not mlir_files:
+    if not models:
         print(f"No .mlir files found in {models_dir}", file=sys.stderr)
         return []
 
-    print(f"\nFound {len(mlir_files)} model(s) to analyze")
+    print(f"\nFound {len(models)} model(s) to analyze")
     print(f"{'='*60}\n")
 
+    analyzer_options = {'objdump_path': objdump_path, 'sections': sections, 'engine': engine,
+                        'shards': shards, 'cache': cache, 'detailed': detailed, 'loops': loops,
+                        'loop_weight': loop_weight, 'cost_model': cost_model, 'records': records}
+    jobs = min(jobs or os.cpu_count() or 1, len(models))
+
     results = []
     analyzed_count = 0
     skipped_count = 0
 
-    for idx, mlir_file in enumerate(mlir_files, 1):
-        # Extract model name (remove .mlir extension)
-        model_basename = mlir_file.stem  # e.g., "bird" or "yolov5n.tosa"
-        model_dir = mlir_file.parent
-
-        # Construct expected .adx path
-        # models/Bird/bird.mlir -> models/Bird/bird/OUTPUT/bird.adx
-        adx_path = model_dir / model_basename / "OUTPUT" / f"{model_basename}.adx"
-
-        print(f"[{idx}/{len(mlir_files)}] Processing: {model_basename}")
-
-        if not adx_path.exists():
-            print(f"  ⚠️  Skipping: {adx_path} not found")
-            skipped_count += 1
-            continue
-
+    if jobs <= 1:
+        for idx, (model_basename, adx_path) in enumerate(models, 1):
+            print(f"[{idx}/{len(models)}] Processing: {model_basename}")
+            result = analyze_model(model_basename, adx_path, analyzer_options, stream=stream,
+                                   profile=bool(profile))
+            if result:
+                results.append(result)
+                analyzed_count += 1
+            else:
+                skipped_count += 1
+    else:
+        print(f"Running {jobs} parallel jobs\n")
+        tasks = [(f"[{idx}/{len(models)}] Processing: {model_basename}",
+                  model_basename, adx_path, analyzer_options, stream, bool(profile))
+                 for idx, (model_basename, adx_path) in enumerate(models, 1)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map() yields in submission order, so output stays deterministic
+            for result, stdout, stderr in executor.map(_scan_worker, tasks):
+                sys.stdout.write(stdout)
+                sys.stderr.write(stderr)
+                sys.stdout.flush()
+                if result:
+                    results.append(result)
+                    analyzed_count += 1
+                else:
+                    skipped_count += 1
+
+    if visualize and results:
         try:
-            # Analyze the model
-            analyzer = RVVAnalyzer(objdump_path=objdump_path, sections=sections)
-
-            print(f"  📊 Analyzing: {adx_path}")
-            disassembly = analyzer.run_objdump(str(adx_path))
-            analyzer.parse_disassembly(disassembly)
-
-            # Save JSON to OUTPUT directory
-            output_dir = adx_path.parent
-            json_path = output_dir / f"{model_basename}_rvv_stats.json"
-            analyzer.save_json(str(json_path), model_basename)
-
-            # Generate visualization if requested
-            if visualize:
-                try:
-                    from arvvi_visualizer import visualize_statistics
-                    visualize_statistics(analyzer.get_statistics(), model_basename, str(output_dir))
-                    print("  ✅ Visualization saved")
-                except ImportError:
-                    print("  ⚠️  matplotlib not installed, skipping visualization")
-
-            results.append({
-                'model': model_basename,
-                'adx_path': str(adx_path),
-                'json_path': str(json_path),
-                'stats': analyzer.get_statistics()
-            })
+            from arvvi_visualizer import chart_dpi, render_charts
+            print(f"Rendering charts for {len(results)} model(s)\n")
+            with scan_profiler.stage('charts'):
+                render_charts([(result['stats'], result['model'], Path(result['json_path']).parent)
+                               for result in results], jobs, chart_format, chart_dpi(dpi, preview))
+            print("  ✅ Visualizations saved")
+        except ImportError:
+            print("  ⚠️  matplotlib not installed, skipping visualization")
 
-            analyzed_count += 1
-            print(f"  ✅ Complete: {analyzer.rvv_instructions} RVV instructions\n")
+    if db and results:
+        with scan_profiler.stage('db_write'):
+            record_run(db, [(result['model'], result['stats'], result['json_path']) for result in results],
+                       run_label, str(models_dir))
 
-        except Exception as e:
-            print(f"  ❌ Error analyzing {model_basename}: {e}\n")
-            skipped_count += 1
-            continue
+    if html and results:
+        from arvvi_visualizer import write_html_report
+        with scan_profiler.stage('html'):
+            for result in results:
+                write_html_report({result['model']: result['stats']},
+                                  Path(result['json_path']).parent / f"{result['model']}_rvv_report.html",
+                                  title=f"RVV Instruction Analysis - {result['model']}")
 
     # Print summary
     print("\n" + "=" * 60)
     print("Batch Analysis Summary")
     print("=" * 60)
-    print(f"Total models found:    {len(mlir_files)}")
+    print(f"Total models found:    {len(models)}")
     print(f"Successfully analyzed: {analyzed_count}")
     print(f"Skipped:              {skipped_count}")
     print("=" * 60 + "\n")
 
+    if profile:
+        reports = [result['profile'] for result in results]
+        summary = aggregate_reports(reports, name='scan', extra=scan_profiler)
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 6)
+        summary['jobs'] = jobs
+        print_profile(summary)
+        write_profile(profile, reports, summary)
+
     return results
 
 
@@ -344,10 +1471,27 @@ Examples:
     %(prog)s /models/mobilenetV1/OUTPUT/output.adx -o stats.json
     %(prog)s /models/mobilenetV1/OUTPUT/output.adx --section .data
     %(prog)s /models/mobilenetV1/OUTPUT/output.adx --function main
+    %(prog)s /models/mobilenetV1/OUTPUT/output.adx --stream
+    %(prog)s /models/mobilenetV1/OUTPUT/output.adx --engine native
+    %(prog)s /models/mobilenetV1/OUTPUT/output.adx --shards 0
 
   Batch analysis (scan directory):
     %(prog)s --scan models/ --section .data --visualize
     %(prog)s --scan ../AutoIREE_zoo/models/ --section .data -v
+    %(prog)s --scan models/ --section .data --jobs 16
+    %(prog)s --scan models/ --section .data --jobs 16 --visualize --preview
+    %(prog)s --scan models/ --section .data --html
+    %(prog)s --scan models/ --section .data --jobs 16 --profile profile.ndjson
+    %(prog)s --scan models/ --section .data --db results.db --run-label nightly-0412
+
+  Keep results up to date while models are rebuilt:
+    %(prog)s --scan models/ --section .data --watch
+    %(prog)s --scan models/ --section .data --watch --aggregate comparison.html
+
+  Result cache:
+    %(prog)s --cache-info
+    %(prog)s --clear-cache
+    %(prog)s --scan models/ --section .data --no-cache
         """
     )
 
@@ -361,9 +1505,74 @@ Examples:
     parser.add_argument('-s', '--section', dest='sections',
                         help='Analyze specific section(s) only (comma-separated). Example: .data or .data,.text (faster for IREE VMFB)')
     parser.add_argument('-f', '--function', dest='functions',
-                        help='Analyze specific function(s) only (comma-separated). Example: main,inference')
+                        help='Analyze specific function(s) only (comma-separated names, globs or re:<regex>). '
+                             'Example: main,conv2d_*,re:^matmul')
+    parser.add_argument('--top-functions', type=int, default=10, metavar='N',
+                        help='Number of RVV-dense functions to list in the report (default: 10)')
+    parser.add_argument('--detailed', action='store_true',
+                        help='Also break RVV instructions down by full mnemonic (vadd.vv/.vx/.vi), '
+                             'operand category (OPIVV, OPFVF, ...), masking (v0.t) and widening/narrowing')
+    parser.add_argument('--loops', action='store_true',
+                        help='Detect loops from backward branches and report loop-weighted RVV usage')
+    parser.add_argument('--loop-weight', type=int, default=DEFAULT_LOOP_WEIGHT, metavar='W',
+                        help=f'Assumed iterations per loop level for --loops (default: {DEFAULT_LOOP_WEIGHT})')
+    parser.add_argument('--cost', action='store_true',
+                        help='Estimate cycles per function, section and model with a cost model '
+                             '(default: built-in Andes-like table)')
+    parser.add_argument('--cost-model', metavar='FILE',
+                        help='Per-core latency/throughput table (JSON or YAML) for --cost; implies --cost')
+    parser.add_argument('--records', action='store_true',
+                        help='Also save every parsed instruction (address, mnemonic, section, function, SEW×LMUL) '
+                             'as columnar arrays in a _records.npz next to the JSON (objdump engine, needs NumPy)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Weight instructions by execution count from a Spike --log-commits or '
+                             'QEMU -d in_asm,exec,nochain trace of the binary (.gz allowed, - for stdin)')
+    parser.add_argument('--trace-format', choices=TRACE_FORMATS, default='auto',
+                        help='Trace format for --trace (default: auto-detect)')
+    parser.add_argument('--trace-offset', type=lambda value: int(value, 0), default=0, metavar='ADDR',
+                        help='Runtime minus link-time address of the traced code, e.g. 0x80000000 (default: 0)')
     parser.add_argument('-v', '--visualize', action='store_true',
                         help='Generate visualization charts')
+    parser.add_argument('--html', action='store_true',
+                        help='Write an interactive, self-contained <model>_rvv_report.html (no matplotlib needed)')
+    parser.add_argument('--chart-format', choices=CHART_FORMATS, default='png',
+                        help='File format of --visualize charts (default: png)')
+    parser.add_argument('--dpi', type=int, metavar='N',
+                        help='Resolution of --visualize charts (default: 300)')
+    parser.add_argument('--preview', action='store_true',
+                        help='Fast low-resolution charts (72 dpi unless --dpi is given)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Parse objdump output incrementally through a pipe (bounded memory for large binaries)')
+    parser.add_argument('--engine', choices=ENGINES, default='objdump',
+                        help='Disassembly engine: external objdump or built-in ELF decoder (default: objdump)')
+    parser.add_argument('--shards', type=int, default=1, metavar='N',
+                        help='Split each binary into N address ranges disassembled in parallel (0 = one per CPU, default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the result cache (always re-run the analysis)')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='Delete all cached results before running')
+    parser.add_argument('--cache-info', action='store_true',
+                        help='Show result cache location, entry count and size')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='Result cache directory (default: $ARVVI_CACHE_DIR or ~/.cache/arvvi)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES >> 20, metavar='MB',
+                        help=f'Result cache size limit in MB (default: {DEFAULT_MAX_BYTES >> 20})')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='Analyze N models in parallel with --scan (0 = one per CPU, default: 1)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Time each stage and save per-model and total profiles to FILE (.json or .ndjson)')
+    parser.add_argument('--db', metavar='FILE',
+                        help='Also record the results as one run in an SQLite database (see arvvi_compare.py --db)')
+    parser.add_argument('--run-label', metavar='LABEL', help='Name of the --db run, e.g. a nightly build tag')
+    parser.add_argument('--watch', action='store_true',
+                        help='With --scan: keep running and re-analyze models whenever their .adx changes')
+    parser.add_argument('--aggregate', metavar='FILE',
+                        help='Comparison of all models kept up to date by --watch (.json, .md or .html, '
+                             'default: DIR/rvv_comparison.json)')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SEC',
+                        help=f'Seconds between --watch polls (default: {DEFAULT_POLL_INTERVAL})')
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE, metavar='SEC',
+                        help=f'Seconds an .adx must stay unchanged before --watch analyzes it (default: {DEFAULT_SETTLE})')
 
     args = parser.parse_args()
 
@@ -372,6 +1581,63 @@ Examples:
     if args.sections:
         sections = [s.strip() for s in args.sections.split(',')]
 
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 (one per CPU) or a positive number")
+    if args.shards < 0:
+        parser.error("--shards must be 0 (one per CPU) or a positive number")
+    if args.dpi is not None and args.dpi < 1:
+        parser.error("--dpi must be a positive number")
+    shards = args.shards or os.cpu_count() or 1
+    if args.records:
+        if args.engine == 'native' or args.trace:
+            parser.error("--records needs the objdump engine and cannot be combined with --trace")
+        if not (args.output or args.scan_dir):
+            parser.error("--records is written next to the JSON output: use -o FILE or --scan")
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            print("Error: --records requires NumPy. Install with: pip install numpy", file=sys.stderr)
+            sys.exit(1)
+    if args.trace and (args.scan_dir or args.engine == 'native' or args.detailed or args.loops):
+        parser.error("--trace works on a single binary with the objdump engine, without --detailed/--loops")
+    if args.watch:
+        if not args.scan_dir:
+            parser.error("--watch needs --scan <directory>")
+        if args.visualize or args.html or args.profile or args.records or args.db:
+            parser.error("--watch cannot be combined with --visualize, --html, --profile, --records or --db "
+                         "(use --aggregate FILE.html for a live report)")
+        if args.poll_interval <= 0 or args.settle < 0:
+            parser.error("--poll-interval must be positive and --settle must not be negative")
+
+    cost_model = None
+    if args.cost or args.cost_model:
+        try:
+            cost_model = CostModel.load(args.cost_model) if args.cost_model else CostModel()
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot load cost model {args.cost_model}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    cache = ResultCache(args.cache_dir, args.cache_size << 20)
+    if args.clear_cache:
+        print(f"Cleared {cache.clear()} cached result(s) from {cache.cache_dir}")
+    if args.cache_info:
+        print_cache_info(cache)
+    if (args.clear_cache or args.cache_info) and not (args.binary or args.scan_dir):
+        return 0
+    if args.no_cache:
+        cache = None
+
+    if args.watch:
+        if not Path(args.scan_dir).is_dir():
+            print(f"Error: Directory not found: {args.scan_dir}", file=sys.stderr)
+            sys.exit(1)
+        analyzer_options = {'objdump_path': args.objdump, 'sections': sections, 'engine': args.engine,
+                            'shards': shards, 'cache': cache, 'detailed': args.detailed, 'loops': args.loops,
+                            'loop_weight': args.loop_weight, 'cost_model': cost_model}
+        watch_models(args.scan_dir, analyzer_options, stream=args.stream, aggregate_path=args.aggregate,
+                     interval=args.poll_interval, settle=args.settle)
+        return 0
+
     # Check if using scan mode
     if args.scan_dir:
         # Batch mode: scan directory
@@ -379,7 +1645,24 @@ Examples:
             models_dir=args.scan_dir,
             objdump_path=args.objdump,
             sections=sections,
-            visualize=args.visualize
+            visualize=args.visualize,
+            stream=args.stream,
+            engine=args.engine,
+            jobs=args.jobs,
+            shards=shards,
+            cache=cache,
+            detailed=args.detailed,
+            loops=args.loops,
+            loop_weight=args.loop_weight,
+            cost_model=cost_model,
+            records=args.records,
+            chart_format=args.chart_format,
+            dpi=args.dpi,
+            preview=args.preview,
+            html=args.html,
+            profile=args.profile,
+            db=args.db,
+            run_label=args.run_label
         )
         return 0
 
@@ -406,7 +1689,10 @@ Examples:
 
     # Run analysis
     print(f"Analyzing binary: {args.binary}")
-    print(f"Using objdump: {args.objdump}")
+    if args.engine == 'native':
+        print("Using built-in ELF decoder (no objdump)")
+    else:
+        print(f"Using objdump: {args.objdump}")
     if sections:
         print(f"Analyzing section(s): {', '.join(sections)} (faster mode)")
     else:
@@ -416,30 +1702,69 @@ Examples:
     else:
         print("Analyzing all functions")
 
-    analyzer = RVVAnalyzer(objdump_path=args.objdump, functions=functions, sections=sections)
-
-    print("\nRunning objdump...")
-    disassembly = analyzer.run_objdump(args.binary)
-
-    print("Parsing instructions...")
-    analyzer.parse_disassembly(disassembly)
+    analyzer = RVVAnalyzer(objdump_path=args.objdump, functions=functions, sections=sections,
+                           engine=args.engine, shards=shards, cache=cache, detailed=args.detailed,
+                           loops=args.loops, loop_weight=args.loop_weight, cost_model=cost_model,
+                           records=args.records, profiler=Profiler(model_name) if args.profile else None)
+    profiler = analyzer.profiler
+
+    try:
+        if args.trace:
+            print(f"\nIndexing objdump output and streaming trace: {args.trace}")
+            analyzer.analyze_trace(args.binary, args.trace, args.trace_format, args.trace_offset)
+            print(f"Execution-weighted from {analyzer.trace_info['format']} trace "
+                  f"({analyzer.trace_info['lines']:,} lines)")
+        else:
+            if args.engine == 'native':
+                print("\nDecoding instructions...")
+            elif analyzer.use_shards():
+                print(f"\nRunning objdump in {shards} address-range shards...")
+            elif args.stream:
+                print("\nRunning objdump and parsing instructions (streaming)...")
+            else:
+                print("\nRunning objdump and parsing instructions...")
+            analyzer.analyze(args.binary, stream=args.stream)
+    except AnalyzerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if analyzer.from_cache:
+        print("Using cached result (run with --no-cache to re-analyze)")
 
     # Print statistics
-    analyzer.print_statistics(model_name)
+    with profiler.stage('report'):
+        analyzer.print_statistics(model_name, top_functions=args.top_functions)
 
     # Save to JSON if requested
     if args.output:
         analyzer.save_json(args.output, model_name)
 
+    if args.db:
+        with profiler.stage('db_write'):
+            record_run(args.db, [(model_name, analyzer.get_statistics(), args.output)], args.run_label,
+                       str(binary_path))
+
+    if args.html:
+        from arvvi_visualizer import write_html_report
+        with profiler.stage('html'):
+            write_html_report({model_name: analyzer.get_statistics()}, f"{model_name}_rvv_report.html",
+                              title=f"RVV Instruction Analysis - {model_name}")
+
     # Generate visualization if requested
     if args.visualize:
         try:
-            from arvvi_visualizer import visualize_statistics
-            visualize_statistics(analyzer.get_statistics(), model_name)
+            from arvvi_visualizer import chart_dpi, visualize_statistics
+            with profiler.stage('charts'):
+                visualize_statistics(analyzer.get_statistics(), model_name, fmt=args.chart_format,
+                                     dpi=chart_dpi(args.dpi, args.preview))
         except ImportError:
             print("\nWarning: matplotlib not installed. Install with: pip install matplotlib")
             print("Skipping visualization.")
 
+    if args.profile:
+        report = profiler.report()
+        print_profile(report)
+        write_profile(args.profile, [report], aggregate_reports([report], name=model_name))
+
     return 0
 
 
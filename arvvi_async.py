@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+ARVVI Async - asyncio library API for analyzing many binaries concurrently
+
+analyze() runs objdump with asyncio.create_subprocess_exec and parses its
+stdout batch by batch as it arrives (RVVAnalyzer.line_parser), so one event
+loop can drive dozens of analyses without threads. analyze_many() bounds
+the number of objdump processes with a semaphore.
+
+Errors are raised as AnalysisError subclasses instead of exiting the
+process:
+
+    import asyncio
+    from arvvi_async import AnalysisError, analyze_many
+
+    results = asyncio.run(analyze_many(paths, objdump_path=objdump, sections=['.data']))
+    for result in results:
+        print(result.model, result.rvv_instructions, result.rvv_percentage)
+"""
+
+import asyncio
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from arvvi import DEFAULT_OBJDUMP, RVVAnalyzer
+from arvvi_loops import DEFAULT_LOOP_WEIGHT
+
+# Bytes of objdump output parsed per batch; the event loop runs other tasks in between
+STREAM_CHUNK_SIZE = 1 << 18
+
+
+class AnalysisError(Exception):
+    """Base class of the errors raised by the async API"""
+
+
+class BinaryNotFoundError(AnalysisError):
+    """The binary to analyze does not exist"""
+
+
+class ObjdumpNotFoundError(AnalysisError):
+    """The objdump executable could not be started"""
+
+
+class ObjdumpError(AnalysisError):
+    """objdump exited with a non-zero status"""
+
+    def __init__(self, cmd, returncode, stderr):
+        super().__init__(f"{cmd[0]} exited with status {returncode}: {stderr.strip()}")
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stderr = stderr
+
+    def __reduce__(self):
+        # Picklable with its fields, e.g. from a process-pool worker
+        return type(self), (self.cmd, self.returncode, self.stderr)
+
+
+class AnalysisResult(namedtuple('AnalysisResult', ['model', 'path', 'statistics', 'from_cache'])):
+    """
+    Result of one analysis
+
+    statistics is the dictionary saved as "statistics" in *_rvv_stats.json
+    (RVVAnalyzer.get_statistics()).
+    """
+
+    __slots__ = ()
+
+    @property
+    def total_instructions(self):
+        return self.statistics['total_instructions']
+
+    @property
+    def rvv_instructions(self):
+        return self.statistics['rvv_instructions']
+
+    @property
+    def rvv_percentage(self):
+        total = self.statistics['total_instructions']
+        return self.statistics['rvv_instructions'] / total * 100 if total > 0 else 0.0
+
+    @property
+    def instruction_stats(self):
+        return self.statistics['instruction_stats']
+
+    def save_json(self, output_path):
+        """Save in the *_rvv_stats.json format read by arvvi_compare and arvvi_diff"""
+        with open(output_path, 'w') as f:
+            json.dump({'model': self.model, 'statistics': self.statistics}, f, indent=2)
+
+
+async def _parse_objdump(analyzer, cmd):
+    """Run objdump and feed its stdout to the analyzer's incremental parser"""
+    try:
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE)
+    except OSError as e:
+        raise ObjdumpNotFoundError(f"Cannot run objdump at {cmd[0]}: {e}") from e
+
+    # stderr is drained concurrently so a chatty objdump never blocks on a full pipe
+    stderr_task = asyncio.ensure_future(proc.stderr.read())
+    try:
+        parser = analyzer.line_parser()
+        next(parser)
+        pending = b''
+        while True:
+            chunk = await proc.stdout.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.rfind(b'\n') + 1
+            if end:
+                parser.send(pending[:end].decode('utf-8', 'replace').split('\n'))
+                pending = pending[end:]
+        if pending:
+            parser.send([pending.decode('utf-8', 'replace')])
+        returncode = await proc.wait()
+        stderr = await stderr_task
+    finally:
+        # Cancelled or failed while parsing: don't leave objdump running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        stderr_task.cancel()
+
+    if returncode != 0:
+        raise ObjdumpError(cmd, returncode, stderr.decode('utf-8', 'replace'))
+    try:
+        parser.send(None)
+    except StopIteration:
+        pass
+
+
+def _cache_lookup(cache, path, analyzer):
+    """Cache key of analyzing path and its cached payload (None on a miss)"""
+    key = cache.key(path, analyzer.cache_options())
+    return key, cache.get(key)
+
+
+async def analyze(path, model=None, objdump_path=DEFAULT_OBJDUMP, sections=None, functions=None, cache=None,
+                  detailed=False, loops=False, loop_weight=DEFAULT_LOOP_WEIGHT, cost_model=None):
+    """
+    Analyze one binary with objdump without blocking the event loop
+
+    Args:
+        path: Binary file (.adx, ELF, ...)
+        model: Model name of the result (default: file name without suffix)
+        objdump_path, sections, functions, cache, detailed, loops, loop_weight,
+        cost_model: As for RVVAnalyzer
+
+    Returns:
+        AnalysisResult
+
+    Raises:
+        BinaryNotFoundError, ObjdumpNotFoundError, ObjdumpError
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise BinaryNotFoundError(f"Binary file not found: {path}")
+
+    analyzer = RVVAnalyzer(objdump_path=objdump_path, functions=functions, sections=sections, cache=cache,
+                           detailed=detailed, loops=loops, loop_weight=loop_weight, cost_model=cost_model)
+    cached = None
+    if cache is not None:
+        # Hashing the binary, `objdump --version` and cache file I/O all block: keep them off the loop
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(None, _cache_lookup, cache, path, analyzer)
+    if cached is not None:
+        analyzer.merge_statistics(cached)
+    else:
+        await _parse_objdump(analyzer, analyzer.objdump_command(path))
+        if cache is not None:
+            payload = analyzer.get_statistics()
+            payload.pop('cost_stats', None)
+            await loop.run_in_executor(None, cache.put, key, payload)
+
+    return AnalysisResult(model or path.stem, str(path), analyzer.get_statistics(), cached is not None)
+
+
+async def analyze_many(paths, concurrency=None, return_exceptions=False, **options):
+    """
+    Analyze several binaries concurrently
+
+    Args:
+        paths: Binary files, or (model, path) pairs
+        concurrency: Maximum number of objdump processes at a time
+                     (default: one per CPU)
+        return_exceptions: Return a failed analysis's AnalysisError in its
+                           place instead of raising the first one
+        **options: Keyword arguments for analyze()
+
+    Returns:
+        List of AnalysisResult (or AnalysisError) in the order of paths
+    """
+    semaphore = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+
+    async def bounded(entry):
+        model, path = entry if isinstance(entry, tuple) else (None, entry)
+        async with semaphore:
+            try:
+                return await analyze(path, model=model, **options)
+            except AnalysisError as e:
+                if return_exceptions:
+                    return e
+                raise
+
+    tasks = [asyncio.ensure_future(bounded(entry)) for entry in paths]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # One analysis failed (or we were cancelled): stop the others and their objdumps
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
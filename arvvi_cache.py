@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+ARVVI Cache - Content-addressed on-disk cache for analysis results
+
+Results are keyed by a hash of the binary contents plus everything that
+can change the statistics (objdump path and version, selected sections and
+functions, engine, analyzer version). Entries, and the per-path digest
+records that avoid re-hashing unchanged binaries, are small JSON files;
+when the cache grows past its size limit the least recently used files of
+either kind are evicted.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Default cache size limit (bytes)
+DEFAULT_MAX_BYTES = 512 << 20
+
+# Read size used when hashing binaries
+HASH_CHUNK_SIZE = 1 << 20
+
+_objdump_versions = {}
+
+
+def default_cache_dir():
+    """Cache location: $ARVVI_CACHE_DIR, else $XDG_CACHE_HOME/arvvi, else ~/.cache/arvvi"""
+    if os.environ.get('ARVVI_CACHE_DIR'):
+        return Path(os.environ['ARVVI_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'arvvi'
+
+
+def objdump_version(objdump_path):
+    """First line of `objdump --version` (memoized per process), or None if it cannot run"""
+    if objdump_path not in _objdump_versions:
+        try:
+            result = subprocess.run([objdump_path, '--version'], capture_output=True, text=True)
+            lines = result.stdout.splitlines()
+            _objdump_versions[objdump_path] = lines[0] if lines else ''
+        except OSError:
+            _objdump_versions[objdump_path] = None
+    return _objdump_versions[objdump_path]
+
+
+class ResultCache:
+    """Size-bounded LRU cache of get_statistics() payloads"""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self._total_bytes = None  # computed lazily on first write
+
+    @property
+    def entries_dir(self):
+        return self.cache_dir / 'entries'
+
+    @property
+    def digests_dir(self):
+        return self.cache_dir / 'digests'
+
+    def file_digest(self, path):
+        """
+        SHA-256 of a file's contents
+
+        The digest is remembered together with the file's size, mtime and
+        inode, so unchanged multi-GB binaries are not re-hashed on every run.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        record_path = self.digests_dir / (hashlib.sha1(path.encode()).hexdigest() + '.json')
+
+        is_new = True
+        try:
+            with open(record_path) as f:
+                is_new = False
+                record = json.load(f)
+            if record.get('stamp') == stamp:
+                # Mark as recently used
+                os.utime(record_path)
+                return record['sha256']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+
+        size = self._write_json(record_path, {'path': path, 'stamp': stamp, 'sha256': sha256})
+        if size is not None and is_new:
+            # New paths of binaries with cached results grow the cache without a put()
+            self._account(size)
+        return sha256
+
+    def key(self, binary_path, options):
+        """
+        Cache key for analyzing binary_path with the given options
+
+        Args:
+            options: JSON-serializable dict of everything that affects the
+                     result (see RVVAnalyzer.cache_options())
+        """
+        material = dict(options, binary=self.file_digest(binary_path))
+        encoded = json.dumps(material, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return self.entries_dir / key[:2] / f'{key}.json'
+
+    def get(self, key):
+        """Return the cached payload for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def put(self, key, payload):
+        """Store a payload and evict least recently used entries if over the size limit"""
+        path = self._entry_path(key)
+        size = self._write_json(path, payload)
+        if size is not None:
+            self._account(size)
+
+    def _account(self, size):
+        """Count a newly written file and evict if over the size limit"""
+        if self._total_bytes is None:
+            self._total_bytes = sum(st.st_size for _, st in self._files())
+        else:
+            self._total_bytes += size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries and digest records until the cache fits in max_bytes"""
+        entries = sorted(self._files(), key=lambda entry: entry[1].st_mtime)
+        total = sum(st.st_size for _, st in entries)
+        for path, st in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= st.st_size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self):
+        """Delete all cached entries and digests; returns the number of entries removed"""
+        removed = 0
+        for path, _ in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        for path, _ in self._digests():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._total_bytes = 0
+        return removed
+
+    def info(self):
+        """Summary of the cache contents"""
+        entries = list(self._entries())
+        digests = list(self._digests())
+        return {
+            'path': str(self.cache_dir),
+            'entries': len(entries),
+            'digests': len(digests),
+            'bytes': sum(st.st_size for _, st in entries + digests),
+            'max_bytes': self.max_bytes,
+        }
+
+    def _entries(self):
+        return self._stat_files(self.entries_dir, '*/*.json')
+
+    def _digests(self):
+        return self._stat_files(self.digests_dir, '*.json')
+
+    def _files(self):
+        """Entries and digest records, the files counted against max_bytes"""
+        return itertools.chain(self._entries(), self._digests())
+
+    @staticmethod
+    def _stat_files(directory, pattern):
+        if not directory.exists():
+            return
+        for path in directory.glob(pattern):
+            try:
+                yield path, path.stat()
+            except OSError:
+                pass
+
+    def _write_json(self, path, data):
+        """Atomically write JSON (concurrent writers never leave partial files); returns size"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+            return path.stat().st_size
+        except OSError as e:
+            print(f"Warning: could not write cache entry {path}: {e}", file=sys.stderr)
+            return None
+
+
+def print_cache_info(cache):
+    """Print a short summary of the cache"""
+    info = cache.info()
+    print(f"Cache directory: {info['path']}")
+    print(f"Entries:         {info['entries']} ({info['digests']} file digests)")
+    print(f"Size:            {info['bytes'] / (1 << 20):.2f} MB / {info['max_bytes'] / (1 << 20):.0f} MB")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+ARVVI Client - Post analyze, compare and diff jobs to arvvi_server.py
+
+When no server is listening the job runs in this process instead (same job
+code, cold tables), so scripts can call the client unconditionally and get
+the fast path whenever the service is up.
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+from arvvi_async import AnalysisError, AnalysisResult
+from arvvi_cache import DEFAULT_MAX_BYTES
+from arvvi_diff import (DEFAULT_FUNCTION_MIN_RVV, DEFAULT_FUNCTION_THRESHOLD, DEFAULT_PERCENT_THRESHOLD,
+                        DEFAULT_RELATIVE_THRESHOLD, EXIT_ERROR, EXIT_REGRESSION)
+from arvvi_server import DEFAULT_HOST, DEFAULT_PORT, JobError, init_worker, run_job
+
+
+class ServiceUnavailable(Exception):
+    """No server is listening at the address"""
+
+
+def default_address():
+    """Server address: $ARVVI_SERVER, else 127.0.0.1:8765"""
+    return os.environ.get('ARVVI_SERVER') or f'{DEFAULT_HOST}:{DEFAULT_PORT}'
+
+
+def _request(address, path, params=None):
+    data = None if params is None else json.dumps(params).encode()
+    request = urllib.request.Request(f'http://{address}{path}', data=data,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.load(e).get('error', str(e))
+        except ValueError:
+            message = str(e)
+        raise JobError(message) from e
+    except (urllib.error.URLError, ConnectionError) as e:
+        raise ServiceUnavailable(f"No ARVVI server at {address} ({getattr(e, 'reason', e)})") from e
+
+
+def post_job(kind, params, address=None):
+    """Run a job on the server and return its result"""
+    return _request(address or default_address(), f'/{kind}', params)
+
+
+def server_status(address=None):
+    return _request(address or default_address(), '/status')
+
+
+def run(kind, params, address=None, fallback=True, cache_dir=None, cache_size=DEFAULT_MAX_BYTES,
+        objdump_path=None):
+    """
+    Run a job on the server, or in-process when none is listening
+
+    Args:
+        fallback: Raise ServiceUnavailable instead of running in-process
+        cache_dir, cache_size: Result cache of an in-process run
+                               (cache_size None = no cache)
+        objdump_path: objdump of an in-process run (the server always uses its own)
+    """
+    try:
+        return post_job(kind, params, address)
+    except ServiceUnavailable as e:
+        if not fallback:
+            raise
+        print(f"{e}; running the job in-process", file=sys.stderr)
+    init_worker(cache_dir, cache_size, objdump_path)
+    return run_job(kind, params)
+
+
+def job_params(args):
+    """Job parameters of the parsed command line, with paths made absolute for the server"""
+    if args.command == 'analyze':
+        params = {'path': os.path.abspath(args.binary), 'detailed': args.detailed, 'loops': args.loops}
+        if args.model:
+            params['model'] = args.model
+        if args.sections:
+            params['sections'] = [s.strip() for s in args.sections.split(',')]
+        if args.functions:
+            params['functions'] = [f.strip() for f in args.functions.split(',')]
+        if args.cost:
+            params['cost'] = True
+        if args.cost_model:
+            params['cost_model'] = os.path.abspath(args.cost_model)
+        return params
+    if args.command == 'compare':
+        params = {'top': args.top}
+        if args.scan_dir:
+            params['scan'] = os.path.abspath(args.scan_dir)
+        else:
+            params['files'] = [os.path.abspath(path) for path in args.json_files]
+        return params
+    params = {'baseline': os.path.abspath(args.baseline), 'candidate': os.path.abspath(args.candidate),
+              'rel_threshold': args.rel_threshold, 'percent_threshold': args.percent_threshold,
+              'allow_missing': args.allow_missing, 'markdown': not args.json, 'top': args.top,
+              'function_threshold': None if args.no_function_gate else args.function_threshold,
+              'function_min_rvv': args.function_min_rvv}
+    if args.abs_threshold is not None:
+        params['abs_threshold'] = args.abs_threshold
+    return params
+
+
+def save_result(result, output_path):
+    """Save an analyze job result as *_rvv_stats.json (written here, never by the server)"""
+    AnalysisResult(**result).save_json(output_path)
+
+
+def print_result(command, result, output_path=None):
+    """Human-readable summary of a job result"""
+    if command == 'analyze':
+        stats = result['statistics']
+        total = stats['total_instructions']
+        percentage = stats['rvv_instructions'] / total * 100 if total > 0 else 0.0
+        cached = " (cached)" if result['from_cache'] else ""
+        print(f"{result['model']}: {stats['rvv_instructions']:,} RVV / {total:,} instructions "
+              f"({percentage:.2f}%){cached}")
+        if output_path:
+            print(f"Statistics saved to: {output_path}")
+    elif command == 'compare':
+        print(f"{'Model':<20} {'Total':<15} {'RVV':<15} {'RVV %':<10}")
+        print("-" * 60)
+        for model in result['models']:
+            print(f"{model['model'][:20]:<20} {model['total_instructions']:<15,} {model['rvv_instructions']:<15,} "
+                  f"{model['rvv_percent']:<10.2f}")
+        top = ', '.join(f"{entry['instruction']} ({entry['total']:,})" for entry in result['top_instructions'])
+        print(f"\nTop instructions: {top}")
+    else:
+        print(result['markdown'], end='')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='ARVVI Client - Run jobs on arvvi_server.py (or in-process when it is not running)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s analyze models/bird/bird/OUTPUT/bird.adx --section .data -o bird_rvv_stats.json
+  %(prog)s compare --scan models/
+  %(prog)s diff baseline/models/ nightly/models/ --rel-threshold 1
+  %(prog)s --server 127.0.0.1:9000 status
+
+Exit status: 0 success, 1 diff found regressions, 2 the job failed.
+        """
+    )
+    parser.add_argument('--server', metavar='HOST:PORT',
+                        help=f'Server address (default: $ARVVI_SERVER or {DEFAULT_HOST}:{DEFAULT_PORT})')
+    parser.add_argument('--no-fallback', action='store_true',
+                        help='Fail instead of running the job in-process when the server is not running')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the result cache of in-process runs')
+    parser.add_argument('--json', action='store_true', help='Print the full job result as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help='Analyze one binary')
+    analyze.add_argument('binary', help='Binary file to analyze')
+    analyze.add_argument('-o', '--output', help='Output JSON file for statistics')
+    analyze.add_argument('-m', '--model', help='Model name for the report')
+    analyze.add_argument('--objdump', help="Path to objdump for in-process runs (the server uses its own)")
+    analyze.add_argument('-s', '--section', dest='sections', help='Section(s) to analyze, comma-separated')
+    analyze.add_argument('-f', '--function', dest='functions', help='Function(s) to analyze, comma-separated')
+    analyze.add_argument('--detailed', action='store_true', help='Count operand forms and masking')
+    analyze.add_argument('--loops', action='store_true', help='Weight counts by loop nesting depth')
+    analyze.add_argument('--cost', action='store_true', help='Add cycle estimates (built-in cost model)')
+    analyze.add_argument('--cost-model', metavar='FILE', help='Add cycle estimates from a cost table')
+
+    compare = commands.add_parser('compare', help='Compare *_rvv_stats.json files')
+    compare.add_argument('json_files', nargs='*', help='JSON files containing statistics (not used with --scan)')
+    compare.add_argument('--scan', dest='scan_dir', metavar='DIR',
+                         help='Scan directory recursively for all *_rvv_stats.json files')
+    compare.add_argument('--top', type=int, default=20, metavar='N', help='Top instructions listed (default: 20)')
+
+    diff = commands.add_parser('diff', help='Baseline vs candidate regression gate (like arvvi_diff.py)')
+    diff.add_argument('baseline', help='Baseline directory, manifest or stats file')
+    diff.add_argument('candidate', help='Candidate directory, manifest or stats file')
+    diff.add_argument('--rel-threshold', type=float, default=DEFAULT_RELATIVE_THRESHOLD, metavar='PCT')
+    diff.add_argument('--abs-threshold', type=int, metavar='N')
+    diff.add_argument('--percent-threshold', type=float, default=DEFAULT_PERCENT_THRESHOLD, metavar='PP')
+    diff.add_argument('--function-threshold', type=float, default=DEFAULT_FUNCTION_THRESHOLD, metavar='PCT')
+    diff.add_argument('--function-min-rvv', type=int, default=DEFAULT_FUNCTION_MIN_RVV, metavar='N')
+    diff.add_argument('--no-function-gate', action='store_true')
+    diff.add_argument('--allow-missing', action='store_true')
+    diff.add_argument('--top', type=int, default=20, metavar='N',
+                      help='Instruction deltas listed in the markdown report (default: 20)')
+
+    commands.add_parser('status', help="Show the server's queue depth and throughput")
+
+    args = parser.parse_args()
+    if args.command == 'compare' and not (args.scan_dir or args.json_files):
+        parser.error("compare needs JSON files or --scan <directory>")
+
+    try:
+        if args.command == 'status':
+            print(json.dumps(server_status(args.server), indent=2))
+            return 0
+        result = run(args.command, job_params(args), args.server, fallback=not args.no_fallback,
+                     cache_size=None if args.no_cache else DEFAULT_MAX_BYTES,
+                     objdump_path=getattr(args, 'objdump', None))
+    except (ServiceUnavailable, JobError, AnalysisError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(EXIT_ERROR)
+
+    output_path = getattr(args, 'output', None)
+    if output_path:
+        try:
+            save_result(result, output_path)
+        except OSError as e:
+            print(f"Error: Cannot write {output_path}: {e}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(args.command, result, output_path)
+    if args.command == 'diff' and not result['passed']:
+        return EXIT_REGRESSION
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
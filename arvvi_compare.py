@@ -4,10 +4,33 @@ ARVVI Compare - Compare RVV instruction usage across multiple models
 """
 
 import argparse
+import contextlib
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from arvvi_cost import CostModel
+from arvvi_db import ResultsDB
+from arvvi_matrix import ComparisonMatrix
+from arvvi_profile import NULL_PROFILER, Profiler, print_profile, write_profile
+from arvvi_similarity import METRICS, similarity_report
+
+# Summary metrics models can be ranked by (--sort-by)
+SORT_KEYS = ('rvv', 'rvv_percent', 'cycles', 'rvv_cycles')
+
+STATS_SUFFIX = '_rvv_stats.json'
+
+# Directories never searched by --scan (besides hidden ones)
+PRUNED_DIRS = frozenset(['__pycache__', 'node_modules', 'venv', 'CMakeFiles'])
+
+# Default number of concurrent JSON loads
+DEFAULT_LOAD_JOBS = 16
+
+# Loading progress is reported (every 10%) only for at least this many files
+PROGRESS_MIN_FILES = 100
+
 
 def load_stats(json_path):
     """Load statistics from JSON file"""
@@ -20,54 +43,96 @@ def load_stats(json_path):
         return None
 
 
-def print_comparison(stats_dict, markdown=False):
+def summary_metric(data, key):
+    """Value of a --sort-by metric for one model (None if the model lacks it)"""
+    stats = data.get('statistics', {})
+    if key == 'rvv':
+        return stats.get('rvv_instructions', 0)
+    if key == 'rvv_percent':
+        total = stats.get('total_instructions', 0)
+        return stats.get('rvv_instructions', 0) / total * 100 if total > 0 else 0
+    cost = stats.get('cost_stats')
+    if cost is None:
+        return None
+    return cost['total_cycles'] if key == 'cycles' else cost['rvv_cycles']
+
+
+def rank_models(stats_dict, key):
+    """Order models by a summary metric, largest first; models without it go last"""
+    def sort_key(item):
+        value = summary_metric(item[1], key)
+        return (value is None, -(value or 0))
+    return dict(sorted(stats_dict.items(), key=sort_key))
+
+
+def add_cost_estimates(stats_dict, cost_model):
+    """(Re)compute cost_stats for every model with one cost model"""
+    for data in stats_dict.values():
+        stats = data.setdefault('statistics', {})
+        stats['cost_stats'] = cost_model.estimate(stats)
+
+
+def build_matrix(stats_dict):
+    """Model × instruction ComparisonMatrix for {model: JSON data} as loaded by load_stats"""
+    return ComparisonMatrix.from_stats({name: data.get('statistics', {}) for name, data in stats_dict.items()})
+
+
+def print_comparison(stats_dict, markdown=False, matrix=None, top_n=20):
     """Print comparison table
 
     Args:
         stats_dict: Dictionary mapping model names to their statistics
         markdown: If True, output in markdown format for README.md
+        matrix: Prebuilt ComparisonMatrix of stats_dict (built if omitted)
+        top_n: Number of instructions in the top instructions table
     """
+    if matrix is None:
+        matrix = build_matrix(stats_dict)
     if markdown:
-        print_comparison_markdown(stats_dict)
+        print_comparison_markdown(stats_dict, matrix, top_n)
     else:
-        print_comparison_text(stats_dict)
+        print_comparison_text(stats_dict, matrix, top_n)
+
+
+def _cost_columns(stats_dict):
+    """(total cycles, RVV cycles %) per model, or None for models without cost_stats"""
+    columns = []
+    for data in stats_dict.values():
+        cost = data.get('statistics', {}).get('cost_stats')
+        if cost:
+            cycles = cost['total_cycles']
+            columns.append((cycles, (cost['rvv_cycles'] / cycles * 100) if cycles else 0))
+        else:
+            columns.append(None)
+    return columns
 
 
-def print_comparison_text(stats_dict):
+def print_comparison_text(stats_dict, matrix=None, top_n=20):
     """Print comparison table in text format"""
+    if matrix is None:
+        matrix = build_matrix(stats_dict)
     print("\n" + "=" * 80)
     print("RVV Instruction Usage Comparison")
     print("=" * 80 + "\n")
 
     # Print summary statistics
-    print(f"{'Model':<20} {'Total Instr':<15} {'RVV Instr':<15} {'RVV %':<10}")
+    cost_columns = _cost_columns(stats_dict)
+    with_cost = any(cost_columns)
+    header = f"{'Model':<20} {'Total Instr':<15} {'RVV Instr':<15} {'RVV %':<10}"
+    if with_cost:
+        header += f"{'Est. Cycles':<15} {'RVV Cyc %':<10}"
+    print(header)
     print(f"{'-'*80}")
 
-    for model_name, data in stats_dict.items():
-        stats = data.get('statistics', {})
-        total = stats.get('total_instructions', 0)
-        rvv = stats.get('rvv_instructions', 0)
-        percentage = (rvv / total * 100) if total > 0 else 0
-
-        print(f"{model_name:<20} {total:<15,} {rvv:<15,} {percentage:<10.2f}")
-
-    # Collect all unique instructions
-    all_instructions = set()
-    for data in stats_dict.values():
-        stats = data.get('statistics', {})
-        all_instructions.update(stats.get('instruction_stats', {}).keys())
-
-    # Calculate total usage for each instruction across all models
-    instruction_totals = {}
-    for instr in all_instructions:
-        total = 0
-        for data in stats_dict.values():
-            stats = data.get('statistics', {})
-            total += stats.get('instruction_stats', {}).get(instr, 0)
-        instruction_totals[instr] = total
-
-    # Sort by total usage
-    sorted_instructions = sorted(instruction_totals.items(), key=lambda x: x[1], reverse=True)
+    summary = zip(matrix.models, matrix.total_instructions.tolist(), matrix.rvv_instructions.tolist(),
+                  matrix.rvv_percent.tolist(), cost_columns)
+    for model_name, total, rvv, percentage, cost in summary:
+        row = f"{model_name:<20} {total:<15,} {rvv:<15,} {percentage:<10.2f}"
+        if cost:
+            row += f"{cost[0]:<15,} {cost[1]:<10.2f}"
+        elif with_cost:
+            row += f"{'-':<15} {'-':<10}"
+        print(row)
 
     # Print top instructions
     print("\n" + "=" * 80)
@@ -75,89 +140,99 @@ def print_comparison_text(stats_dict):
     print("=" * 80 + "\n")
 
     # Header
-    model_names = list(stats_dict.keys())
-    header = f"{'Instruction':<15} {'Total':<10}"
-    for model_name in model_names:
-        header += f"{model_name[:12]:<12}"
+    header = f"{'Instruction':<15} {'Total':<10}" + ''.join(f"{name[:12]:<12}" for name in matrix.models)
     print(header)
     print(f"{'-'*80}")
 
-    # Print top 20 instructions
-    for instr, total_count in sorted_instructions[:20]:
-        row = f"{instr:<15} {total_count:<10}"
-        for model_name in model_names:
-            data = stats_dict[model_name]
-            stats = data.get('statistics', {})
-            count = stats.get('instruction_stats', {}).get(instr, 0)
-            row += f"{count:<12}"
+    totals = matrix.instruction_totals
+    for index in matrix.top_instructions(top_n):
+        row = f"{matrix.instructions[index]:<15} {int(totals[index]):<10}"
+        row += ''.join(f"{count:<12}" for count in matrix.counts[:, index].tolist())
         print(row)
 
 
-def print_comparison_markdown(stats_dict):
+def print_comparison_markdown(stats_dict, matrix=None, top_n=20):
     """Print comparison table in markdown format for README.md"""
+    if matrix is None:
+        matrix = build_matrix(stats_dict)
 
     print("\n## RVV Instruction Usage Comparison\n")
 
     # Summary table
     print("### Model Summary\n")
-    print("| Model | Total Instructions | RVV Instructions | RVV % |")
-    print("|-------|-------------------:|-----------------:|------:|")
-
-    for model_name, data in stats_dict.items():
-        stats = data.get('statistics', {})
-        total = stats.get('total_instructions', 0)
-        rvv = stats.get('rvv_instructions', 0)
-        percentage = (rvv / total * 100) if total > 0 else 0
-
-        print(f"| {model_name} | {total:,} | {rvv:,} | {percentage:.2f}% |")
-
-    # Collect instruction statistics
-    all_instructions = set()
-    for data in stats_dict.values():
-        stats = data.get('statistics', {})
-        all_instructions.update(stats.get('instruction_stats', {}).keys())
-
-    instruction_totals = {}
-    for instr in all_instructions:
-        total = 0
-        for data in stats_dict.values():
-            stats = data.get('statistics', {})
-            total += stats.get('instruction_stats', {}).get(instr, 0)
-        instruction_totals[instr] = total
-
-    sorted_instructions = sorted(instruction_totals.items(), key=lambda x: x[1], reverse=True)
+    cost_columns = _cost_columns(stats_dict)
+    with_cost = any(cost_columns)
+    if with_cost:
+        print("| Model | Total Instructions | RVV Instructions | RVV % | Est. Cycles | RVV Cycles % |")
+        print("|-------|-------------------:|-----------------:|------:|------------:|-------------:|")
+    else:
+        print("| Model | Total Instructions | RVV Instructions | RVV % |")
+        print("|-------|-------------------:|-----------------:|------:|")
+
+    summary = zip(matrix.models, matrix.total_instructions.tolist(), matrix.rvv_instructions.tolist(),
+                  matrix.rvv_percent.tolist(), cost_columns)
+    for model_name, total, rvv, percentage, cost in summary:
+        row = f"| {model_name} | {total:,} | {rvv:,} | {percentage:.2f}% |"
+        if cost:
+            row += f" {cost[0]:,} | {cost[1]:.2f}% |"
+        elif with_cost:
+            row += " - | - |"
+        print(row)
 
     # Top instructions table
-    print("\n### Top 20 RVV Instructions Across All Models\n")
+    print(f"\n### Top {top_n} RVV Instructions Across All Models\n")
 
-    model_names = list(stats_dict.keys())
-
-    # Header
-    header = "| Instruction | Total |"
-    for model_name in model_names:
-        header += f" {model_name} |"
-    print(header)
-
-    # Alignment row
-    align = "|-------------|------:|"
-    for _ in model_names:
-        align += "------:|"
-    print(align)
+    # Header and alignment row
+    print("| Instruction | Total |" + ''.join(f" {name} |" for name in matrix.models))
+    print("|-------------|------:|" + "------:|" * len(matrix.models))
 
     # Data rows
-    for instr, total_count in sorted_instructions[:20]:
-        row = f"| **{instr}** | **{total_count:,}** |"
-        for model_name in model_names:
-            data = stats_dict[model_name]
-            stats = data.get('statistics', {})
-            count = stats.get('instruction_stats', {}).get(instr, 0)
-            if count > 0:
-                row += f" {count:,} |"
-            else:
-                row += " - |"
+    totals = matrix.instruction_totals
+    for index in matrix.top_instructions(top_n):
+        row = f"| **{matrix.instructions[index]}** | **{int(totals[index]):,}** |"
+        row += ''.join(f" {count:,} |" if count > 0 else " - |" for count in matrix.counts[:, index].tolist())
         print(row)
 
 
+def print_similarity(report, markdown=False):
+    """Print nearest neighbours and clusters from similarity_report()"""
+    metric = 'cosine distance' if report['metric'] == 'cosine' else 'Jensen-Shannon distance'
+    if markdown:
+        print(f"\n## RVV Instruction Mix Similarity ({metric})\n")
+    else:
+        print("\n" + "=" * 80)
+        print(f"RVV Instruction Mix Similarity ({metric})")
+        print("=" * 80)
+    if report['excluded']:
+        print(f"\nExcluded (no RVV instructions): {', '.join(report['excluded'])}")
+
+    if report['clusters']:
+        if markdown:
+            print(f"\n### {len(report['clusters'])} Clusters\n")
+            print("| Representative | Models | Mean Distance | Members |")
+            print("|----------------|-------:|--------------:|---------|")
+            for cluster in report['clusters']:
+                print(f"| **{cluster['representative']}** | {len(cluster['members'])} | "
+                      f"{cluster['mean_distance']:.4f} | {', '.join(cluster['members'])} |")
+        else:
+            print(f"\n{len(report['clusters'])} Clusters (representative: members)")
+            print(f"{'-'*80}")
+            for cluster in report['clusters']:
+                print(f"{cluster['representative']} ({len(cluster['members'])} models, "
+                      f"mean distance {cluster['mean_distance']:.4f}): {', '.join(cluster['members'])}")
+
+    if markdown:
+        print("\n### Nearest Neighbours\n")
+        print("| Model | Nearest (distance) |")
+        print("|-------|--------------------|")
+    else:
+        print("\nNearest Neighbours")
+        print(f"{'-'*80}")
+    for model, neighbours in report['neighbours'].items():
+        nearest = ', '.join(f"{name} ({distance:.4f})" for name, distance in neighbours)
+        print(f"| {model} | {nearest} |" if markdown else f"{model[:20]:<20} {nearest}")
+
+
 def scan_json_files(models_dir):
     """
     Scan directory recursively for all *_rvv_stats.json files
@@ -173,8 +248,7 @@ def scan_json_files(models_dir):
         print(f"Error: Directory not found: {models_dir}", file=sys.stderr)
         return []
 
-    # Find all *_rvv_stats.json files recursively
-    json_files = list(models_path.rglob('*_rvv_stats.json'))
+    json_files = find_stats_files(models_path)
 
     if not json_files:
         print(f"No *_rvv_stats.json files found in {models_dir}", file=sys.stderr)
@@ -184,7 +258,128 @@ def scan_json_files(models_dir):
     for json_file in json_files:
         print(f"  - {json_file}")
 
-    return [str(f) for f in json_files]
+    return json_files
+
+
+def find_stats_files(root):
+    """
+    Walk root with os.scandir and return the *_rvv_stats.json paths, sorted
+
+    Hidden directories (.git, .cache, ...) and PRUNED_DIRS are not entered,
+    and symlinked directories are not followed (like Path.rglob). Entries
+    are visited in name order, so the result does not depend on the
+    filesystem's directory order.
+    """
+    found = []
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Warning: Cannot read directory {directory}: {e}", file=sys.stderr)
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.') and entry.name not in PRUNED_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(STATS_SUFFIX):
+                    found.append(entry.path)
+            except OSError:
+                continue
+        # Depth-first in name order
+        stack.extend(reversed(subdirs))
+    return sorted(found)
+
+
+def load_all_stats(json_files, jobs=DEFAULT_LOAD_JOBS, progress=True):
+    """
+    Load statistics files concurrently and key them by model name
+
+    Up to `jobs` files are read at once by a thread pool (loading is
+    dominated by filesystem latency on network mounts). Results are
+    consumed in input order, so progress output and duplicate handling are
+    deterministic: when two files report the same model name, the first
+    keeps it and later ones are renamed "<name> (2)", "<name> (3)", ...
+
+    Returns:
+        Dictionary mapping model names to their JSON data, in input order
+    """
+    def load(json_file):
+        if not os.path.exists(json_file):
+            return None, f"Warning: File not found: {json_file}"
+        return load_stats(json_file), None
+
+    stats_dict = {}
+    total = len(json_files)
+    step = max(1, total // 10)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, total))) as executor:
+        for index, (json_file, (data, warning)) in enumerate(zip(json_files, executor.map(load, json_files)), 1):
+            if warning:
+                print(warning, file=sys.stderr)
+            elif data:
+                model_name = base_name = data.get('model', Path(json_file).stem)
+                duplicate = 1
+                while model_name in stats_dict:
+                    duplicate += 1
+                    model_name = f"{base_name} ({duplicate})"
+                if duplicate > 1:
+                    print(f"Warning: Duplicate model name '{base_name}' in {json_file}, "
+                          f"renamed to '{model_name}'", file=sys.stderr)
+                stats_dict[model_name] = data
+            if progress and total >= PROGRESS_MIN_FILES and (index % step == 0 or index == total):
+                print(f"Loaded {index}/{total} file(s)", file=sys.stderr)
+    return stats_dict
+
+
+def load_input(parser, args, profiler):
+    """Statistics of the JSON files given on the command line or found by --scan"""
+    # Check if using scan mode
+    if args.scan_dir:
+        with profiler.stage('scan'):
+            json_files = scan_json_files(args.scan_dir)
+        if not json_files:
+            sys.exit(1)
+    else:
+        if not args.json_files:
+            parser.error("Either provide JSON files, use --scan <directory> or --db FILE")
+        json_files = args.json_files
+
+    # Load all statistics
+    with profiler.stage('load'):
+        stats_dict = load_all_stats(json_files, args.jobs)
+    profiler.count('files', len(json_files))
+    profiler.count('models', len(stats_dict))
+    return stats_dict
+
+
+def print_runs(runs):
+    """Print the runs of a results database"""
+    print(f"{'Run':>5}  {'Created':<20} {'Models':>7}  {'Label':<20} Source")
+    print("-" * 80)
+    for run_id, created, label, source, models in runs:
+        print(f"{run_id:>5}  {created:<20} {models:>7}  {label or '-':<20} {source or '-'}")
+
+
+def print_history(instruction, rows, markdown=False):
+    """Print the count of one instruction per run and model (ResultsDB.instruction_history)"""
+    if markdown:
+        print(f"\n## {instruction} Across Runs\n")
+        print("| Run | Created | Label | Model | Count |")
+        print("|----:|---------|-------|-------|------:|")
+        for run_id, created, label, model, count in rows:
+            print(f"| {run_id} | {created} | {label or '-'} | {model} | {count:,} |")
+        return
+    print(f"\n{instruction} across runs")
+    print(f"{'Run':>5}  {'Created':<20} {'Label':<20} {'Model':<20} {'Count':>10}")
+    print("-" * 80)
+    for run_id, created, label, model, count in rows:
+        print(f"{run_id:>5}  {created:<20} {(label or '-')[:20]:<20} {model[:20]:<20} {count:>10,}")
+    if not rows:
+        print("(no runs)")
 
 
 def main():
@@ -202,6 +397,24 @@ Examples:
     %(prog)s --scan models/
     %(prog)s --scan ../AutoIREE_zoo/models/ --visualize
     %(prog)s --scan models/ --markdown > results.md
+
+  Similar models and representative benchmarks:
+    %(prog)s --scan models/ --similarity --clusters 8
+    %(prog)s --scan models/ --similarity --metric js --neighbours 3 --similarity-output clusters.json
+
+  Interactive HTML report (sortable tables, zoomable charts, works offline):
+    %(prog)s --scan models/ --html comparison.html
+
+  Rank models by estimated cycles:
+    %(prog)s --scan models/ --cost --sort-by cycles
+
+  Compare from a results database (arvvi.py --db) and follow one instruction across runs:
+    %(prog)s --db results.db --list-runs
+    %(prog)s --db results.db --run nightly-0412 --markdown
+    %(prog)s --db results.db --history vfmacc --model YOLOv5n --last 30
+
+  Time each stage of a large comparison:
+    %(prog)s --scan models/ --profile compare_profile.json
         """
     )
 
@@ -211,33 +424,86 @@ Examples:
     parser.add_argument('-v', '--visualize', action='store_true',
                         help='Generate comparison visualization')
     parser.add_argument('-o', '--output', help='Output directory for visualizations (default: current directory)')
+    parser.add_argument('--html', metavar='FILE',
+                        help='Write an interactive, self-contained HTML report of all models (no matplotlib needed)')
+    parser.add_argument('--chart-format', choices=('png', 'svg', 'pdf'), default='png',
+                        help='File format of the comparison charts (default: png)')
+    parser.add_argument('--dpi', type=int, metavar='N', help='Resolution of the comparison charts (default: 300)')
+    parser.add_argument('--preview', action='store_true',
+                        help='Fast low-resolution charts (72 dpi unless --dpi is given)')
     parser.add_argument('--markdown', action='store_true',
                         help='Output in markdown format for README.md')
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_LOAD_JOBS, metavar='N',
+                        help=f'Load up to N JSON files concurrently (default: {DEFAULT_LOAD_JOBS})')
+    parser.add_argument('--top', type=int, default=20, metavar='N',
+                        help='Number of instructions in the top instructions table (default: 20)')
+    parser.add_argument('--similarity', action='store_true',
+                        help='Report nearest neighbours (and clusters) by instruction mix instead of the usage tables')
+    parser.add_argument('--metric', choices=METRICS, default='cosine',
+                        help='Distance between instruction mixes for --similarity (default: cosine)')
+    parser.add_argument('--neighbours', type=int, default=5, metavar='K',
+                        help='Nearest neighbours listed per model with --similarity (default: 5)')
+    parser.add_argument('--clusters', type=int, default=0, metavar='N',
+                        help='Group models into N clusters with a representative each (--similarity)')
+    parser.add_argument('--similarity-output', metavar='FILE',
+                        help='Also save the --similarity report as JSON')
+    parser.add_argument('--sort-by', choices=SORT_KEYS,
+                        help='Order models by a summary metric, largest first (cycles need cost_stats or --cost)')
+    parser.add_argument('--cost', action='store_true',
+                        help='Recompute cycle estimates for all models with the built-in cost model')
+    parser.add_argument('--cost-model', metavar='FILE',
+                        help='Recompute cycle estimates with a latency/throughput table (JSON or YAML)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Time each stage (scan, load, tables, charts, ...) and save the profile to FILE')
+    parser.add_argument('--db', metavar='FILE',
+                        help='Compare the models of a run in an SQLite results database (arvvi.py --db)')
+    parser.add_argument('--run', metavar='ID|LABEL',
+                        help='Run to compare with --db: run id, label (its latest run) or "latest" (default)')
+    parser.add_argument('--list-runs', action='store_true', help='List the runs in the --db database')
+    parser.add_argument('--history', metavar='INSTRUCTION',
+                        help='Print the count of INSTRUCTION in every --db run instead of comparing models')
+    parser.add_argument('--model', metavar='NAME', help='Limit --history to one model')
+    parser.add_argument('--last', type=int, metavar='N', help='Limit --history to the N most recent runs')
 
     args = parser.parse_args()
-
-    # Check if using scan mode
-    if args.scan_dir:
-        json_files = scan_json_files(args.scan_dir)
-        if not json_files:
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive number")
+    if args.dpi is not None and args.dpi < 1:
+        parser.error("--dpi must be a positive number")
+    if args.neighbours < 0 or args.clusters < 0:
+        parser.error("--neighbours and --clusters must not be negative")
+
+    if (args.run or args.list_runs or args.history) and not args.db:
+        parser.error("--run, --list-runs and --history need --db FILE")
+    if args.db and (args.scan_dir or args.json_files):
+        parser.error("--db cannot be combined with --scan or JSON files")
+    if args.last is not None and args.last < 1:
+        parser.error("--last must be a positive number")
+
+    profiler = Profiler('compare') if args.profile else NULL_PROFILER
+
+    if args.db:
+        if not os.path.exists(args.db):
+            print(f"Error: Database not found: {args.db}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            with ResultsDB(args.db) as db:
+                if args.list_runs:
+                    print_runs(db.runs())
+                    return 0
+                if args.history:
+                    print_history(args.history, db.instruction_history(args.history, args.model, args.last),
+                                  markdown=args.markdown)
+                    return 0
+                with profiler.stage('load'):
+                    stats_dict = {model: {'model': model, 'statistics': stats}
+                                  for model, stats in db.load_run(args.run).items()}
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+        profiler.count('models', len(stats_dict))
     else:
-        if not args.json_files:
-            parser.error("Either provide JSON files or use --scan <directory>")
-        json_files = args.json_files
-
-    # Load all statistics
-    stats_dict = {}
-    for json_file in json_files:
-        path = Path(json_file)
-        if not path.exists():
-            print(f"Warning: File not found: {json_file}", file=sys.stderr)
-            continue
-
-        data = load_stats(json_file)
-        if data:
-            model_name = data.get('model', path.stem)
-            stats_dict[model_name] = data
+        stats_dict = load_input(parser, args, profiler)
 
     if not stats_dict:
         print("Error: No valid statistics files found", file=sys.stderr)
@@ -246,13 +512,43 @@ Examples:
     if len(stats_dict) < 2:
         print("Warning: Only one model loaded. Need at least 2 models for comparison.")
 
+    if args.cost or args.cost_model:
+        try:
+            cost_model = CostModel.load(args.cost_model) if args.cost_model else CostModel()
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot load cost model {args.cost_model}: {e}", file=sys.stderr)
+            sys.exit(1)
+        with profiler.stage('cost'):
+            add_cost_estimates(stats_dict, cost_model)
+    if args.sort_by:
+        stats_dict = rank_models(stats_dict, args.sort_by)
+
     # Print comparison
-    print_comparison(stats_dict, markdown=args.markdown)
+    # One shared model × instruction matrix for the tables and charts
+    with profiler.stage('matrix'):
+        matrix = build_matrix(stats_dict)
+    if args.similarity:
+        with profiler.stage('similarity'):
+            report = similarity_report(matrix, args.metric, args.neighbours, args.clusters)
+        print_similarity(report, markdown=args.markdown)
+        if args.similarity_output:
+            with open(args.similarity_output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nSimilarity report saved to: {args.similarity_output}")
+    else:
+        with profiler.stage('tables'):
+            print_comparison(stats_dict, markdown=args.markdown, matrix=matrix, top_n=args.top)
+
+    if args.html:
+        from arvvi_visualizer import write_html_report
+        with profiler.stage('html'):
+            write_html_report({model_name: data.get('statistics', {}) for model_name, data in stats_dict.items()},
+                              args.html, title='RVV Instruction Usage Comparison')
 
     # Generate visualization if requested
     if args.visualize:
         try:
-            from arvvi_visualizer import compare_models, visualize_instruction_breakdown_by_model
+            from arvvi_visualizer import chart_dpi, compare_models, visualize_instruction_breakdown_by_model
 
             # Convert data format for visualizer
             visualizer_stats = {}
@@ -260,17 +556,27 @@ Examples:
                 visualizer_stats[model_name] = data.get('statistics', {})
 
             output_dir = args.output or '.'
+            dpi = chart_dpi(args.dpi, args.preview)
 
-            # Generate grouped comparison chart
-            compare_models(visualizer_stats, output_dir)
+            with profiler.stage('charts'):
+                # Generate grouped comparison chart
+                compare_models(visualizer_stats, output_dir, matrix=matrix, fmt=args.chart_format, dpi=dpi)
 
-            # Generate stacked breakdown chart
-            visualize_instruction_breakdown_by_model(visualizer_stats, output_dir)
+                # Generate stacked breakdown chart
+                visualize_instruction_breakdown_by_model(visualizer_stats, output_dir, matrix=matrix,
+                                                         fmt=args.chart_format, dpi=dpi)
 
         except ImportError:
             print("\nWarning: matplotlib not installed. Install with: pip install matplotlib")
             print("Skipping visualization.")
 
+    if args.profile:
+        # Progress and tables go to stdout; keep the profile table off --markdown output
+        report = profiler.report()
+        with contextlib.redirect_stdout(sys.stderr):
+            print_profile(report)
+            write_profile(args.profile, [], report)
+
     return 0
 
 
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ARVVI Cost - Static cycle estimates from instruction counts
+
+A cost table gives the latency and reciprocal throughput (cycles per
+instruction at LMUL=1) of RVV mnemonics for one core. Patterns are globs
+matched against the coarse mnemonic ("vfdiv", "vle32"); the first match
+wins. Example (JSON, or YAML if PyYAML is installed):
+
+    {
+      "name": "my-core",
+      "metric": "throughput",
+      "scalar": 1,
+      "vector": 1,
+      "instructions": {
+        "vset*": {"latency": 1, "throughput": 1, "lmul": false},
+        "vfdiv": {"latency": 20, "throughput": 16},
+        "vle*": 1
+      }
+    }
+
+A plain number is the throughput. "metric" selects which column is summed
+(throughput for pipelined code, latency for dependency chains). LMUL-scaled
+instructions cost LMUL times more at m2/m4/m8 (fractional LMUL costs as m1),
+widening and narrowing ones 2×LMUL. Each mnemonic is scaled by the LMUL it
+ran under (vtype_instruction_stats, per model and per function); only
+instructions whose vtype is unknown (before the first vset{i}vl{i} of a
+function, or statistics saved without the split) use the model's average
+over its SEW×LMUL mix (vtype_stats). Non-RVV instructions cost "scalar"
+cycles each, unlisted RVV mnemonics "vector" cycles.
+"""
+
+import fnmatch
+import json
+
+from arvvi_opcodes import width_class
+
+# Approximation of an in-order Andes-class RVV core (VLEN = DLEN = 512);
+# not vendor data, replace with measured numbers for a real core
+DEFAULT_COST_TABLE = {
+    'name': 'andes-like',
+    'metric': 'throughput',
+    'scalar': 1,
+    'vector': 1,
+    'instructions': {
+        'vset*': {'latency': 1, 'throughput': 1, 'lmul': False},
+        # Whole-register loads/stores and moves: size fixed by the mnemonic
+        'vl[1248]re*': {'latency': 4, 'throughput': 2, 'lmul': False},
+        'vs[1248]r': {'latency': 4, 'throughput': 2, 'lmul': False},
+        'vmv[1248]r': {'latency': 2, 'throughput': 1, 'lmul': False},
+        # Memory: segment, strided and indexed accesses are element-serial
+        'v[ls]seg*': {'latency': 6, 'throughput': 4},
+        'v[ls]sseg*': {'latency': 8, 'throughput': 6},
+        'v[ls]*xseg*': {'latency': 12, 'throughput': 8},
+        'vlse*': {'latency': 8, 'throughput': 4},
+        'vsse*': {'latency': 8, 'throughput': 4},
+        'v[ls]xei*': {'latency': 12, 'throughput': 8},
+        'v[ls][ou]xei*': {'latency': 12, 'throughput': 8},
+        'vle*': {'latency': 4, 'throughput': 1},
+        'vse*': {'latency': 4, 'throughput': 1},
+        'vlm': {'latency': 4, 'throughput': 1, 'lmul': False},
+        'vsm': {'latency': 4, 'throughput': 1, 'lmul': False},
+        # Iterative units
+        'vfdiv': {'latency': 20, 'throughput': 16},
+        'vfrdiv': {'latency': 20, 'throughput': 16},
+        'vfsqrt': {'latency': 20, 'throughput': 16},
+        'vdiv*': {'latency': 20, 'throughput': 16},
+        'vrem*': {'latency': 20, 'throughput': 16},
+        # Reductions (ordered FP sums are sequential)
+        'vfredosum': {'latency': 24, 'throughput': 16},
+        'vfwredosum': {'latency': 24, 'throughput': 16},
+        'vfred*': {'latency': 8, 'throughput': 4},
+        'vfwred*': {'latency': 8, 'throughput': 4},
+        'vred*': {'latency': 6, 'throughput': 3},
+        'vwred*': {'latency': 6, 'throughput': 3},
+        # Permutations
+        'vrgather*': {'latency': 4, 'throughput': 4},
+        'vcompress': {'latency': 4, 'throughput': 4},
+        'vslide*': {'latency': 2, 'throughput': 1},
+        # Mask-register logic operates on a single register
+        'vmand*': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vmnand': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vmor*': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vmnor': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vmxor': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vmxnor': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vms[bio]f': {'latency': 2, 'throughput': 1, 'lmul': False},
+        'vcpop': {'latency': 3, 'throughput': 1, 'lmul': False},
+        'vfirst': {'latency': 3, 'throughput': 1, 'lmul': False},
+        # Pipelined multiply and FP units
+        'vmul*': {'latency': 4, 'throughput': 1},
+        'vwmul*': {'latency': 4, 'throughput': 1},
+        'vmacc': {'latency': 4, 'throughput': 1},
+        'vnmsac': {'latency': 4, 'throughput': 1},
+        'vmadd': {'latency': 4, 'throughput': 1},
+        'vnmsub': {'latency': 4, 'throughput': 1},
+        'vwmacc*': {'latency': 4, 'throughput': 1},
+        'vf*': {'latency': 5, 'throughput': 1},
+    },
+}
+
+METRICS = ('throughput', 'latency')
+
+_LMUL_FACTORS = {'m1': 1, 'm2': 2, 'm4': 4, 'm8': 8, 'mf2': 0.5, 'mf4': 0.25, 'mf8': 0.125}
+
+
+def _register_groups(lmul):
+    """Register-group passes for an effective LMUL (fractional LMUL is one pass)"""
+    return max(lmul, 1)
+
+
+class CostModel:
+    """Per-mnemonic cycle costs and cycle estimates for get_statistics() dictionaries"""
+
+    def __init__(self, table=None):
+        table = DEFAULT_COST_TABLE if table is None else table
+        if not isinstance(table, dict) or not isinstance(table.get('instructions', {}), dict):
+            raise ValueError("cost table must be a mapping with an 'instructions' mapping")
+        self.name = str(table.get('name', 'custom'))
+        self.metric = table.get('metric', 'throughput')
+        if self.metric not in METRICS:
+            raise ValueError(f"unknown cost metric {self.metric!r} (expected one of {', '.join(METRICS)})")
+        self.scalar = float(table.get('scalar', 1))
+        self.vector = float(table.get('vector', 1))
+
+        self._entries = []  # (pattern, cycles, lmul_scaled)
+        for pattern, entry in table.get('instructions', {}).items():
+            if isinstance(entry, dict):
+                if self.metric not in entry:
+                    raise ValueError(f"cost entry {pattern!r} has no {self.metric!r}")
+                self._entries.append((pattern, float(entry[self.metric]), bool(entry.get('lmul', True))))
+            elif isinstance(entry, (int, float)):
+                if self.metric != 'throughput':
+                    raise ValueError(f"cost entry {pattern!r} is a plain number (throughput only)")
+                self._entries.append((pattern, float(entry), True))
+            else:
+                raise ValueError(f"invalid cost entry for {pattern!r}: {entry!r}")
+        self._cache = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a cost table from a JSON or YAML (.yaml/.yml) file"""
+        with open(path) as f:
+            if str(path).endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ValueError("PyYAML is required for YAML cost tables (pip install pyyaml), "
+                                     "or use JSON") from None
+                table = yaml.safe_load(f)
+            else:
+                table = json.load(f)
+        return cls(table)
+
+    def lookup(self, mnemonic):
+        """(cycles at LMUL=1, LMUL-scaled) for an RVV mnemonic"""
+        result = self._cache.get(mnemonic)
+        if result is None:
+            result = (self.vector, True)
+            for pattern, cycles, lmul_scaled in self._entries:
+                if fnmatch.fnmatchcase(mnemonic, pattern):
+                    result = (cycles, lmul_scaled)
+                    break
+            self._cache[mnemonic] = result
+        return result
+
+    @staticmethod
+    def vtype_factors(vtype):
+        """(factor, wide_factor) of one SEW×LMUL ("e32,m4"), or None if its LMUL is unknown"""
+        lmul = _LMUL_FACTORS.get(vtype.rpartition(',')[2])
+        if lmul is None:
+            return None
+        return _register_groups(lmul), _register_groups(2 * lmul)
+
+    @staticmethod
+    def lmul_factors(vtype_stats):
+        """
+        Average register-group passes for the model's SEW×LMUL mix
+
+        Returns:
+            (factor, wide_factor) for normal and widening/narrowing
+            instructions; 1.0 when nothing has a known vtype
+        """
+        total = passes = wide_passes = 0
+        for vtype, count in (vtype_stats or {}).items():
+            lmul = _LMUL_FACTORS.get(vtype.rpartition(',')[2])
+            if lmul is None:
+                lmul = 1  # Unknown vtype
+            total += count
+            passes += count * _register_groups(lmul)
+            wide_passes += count * _register_groups(2 * lmul)
+        if not total:
+            return 1.0, 2.0
+        return passes / total, wide_passes / total
+
+    def cycles(self, mnemonic, factors=(1.0, 2.0)):
+        """Estimated cycles of one RVV instruction given lmul_factors()"""
+        cycles, lmul_scaled = self.lookup(mnemonic)
+        if not lmul_scaled:
+            return cycles
+        return cycles * (factors[1] if width_class(mnemonic) else factors[0])
+
+    def instruction_cycles(self, instruction_stats, vtype_instruction_stats, factors):
+        """
+        Cycles per mnemonic: counts with a known vtype are scaled by its LMUL,
+        the rest by the fallback lmul_factors()
+        """
+        remaining = dict(instruction_stats)
+        cycles = dict.fromkeys(remaining, 0.0)
+        for vtype, counts in (vtype_instruction_stats or {}).items():
+            vtype_factors = self.vtype_factors(vtype)
+            if vtype_factors is None:
+                continue
+            for instruction, count in counts.items():
+                cycles[instruction] = cycles.get(instruction, 0.0) + count * self.cycles(instruction, vtype_factors)
+                remaining[instruction] = remaining.get(instruction, 0) - count
+        for instruction, count in remaining.items():
+            if count > 0:
+                cycles[instruction] += count * self.cycles(instruction, factors)
+        return cycles
+
+    def estimate(self, stats):
+        """
+        Cycle estimates for a get_statistics() dictionary
+
+        Functions and the whole model are costed from their (mnemonic,
+        SEW×LMUL) counts. Sections only record RVV counts, so they use the
+        model's average cycles per RVV instruction.
+        """
+        factors = self.lmul_factors(stats.get('vtype_stats'))
+
+        instruction_cycles = self.instruction_cycles(stats.get('instruction_stats', {}),
+                                                     stats.get('vtype_instruction_stats'), factors)
+        rvv = sum(instruction_cycles.values())
+        rvv_count = stats.get('rvv_instructions', 0)
+        scalar = (stats.get('total_instructions', 0) - rvv_count) * self.scalar
+        per_rvv = rvv / rvv_count if rvv_count else 0
+
+        function_cycles = {}
+        for name, function in stats.get('function_stats', {}).items():
+            scalar_count = function.get('total_instructions', 0) - function.get('rvv_instructions', 0)
+            function_rvv = self.instruction_cycles(function.get('instruction_stats', {}),
+                                                   function.get('vtype_instruction_stats'), factors)
+            function_cycles[name] = round(sum(function_rvv.values()) + scalar_count * self.scalar)
+
+        return {
+            'cost_model': self.name,
+            'metric': self.metric,
+            'total_cycles': round(rvv + scalar),
+            'rvv_cycles': round(rvv),
+            'scalar_cycles': round(scalar),
+            'lmul_factor': round(factors[0], 3),
+            'instruction_cycles': {instruction: round(cycles) for instruction, cycles in instruction_cycles.items()},
+            'section_cycles': {section: round(count * per_rvv)
+                               for section, count in stats.get('section_stats', {}).items()},
+            'function_cycles': function_cycles,
+        }
+
+
+def top_consumers(cycles, n=10):
+    """The n largest (name, cycles) pairs of a *_cycles mapping"""
+    return sorted(cycles.items(), key=lambda item: item[1], reverse=True)[:n]
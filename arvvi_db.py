@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+ARVVI DB - SQLite database of analysis results across runs
+
+Every `arvvi.py --db FILE` run (a single binary or a whole --scan) adds one
+row to `runs` and one row per model to `models`, with the instruction,
+section and function counts in their own tables:
+
+    runs(id, created, label, source)
+    models(id, run_id, name, json_path, total_instructions, rvv_instructions, extra)
+    instructions(id, name)                        -- interned mnemonics
+    instruction_counts(model_id, instruction_id, count)
+    sections(model_id, name, rvv_instructions)
+    functions(model_id, name, total_instructions, rvv_instructions)
+
+`extra` holds the remaining statistics (vtype, vset, cost, ...) as JSON, so
+load_run() returns the same dictionaries as the *_rvv_stats.json files.
+A run is inserted with executemany() in one transaction; queries by model
+name, run and instruction are covered by indexes.
+"""
+
+import json
+import sqlite3
+import time
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    label TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    json_path TEXT,
+    total_instructions INTEGER NOT NULL,
+    rvv_instructions INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS instructions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS instruction_counts (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    instruction_id INTEGER NOT NULL REFERENCES instructions(id),
+    count INTEGER NOT NULL,
+    PRIMARY KEY (model_id, instruction_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sections (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    rvv_instructions INTEGER NOT NULL,
+    PRIMARY KEY (model_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS functions (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    total_instructions INTEGER NOT NULL,
+    rvv_instructions INTEGER NOT NULL,
+    PRIMARY KEY (model_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS models_run ON models(run_id, name);
+CREATE INDEX IF NOT EXISTS models_name ON models(name, run_id);
+CREATE INDEX IF NOT EXISTS runs_label ON runs(label);
+CREATE INDEX IF NOT EXISTS instruction_counts_instruction ON instruction_counts(instruction_id, model_id);
+"""
+
+# Statistics stored in their own tables rather than in models.extra
+TABLE_KEYS = ('total_instructions', 'rvv_instructions', 'instruction_stats', 'section_stats', 'function_stats')
+
+
+class ResultsDB:
+    """Runs of per-model statistics in one SQLite file"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"{self.path} uses database schema {version}; this ARVVI supports {SCHEMA_VERSION}")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._instruction_ids = dict(self.conn.execute('SELECT name, id FROM instructions'))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _instruction_id(self, name):
+        instruction_id = self._instruction_ids.get(name)
+        if instruction_id is None:
+            instruction_id = self.conn.execute('INSERT INTO instructions (name) VALUES (?)', (name,)).lastrowid
+            self._instruction_ids[name] = instruction_id
+        return instruction_id
+
+    def add_run(self, models, label=None, source=None):
+        """
+        Insert one run in a single transaction
+
+        Args:
+            models: Iterable of (model name, get_statistics() dict, json_path or None)
+            label: Free-form run name, e.g. a nightly build tag
+            source: Where the run came from (scanned directory or binary)
+
+        Returns:
+            The new run id
+        """
+        created = time.strftime('%Y-%m-%dT%H:%M:%S')
+        try:
+            with self.conn:
+                run_id = self.conn.execute('INSERT INTO runs (created, label, source) VALUES (?, ?, ?)',
+                                           (created, label, source)).lastrowid
+                counts, sections, functions = [], [], []
+                for name, stats, json_path in models:
+                    extra = {key: value for key, value in stats.items() if key not in TABLE_KEYS}
+                    model_id = self.conn.execute(
+                        'INSERT INTO models (run_id, name, json_path, total_instructions, rvv_instructions, extra) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        (run_id, name, json_path, stats.get('total_instructions', 0),
+                         stats.get('rvv_instructions', 0), json.dumps(extra) if extra else None)).lastrowid
+                    counts.extend((model_id, self._instruction_id(instruction), count)
+                                  for instruction, count in stats.get('instruction_stats', {}).items())
+                    sections.extend((model_id, section, count)
+                                    for section, count in stats.get('section_stats', {}).items())
+                    functions.extend((model_id, function, values['total_instructions'], values['rvv_instructions'])
+                                     for function, values in stats.get('function_stats', {}).items())
+                self.conn.executemany('INSERT INTO instruction_counts VALUES (?, ?, ?)', counts)
+                self.conn.executemany('INSERT INTO sections VALUES (?, ?, ?)', sections)
+                self.conn.executemany('INSERT INTO functions VALUES (?, ?, ?, ?)', functions)
+        except BaseException:
+            # Names interned in the rolled-back transaction are gone
+            self._instruction_ids = dict(self.conn.execute('SELECT name, id FROM instructions'))
+            raise
+        return run_id
+
+    def runs(self):
+        """All runs, oldest first: (id, created, label, source, model count)"""
+        return self.conn.execute(
+            'SELECT runs.id, created, label, source, COUNT(models.id) FROM runs '
+            'LEFT JOIN models ON models.run_id = runs.id GROUP BY runs.id ORDER BY runs.id').fetchall()
+
+    def resolve_run(self, run=None):
+        """
+        Run id of a run given by id, label (its latest run) or None (the latest run)
+
+        Raises:
+            ValueError if there is no such run
+        """
+        if run is None or run == 'latest':
+            row = self.conn.execute('SELECT MAX(id) FROM runs').fetchone()
+        elif str(run).isdigit():
+            row = self.conn.execute('SELECT id FROM runs WHERE id = ?', (int(run),)).fetchone()
+        else:
+            row = self.conn.execute('SELECT MAX(id) FROM runs WHERE label = ?', (run,)).fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"No run {run!r} in {self.path}" if run not in (None, 'latest')
+                             else f"No runs in {self.path}")
+        return row[0]
+
+    def load_run(self, run=None, functions=True):
+        """
+        Statistics of every model of a run, as {model: get_statistics() dict}
+
+        Per-function instruction counts are not stored, so each function
+        has an empty instruction_stats and vtype_instruction_stats. Models
+        sharing a name (e.g. the same basename in two directories) are
+        renamed like arvvi_compare.load_all_stats does: the first keeps it,
+        later ones become "<name> (2)", "<name> (3)", ...
+        """
+        run_id = self.resolve_run(run)
+        stats_by_model = {}
+        names = {}
+        for model_id, name, total, rvv, extra in self.conn.execute(
+                'SELECT id, name, total_instructions, rvv_instructions, extra FROM models '
+                'WHERE run_id = ? ORDER BY id', (run_id,)):
+            stats = {'total_instructions': total, 'rvv_instructions': rvv, 'instruction_stats': {},
+                     'section_stats': {}, 'function_stats': {}}
+            if extra:
+                stats.update(json.loads(extra))
+            model_name, duplicate = name, 1
+            while model_name in stats_by_model:
+                duplicate += 1
+                model_name = f"{name} ({duplicate})"
+            stats_by_model[model_name] = names[model_id] = stats
+
+        for model_id, instruction, count in self.conn.execute(
+                'SELECT model_id, instructions.name, count FROM models '
+                'JOIN instruction_counts ON instruction_counts.model_id = models.id '
+                'JOIN instructions ON instructions.id = instruction_counts.instruction_id '
+                'WHERE run_id = ? ORDER BY model_id, count DESC, instructions.name', (run_id,)):
+            names[model_id]['instruction_stats'][instruction] = count
+        for model_id, section, count in self.conn.execute(
+                'SELECT model_id, sections.name, sections.rvv_instructions FROM models '
+                'JOIN sections ON sections.model_id = models.id WHERE run_id = ?', (run_id,)):
+            names[model_id]['section_stats'][section] = count
+        if functions:
+            for model_id, function, total, rvv in self.conn.execute(
+                    'SELECT model_id, functions.name, functions.total_instructions, functions.rvv_instructions '
+                    'FROM models JOIN functions ON functions.model_id = models.id WHERE run_id = ?', (run_id,)):
+                names[model_id]['function_stats'][function] = {
+                    'total_instructions': total, 'rvv_instructions': rvv, 'instruction_stats': {},
+                    'vtype_instruction_stats': {}}
+        return stats_by_model
+
+    def instruction_history(self, instruction, model=None, last=None):
+        """
+        Count of one instruction per run, oldest first: (run id, created, label, model, count)
+
+        Runs where a model was analyzed without using the instruction report
+        a count of 0. last limits the result to the most recent runs.
+        """
+        instruction_id = self._instruction_ids.get(instruction, -1)
+        query = ('SELECT runs.id, runs.created, runs.label, models.name, COALESCE(instruction_counts.count, 0) '
+                 'FROM models JOIN runs ON runs.id = models.run_id '
+                 'LEFT JOIN instruction_counts ON instruction_counts.model_id = models.id '
+                 'AND instruction_counts.instruction_id = ?')
+        conditions, params = [], [instruction_id]
+        if model is not None:
+            conditions.append('models.name = ?')
+            params.append(model)
+        if last:
+            conditions.append('runs.id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)')
+            params.append(last)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY runs.id, models.name'
+        return self.conn.execute(query, params).fetchall()
+
+
+def record_run(db_path, models, label=None, source=None):
+    """Add a run to the database at db_path and report it"""
+    with ResultsDB(db_path) as db:
+        run_id = db.add_run(models, label, source)
+    print(f"Recorded run {run_id} ({len(models)} model(s)) in: {db_path}")
+    return run_id
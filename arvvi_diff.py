@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+ARVVI Diff - Baseline vs candidate regression gate for RVV statistics
+
+Two sets of *_rvv_stats.json (directories scanned like arvvi_compare --scan,
+or manifests listing the files) are matched by model name. For every model
+present in both, the report holds the deltas of the instruction counts, the
+RVV share and, when both sides were analyzed with function statistics, the
+RVV count of each function.
+
+A drop in a model's RVV count larger than the relative or the absolute
+threshold, a drop in RVV % of more than the allowed percentage points, or a
+model missing from the candidate set is a regression; the command then
+exits with status 1 so CI pipelines fail automatically.
+
+Functions are gated separately: only functions with at least
+--function-min-rvv RVV instructions in the baseline count, against their own
+relative threshold (and the absolute one). Functions present on one side
+only, typically renamed or inlined by the compiler, are listed as missing or
+new rather than treated as a drop to zero.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from arvvi_compare import DEFAULT_LOAD_JOBS, STATS_SUFFIX, find_stats_files, load_all_stats
+
+# Default regression thresholds
+DEFAULT_RELATIVE_THRESHOLD = 5.0  # Percent of the baseline RVV count
+DEFAULT_PERCENT_THRESHOLD = 1.0  # Percentage points of RVV %
+DEFAULT_FUNCTION_THRESHOLD = 10.0  # Percent of a function's baseline RVV count
+DEFAULT_FUNCTION_MIN_RVV = 32  # Smaller functions are reported but never fail the gate
+
+# Exit status of a failed gate (2 is used for unusable input, like argparse)
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+
+
+def read_manifest(manifest_path):
+    """
+    Stats file paths listed in a manifest, one per line
+
+    Blank lines and lines starting with '#' are skipped; relative paths are
+    resolved against the manifest's directory.
+    """
+    base_dir = Path(manifest_path).parent
+    paths = []
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(str(base_dir / line))
+    return paths
+
+
+def stats_files(path):
+    """Stats files of a directory (recursive scan), a manifest or a single stats file"""
+    if os.path.isdir(path):
+        return find_stats_files(path)
+    if path.endswith(STATS_SUFFIX):
+        return [path]
+    return read_manifest(path)
+
+
+def load_stats_set(path, jobs=DEFAULT_LOAD_JOBS):
+    """Load one side of the diff as {model: get_statistics() dict}"""
+    stats_dict = load_all_stats(stats_files(path), jobs)
+    return {model: data.get('statistics', {}) for model, data in stats_dict.items()}
+
+
+def count_delta(baseline, candidate):
+    """Baseline, candidate, absolute and relative (percent) change of a count"""
+    delta = candidate - baseline
+    return {
+        'baseline': baseline,
+        'candidate': candidate,
+        'delta': delta,
+        'relative': round(delta * 100.0 / baseline, 2) if baseline else None,
+    }
+
+
+def rvv_percent(stats):
+    total = stats.get('total_instructions', 0)
+    return stats.get('rvv_instructions', 0) * 100.0 / total if total > 0 else 0.0
+
+
+def is_count_regression(delta, relative_threshold, absolute_threshold):
+    """Whether a count_delta() drop exceeds the relative or the absolute threshold"""
+    drop = -delta['delta']
+    if drop <= 0:
+        return False
+    if absolute_threshold is not None and drop > absolute_threshold:
+        return True
+    return (relative_threshold is not None and delta['baseline'] > 0
+            and drop * 100.0 / delta['baseline'] > relative_threshold)
+
+
+def changed_counts(baseline, candidate):
+    """count_delta() of every key whose count differs, largest change first"""
+    deltas = {}
+    for name in set(baseline) | set(candidate):
+        base, cand = baseline.get(name, 0), candidate.get(name, 0)
+        if base != cand:
+            deltas[name] = count_delta(base, cand)
+    return dict(sorted(deltas.items(), key=lambda item: (-abs(item[1]['delta']), item[0])))
+
+
+def one_sided(counts, other):
+    """Counts of the names missing from other, largest first"""
+    return dict(sorted(((name, count) for name, count in counts.items() if name not in other),
+                       key=lambda item: (-item[1], item[0])))
+
+
+def diff_model(baseline, candidate, relative_threshold=DEFAULT_RELATIVE_THRESHOLD, absolute_threshold=None,
+               percent_threshold=DEFAULT_PERCENT_THRESHOLD, function_threshold=DEFAULT_FUNCTION_THRESHOLD,
+               function_min_rvv=DEFAULT_FUNCTION_MIN_RVV):
+    """
+    Deltas and regressions of one model (two get_statistics() dicts)
+
+    function_threshold=None reports function deltas without gating them.
+    """
+    base_percent, cand_percent = rvv_percent(baseline), rvv_percent(candidate)
+    result = {
+        'total_instructions': count_delta(baseline.get('total_instructions', 0),
+                                          candidate.get('total_instructions', 0)),
+        'rvv_instructions': count_delta(baseline.get('rvv_instructions', 0), candidate.get('rvv_instructions', 0)),
+        'rvv_percent': {
+            'baseline': round(base_percent, 2),
+            'candidate': round(cand_percent, 2),
+            'delta': round(cand_percent - base_percent, 2),
+        },
+        'instructions': changed_counts(baseline.get('instruction_stats', {}), candidate.get('instruction_stats', {})),
+        'functions': {},
+        'missing_functions': {},
+        'added_functions': {},
+        'regressions': [],
+    }
+
+    def regression(scope, name, metric, values):
+        result['regressions'].append({'scope': scope, 'name': name, 'metric': metric, **values})
+
+    if is_count_regression(result['rvv_instructions'], relative_threshold, absolute_threshold):
+        regression('model', None, 'rvv_instructions', result['rvv_instructions'])
+    if percent_threshold is not None and base_percent - cand_percent > percent_threshold:
+        regression('model', None, 'rvv_percent', result['rvv_percent'])
+
+    # Per-function RVV counts only mean something when both runs collected them
+    if baseline.get('function_stats') and candidate.get('function_stats'):
+        base_functions = {name: f['rvv_instructions'] for name, f in baseline['function_stats'].items()}
+        cand_functions = {name: f['rvv_instructions'] for name, f in candidate['function_stats'].items()}
+        result['functions'] = changed_counts(
+            {name: count for name, count in base_functions.items() if name in cand_functions},
+            {name: count for name, count in cand_functions.items() if name in base_functions})
+        # Renamed or inlined functions appear on one side only: listed, not gated
+        result['missing_functions'] = one_sided(base_functions, cand_functions)
+        result['added_functions'] = one_sided(cand_functions, base_functions)
+        if function_threshold is not None:
+            for name, delta in result['functions'].items():
+                if (delta['baseline'] >= function_min_rvv
+                        and is_count_regression(delta, function_threshold, absolute_threshold)):
+                    regression('function', name, 'rvv_instructions', delta)
+
+    if result['regressions']:
+        result['status'] = 'regressed'
+    elif result['rvv_instructions']['delta'] > 0:
+        result['status'] = 'improved'
+    elif (result['instructions'] or result['functions'] or result['missing_functions']
+          or result['added_functions'] or result['total_instructions']['delta']):
+        result['status'] = 'changed'
+    else:
+        result['status'] = 'unchanged'
+    return result
+
+
+def diff_stats(baseline, candidate, relative_threshold=DEFAULT_RELATIVE_THRESHOLD, absolute_threshold=None,
+               percent_threshold=DEFAULT_PERCENT_THRESHOLD, allow_missing=False,
+               function_threshold=DEFAULT_FUNCTION_THRESHOLD, function_min_rvv=DEFAULT_FUNCTION_MIN_RVV):
+    """
+    Compare two {model: get_statistics() dict} sets matched by model name
+
+    Returns:
+        JSON-serializable report; report['passed'] is False when any model
+        regressed or (unless allow_missing) a baseline model is missing
+    """
+    models = {}
+    for model, stats in baseline.items():
+        if model in candidate:
+            models[model] = diff_model(stats, candidate[model], relative_threshold, absolute_threshold,
+                                       percent_threshold, function_threshold, function_min_rvv)
+    missing = [model for model in baseline if model not in candidate]
+    added = [model for model in candidate if model not in baseline]
+
+    summary = {'compared': len(models)}
+    for status in ('regressed', 'improved', 'changed', 'unchanged'):
+        summary[status] = sum(1 for result in models.values() if result['status'] == status)
+    summary['missing'] = len(missing)
+    summary['added'] = len(added)
+    summary['regressions'] = sum(len(result['regressions']) for result in models.values())
+    summary['missing_functions'] = sum(len(result['missing_functions']) for result in models.values())
+    summary['added_functions'] = sum(len(result['added_functions']) for result in models.values())
+
+    return {
+        'passed': not summary['regressed'] and (allow_missing or not missing),
+        'thresholds': {
+            'relative': relative_threshold,
+            'absolute': absolute_threshold,
+            'rvv_percent_points': percent_threshold,
+            'function_relative': function_threshold,
+            'function_min_rvv': function_min_rvv,
+            'allow_missing': allow_missing,
+        },
+        'summary': summary,
+        'missing': missing,
+        'added': added,
+        'models': models,
+    }
+
+
+def instruction_totals(report):
+    """Instruction deltas summed over all compared models, largest change first"""
+    totals = {}
+    for result in report['models'].values():
+        for name, delta in result['instructions'].items():
+            total = totals.setdefault(name, {'baseline': 0, 'candidate': 0, 'models': 0})
+            total['baseline'] += delta['baseline']
+            total['candidate'] += delta['candidate']
+            total['models'] += 1
+    return sorted(totals.items(), key=lambda item: (-abs(item[1]['candidate'] - item[1]['baseline']), item[0]))
+
+
+def _signed(value, suffix=''):
+    return f"{value:+}{suffix}" if isinstance(value, int) else f"{value:+.2f}{suffix}"
+
+
+def format_markdown(report, top_n=20):
+    """Markdown rendering of a diff_stats() report"""
+    summary = report['summary']
+    lines = ["## RVV Regression Report", ""]
+    if report.get('baseline') or report.get('candidate'):
+        lines += [f"- **Baseline:** `{report.get('baseline')}`", f"- **Candidate:** `{report.get('candidate')}`", ""]
+    if report['passed']:
+        lines.append("**Result: ✅ PASS**")
+    else:
+        lines.append(f"**Result: ❌ FAIL** ({summary['regressions']} regression(s) in "
+                     f"{summary['regressed']} model(s), {summary['missing']} missing model(s))")
+    lines += [
+        "",
+        "| Compared | Regressed | Improved | Changed | Unchanged | Missing | Added |",
+        "|---------:|----------:|---------:|--------:|----------:|--------:|------:|",
+        f"| {summary['compared']} | {summary['regressed']} | {summary['improved']} | {summary['changed']} | "
+        f"{summary['unchanged']} | {summary['missing']} | {summary['added']} |",
+    ]
+
+    regressions = [(model, regression) for model, result in report['models'].items()
+                   for regression in result['regressions']]
+    if regressions:
+        lines += ["", "### Regressions", "",
+                  "| Model | Function | Metric | Baseline | Candidate | Change |",
+                  "|-------|----------|--------|---------:|----------:|-------:|"]
+        for model, regression in regressions:
+            if regression['metric'] == 'rvv_percent':
+                change = _signed(regression['delta'], ' pp')
+            elif regression['relative'] is None:
+                change = _signed(regression['delta'])
+            else:
+                change = f"{_signed(regression['delta'])} ({regression['relative']:+.2f}%)"
+            lines.append(f"| {model} | {regression['name'] or '-'} | {regression['metric']} | "
+                         f"{regression['baseline']} | {regression['candidate']} | {change} |")
+
+    changed = {model: result for model, result in report['models'].items() if result['status'] != 'unchanged'}
+    if changed:
+        lines += ["", "### Model Deltas", "",
+                  "| Model | Status | RVV Instructions | Δ RVV | RVV % | Δ RVV % |",
+                  "|-------|--------|-----------------:|------:|------:|--------:|"]
+        for model, result in changed.items():
+            rvv, percent = result['rvv_instructions'], result['rvv_percent']
+            lines.append(f"| {model} | {result['status']} | {rvv['baseline']} → {rvv['candidate']} | "
+                         f"{_signed(rvv['delta'])} | {percent['baseline']:.2f}% → {percent['candidate']:.2f}% | "
+                         f"{_signed(percent['delta'], ' pp')} |")
+
+    one_sided_functions = {model: result for model, result in report['models'].items()
+                           if result['missing_functions'] or result['added_functions']}
+    if one_sided_functions:
+        lines += ["", "### Missing and New Functions (renamed or inlined; not gated)", "",
+                  "| Model | Missing from candidate | New in candidate |",
+                  "|-------|------------------------|------------------|"]
+        for model, result in one_sided_functions.items():
+            missing = ', '.join(f"{name} ({count})" for name, count in result['missing_functions'].items())
+            added = ', '.join(f"{name} ({count})" for name, count in result['added_functions'].items())
+            lines.append(f"| {model} | {missing or '-'} | {added or '-'} |")
+
+    totals = instruction_totals(report)[:top_n]
+    if totals:
+        lines += ["", f"### Top {len(totals)} Instruction Deltas (all compared models)", "",
+                  "| Instruction | Baseline | Candidate | Δ | Models Changed |",
+                  "|-------------|---------:|----------:|--:|---------------:|"]
+        for name, total in totals:
+            lines.append(f"| {name} | {total['baseline']} | {total['candidate']} | "
+                         f"{_signed(total['candidate'] - total['baseline'])} | {total['models']} |")
+
+    if report['missing']:
+        lines += ["", f"**Missing from candidate:** {', '.join(report['missing'])}"]
+    if report['added']:
+        lines += ["", f"**New in candidate:** {', '.join(report['added'])}"]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='ARVVI Diff - Flag RVV regressions between a baseline and a candidate set of models',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+BASELINE and CANDIDATE are directories (scanned recursively for
+*_rvv_stats.json), manifest files listing one stats file per line, or
+single *_rvv_stats.json files. Models are matched by name.
+
+Exit status: 0 no regressions, 1 regressions found, 2 unusable input.
+
+Examples:
+  Gate a nightly compiler build:
+    %(prog)s baseline/models/ nightly/models/ -o diff.json --markdown-output diff.md
+
+  Stricter thresholds, ignoring models that were not built:
+    %(prog)s base.txt cand.txt --rel-threshold 1 --abs-threshold 100 --allow-missing
+        """
+    )
+    parser.add_argument('baseline', help='Baseline directory, manifest or stats file')
+    parser.add_argument('candidate', help='Candidate directory, manifest or stats file')
+    parser.add_argument('--rel-threshold', type=float, default=DEFAULT_RELATIVE_THRESHOLD, metavar='PCT',
+                        help='Flag model RVV count drops larger than PCT%% of the baseline '
+                             f'(default: {DEFAULT_RELATIVE_THRESHOLD})')
+    parser.add_argument('--abs-threshold', type=int, metavar='N',
+                        help='Also flag model and function RVV count drops larger than N instructions '
+                             '(default: off)')
+    parser.add_argument('--function-threshold', type=float, default=DEFAULT_FUNCTION_THRESHOLD, metavar='PCT',
+                        help='Flag function RVV count drops larger than PCT%% of the baseline '
+                             f'(default: {DEFAULT_FUNCTION_THRESHOLD})')
+    parser.add_argument('--function-min-rvv', type=int, default=DEFAULT_FUNCTION_MIN_RVV, metavar='N',
+                        help='Only gate functions with at least N RVV instructions in the baseline '
+                             f'(default: {DEFAULT_FUNCTION_MIN_RVV})')
+    parser.add_argument('--no-function-gate', action='store_true',
+                        help='Report function deltas without failing on them')
+    parser.add_argument('--percent-threshold', type=float, default=DEFAULT_PERCENT_THRESHOLD, metavar='PP',
+                        help=f'Flag RVV %% drops larger than PP percentage points (default: {DEFAULT_PERCENT_THRESHOLD})')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='Do not fail when baseline models are missing from the candidate set')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Save the report as JSON')
+    parser.add_argument('--markdown-output', metavar='FILE',
+                        help='Write the markdown report to FILE instead of stdout')
+    parser.add_argument('--top', type=int, default=20, metavar='N',
+                        help='Instruction deltas listed in the markdown report (default: 20)')
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_LOAD_JOBS, metavar='N',
+                        help=f'Load up to N JSON files concurrently (default: {DEFAULT_LOAD_JOBS})')
+
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive number")
+
+    sides = []
+    for path in (args.baseline, args.candidate):
+        if not os.path.exists(path):
+            print(f"Error: Not found: {path}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
+        try:
+            stats = load_stats_set(path, args.jobs)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error: Cannot read manifest {path}: {e}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
+        if not stats:
+            print(f"Error: No valid statistics files found in {path}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
+        sides.append(stats)
+
+    report = diff_stats(*sides, relative_threshold=args.rel_threshold, absolute_threshold=args.abs_threshold,
+                        percent_threshold=args.percent_threshold, allow_missing=args.allow_missing,
+                        function_threshold=None if args.no_function_gate else args.function_threshold,
+                        function_min_rvv=args.function_min_rvv)
+    report = {'baseline': args.baseline, 'candidate': args.candidate, **report}
+
+    markdown = format_markdown(report, args.top)
+    if args.markdown_output:
+        with open(args.markdown_output, 'w') as f:
+            f.write(markdown)
+        print(f"Markdown report saved to: {args.markdown_output}")
+    else:
+        print(markdown, end='')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"JSON report saved to: {args.output}")
+
+    return 0 if report['passed'] else EXIT_REGRESSION
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ARVVI loops - Static loop detection from branch and jump targets
+
+Within a function, a branch or jump whose target is at or before its own
+address is a back edge and closes a loop over the address range
+[target, branch]. Back edges to the same header form one loop. The nesting
+depth of an instruction is the number of loop ranges containing it.
+
+Depths are computed with a sweep over the loop boundaries and bisection
+into the function's sorted instruction addresses, so a function costs
+O(n) to collect plus O(L log n) for L loops.
+"""
+
+from bisect import bisect_left
+
+# Assumed iterations per loop level when weighting counts by nesting depth
+DEFAULT_LOOP_WEIGHT = 10
+
+# Conditional branches and direct jumps as printed by objdump (calls are
+# excluded: jal with a link register is not a loop edge)
+BRANCH_MNEMONICS = frozenset([
+    'beq', 'bne', 'blt', 'bge', 'bltu', 'bgeu',
+    'beqz', 'bnez', 'blez', 'bgez', 'bltz', 'bgtz',
+    'bgt', 'ble', 'bgtu', 'bleu', 'j',
+])
+
+
+def branch_target(operands):
+    """
+    Target address of a branch or jump from its objdump operand text
+
+    Handles GNU ("a1,1000c <kernel+0xc>") and LLVM ("a1, 0x1000c <kernel+0xc>")
+    formats. Returns None for indirect jumps.
+    """
+    target = operands.split('<', 1)[0].rsplit(',', 1)[-1].strip()
+    try:
+        return int(target, 16)
+    except ValueError:
+        return None
+
+
+def loop_depths(addresses, rvv_addresses, back_edges):
+    """
+    Count a function's instructions per loop nesting depth
+
+    Args:
+        addresses: Sorted addresses of all instructions in the function
+        rvv_addresses: Sorted addresses of its RVV instructions
+        back_edges: Dict of loop header address -> furthest back-edge source
+
+    Returns:
+        Dict of depth -> [instructions, rvv_instructions]
+    """
+    events = {}
+    for header, end in back_edges.items():
+        events[header] = events.get(header, 0) + 1
+        events[end + 1] = events.get(end + 1, 0) - 1
+
+    depths = {}
+    depth = position = rvv_position = 0
+    for point in sorted(events):
+        index = bisect_left(addresses, point)
+        rvv_index = bisect_left(rvv_addresses, point)
+        if index > position:
+            counts = depths.setdefault(depth, [0, 0])
+            counts[0] += index - position
+            counts[1] += rvv_index - rvv_position
+        position, rvv_position = index, rvv_index
+        depth += events[point]
+
+    if len(addresses) > position:
+        counts = depths.setdefault(depth, [0, 0])
+        counts[0] += len(addresses) - position
+        counts[1] += len(rvv_addresses) - rvv_position
+    return depths
+
+
+def weighted_counts(depths, weight=DEFAULT_LOOP_WEIGHT):
+    """Instruction and RVV counts weighted by weight ** depth"""
+    total = rvv = 0
+    for depth, (instructions, rvv_instructions) in depths.items():
+        factor = weight ** int(depth)
+        total += instructions * factor
+        rvv += rvv_instructions * factor
+    return total, rvv
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+ARVVI Matrix - Model × instruction count matrix for comparisons
+
+All per-model instruction_stats are interned into one dense NumPy matrix
+(rows = models in input order, columns = instruction mnemonics), built once
+in O(total non-zero counts). Totals are column sums and the top-K
+instructions come from a partial sort, so rendering a comparison of
+thousands of models costs only the cells that are printed.
+"""
+
+import numpy as np
+
+
+class ComparisonMatrix:
+    """Dense model × instruction counts with per-model summary columns"""
+
+    def __init__(self, models, instructions, counts, total_instructions, rvv_instructions):
+        self.models = models  # Row names
+        self.instructions = instructions  # Column names
+        self.counts = counts  # int64 array (models × instructions)
+        self.total_instructions = total_instructions  # int64 per model
+        self.rvv_instructions = rvv_instructions  # int64 per model
+        self._columns = {name: i for i, name in enumerate(instructions)}
+        self._instruction_totals = None
+
+    @classmethod
+    def from_stats(cls, stats_by_model):
+        """
+        Build the matrix from a {model: get_statistics() dict} mapping
+
+        Each model's instruction_stats is scattered into its row with one
+        vectorized assignment.
+        """
+        models = list(stats_by_model)
+        columns = {}
+        rows = []
+        for stats in stats_by_model.values():
+            instruction_stats = stats.get('instruction_stats', {})
+            ids = [columns.setdefault(name, len(columns)) for name in instruction_stats]
+            rows.append((ids, list(instruction_stats.values())))
+
+        counts = np.zeros((len(models), len(columns)), dtype=np.int64)
+        for row, (ids, values) in enumerate(rows):
+            if ids:
+                counts[row, ids] = values
+
+        total = np.array([stats.get('total_instructions', 0) for stats in stats_by_model.values()], dtype=np.int64)
+        rvv = np.array([stats.get('rvv_instructions', 0) for stats in stats_by_model.values()], dtype=np.int64)
+        return cls(models, list(columns), counts, total, rvv)
+
+    def __len__(self):
+        return len(self.models)
+
+    @property
+    def instruction_totals(self):
+        """Count of each instruction summed over all models"""
+        if self._instruction_totals is None:
+            self._instruction_totals = self.counts.sum(axis=0)
+        return self._instruction_totals
+
+    @property
+    def rvv_percent(self):
+        """RVV share of each model's instructions (0 for empty models)"""
+        total = self.total_instructions.astype(np.float64)
+        return np.divide(self.rvv_instructions * 100.0, total, out=np.zeros_like(total), where=total > 0)
+
+    def top_instructions(self, k=20):
+        """
+        Column indices of the k most used instructions, largest first
+
+        np.partition finds the k-th largest total in linear time; only the
+        instructions at or above it are sorted (ties by name, including ties
+        at the k-th place, so output is deterministic).
+        """
+        totals = self.instruction_totals
+        if k <= 0 or not totals.size:
+            return []
+        if k < totals.size:
+            kth = np.partition(totals, totals.size - k)[totals.size - k]
+            candidates = np.flatnonzero(totals >= kth)
+        else:
+            candidates = np.arange(totals.size)
+        return sorted(candidates.tolist(), key=lambda i: (-int(totals[i]), self.instructions[i]))[:k]
+
+    def column(self, instruction):
+        """Per-model counts of one instruction (zeros if no model uses it)"""
+        index = self._columns.get(instruction)
+        if index is None:
+            return np.zeros(len(self.models), dtype=np.int64)
+        return self.counts[:, index]
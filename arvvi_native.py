@@ -0,0 +1,765 @@
+#!/usr/bin/env python3
+"""
+ARVVI Native - Built-in ELF reader and RVV decoder
+
+Analyzes RISC-V binaries without spawning objdump: the ELF file is
+memory-mapped, section headers are walked with struct, and the 16/32-bit
+instruction stream is classified with vectorized NumPy masks. Only the
+distinct vector encodings are decoded in Python, so the cost is dominated
+by a few array passes over each section.
+"""
+
+import mmap
+import re
+import struct
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from arvvi_opcodes import (OPCFG, OPFVV, OPIVI, OPIVV, OPIVX, OPMVV, OPMVX, OPI_FUNCT6, OPM_FUNCT6, OPF_FUNCT6,
+                           SUFFIX, VFUNARY0, VFUNARY1, VMUNARY0, VWXUNARY0, VXUNARY0)
+from arvvi_loops import DEFAULT_LOOP_WEIGHT, loop_depths, weighted_counts
+from arvvi_vtype import decode_vset, is_redundant_vset, sew_lmul
+
+ElfSection = namedtuple('ElfSection', ['name', 'type', 'flags', 'addr', 'offset', 'size', 'link'])
+ElfSymbol = namedtuple('ElfSymbol', ['name', 'value', 'size', 'shndx'])
+
+# ELF constants
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+SHT_NULL = 0
+SHT_SYMTAB = 2
+SHT_STRTAB = 3
+SHT_RELA = 4
+SHT_NOBITS = 8
+SHT_REL = 9
+SHT_DYNSYM = 11
+SHT_GROUP = 17
+SHT_SYMTAB_SHNDX = 18
+SHN_XINDEX = 0xffff
+
+# Sections BFD consumes itself; objdump -D never disassembles these
+SKIPPED_SECTION_TYPES = frozenset([
+    SHT_NULL, SHT_SYMTAB, SHT_STRTAB, SHT_RELA, SHT_NOBITS, SHT_REL, SHT_DYNSYM,
+    SHT_GROUP, SHT_SYMTAB_SHNDX,
+])
+
+# struct layouts (without byte-order prefix) per ELF class
+ELF_HEADER_FORMAT = {ELFCLASS32: 'HHIIIIIHHHHHH', ELFCLASS64: 'HHIQQQIHHHHHH'}
+SECTION_HEADER_FORMAT = {ELFCLASS32: 'IIIIIIIIII', ELFCLASS64: 'IIQQQQIIQQ'}
+
+# Major opcodes that carry vector instructions
+OPCODE_LOAD_FP = 0x07
+OPCODE_STORE_FP = 0x27
+OPCODE_OP_V = 0x57
+
+# Width field values used by vector loads/stores (others are scalar FP)
+VECTOR_WIDTH_EEW = {0b000: 8, 0b101: 16, 0b110: 32, 0b111: 64}
+
+# Bits of an OP-V word that select the mnemonic: funct6, vm, vs1/rs1/imm, funct3, opcode
+OP_V_KEY_MASK = 0xFE0FF07F
+# Bits of a vector load/store word that select the mnemonic: nf, mew, mop, vm, lumop/sumop, width, opcode
+LOAD_STORE_KEY_MASK = 0xFFF0707F
+# Extra key bits computed from register fields (needed to recognize objdump aliases)
+KEY_VS1_EQ_VS2 = 1 << 32
+KEY_VD_EQ_VS1 = 1 << 33
+
+_MNEMONIC_TOKEN_RE = re.compile(r'\w+')
+
+# Bytes decoded per NumPy pass (bounds memory for multi-GB sections)
+CHUNK_BYTES = 8 << 20
+
+
+def _decode_op_v(key):
+    """Decode an OP-V key (see OP_V_KEY_MASK) to an objdump-style mnemonic"""
+    funct3 = (key >> 12) & 0x7
+    funct6 = (key >> 26) & 0x3f
+    vm = (key >> 25) & 0x1
+    vs1 = (key >> 15) & 0x1f
+    vs1_eq_vs2 = bool(key & KEY_VS1_EQ_VS2)
+    vd_eq_vs1 = bool(key & KEY_VD_EQ_VS1)
+
+    if funct3 == OPCFG:
+        if not (key >> 31) & 0x1:
+            return 'vsetvli'
+        if (key >> 30) & 0x3 == 0x3:
+            return 'vsetivli'
+        if (key >> 25) & 0x7f == 0x40:
+            return 'vsetvl'
+        return None
+
+    suffix = SUFFIX[funct3]
+
+    if funct3 in (OPIVV, OPIVX, OPIVI):
+        name = OPI_FUNCT6.get(funct6)
+        if name is None:
+            return None
+        if funct6 == 0b010111:
+            return f'vmerge.{suffix}m' if vm == 0 else f'vmv.v.{suffix[1]}'
+        if funct6 == 0b100111 and funct3 == OPIVI:
+            return f'vmv{vs1 + 1}r.v'
+        if funct6 == 0b001110 and funct3 == OPIVV:
+            return 'vrgatherei16.vv'
+        if funct6 in (0b010000, 0b010010) or (funct6 in (0b010001, 0b010011) and vm == 0):
+            return f'{name}.{suffix}m'
+        if funct6 in (0b101100, 0b101101, 0b101110, 0b101111):
+            if funct6 == 0b101100 and funct3 == OPIVX and vs1 == 0:
+                return 'vncvt.x.x.w'
+            return f'{name}.w{suffix[1]}'
+        if funct6 in (0b110000, 0b110001):
+            return f'{name}.vs'
+        # objdump aliases
+        if funct6 == 0b001011 and funct3 == OPIVI and vs1 == 0x1f:
+            return 'vnot.v'
+        if funct6 == 0b000011 and funct3 == OPIVX and vs1 == 0:
+            return 'vneg.v'
+        return f'{name}.{suffix}'
+
+    if funct3 in (OPMVV, OPMVX):
+        if funct6 == 0b010000:
+            return VWXUNARY0.get(vs1) if funct3 == OPMVV else 'vmv.s.x'
+        if funct6 == 0b010010 and funct3 == OPMVV:
+            return VXUNARY0.get(vs1)
+        if funct6 == 0b010100 and funct3 == OPMVV:
+            return VMUNARY0.get(vs1)
+        name = OPM_FUNCT6.get(funct6)
+        if name is None:
+            return None
+        if funct6 <= 0b000111:
+            return f'{name}.vs'
+        if 0b011000 <= funct6 <= 0b011111:
+            # objdump aliases for mask-register logical operations
+            if funct6 == 0b011011 and vs1_eq_vs2 and vd_eq_vs1:
+                return 'vmclr.m'
+            if funct6 == 0b011111 and vs1_eq_vs2 and vd_eq_vs1:
+                return 'vmset.m'
+            if funct6 == 0b011001 and vs1_eq_vs2:
+                return 'vmmv.m'
+            if funct6 == 0b011101 and vs1_eq_vs2:
+                return 'vmnot.m'
+            return f'{name}.mm'
+        if funct6 == 0b010111:
+            return 'vcompress.vm'
+        if 0b110100 <= funct6 <= 0b110111:
+            return f'{name}.w{suffix[1]}'
+        if funct6 in (0b110000, 0b110001) and funct3 == OPMVX and vs1 == 0:
+            return 'vwcvtu.x.x.v' if funct6 == 0b110000 else 'vwcvt.x.x.v'
+        return f'{name}.{suffix}'
+
+    # OPFVV / OPFVF
+    if funct6 == 0b010000:
+        return ('vfmv.f.s' if vs1 == 0 else None) if funct3 == OPFVV else 'vfmv.s.f'
+    if funct6 == 0b010010 and funct3 == OPFVV:
+        return VFUNARY0.get(vs1)
+    if funct6 == 0b010011 and funct3 == OPFVV:
+        return VFUNARY1.get(vs1)
+    name = OPF_FUNCT6.get(funct6)
+    if name is None:
+        return None
+    if funct6 == 0b010111:
+        return 'vfmerge.vfm' if vm == 0 else 'vfmv.v.f'
+    if funct6 in (0b000001, 0b000011, 0b000101, 0b000111, 0b110001, 0b110011):
+        return f'{name}.vs'
+    if funct6 in (0b110100, 0b110110):
+        return f'{name}.w{suffix[1]}'
+    if funct3 == OPFVV and vs1_eq_vs2 and funct6 in (0b001001, 0b001010):
+        return 'vfneg.v' if funct6 == 0b001001 else 'vfabs.v'
+    return f'{name}.{suffix}'
+
+
+def _decode_load_store(key):
+    """Decode a LOAD-FP/STORE-FP key (see LOAD_STORE_KEY_MASK) to an objdump-style mnemonic"""
+    eew = VECTOR_WIDTH_EEW.get((key >> 12) & 0x7)
+    if eew is None:
+        return None
+    store = (key & 0x7f) == OPCODE_STORE_FP
+    nf = ((key >> 29) & 0x7) + 1
+    mew = (key >> 28) & 0x1
+    mop = (key >> 26) & 0x3
+    umop = (key >> 20) & 0x1f
+    if mew:
+        return None
+    seg = f'seg{nf}' if nf > 1 else ''
+    op = 's' if store else 'l'
+
+    if mop == 0b00:
+        if umop == 0b00000:
+            return f'v{op}{seg}e{eew}.v'
+        if umop == 0b01000:
+            if nf not in (1, 2, 4, 8):
+                return None
+            return f'vs{nf}r.v' if store else f'vl{nf}re{eew}.v'
+        if umop == 0b01011 and nf == 1 and eew == 8:
+            return f'v{op}m.v'
+        if umop == 0b10000 and not store:
+            return f'vl{seg}e{eew}ff.v'
+        return None
+    if mop == 0b10:
+        return f'v{op}s{seg}e{eew}.v'
+    order = 'u' if mop == 0b01 else 'o'
+    return f'v{op}{order}x{seg}ei{eew}.v'
+
+
+@lru_cache(maxsize=None)
+def decode_vector_key(key):
+    """
+    Decode a masked vector instruction key to an objdump-style mnemonic
+
+    Returns:
+        Full mnemonic such as 'vadd.vv' or 'vle32.v', or None if the key is
+        not a valid vector encoding
+    """
+    opcode = key & 0x7f
+    if opcode == OPCODE_OP_V:
+        return _decode_op_v(key)
+    if opcode in (OPCODE_LOAD_FP, OPCODE_STORE_FP):
+        return _decode_load_store(key)
+    return None
+
+
+def decode_vector_instruction(word):
+    """Decode one 32-bit instruction word to an objdump-style mnemonic (None if not vector)"""
+    keys = vector_keys(np.array([word], dtype=np.uint32))
+    if keys.size == 0:
+        return None
+    return decode_vector_key(int(keys[0]))
+
+
+def instruction_starts(halfwords):
+    """
+    Find instruction boundaries in a 16-bit parcel stream
+
+    A parcel whose low two bits are 11 starts a 32-bit instruction and the
+    next parcel belongs to it; anything else is a compressed instruction.
+    Decoding restarts cleanly after every compressed parcel, so within a run
+    of "32-bit looking" parcels the starts simply alternate. This lets the
+    whole stream be walked without a Python loop.
+
+    Returns:
+        (start_indices, is_32bit) arrays over the instruction starts
+    """
+    count = halfwords.size
+    if count == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+
+    wide = (halfwords & 0x3) == 0x3
+    index = np.arange(count, dtype=np.int64)
+    reset = np.empty(count, dtype=bool)
+    reset[0] = True
+    reset[1:] = ~wide[:-1]
+    last_reset = np.maximum.accumulate(np.where(reset, index, 0))
+    is_start = ((index - last_reset) & 1) == 0
+
+    starts = index[is_start]
+    is_32bit = wide[is_start]
+    # A 32-bit instruction cut off by the end of the section is not decoded
+    if is_32bit.size and is_32bit[-1] and starts[-1] == count - 1:
+        starts = starts[:-1]
+        is_32bit = is_32bit[:-1]
+    return starts, is_32bit
+
+
+def vector_keys(words):
+    """
+    Select vector instructions from 32-bit words and reduce them to decode keys
+
+    Keys keep only the fields that select a mnemonic (plus register-equality
+    bits for objdump aliases), so a large kernel collapses to a few hundred
+    distinct keys that are decoded once each.
+    """
+    return select_vector(words)[0]
+
+
+def select_vector(words):
+    """Return (decode keys, instruction words, selection mask) of the vector instructions in words"""
+    words = words.astype(np.uint64)
+    opcode = words & 0x7f
+    width = (words >> 12) & 0x7
+    is_op_v = opcode == OPCODE_OP_V
+    is_vmem = ((opcode == OPCODE_LOAD_FP) | (opcode == OPCODE_STORE_FP)) & \
+        ((width == 0b000) | (width >= 0b101))
+
+    keys = np.where(is_op_v, words & OP_V_KEY_MASK, words & LOAD_STORE_KEY_MASK)
+    vd = (words >> 7) & 0x1f
+    vs1 = (words >> 15) & 0x1f
+    vs2 = (words >> 20) & 0x1f
+    keys |= np.where(is_op_v & (vs1 == vs2), np.uint64(KEY_VS1_EQ_VS2), np.uint64(0))
+    keys |= np.where(is_op_v & (vd == vs1), np.uint64(KEY_VD_EQ_VS1), np.uint64(0))
+    selected = is_op_v | is_vmem
+    return keys[selected], words[selected], selected
+
+
+class ElfFile:
+    """Minimal memory-mapped ELF reader (section headers and symbols)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self._file.close()
+            raise ValueError(f"Not an ELF file: {self.path}")
+
+        ident = self.data[:16]
+        if len(ident) < 16 or ident[:4] != b'\x7fELF':
+            self.close()
+            raise ValueError(f"Not an ELF file: {self.path}")
+        self.elf_class = ident[4]
+        if self.elf_class not in (ELFCLASS32, ELFCLASS64):
+            self.close()
+            raise ValueError(f"Unsupported ELF class {self.elf_class}: {self.path}")
+        self.byte_order = '<' if ident[5] == ELFDATA2LSB else '>'
+
+        header = struct.unpack_from(self.byte_order + ELF_HEADER_FORMAT[self.elf_class], self.data, 16)
+        (_, self.machine, _, self.entry, _, shoff, self.flags,
+         _, _, _, shentsize, shnum, shstrndx) = header
+        self.sections = self._read_sections(shoff, shentsize, shnum, shstrndx)
+
+    def _unpack_section(self, offset):
+        fmt = self.byte_order + SECTION_HEADER_FORMAT[self.elf_class]
+        return struct.unpack_from(fmt, self.data, offset)
+
+    def _read_sections(self, shoff, shentsize, shnum, shstrndx):
+        if shoff == 0:
+            return []
+        # Extended numbering: real counts live in section header 0
+        first = self._unpack_section(shoff)
+        if shnum == 0:
+            shnum = first[5]
+        if shstrndx == SHN_XINDEX:
+            shstrndx = first[6]
+
+        raw = [self._unpack_section(shoff + i * shentsize) for i in range(shnum)]
+        strtab_offset = raw[shstrndx][4] if shstrndx < len(raw) else 0
+
+        sections = []
+        for sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link, *_ in raw:
+            name = self._read_string(strtab_offset + sh_name) if strtab_offset else ''
+            sections.append(ElfSection(name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link))
+        return sections
+
+    def _read_string(self, offset):
+        end = self.data.find(b'\0', offset)
+        if end < 0:
+            end = len(self.data)
+        return self.data[offset:end].decode('utf-8', errors='replace')
+
+    def code_sections(self):
+        """Sections objdump -D would disassemble, in file order"""
+        return [s for s in self.sections
+                if s.type not in SKIPPED_SECTION_TYPES and s.size > 0]
+
+    def symbols(self):
+        """Yield named symbols from .symtab"""
+        for section in self.sections:
+            if section.type != SHT_SYMTAB:
+                continue
+            strtab = self.sections[section.link]
+            if self.elf_class == ELFCLASS64:
+                fmt, entsize = self.byte_order + 'IBBHQQ', 24
+            else:
+                fmt, entsize = self.byte_order + 'IIIBBH', 16
+            for i in range(section.size // entsize):
+                fields = struct.unpack_from(fmt, self.data, section.offset + i * entsize)
+                if self.elf_class == ELFCLASS64:
+                    st_name, _, _, shndx, value, size = fields
+                else:
+                    st_name, value, size, _, _, shndx = fields
+                if st_name == 0:
+                    continue
+                yield ElfSymbol(self._read_string(strtab.offset + st_name), value, size, shndx)
+
+    def halfwords(self, section, start=0, end=None):
+        """Return the section contents (or a byte range of it) as 16-bit parcels"""
+        end = section.size if end is None else end
+        start -= start & 1
+        length = (end - start) & ~1
+        dtype = np.dtype(self.byte_order + 'u2')
+        return np.frombuffer(self.data, dtype=dtype, count=length // 2, offset=section.offset + start)
+
+    def close(self):
+        if getattr(self, 'data', None) is not None:
+            try:
+                self.data.close()
+            except BufferError:
+                # NumPy views still reference the mapping; it is released with them
+                pass
+            self.data = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VtypeTracker:
+    """
+    Attribute vector instructions to the active vtype, in program order
+
+    Mirrors the vtype tracking of RVVAnalyzer.parse_lines: only the
+    vset{i}vl{i} words are walked in Python; the other vector instructions
+    are assigned to the preceding vset with a searchsorted/bincount.
+    (vtype, decode key) counts of the current range are kept in key_vtypes
+    for the per-mnemonic split.
+    """
+
+    KIND_OTHER, KIND_RVV, KIND_VSET = 0, 1, 2
+
+    def __init__(self, classifier):
+        self.classifier = classifier
+        self.kinds = {}  # decode key -> kind
+        self.vtype_stats = defaultdict(int)
+        self.key_vtypes = defaultdict(int)  # (SEW×LMUL, decode key) -> count, see pop_key_vtypes
+        self.vset_configs = defaultdict(int)
+        self.avl_immediates = defaultdict(int)
+        self.vset_count = 0
+        self.redundant_vsets = 0
+        self.reset()
+
+    def reset(self):
+        """Start of a function: the configuration is unknown"""
+        self.config = self.avl = None
+
+    def kind(self, key):
+        kind = self.kinds.get(key)
+        if kind is None:
+            mnemonic = decode_vector_key(key)
+            kind = self.KIND_OTHER
+            if mnemonic is not None:
+                instruction = _MNEMONIC_TOKEN_RE.match(mnemonic).group(0)
+                if self.classifier.is_rvv(instruction):
+                    kind = self.KIND_VSET if instruction.startswith('vset') else self.KIND_RVV
+            self.kinds[key] = kind
+        return kind
+
+    def kinds_of(self, keys, inverse):
+        """Per-instruction kinds from unique decode keys and their inverse index"""
+        return np.array([self.kind(key) for key in keys.tolist()], dtype=np.int8)[inverse]
+
+    def pop_key_vtypes(self):
+        """(SEW×LMUL, decode key) -> count since the last call"""
+        key_vtypes, self.key_vtypes = self.key_vtypes, defaultdict(int)
+        return key_vtypes
+
+    def update(self, kinds, words, keys, inverse):
+        """
+        Process a chunk: per-instruction kinds (see kinds_of), the vector
+        words, and the unique decode keys with their inverse index
+        """
+        vsets = np.flatnonzero(kinds == self.KIND_VSET)
+        others = np.flatnonzero(kinds == self.KIND_RVV)
+        interval_of = np.searchsorted(vsets, others, side='right')
+        intervals = np.bincount(interval_of, minlength=vsets.size + 1).tolist()
+
+        vtypes = [sew_lmul(self.config)]
+        self._attribute(intervals[0])
+        for word, count in zip(words[vsets].tolist(), intervals[1:]):
+            config, avl = decode_vset(word)
+            self.vset_count += 1
+            if config is not None:
+                self.vset_configs[config] += 1
+            if isinstance(avl, int):
+                self.avl_immediates[avl] += 1
+            if is_redundant_vset(config, avl, self.config, self.avl):
+                self.redundant_vsets += 1
+            self.config, self.avl = config, avl
+            vtypes.append(sew_lmul(config))
+            self._attribute(count)
+
+        # One (interval, key) id per vector instruction, counted in one pass
+        if others.size:
+            pairs, counts = np.unique(interval_of * keys.size + inverse[others], return_counts=True)
+            key_list = keys.tolist()
+            for pair, count in zip(pairs.tolist(), counts.tolist()):
+                interval, key_index = divmod(pair, keys.size)
+                self.key_vtypes[vtypes[interval], key_list[key_index]] += count
+
+    def _attribute(self, count):
+        if count:
+            self.vtype_stats[sew_lmul(self.config)] += count
+
+
+def _sign_extend(values, bits):
+    return values - ((values >> (bits - 1)) & 1) * (1 << bits)
+
+
+def branch_offsets(halfwords, starts, is_32bit, words):
+    """
+    Direct branch/jump offsets (bytes) in a decoded chunk
+
+    Conditional branches, jal with rd=zero (j), c.j, c.beqz and c.bnez;
+    calls are excluded like in arvvi_loops.BRANCH_MNEMONICS.
+
+    Returns:
+        (positions, offsets): halfword index of each branch within the chunk
+        and its signed target offset
+    """
+    words = words.astype(np.int64)
+    opcode = words & 0x7f
+    is_branch = opcode == 0x63
+    is_jump = (opcode == 0x6f) & (((words >> 7) & 0x1f) == 0)
+    b_offset = _sign_extend(((words >> 31) & 1) << 12 | ((words >> 7) & 1) << 11
+                            | ((words >> 25) & 0x3f) << 5 | ((words >> 8) & 0xf) << 1, 13)
+    j_offset = _sign_extend(((words >> 31) & 1) << 20 | ((words >> 12) & 0xff) << 12
+                            | ((words >> 20) & 1) << 11 | ((words >> 21) & 0x3ff) << 1, 21)
+    wide = starts[is_32bit]
+    wide_selected = is_branch | is_jump
+    wide_offsets = np.where(is_branch, b_offset, j_offset)[wide_selected]
+
+    narrow = starts[~is_32bit]
+    parcels = halfwords[narrow].astype(np.int64)
+    quadrant1 = (parcels & 0x3) == 1
+    funct3 = parcels >> 13
+    is_cj = quadrant1 & (funct3 == 0b101)
+    is_cb = quadrant1 & (funct3 >= 0b110)
+    cj_offset = _sign_extend(((parcels >> 12) & 1) << 11 | ((parcels >> 11) & 1) << 4
+                             | ((parcels >> 9) & 3) << 8 | ((parcels >> 8) & 1) << 10
+                             | ((parcels >> 7) & 1) << 6 | ((parcels >> 6) & 1) << 7
+                             | ((parcels >> 3) & 7) << 1 | ((parcels >> 2) & 1) << 5, 12)
+    cb_offset = _sign_extend(((parcels >> 12) & 1) << 8 | ((parcels >> 10) & 3) << 3
+                             | ((parcels >> 5) & 3) << 6 | ((parcels >> 3) & 3) << 1
+                             | ((parcels >> 2) & 1) << 5, 9)
+    narrow_selected = is_cj | is_cb
+    narrow_offsets = np.where(is_cj, cj_offset, cb_offset)[narrow_selected]
+
+    return (np.concatenate([wide[wide_selected], narrow[narrow_selected]]),
+            np.concatenate([wide_offsets, narrow_offsets]))
+
+
+class LoopTracker:
+    """Collect a function's instruction addresses and back edges for arvvi_loops (native engine)"""
+
+    def __init__(self):
+        self.loop_depths = defaultdict(lambda: [0, 0])
+        self.loop_count = 0
+        self.reset()
+
+    def reset(self):
+        """Start of a function"""
+        self.addresses = []
+        self.rvv_addresses = []
+        self.back_edges = {}
+
+    def update(self, base, halfwords, starts, is_32bit, words, rvv_starts):
+        """Process a chunk whose first parcel is at address base"""
+        instruction_starts = starts[halfwords[starts] != 0]
+        if instruction_starts.size == 0:
+            return
+        self.addresses.extend((base + 2 * instruction_starts.astype(np.int64)).tolist())
+        self.rvv_addresses.extend((base + 2 * rvv_starts.astype(np.int64)).tolist())
+
+        positions, offsets = branch_offsets(halfwords, starts, is_32bit, words)
+        backward = offsets <= 0
+        sources = base + 2 * positions[backward].astype(np.int64)
+        first = self.addresses[0]
+        for source, target in zip(sources.tolist(), (sources + offsets[backward]).tolist()):
+            if target >= first and self.back_edges.get(target, -1) < source:
+                self.back_edges[target] = source
+
+    def finish(self):
+        """End of a function: accumulate its counts per loop depth"""
+        self.loop_count += len(self.back_edges)
+        for depth, (total, rvv) in loop_depths(self.addresses, self.rvv_addresses, self.back_edges).items():
+            counts = self.loop_depths[depth]
+            counts[0] += total
+            counts[1] += rvv
+        self.reset()
+
+
+def _count_range(elf, section, start, end, key_counts, vtype=None, loops=None):
+    """
+    Decode a byte range of a section in fixed-size chunks
+
+    Vector decode keys are accumulated into key_counts; the number of
+    (non-padding) instructions is returned. An instruction straddling a chunk
+    boundary is carried over to the next chunk. With a VtypeTracker, vector
+    instructions are also attributed to the active vtype; with a LoopTracker
+    (which needs vtype), instruction addresses and back edges are collected.
+    """
+    total = 0
+    pos = start
+    while pos < end:
+        chunk_end = min(pos + CHUNK_BYTES, end)
+        halfwords = elf.halfwords(section, pos, chunk_end)
+        starts, is_32bit = instruction_starts(halfwords)
+        if starts.size == 0:
+            break
+
+        # All-zero parcels are padding (objdump elides them as "...")
+        total += int(np.count_nonzero(halfwords[starts]))
+
+        wide = starts[is_32bit]
+        words = halfwords[wide].astype(np.uint32) | (halfwords[wide + 1].astype(np.uint32) << 16)
+        keys, vector_words, selected = select_vector(words)
+        if vtype is None:
+            keys, counts = np.unique(keys, return_counts=True)
+        else:
+            keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            kinds = vtype.kinds_of(keys, inverse)
+            vtype.update(kinds, vector_words, keys, inverse)
+            if loops is not None:
+                rvv_starts = wide[selected][kinds != VtypeTracker.KIND_OTHER]
+                loops.update(section.addr + pos, halfwords, starts, is_32bit, words, rvv_starts)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            key_counts[key] += count
+
+        if chunk_end == end:
+            break
+        pos += 2 * (int(starts[-1]) + (2 if is_32bit[-1] else 1))
+    return total
+
+
+def function_segments(elf, section):
+    """
+    Split a section into (start, end, function) byte ranges at symbol addresses
+
+    Like objdump's "<symbol>:" headers, each symbol covers the bytes up to the
+    next symbol in the section; bytes before the first symbol belong to None.
+    Mapping symbols ($x, $d) are ignored. When several symbols share an
+    address, sized symbols win, then the first name in sort order.
+    """
+    index = elf.sections.index(section)
+    starts = {}
+    for symbol in sorted(elf.symbols(), key=lambda s: (s.value, not s.size, s.name)):
+        if symbol.shndx != index or symbol.name.startswith('$'):
+            continue
+        offset = symbol.value - section.addr
+        if 0 <= offset < section.size and offset not in starts:
+            starts[offset] = symbol.name
+
+    segments = []
+    position, function = 0, None
+    for offset in sorted(starts):
+        if offset > position:
+            segments.append((position, offset, function))
+        position, function = offset, starts[offset]
+    if position < section.size:
+        segments.append((position, section.size, function))
+    return segments
+
+
+def key_masked(key, mnemonic):
+    """Whether a decode key's vm=0 means v0.t masking (not carry-in/merge as in vadc.vvm)"""
+    if (key >> 25) & 0x1:
+        return False
+    if (key & 0x7f) == OPCODE_OP_V:
+        return (key >> 12) & 0x7 != OPCFG and not mnemonic.endswith(('vvm', 'vxm', 'vim', 'vfm'))
+    return True
+
+
+def analyze_elf(binary_path, sections=None, functions=None, classifier=None, detailed=False, loops=False,
+                loop_weight=DEFAULT_LOOP_WEIGHT):
+    """
+    Analyze a RISC-V ELF binary without objdump
+
+    Args:
+        binary_path: Path to the ELF file
+        sections: Optional list of section names to analyze (like objdump -j)
+        functions: Optional list of function names, globs or "re:" regexes to analyze
+        classifier: RVVClassifier used to decide which mnemonics count as RVV
+        detailed: Also count full mnemonics and masked forms (detailed_stats)
+        loops: Detect loops and count instructions per nesting depth (loop_stats)
+        loop_weight: Assumed iterations per loop level for the weighted counts
+
+    Returns:
+        Dictionary in the same format as RVVAnalyzer.get_statistics()
+    """
+    from arvvi import FunctionFilter, get_classifier, new_function_stats, new_vtype_instruction_stats, \
+        vtype_instruction_dict
+    if classifier is None:
+        classifier = get_classifier()
+    function_filter = FunctionFilter(functions) if functions else None
+    vtype = VtypeTracker(classifier)
+    loop_tracker = LoopTracker() if loops else None
+    detailed_stats = {}
+
+    instruction_stats = defaultdict(int)
+    section_stats = defaultdict(int)
+    vtype_instruction_stats = new_vtype_instruction_stats()
+    function_stats = {}
+    total_instructions = 0
+    rvv_instructions = 0
+
+    with ElfFile(binary_path) as elf:
+        code_sections = elf.code_sections()
+        if sections:
+            wanted = set(sections)
+            code_sections = [s for s in code_sections if s.name in wanted]
+
+        for section in code_sections:
+            for start, end, function in function_segments(elf, section):
+                if function_filter is not None and (function is None or not function_filter(function)):
+                    continue
+                key_counts = defaultdict(int)
+                vtype.reset()
+                count = _count_range(elf, section, start, end, key_counts, vtype, loop_tracker)
+                if loop_tracker is not None:
+                    loop_tracker.finish()
+                total_instructions += count
+
+                stats = None
+                if function is not None:
+                    stats = function_stats.get(function)
+                    if stats is None:
+                        stats = function_stats[function] = new_function_stats()
+                    stats['total_instructions'] += count
+
+                for key, count in key_counts.items():
+                    mnemonic = decode_vector_key(key)
+                    if mnemonic is None:
+                        continue
+                    instruction = _MNEMONIC_TOKEN_RE.match(mnemonic).group(0)
+                    if classifier.is_rvv(instruction):
+                        instruction_stats[instruction] += count
+                        section_stats[section.name] += count
+                        rvv_instructions += count
+                        if stats is not None:
+                            stats['instruction_stats'][instruction] += count
+                            stats['rvv_instructions'] += count
+                        if detailed:
+                            counter = detailed_stats.setdefault(instruction, {}).setdefault(mnemonic, [0, 0])
+                            counter[key_masked(key, mnemonic)] += count
+
+                for (vtype_name, key), count in vtype.pop_key_vtypes().items():
+                    instruction = _MNEMONIC_TOKEN_RE.match(decode_vector_key(key)).group(0)
+                    vtype_instruction_stats[vtype_name][instruction] += count
+                    if stats is not None:
+                        stats['vtype_instruction_stats'][vtype_name][instruction] += count
+
+    result = {
+        'total_instructions': total_instructions,
+        'rvv_instructions': rvv_instructions,
+        'instruction_stats': dict(instruction_stats),
+        'section_stats': dict(section_stats),
+        'function_stats': {
+            name: dict(stats, instruction_stats=dict(stats['instruction_stats']),
+                       vtype_instruction_stats=vtype_instruction_dict(stats['vtype_instruction_stats']))
+            for name, stats in function_stats.items()
+        },
+        'vtype_stats': dict(vtype.vtype_stats),
+        'vtype_instruction_stats': vtype_instruction_dict(vtype_instruction_stats),
+        'vset_stats': {
+            'total': vtype.vset_count,
+            'redundant': vtype.redundant_vsets,
+            'configs': dict(vtype.vset_configs),
+            'avl_immediates': {str(avl): count for avl, count in vtype.avl_immediates.items()},
+        }
+    }
+    if loops:
+        weighted_total, weighted_rvv = weighted_counts(loop_tracker.loop_depths, loop_weight)
+        result['loop_stats'] = {
+            'loops': loop_tracker.loop_count,
+            'depths': {str(depth): counts for depth, counts in sorted(loop_tracker.loop_depths.items())},
+            'loop_weight': loop_weight,
+            'weighted_instructions': weighted_total,
+            'weighted_rvv_instructions': weighted_rvv,
+        }
+    if detailed:
+        result['detailed_stats'] = {'mnemonics': detailed_stats}
+    return result
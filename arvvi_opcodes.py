@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+ARVVI opcodes - RVV 1.0 encoding tables and operand-form classification
+
+The funct6 tables are used by the native decoder (arvvi_native); the
+operand-form helpers work on objdump-style dotted mnemonics, so the
+objdump parser and the native engine classify instructions identically.
+"""
+
+import re
+
+# funct3 operand categories of OP-V
+OPIVV, OPFVV, OPMVV, OPIVI, OPIVX, OPFVF, OPMVX, OPCFG = range(8)
+
+# funct6 -> name for integer operations (OPIVV/OPIVX/OPIVI)
+OPI_FUNCT6 = {
+    0b000000: 'vadd', 0b000010: 'vsub', 0b000011: 'vrsub',
+    0b000100: 'vminu', 0b000101: 'vmin', 0b000110: 'vmaxu', 0b000111: 'vmax',
+    0b001001: 'vand', 0b001010: 'vor', 0b001011: 'vxor',
+    0b001100: 'vrgather', 0b001110: 'vslideup', 0b001111: 'vslidedown',
+    0b010000: 'vadc', 0b010001: 'vmadc', 0b010010: 'vsbc', 0b010011: 'vmsbc',
+    0b010111: 'vmerge',
+    0b011000: 'vmseq', 0b011001: 'vmsne', 0b011010: 'vmsltu', 0b011011: 'vmslt',
+    0b011100: 'vmsleu', 0b011101: 'vmsle', 0b011110: 'vmsgtu', 0b011111: 'vmsgt',
+    0b100000: 'vsaddu', 0b100001: 'vsadd', 0b100010: 'vssubu', 0b100011: 'vssub',
+    0b100101: 'vsll', 0b100111: 'vsmul',
+    0b101000: 'vsrl', 0b101001: 'vsra', 0b101010: 'vssrl', 0b101011: 'vssra',
+    0b101100: 'vnsrl', 0b101101: 'vnsra', 0b101110: 'vnclipu', 0b101111: 'vnclip',
+    0b110000: 'vwredsumu', 0b110001: 'vwredsum',
+}
+
+# funct6 -> name for integer multiply/mask operations (OPMVV/OPMVX)
+OPM_FUNCT6 = {
+    0b000000: 'vredsum', 0b000001: 'vredand', 0b000010: 'vredor', 0b000011: 'vredxor',
+    0b000100: 'vredminu', 0b000101: 'vredmin', 0b000110: 'vredmaxu', 0b000111: 'vredmax',
+    0b001000: 'vaaddu', 0b001001: 'vaadd', 0b001010: 'vasubu', 0b001011: 'vasub',
+    0b001110: 'vslide1up', 0b001111: 'vslide1down',
+    0b010111: 'vcompress',
+    0b011000: 'vmandn', 0b011001: 'vmand', 0b011010: 'vmor', 0b011011: 'vmxor',
+    0b011100: 'vmorn', 0b011101: 'vmnand', 0b011110: 'vmnor', 0b011111: 'vmxnor',
+    0b100000: 'vdivu', 0b100001: 'vdiv', 0b100010: 'vremu', 0b100011: 'vrem',
+    0b100100: 'vmulhu', 0b100101: 'vmul', 0b100110: 'vmulhsu', 0b100111: 'vmulh',
+    0b101001: 'vmadd', 0b101011: 'vnmsub', 0b101101: 'vmacc', 0b101111: 'vnmsac',
+    0b110000: 'vwaddu', 0b110001: 'vwadd', 0b110010: 'vwsubu', 0b110011: 'vwsub',
+    0b110100: 'vwaddu', 0b110101: 'vwadd', 0b110110: 'vwsubu', 0b110111: 'vwsub',
+    0b111000: 'vwmulu', 0b111010: 'vwmulsu', 0b111011: 'vwmul',
+    0b111100: 'vwmaccu', 0b111101: 'vwmacc', 0b111110: 'vwmaccus', 0b111111: 'vwmaccsu',
+}
+
+# funct6 -> name for floating-point operations (OPFVV/OPFVF)
+OPF_FUNCT6 = {
+    0b000000: 'vfadd', 0b000001: 'vfredusum', 0b000010: 'vfsub', 0b000011: 'vfredosum',
+    0b000100: 'vfmin', 0b000101: 'vfredmin', 0b000110: 'vfmax', 0b000111: 'vfredmax',
+    0b001000: 'vfsgnj', 0b001001: 'vfsgnjn', 0b001010: 'vfsgnjx',
+    0b001110: 'vfslide1up', 0b001111: 'vfslide1down',
+    0b010111: 'vfmerge',
+    0b011000: 'vmfeq', 0b011001: 'vmfle', 0b011011: 'vmflt', 0b011100: 'vmfne',
+    0b011101: 'vmfgt', 0b011111: 'vmfge',
+    0b100000: 'vfdiv', 0b100001: 'vfrdiv', 0b100100: 'vfmul', 0b100111: 'vfrsub',
+    0b101000: 'vfmadd', 0b101001: 'vfnmadd', 0b101010: 'vfmsub', 0b101011: 'vfnmsub',
+    0b101100: 'vfmacc', 0b101101: 'vfnmacc', 0b101110: 'vfmsac', 0b101111: 'vfnmsac',
+    0b110000: 'vfwadd', 0b110001: 'vfwredusum', 0b110010: 'vfwsub', 0b110011: 'vfwredosum',
+    0b110100: 'vfwadd', 0b110110: 'vfwsub', 0b111000: 'vfwmul',
+    0b111100: 'vfwmacc', 0b111101: 'vfwnmacc', 0b111110: 'vfwmsac', 0b111111: 'vfwnmsac',
+}
+
+# Unary groups selected by the vs1 field
+VXUNARY0 = {0b00010: 'vzext.vf8', 0b00011: 'vsext.vf8', 0b00100: 'vzext.vf4',
+            0b00101: 'vsext.vf4', 0b00110: 'vzext.vf2', 0b00111: 'vsext.vf2'}
+VMUNARY0 = {0b00001: 'vmsbf.m', 0b00010: 'vmsof.m', 0b00011: 'vmsif.m',
+            0b10000: 'viota.m', 0b10001: 'vid.v'}
+VWXUNARY0 = {0b00000: 'vmv.x.s', 0b10000: 'vcpop.m', 0b10001: 'vfirst.m'}
+VFUNARY0 = {
+    0b00000: 'vfcvt.xu.f.v', 0b00001: 'vfcvt.x.f.v', 0b00010: 'vfcvt.f.xu.v', 0b00011: 'vfcvt.f.x.v',
+    0b00110: 'vfcvt.rtz.xu.f.v', 0b00111: 'vfcvt.rtz.x.f.v',
+    0b01000: 'vfwcvt.xu.f.v', 0b01001: 'vfwcvt.x.f.v', 0b01010: 'vfwcvt.f.xu.v', 0b01011: 'vfwcvt.f.x.v',
+    0b01100: 'vfwcvt.f.f.v', 0b01110: 'vfwcvt.rtz.xu.f.v', 0b01111: 'vfwcvt.rtz.x.f.v',
+    0b10000: 'vfncvt.xu.f.w', 0b10001: 'vfncvt.x.f.w', 0b10010: 'vfncvt.f.xu.w', 0b10011: 'vfncvt.f.x.w',
+    0b10100: 'vfncvt.f.f.w', 0b10101: 'vfncvt.rod.f.f.w',
+    0b10110: 'vfncvt.rtz.xu.f.w', 0b10111: 'vfncvt.rtz.x.f.w',
+}
+VFUNARY1 = {0b00000: 'vfsqrt.v', 0b00100: 'vfrsqrt7.v', 0b00101: 'vfrec7.v', 0b10000: 'vfclass.v'}
+
+# Operand suffixes per funct3 category
+SUFFIX = {OPIVV: 'vv', OPIVX: 'vx', OPIVI: 'vi', OPMVV: 'vv', OPMVX: 'vx', OPFVV: 'vv', OPFVF: 'vf'}
+
+CATEGORY_NAMES = {
+    OPIVV: 'OPIVV', OPFVV: 'OPFVV', OPMVV: 'OPMVV', OPIVI: 'OPIVI',
+    OPIVX: 'OPIVX', OPFVF: 'OPFVF', OPMVX: 'OPMVX', OPCFG: 'OPCFG',
+}
+
+# Categories for vector loads/stores (LOAD-FP/STORE-FP major opcodes)
+LOAD, STORE = 'LOAD', 'STORE'
+
+_OPM_NAMES = frozenset(OPM_FUNCT6.values())
+_OPF_NAMES = frozenset(OPF_FUNCT6.values())
+
+# Mnemonics whose category does not follow from the base name and suffix
+_SPECIAL_CATEGORIES = {
+    'vsetvli': 'OPCFG', 'vsetivli': 'OPCFG', 'vsetvl': 'OPCFG',
+    'vmv.v.v': 'OPIVV', 'vmv.v.x': 'OPIVX', 'vmv.v.i': 'OPIVI',
+    'vmv.s.x': 'OPMVX', 'vfmv.f.s': 'OPFVV', 'vfmv.s.f': 'OPFVF', 'vfmv.v.f': 'OPFVF',
+    'vrgatherei16.vv': 'OPIVV', 'vcompress.vm': 'OPMVV',
+    # objdump aliases
+    'vneg.v': 'OPIVX', 'vnot.v': 'OPIVI', 'vncvt.x.x.w': 'OPIVX',
+    'vwcvt.x.x.v': 'OPMVX', 'vwcvtu.x.x.v': 'OPMVX',
+    'vmmv.m': 'OPMVV', 'vmnot.m': 'OPMVV', 'vmclr.m': 'OPMVV', 'vmset.m': 'OPMVV',
+    'vfneg.v': 'OPFVV', 'vfabs.v': 'OPFVV',
+    # Pre-1.0 spellings of vcpop.m
+    'vpopc.m': 'OPMVV', 'vmpopc.m': 'OPMVV',
+}
+for _table, _category in ((VXUNARY0, 'OPMVV'), (VMUNARY0, 'OPMVV'), (VWXUNARY0, 'OPMVV'),
+                          (VFUNARY0, 'OPFVV'), (VFUNARY1, 'OPFVV')):
+    for _mnemonic in _table.values():
+        _SPECIAL_CATEGORIES[_mnemonic] = _category
+
+_MEMORY_RE = re.compile(r'v([ls])(?:(?:seg\d)?e\d+(?:ff)?|\dre\d+|\dr|m|s(?:seg\d)?e\d+|[uo]?x(?:seg\d)?ei\d+)\.v$')
+_WHOLE_REGISTER_MOVE_RE = re.compile(r'vmv\dr\.v$')
+
+# Second letter of the operand suffix -> second operand kind
+_OPERAND_KINDS = {'v': 'V', 's': 'V', 'm': 'V', 'x': 'X', 'i': 'I', 'f': 'F'}
+_NARROWING = frozenset(['vnsrl', 'vnsra', 'vnclip', 'vnclipu', 'vncvt'])
+
+
+def operand_category(mnemonic):
+    """
+    funct3 operand category of a dotted mnemonic
+
+    Returns one of 'OPIVV', 'OPIVX', 'OPIVI', 'OPMVV', 'OPMVX', 'OPFVV',
+    'OPFVF', 'OPCFG', 'LOAD', 'STORE', or None if it cannot be determined
+    (e.g. a mnemonic without an operand suffix).
+    """
+    category = _SPECIAL_CATEGORIES.get(mnemonic)
+    if category is not None:
+        return category
+    memory = _MEMORY_RE.match(mnemonic)
+    if memory:
+        return LOAD if memory.group(1) == 'l' else STORE
+    if _WHOLE_REGISTER_MOVE_RE.match(mnemonic):
+        return 'OPIVI'
+
+    base, _, suffix = mnemonic.partition('.')
+    if not suffix:
+        return None
+    kind = _OPERAND_KINDS.get(suffix[1] if len(suffix) > 1 else suffix[0])
+    if base in _OPM_NAMES:
+        category = {'V': 'OPMVV', 'X': 'OPMVX'}.get(kind)
+    elif base in _OPF_NAMES:
+        category = {'V': 'OPFVV', 'F': 'OPFVF'}.get(kind)
+    else:
+        category = {'V': 'OPIVV', 'X': 'OPIVX', 'I': 'OPIVI'}.get(kind)
+    return category
+
+
+def width_class(mnemonic):
+    """'widening', 'narrowing' or None for a dotted mnemonic"""
+    base = mnemonic.partition('.')[0]
+    if base.startswith(('vw', 'vfw')):
+        return 'widening'
+    if base in _NARROWING or base.startswith('vfncvt'):
+        return 'narrowing'
+    return None
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+ARVVI Profile - Per-stage timing and throughput telemetry (--profile)
+
+A Profiler records wall and CPU time per named stage (objdump, parse,
+json_write, ...) and counters (lines, instructions, objdump output size) for
+one model or one run. CPU time includes finished child processes, so an
+objdump run is charged to the stage that waited for it.
+
+When profiling is off the analyzer holds NULL_PROFILER, whose stage() is a
+shared no-op context manager and whose counters are discarded; the parser
+loop itself is never instrumented.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+
+# Stages whose wall time is the denominator of lines/sec and instructions/sec
+ANALYSIS_STAGES = ('objdump', 'parse', 'stream', 'sharded', 'native', 'trace')
+
+
+def cpu_seconds():
+    """User + system CPU time of this process and its waited-for children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (0 where resource is unavailable, e.g. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    # ru_maxrss is in KB on Linux (bytes on macOS)
+    scale = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class Profiler:
+    """Wall/CPU time per stage and counters of one model or run"""
+
+    enabled = True
+
+    def __init__(self, name=None):
+        self.name = name
+        self.stages = {}  # Stage -> [wall seconds, cpu seconds, calls], in first-use order
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the enclosed block as (one more call of) a stage"""
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += cpu_seconds() - cpu
+            totals[2] += 1
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def tap(self, lines):
+        """Pass lines through, counting them and their characters (streamed objdump output)"""
+        count = size = 0
+        try:
+            for line in lines:
+                count += 1
+                size += len(line)
+                yield line
+        finally:
+            self.count('lines', count)
+            self.count('objdump_bytes', size)
+
+    def report(self):
+        """JSON-ready record: stages, counters, throughput and peak RSS"""
+        return build_report(self.name, self.stages, self.counters, peak_rss_mb())
+
+
+class NullProfiler:
+    """Profiler stand-in that records nothing"""
+
+    enabled = False
+    _null = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._null
+
+    def count(self, name, value):
+        pass
+
+    def tap(self, lines):
+        return lines
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def build_report(name, stages, counters, rss_mb):
+    analysis = sum(stages[stage][0] for stage in ANALYSIS_STAGES if stage in stages)
+    report = {
+        'name': name,
+        'wall_seconds': round(sum(wall for wall, _, _ in stages.values()), 6),
+        'cpu_seconds': round(sum(cpu for _, cpu, _ in stages.values()), 6),
+        'stages': {stage: {'wall_seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6), 'calls': calls}
+                   for stage, (wall, cpu, calls) in stages.items()},
+        'counters': dict(counters),
+        'peak_rss_mb': round(rss_mb, 1),
+    }
+    if analysis > 0:
+        for counter in ('lines', 'instructions'):
+            if counter in counters:
+                report[f'{counter}_per_sec'] = round(counters[counter] / analysis, 1)
+    return report
+
+
+def aggregate_reports(reports, name='total', extra=None):
+    """
+    Sum per-model reports (and the run's own stages in extra, a Profiler)
+
+    Stage times and counters add up; peak RSS is the largest seen. With
+    parallel jobs the summed times exceed the run's elapsed time.
+    """
+    stages, counters, rss = {}, {}, 0.0
+    for report in reports:
+        for stage, values in report['stages'].items():
+            totals = stages.setdefault(stage, [0.0, 0.0, 0])
+            totals[0] += values['wall_seconds']
+            totals[1] += values['cpu_seconds']
+            totals[2] += values['calls']
+        for counter, value in report['counters'].items():
+            counters[counter] = counters.get(counter, 0) + value
+        rss = max(rss, report['peak_rss_mb'])
+    if extra is not None:
+        for stage, (wall, cpu, calls) in extra.stages.items():
+            totals = stages.setdefault(stage, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += calls
+        for counter, value in extra.counters.items():
+            counters[counter] = counters.get(counter, 0) + value
+        rss = max(rss, peak_rss_mb())
+    report = build_report(name, stages, counters, rss)
+    report['models'] = len(reports)
+    return report
+
+
+def write_profile(path, reports, summary):
+    """
+    Save profile records: NDJSON (.ndjson/.jsonl, one line per model, then
+    the summary) or one JSON document
+    """
+    with open(path, 'w') as f:
+        if str(path).endswith(('.ndjson', '.jsonl')):
+            for report in reports:
+                f.write(json.dumps(dict(report, type='model'), separators=(',', ':')) + '\n')
+            f.write(json.dumps(dict(summary, type='summary'), separators=(',', ':')) + '\n')
+        else:
+            json.dump({'models': reports, 'summary': summary}, f, indent=2)
+    print(f"Profile saved to: {path}")
+
+
+def print_profile(report):
+    """Print the stage table of a report"""
+    print("\n" + "=" * 60)
+    print(f"Profile - {report['name']}" if report['name'] else "Profile")
+    print("=" * 60)
+    print(f"{'Stage':<16} {'Calls':>7} {'Wall (s)':>11} {'CPU (s)':>11}")
+    print("-" * 60)
+    for stage, values in report['stages'].items():
+        print(f"{stage:<16} {values['calls']:>7} {values['wall_seconds']:>11.3f} {values['cpu_seconds']:>11.3f}")
+    print("-" * 60)
+    counters = report['counters']
+    if 'lines_per_sec' in report:
+        print(f"Lines parsed:        {counters['lines']:,} ({report['lines_per_sec']:,.0f}/sec)")
+    if 'instructions_per_sec' in report:
+        print(f"Instructions:        {counters['instructions']:,} ({report['instructions_per_sec']:,.0f}/sec)")
+    if 'objdump_bytes' in counters:
+        print(f"objdump output:      {counters['objdump_bytes'] / 1e6:,.1f} MB")
+    print(f"Peak RSS:            {report['peak_rss_mb']:,.1f} MB")
+    if 'elapsed_seconds' in report:
+        print(f"Elapsed:             {report['elapsed_seconds']:,.3f} s ({report['models']} model(s))")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+ARVVI Records - Columnar per-instruction store
+
+With --records every parsed instruction is kept as one row of compact
+columns (address, mnemonic, section, function, active SEW×LMUL), the last
+four as ids into interned string tables. The columns are saved as an
+uncompressed .npz next to the _rvv_stats.json, so aggregates and filters
+("which addresses run vfmacc under e32,m4 in matmul kernels?") can be
+recomputed with vectorized NumPy instead of re-running objdump:
+
+    records = InstructionRecords.load('bird_rvv_records.npz')
+    matmul = records.select(functions=['*matmul*'])
+    matmul.statistics()['instruction_stats']
+    records.addresses('vfmacc')
+"""
+
+import fnmatch
+from array import array
+
+import numpy as np
+
+# Column name -> dtype in the .npz
+COLUMNS = {
+    'address': np.uint64,
+    'mnemonic': np.uint32,
+    'section': np.uint32,
+    'function': np.uint32,
+    'vtype': np.uint32,
+}
+TABLES = ('mnemonics', 'sections', 'functions', 'vtypes')
+
+# Function table entry for instructions outside any <symbol>: block
+NO_FUNCTION = ''
+
+
+class RecordWriter:
+    """
+    Accumulates instruction rows while parsing
+
+    Rows are appended to array.array columns (8 + 4×4 bytes per
+    instruction). The section, function and vtype columns repeat the current
+    context, which the parser updates only when it changes.
+    """
+
+    def __init__(self):
+        self.address = array('Q')
+        self.mnemonic = array('I')
+        self.section = array('I')
+        self.function = array('I')
+        self.vtype = array('I')
+        self.tables = {name: [] for name in TABLES}
+        self._ids = {name: {} for name in TABLES}
+        self._context = (0, 0, 0)
+        self.set_context('unknown', None, 'unknown')
+
+    def intern(self, table, name):
+        """Id of name in a string table, adding it on first use"""
+        ids = self._ids[table]
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(self.tables[table])
+            self.tables[table].append(name)
+        return name_id
+
+    def set_context(self, section, function, vtype):
+        """Section, function (None outside symbols) and SEW×LMUL of the following rows"""
+        self._context = (self.intern('sections', section),
+                         self.intern('functions', NO_FUNCTION if function is None else function),
+                         self.intern('vtypes', vtype))
+
+    def add(self, address, mnemonic):
+        mnemonic_id = self._ids['mnemonics'].get(mnemonic)
+        if mnemonic_id is None:
+            mnemonic_id = self.intern('mnemonics', mnemonic)
+        section_id, function_id, vtype_id = self._context
+        self.address.append(address)
+        self.mnemonic.append(mnemonic_id)
+        self.section.append(section_id)
+        self.function.append(function_id)
+        self.vtype.append(vtype_id)
+
+    def __len__(self):
+        return len(self.address)
+
+    def save(self, path, classifier):
+        """Write the columns and string tables as an uncompressed .npz"""
+        arrays = {name: np.frombuffer(getattr(self, name), dtype=dtype) if len(self) else np.zeros(0, dtype)
+                  for name, dtype in COLUMNS.items()}
+        for name in TABLES:
+            arrays[name] = np.array(self.tables[name], dtype=str)
+        arrays['rvv'] = np.array([classifier.is_rvv(m) for m in self.tables['mnemonics']], dtype=bool)
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+
+class InstructionRecords:
+    """Loaded columns with vectorized filters and aggregates"""
+
+    def __init__(self, columns, tables, rvv):
+        self.columns = columns  # name -> array, all of the same length
+        self.tables = tables  # table name -> list of strings
+        self.rvv = rvv  # bool per mnemonic id
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            columns = {name: data[name] for name in COLUMNS}
+            tables = {name: data[name].tolist() for name in TABLES}
+            rvv = data['rvv']
+        return cls(columns, tables, rvv)
+
+    def __len__(self):
+        return len(self.columns['address'])
+
+    def _ids(self, table, patterns):
+        """Table ids whose names match any glob"""
+        return [i for i, name in enumerate(self.tables[table])
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+    def select(self, functions=None, sections=None, mnemonics=None, start=None, stop=None):
+        """
+        Rows matching all given filters (function/section/mnemonic globs and
+        an address range [start, stop)) as a new InstructionRecords
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, table, patterns in (('function', 'functions', functions),
+                                        ('section', 'sections', sections),
+                                        ('mnemonic', 'mnemonics', mnemonics)):
+            if patterns:
+                mask &= np.isin(self.columns[column], self._ids(table, patterns))
+        if start is not None:
+            mask &= self.columns['address'] >= start
+        if stop is not None:
+            mask &= self.columns['address'] < stop
+        return InstructionRecords({name: values[mask] for name, values in self.columns.items()},
+                                  self.tables, self.rvv)
+
+    def addresses(self, mnemonic):
+        """Addresses of all instructions with a mnemonic"""
+        ids = self._ids('mnemonics', [mnemonic])
+        return self.columns['address'][np.isin(self.columns['mnemonic'], ids)]
+
+    def _counts(self, column, table, mask=None):
+        values = self.columns[column] if mask is None else self.columns[column][mask]
+        counts = np.bincount(values, minlength=len(self.tables[table]))
+        names = self.tables[table]
+        return {names[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def statistics(self):
+        """
+        Recompute the counters of RVVAnalyzer.get_statistics()
+
+        Returns total/RVV instruction counts, instruction_stats,
+        section_stats, function_stats, vtype_stats and vtype_instruction_stats.
+        """
+        is_rvv = self.rvv[self.columns['mnemonic']] if len(self.rvv) else np.zeros(len(self), dtype=bool)
+        vset_ids = [i for i, name in enumerate(self.tables['mnemonics']) if name.startswith('vset')]
+        vector = is_rvv & ~np.isin(self.columns['mnemonic'], vset_ids)
+
+        function_stats = {}
+        functions = self.columns['function']
+        totals = np.bincount(functions, minlength=len(self.tables['functions']))
+        rvv_totals = np.bincount(functions[is_rvv], minlength=len(self.tables['functions']))
+        # One stable sort groups the RVV rows by function for the per-function mnemonic counts
+        rvv_functions = functions[is_rvv]
+        rvv_mnemonics = self.columns['mnemonic'][is_rvv]
+        order = np.argsort(rvv_functions, kind='stable')
+        bounds = np.searchsorted(rvv_functions[order], np.arange(len(self.tables['functions']) + 1))
+        mnemonics = self.tables['mnemonics']
+        vtypes = self.tables['vtypes']
+
+        # (function, vtype, mnemonic) counts of the vector instructions in one np.unique
+        vtype_instruction_stats = {}
+        function_vtypes = {}
+        width = max(len(mnemonics), 1)
+        groups = len(vtypes) * width
+        ids = ((self.columns['function'][vector].astype(np.int64) * len(vtypes)
+                + self.columns['vtype'][vector]) * width + self.columns['mnemonic'][vector])
+        ids, counts = np.unique(ids, return_counts=True)
+        for pair, count in zip(ids.tolist(), counts.tolist()):
+            function_id, rest = divmod(pair, groups)
+            vtype_id, mnemonic_id = divmod(rest, width)
+            vtype, mnemonic = vtypes[vtype_id], mnemonics[mnemonic_id]
+            by_vtype = vtype_instruction_stats.setdefault(vtype, {})
+            by_vtype[mnemonic] = by_vtype.get(mnemonic, 0) + count
+            function_vtypes.setdefault(function_id, {}).setdefault(vtype, {})[mnemonic] = count
+
+        for function_id in np.flatnonzero(totals):
+            name = self.tables['functions'][function_id]
+            if name == NO_FUNCTION:
+                continue
+            group = rvv_mnemonics[order[bounds[function_id]:bounds[function_id + 1]]]
+            counts = np.bincount(group, minlength=len(mnemonics))
+            function_stats[name] = {
+                'total_instructions': int(totals[function_id]),
+                'rvv_instructions': int(rvv_totals[function_id]),
+                'instruction_stats': {mnemonics[i]: int(counts[i]) for i in np.flatnonzero(counts)},
+                'vtype_instruction_stats': function_vtypes.get(int(function_id), {}),
+            }
+
+        return {
+            'total_instructions': len(self),
+            'rvv_instructions': int(np.count_nonzero(is_rvv)),
+            'instruction_stats': self._counts('mnemonic', 'mnemonics', is_rvv),
+            'section_stats': self._counts('section', 'sections', is_rvv),
+            'function_stats': function_stats,
+            'vtype_stats': self._counts('vtype', 'vtypes', vector),
+            'vtype_instruction_stats': vtype_instruction_stats,
+        }
+
+
+def records_path(json_path):
+    """Records file next to a statistics JSON (bird_rvv_stats.json -> bird_rvv_records.npz)"""
+    json_path = str(json_path)
+    if json_path.endswith('_rvv_stats.json'):
+        return json_path[:-len('_rvv_stats.json')] + '_rvv_records.npz'
+    base = json_path[:-len('.json')] if json_path.endswith('.json') else json_path
+    return base + '_records.npz'
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+ARVVI Server - Long-running local analysis service
+
+Listens on localhost HTTP and runs analyze, compare and diff jobs posted as
+JSON on a pool of worker processes. Each worker builds the RVV classifier,
+the result cache handle, the objdump version lookups and the cost tables
+once and keeps them for every later job, so a job pays neither interpreter
+startup nor cold tables.
+
+    POST /analyze  {"path": "bird.adx", "sections": [".data"]}
+    POST /compare  {"scan": "models/"}  or  {"files": ["a_rvv_stats.json", ...]}
+    POST /diff     {"baseline": "base/", "candidate": "nightly/"}
+    GET  /status   queue depth, running jobs and throughput counters
+
+Paths are resolved on the server side. Jobs only read files: analyze
+results come back in the response (the client writes any JSON output) and
+objdump is always the one the server was started with, never one named by a
+request. Requests must be sent as Content-Type: application/json, which
+browsers cannot post cross-origin without a preflight. arvvi_client.py posts
+jobs and falls back to running them in-process when no server is listening.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from arvvi_async import AnalysisError, analyze
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+JOB_KINDS = ('analyze', 'compare', 'diff')
+
+# Seconds of completed jobs behind recent_jobs_per_sec
+THROUGHPUT_WINDOW = 60.0
+
+# Options an analyze job may set (see arvvi_async.analyze); objdump_path is
+# deliberately not one of them, jobs use the worker's
+ANALYZE_OPTIONS = ('model', 'sections', 'functions', 'detailed', 'loops', 'loop_weight')
+
+# Per-process state kept warm between jobs (set by init_worker)
+_worker = {'cache': None, 'objdump_path': None, 'cost_models': {}}
+
+
+class JobError(Exception):
+    """A job that cannot run as posted (unknown kind, bad parameters, missing input)"""
+
+
+def init_worker(cache_dir=None, cache_size=None, objdump_path=None):
+    """
+    Prepare a worker process: build the classifier and open the result cache
+
+    Args:
+        cache_size: Result cache size limit in bytes (None = no cache)
+        objdump_path: objdump used by every analyze job (None = the configured default)
+    """
+    from arvvi import get_classifier
+    get_classifier()
+    if cache_size is not None:
+        from arvvi_cache import ResultCache
+        _worker['cache'] = ResultCache(cache_dir, cache_size)
+    _worker['objdump_path'] = objdump_path
+
+
+def _cost_model(params):
+    """CostModel requested by a job's cost / cost_model parameters (loaded once per worker)"""
+    path = params.pop('cost_model', None)
+    if not params.pop('cost', False) and path is None:
+        return None
+    cost_models = _worker['cost_models']
+    if path not in cost_models:
+        from arvvi_cost import CostModel
+        try:
+            cost_models[path] = CostModel.load(path) if path else CostModel()
+        except (OSError, ValueError) as e:
+            raise JobError(f"Cannot load cost model {path}: {e}") from e
+    return cost_models[path]
+
+
+def _pop_required(params, name):
+    value = params.pop(name, None)
+    if value is None:
+        raise JobError(f"missing parameter {name!r}")
+    return value
+
+
+def _check_empty(params):
+    if params:
+        raise JobError(f"unknown parameter(s): {', '.join(sorted(params))}")
+
+
+def analyze_job(params):
+    """Analyze one binary"""
+    path = _pop_required(params, 'path')
+    cost_model = _cost_model(params)
+    options = {name: params.pop(name) for name in ANALYZE_OPTIONS if name in params}
+    _check_empty(params)
+    if _worker['objdump_path']:
+        options['objdump_path'] = _worker['objdump_path']
+
+    result = asyncio.run(analyze(path, cache=_worker['cache'], cost_model=cost_model, **options))
+    return {'model': result.model, 'path': result.path, 'from_cache': result.from_cache,
+            'statistics': result.statistics}
+
+
+def _load_stats(files):
+    from arvvi_compare import load_all_stats
+    stats_dict = load_all_stats(files, progress=False)
+    return {model: data.get('statistics', {}) for model, data in stats_dict.items()}
+
+
+def compare_job(params):
+    """Per-model totals and the most used instructions across models"""
+    from arvvi_compare import find_stats_files
+    from arvvi_matrix import ComparisonMatrix
+    scan = params.pop('scan', None)
+    files = params.pop('files', None)
+    top = params.pop('top', 20)
+    _check_empty(params)
+    if (scan is None) == (files is None):
+        raise JobError("compare needs exactly one of 'scan' or 'files'")
+    if scan is not None:
+        if not os.path.isdir(scan):
+            raise JobError(f"Directory not found: {scan}")
+        files = find_stats_files(scan)
+
+    stats = _load_stats(files)
+    if not stats:
+        raise JobError("No valid statistics files found")
+    matrix = ComparisonMatrix.from_stats(stats)
+    return {
+        'models': [{'model': model, 'total_instructions': int(total), 'rvv_instructions': int(rvv),
+                    'rvv_percent': round(float(percent), 4)}
+                   for model, total, rvv, percent in zip(matrix.models, matrix.total_instructions,
+                                                         matrix.rvv_instructions, matrix.rvv_percent)],
+        'top_instructions': [{'instruction': matrix.instructions[i], 'total': int(matrix.instruction_totals[i]),
+                              'counts': matrix.counts[:, i].tolist()}
+                             for i in matrix.top_instructions(top)],
+    }
+
+
+def diff_job(params):
+    """Baseline vs candidate regression report (arvvi_diff), plus its markdown with markdown=true"""
+    from arvvi_diff import DEFAULT_FUNCTION_MIN_RVV, DEFAULT_FUNCTION_THRESHOLD, DEFAULT_PERCENT_THRESHOLD, \
+        DEFAULT_RELATIVE_THRESHOLD, diff_stats, format_markdown, stats_files
+    baseline = _pop_required(params, 'baseline')
+    candidate = _pop_required(params, 'candidate')
+    thresholds = {
+        'relative_threshold': params.pop('rel_threshold', DEFAULT_RELATIVE_THRESHOLD),
+        'absolute_threshold': params.pop('abs_threshold', None),
+        'percent_threshold': params.pop('percent_threshold', DEFAULT_PERCENT_THRESHOLD),
+        'allow_missing': params.pop('allow_missing', False),
+        # function_threshold=null turns the function gate off
+        'function_threshold': params.pop('function_threshold', DEFAULT_FUNCTION_THRESHOLD),
+        'function_min_rvv': params.pop('function_min_rvv', DEFAULT_FUNCTION_MIN_RVV),
+    }
+    markdown = params.pop('markdown', False)
+    top = params.pop('top', 20)
+    _check_empty(params)
+
+    sides = []
+    for path in (baseline, candidate):
+        if not os.path.exists(path):
+            raise JobError(f"Not found: {path}")
+        try:
+            stats = _load_stats(stats_files(path))
+        except (OSError, UnicodeDecodeError) as e:
+            raise JobError(f"Cannot read manifest {path}: {e}") from e
+        if not stats:
+            raise JobError(f"No valid statistics files found in {path}")
+        sides.append(stats)
+
+    report = {'baseline': baseline, 'candidate': candidate, **diff_stats(*sides, **thresholds)}
+    if markdown:
+        report['markdown'] = format_markdown(report, top)
+    return report
+
+
+JOBS = {'analyze': analyze_job, 'compare': compare_job, 'diff': diff_job}
+
+
+def run_job(kind, params):
+    """
+    Run one job in this process and return its JSON-ready result
+
+    Raises:
+        JobError or arvvi_async.AnalysisError for jobs that cannot run
+    """
+    job = JOBS.get(kind)
+    if job is None:
+        raise JobError(f"unknown job {kind!r} (expected one of {', '.join(JOB_KINDS)})")
+    if not isinstance(params, dict):
+        raise JobError("job parameters must be a JSON object")
+    return job(dict(params))
+
+
+class AnalysisService:
+    """Worker pool with queue depth and throughput counters"""
+
+    def __init__(self, jobs=None, cache_dir=None, cache_size=None, objdump_path=None):
+        self.workers = jobs or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(cache_dir, cache_size, objdump_path))
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counts = {kind: {'completed': 0, 'failed': 0} for kind in JOB_KINDS}
+        self._job_seconds = 0.0
+        self._recent = deque()  # Completion times within THROUGHPUT_WINDOW
+
+    def run(self, kind, params):
+        """Run a job on the pool, blocking the calling (request) thread until it is done"""
+        if kind not in JOBS:
+            raise JobError(f"unknown job {kind!r} (expected one of {', '.join(JOB_KINDS)})")
+        with self._lock:
+            self._in_flight += 1
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = self.executor.submit(run_job, kind, params).result()
+            failed = False
+            return result
+        finally:
+            now = time.time()
+            with self._lock:
+                self._in_flight -= 1
+                self._counts[kind]['failed' if failed else 'completed'] += 1
+                self._job_seconds += time.perf_counter() - start
+                self._recent.append(now)
+                while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW:
+                    self._recent.popleft()
+
+    def status(self):
+        """Queue depth, running jobs and throughput since start and over THROUGHPUT_WINDOW"""
+        now = time.time()
+        with self._lock:
+            done = sum(counts['completed'] + counts['failed'] for counts in self._counts.values())
+            recent = sum(1 for finished in self._recent if finished >= now - THROUGHPUT_WINDOW)
+            uptime = now - self.started
+            return {
+                'uptime_seconds': round(uptime, 3),
+                'workers': self.workers,
+                'running': min(self._in_flight, self.workers),
+                'queue_depth': max(0, self._in_flight - self.workers),
+                'completed': sum(counts['completed'] for counts in self._counts.values()),
+                'failed': sum(counts['failed'] for counts in self._counts.values()),
+                'jobs': {kind: dict(counts) for kind, counts in self._counts.items()},
+                'jobs_per_sec': round(done / uptime, 3) if uptime > 0 else 0.0,
+                'recent_jobs_per_sec': round(recent / min(uptime, THROUGHPUT_WINDOW), 3) if uptime > 0 else 0.0,
+                'mean_job_seconds': round(self._job_seconds / done, 6) if done else None,
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP: POST /<job> runs a job, GET /status reports the counters"""
+
+    server_version = 'ARVVI'
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/status':
+            self._reply(200, self.server.service.status())
+        else:
+            self._reply(404, {'error': f"not found: {self.path}"})
+
+    def do_POST(self):
+        kind = self.path.strip('/')
+        if self.headers.get_content_type() != 'application/json':
+            self._reply(415, {'error': "jobs must be posted as Content-Type: application/json"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            self._reply(400, {'error': f"invalid JSON: {e}"})
+            return
+        if kind not in JOBS:
+            self._reply(404, {'error': f"unknown job {kind!r} (expected one of {', '.join(JOB_KINDS)})"})
+            return
+        try:
+            self._reply(200, self.server.service.run(kind, params))
+        except (JobError, AnalysisError) as e:
+            self._reply(400, {'error': str(e), 'type': type(e).__name__})
+        except Exception as e:
+            self._reply(500, {'error': str(e), 'type': type(e).__name__})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """HTTP server bound to host:port (port 0 picks a free one) that runs jobs on service"""
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='ARVVI Server - Local analysis service with warm worker processes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  Start the service (one worker per CPU):
+    %(prog)s --objdump /opt/riscv/bin/riscv64-elf-objdump
+
+  Post jobs with the client (falls back to in-process analysis without a server):
+    arvvi_client.py analyze models/bird/bird/OUTPUT/bird.adx --section .data -o bird_rvv_stats.json
+    arvvi_client.py status
+        """
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+                        help='Worker processes (0 = one per CPU, default: 0)')
+    parser.add_argument('--objdump', metavar='PATH', help='objdump used by all analyze jobs')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='Result cache directory (default: $ARVVI_CACHE_DIR or ~/.cache/arvvi)')
+    parser.add_argument('--cache-size', type=int, metavar='MB', help='Result cache size limit in MB (default: 512)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the result cache')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 (one per CPU) or a positive number")
+
+    from arvvi_cache import DEFAULT_MAX_BYTES
+    cache_size = None if args.no_cache else (args.cache_size << 20 if args.cache_size else DEFAULT_MAX_BYTES)
+    service = AnalysisService(args.jobs, args.cache_dir, cache_size, args.objdump)
+    try:
+        server = make_server(service, args.host, args.port, args.verbose)
+    except OSError as e:
+        print(f"Error: Cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        service.shutdown()
+        sys.exit(1)
+
+    print(f"ARVVI server listening on http://{args.host}:{server.server_port} ({service.workers} worker(s))")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+ARVVI Similarity - Instruction-mix distances, neighbours and clustering
+
+Each model's instruction_stats row of the ComparisonMatrix is normalized to
+a distribution over mnemonics. Pairwise distances are either cosine
+distance or Jensen-Shannon distance (square root of the JS divergence, base
+2, so both lie in [0, 1]). Cosine distances are one matrix product; JS
+distances are computed one row at a time over that row's non-zero columns.
+
+Clustering is k-medoids on the distance matrix: the medoid of each cluster
+is an actual model, which is the representative to benchmark.
+"""
+
+import numpy as np
+
+METRICS = ('cosine', 'js')
+
+# Rows closer than this have the same instruction mix (rounding error of identical
+# rows is ~1e-16 for cosine and ~1e-8 for JS, whose divergence is square-rooted)
+DUPLICATE_DISTANCE = 1e-6
+
+
+def distributions(counts):
+    """Rows normalized to sum to 1 (rows must be non-zero)"""
+    counts = np.asarray(counts, dtype=np.float64)
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def cosine_distances(p):
+    """Pairwise 1 - cosine similarity"""
+    unit = p / np.linalg.norm(p, axis=1, keepdims=True)
+    distances = 1.0 - unit @ unit.T
+    np.clip(distances, 0.0, 1.0, out=distances)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+def _plogp(x):
+    """x * log2(x) with 0 log 0 = 0"""
+    return x * np.log2(x, out=np.zeros_like(x), where=x > 0)
+
+
+def js_distances(p):
+    """
+    Pairwise Jensen-Shannon distance
+
+    With s = p log2 p, a column where P is zero contributes exactly Q's mass
+    to 2 JS(P, Q), which sums to one minus Q's mass on P's support. So
+
+        JS(P, Q) = 1 + 1/2 * sum over P's support of s(P) + s(Q) - s(P + Q)
+
+    and each row is only compared on its own non-zero columns (instruction
+    mixes are sparse), against the rows after it (the matrix is symmetric).
+    """
+    n = len(p)
+    plogp = _plogp(p)
+    divergence = np.zeros((n, n))
+    for row in range(n - 1):
+        support = np.flatnonzero(p[row])
+        # P + Q > 0 on P's support, so no zero guard is needed for the mixture
+        mixture = p[row + 1:, support] + p[row, support]
+        mixture *= np.log2(mixture)
+        values = 1.0 + 0.5 * (plogp[row].sum() + plogp[row + 1:, support].sum(axis=1) - mixture.sum(axis=1))
+        divergence[row, row + 1:] = values
+        divergence[row + 1:, row] = values
+    np.clip(divergence, 0.0, 1.0, out=divergence)
+    distances = np.sqrt(divergence)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+def pairwise_distances(counts, metric='cosine'):
+    """Distance matrix of the rows of a count matrix"""
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r} (expected one of {', '.join(METRICS)})")
+    p = distributions(counts)
+    return cosine_distances(p) if metric == 'cosine' else js_distances(p)
+
+
+def nearest_neighbours(distances, k=5):
+    """
+    The k nearest other rows of each row, closest first
+
+    Returns:
+        Array (n × min(k, n-1)) of row indices; ties are broken by index
+    """
+    n = len(distances)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    masked = distances.copy()
+    np.fill_diagonal(masked, np.inf)
+    candidates = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    rows = np.arange(n)[:, None]
+    order = np.lexsort((candidates, masked[rows, candidates]))
+    return candidates[rows, order]
+
+
+def kmedoids(distances, clusters, iterations=100):
+    """
+    Partition rows into clusters around medoids (alternating k-medoids)
+
+    Initialization is deterministic: the most central row first, then
+    repeatedly the row farthest from all chosen medoids. Each iteration
+    assigns rows to the nearest medoid and moves every medoid to the member
+    with the smallest total distance to its cluster. When fewer distinct
+    rows than clusters exist, fewer clusters are returned.
+
+    Returns:
+        (labels, medoids): cluster index per row and the medoid row of each
+        cluster
+    """
+    n = len(distances)
+    clusters = max(1, min(clusters, n))
+    medoids = [int(np.argmin(distances.sum(axis=1)))]
+    nearest = distances[medoids[0]].copy()
+    nearest[medoids[0]] = -1
+    while len(medoids) < clusters:
+        candidate = int(np.argmax(nearest))
+        if nearest[candidate] <= DUPLICATE_DISTANCE:
+            # Every remaining row duplicates a medoid
+            break
+        medoids.append(candidate)
+        np.minimum(nearest, distances[candidate], out=nearest)
+        nearest[candidate] = -1
+    medoids = np.array(medoids)
+    clusters = len(medoids)
+
+    for _ in range(iterations):
+        labels = np.argmin(distances[:, medoids], axis=1)
+        labels[medoids] = np.arange(clusters)
+        updated = medoids.copy()
+        for cluster in range(clusters):
+            members = np.flatnonzero(labels == cluster)
+            if not members.size:
+                continue
+            costs = distances[np.ix_(members, members)].sum(axis=1)
+            updated[cluster] = members[np.argmin(costs)]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+    labels = np.argmin(distances[:, medoids], axis=1)
+    labels[medoids] = np.arange(clusters)
+    return labels, medoids
+
+
+def similarity_report(matrix, metric='cosine', neighbours=5, clusters=0):
+    """
+    Neighbours and clusters for the models of a ComparisonMatrix
+
+    Models without RVV instructions have no instruction mix and are listed
+    under 'excluded'.
+    """
+    row_totals = matrix.counts.sum(axis=1)
+    included = np.flatnonzero(row_totals > 0)
+    models = [matrix.models[i] for i in included]
+    report = {
+        'metric': metric,
+        'models': len(models),
+        'excluded': [matrix.models[i] for i in np.flatnonzero(row_totals == 0)],
+        'neighbours': {},
+        'clusters': [],
+    }
+    if not models:
+        return report
+
+    distances = pairwise_distances(matrix.counts[included], metric)
+    for row, nearest in enumerate(nearest_neighbours(distances, neighbours).tolist()):
+        report['neighbours'][models[row]] = [[models[j], round(float(distances[row, j]), 6)] for j in nearest]
+
+    if clusters:
+        labels, medoids = kmedoids(distances, clusters)
+        for cluster, medoid in enumerate(medoids.tolist()):
+            members = np.flatnonzero(labels == cluster)
+            report['clusters'].append({
+                'representative': models[medoid],
+                'members': [models[i] for i in members.tolist()],
+                'mean_distance': round(float(distances[medoid, members].mean()), 6),
+            })
+        report['clusters'].sort(key=lambda cluster: (-len(cluster['members']), cluster['representative']))
+    return report
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+ARVVI Trace - Execution-weighted statistics from simulator traces
+
+A trace is streamed line by line and every retired PC is joined to the
+static disassembly of the same binary, so instruction_stats/section_stats
+count executions instead of occurrences. Supported formats:
+
+    spike   Spike --log-commits logs ("core   0: 3 0x0000000080000000 (0x00000297) x5 ...")
+            or -l instruction logs ("core   0: 0x0000000080000000 (0x00000297) auipc ...");
+            with both enabled only the commit lines are counted
+    qemu    QEMU -d in_asm,exec,nochain logs: "IN:" blocks give the
+            instructions of each translation block, "Trace ...[.../pc/...]"
+            lines count block executions
+
+Files ending in .gz are decompressed on the fly. Memory is bounded by the
+static lookup table (one entry per RVV instruction of the binary) and, for
+QEMU, the translation block table; it does not grow with the trace.
+"""
+
+import contextlib
+import gzip
+import re
+import sys
+from collections import defaultdict
+
+TRACE_FORMATS = ('auto', 'spike', 'qemu')
+
+# Lines inspected to auto-detect the trace format
+DETECT_LINES = 1000
+
+SPIKE_PC_RE = re.compile(r'core\s+\d+:\s+(?:\d\s+)?0x([0-9a-f]+)\s+\(0x[0-9a-f]+\)')
+# Commit lines carry the privilege level before the PC
+SPIKE_COMMIT_RE = re.compile(r'core\s+\d+:\s+\d\s+0x([0-9a-f]+)\s+\(0x[0-9a-f]+\)')
+QEMU_EXEC_RE = re.compile(r'Trace [^\[]*\[(?:[0-9a-f]+/)?([0-9a-f]+)[/\]]')
+QEMU_INSN_RE = re.compile(r'0x([0-9a-f]+):\s')
+
+
+class StaticIndex:
+    """
+    PC -> static RVV instruction lookup built from objdump output
+
+    Without a function filter only RVV instructions are indexed and every
+    retired instruction counts towards the total. With a filter, all
+    instructions of the selected functions are indexed (non-RVV ones as
+    OTHER) and only those count. Each PC maps to a small integer id of a
+    distinct (mnemonic, section) pair, so per-PC memory is one dict entry.
+    """
+
+    OTHER = -1
+
+    def __init__(self, classifier, function_filter=None):
+        self.classifier = classifier
+        self.function_filter = function_filter
+        self.pcs = {}  # address -> id
+        self.kinds = []  # id -> (mnemonic, section)
+        self._kind_ids = {}
+
+    def add_lines(self, lines, instruction_re, section_re, function_re=None):
+        """Index objdump output lines (see RVVAnalyzer.ADDRESSED_INSTRUCTION_RE / SECTION_RE / FUNCTION_RE)"""
+        section = 'unknown'
+        is_rvv = self.classifier.is_rvv
+        keep = self.function_filter
+        selected = keep is None
+        for line in lines:
+            section_match = section_re.match(line)
+            if section_match:
+                section = section_match.group(1)
+                continue
+            match = instruction_re.match(line)
+            if match is None:
+                if keep is not None:
+                    function_match = function_re.match(line.strip())
+                    if function_match:
+                        selected = keep(function_match.group(1))
+                continue
+            if selected:
+                address, _, instruction = match.groups()
+                if is_rvv(instruction):
+                    kind = (instruction, section)
+                    kind_id = self._kind_ids.get(kind)
+                    if kind_id is None:
+                        kind_id = self._kind_ids[kind] = len(self.kinds)
+                        self.kinds.append(kind)
+                    self.pcs[int(address, 16)] = kind_id
+                elif keep is not None:
+                    self.pcs[int(address, 16)] = self.OTHER
+        return self
+
+    def __len__(self):
+        """Number of indexed RVV instructions"""
+        if self.function_filter is None:
+            return len(self.pcs)
+        return sum(1 for kind_id in self.pcs.values() if kind_id != self.OTHER)
+
+
+def open_trace(path):
+    """Open a trace as text ('-' for stdin, gzip by extension or magic bytes)"""
+    if path == '-':
+        # Leave stdin open when the caller's with block exits
+        return contextlib.nullcontext(sys.stdin)
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+    if compressed or str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', errors='replace')
+    return open(path, errors='replace')
+
+
+def detect_format(lines):
+    """Guess the trace format from the first lines; returns 'spike', 'qemu' or None"""
+    for line in lines:
+        if SPIKE_PC_RE.match(line):
+            return 'spike'
+        if line.startswith(('IN:', 'Trace ')):
+            return 'qemu'
+    return None
+
+
+class TraceCounter:
+    """Stream a trace and count executions per static RVV instruction"""
+
+    def __init__(self, index, offset=0):
+        """
+        Args:
+            index: StaticIndex of the binary
+            offset: Load offset subtracted from trace PCs (runtime address -
+                    link-time address, e.g. for IREE modules loaded at runtime)
+        """
+        self.index = index
+        self.offset = offset
+        self.counts = [0] * len(index.kinds)
+        self.retired = 0  # Instructions retired in the trace (in the selected functions)
+        self.lines = 0
+
+    def count_spike(self, lines, pc_re=SPIKE_PC_RE):
+        pcs = self.index.pcs
+        counts = self.counts
+        offset = self.offset
+        match_pc = pc_re.match
+        retired = selected = line_count = 0
+        for line in lines:
+            line_count += 1
+            match = match_pc(line)
+            if match:
+                retired += 1
+                kind_id = pcs.get(int(match.group(1), 16) - offset)
+                if kind_id is not None:
+                    selected += 1
+                    if kind_id >= 0:
+                        counts[kind_id] += 1
+        self.retired += retired if self.index.function_filter is None else selected
+        self.lines += line_count
+
+    def count_qemu(self, lines):
+        """
+        Count QEMU translation block executions
+
+        An "IN:" block lists the guest instructions of one translation
+        block; every "Trace" line for the block's PC executes all of them.
+        Only the RVV ids and the block length are kept per block.
+        """
+        pcs = self.index.pcs
+        offset = self.offset
+        filtered = self.index.function_filter is not None
+        blocks = {}  # block pc -> (instruction count, [RVV ids])
+        executions = defaultdict(int)  # block pc -> times executed
+        block_pc = None
+        block_size = 0
+        block_ids = []
+
+        line_count = 0
+        for line in lines:
+            line_count += 1
+            if line.startswith('IN:'):
+                if block_pc is not None:
+                    blocks[block_pc] = (block_size, block_ids)
+                block_pc, block_size, block_ids = None, 0, []
+                continue
+            match = QEMU_INSN_RE.match(line)
+            if match:
+                pc = int(match.group(1), 16)
+                if block_pc is None:
+                    block_pc = pc
+                kind_id = pcs.get(pc - offset)
+                if not filtered or kind_id is not None:
+                    block_size += 1
+                if kind_id is not None and kind_id >= 0:
+                    block_ids.append(kind_id)
+                continue
+            match = QEMU_EXEC_RE.match(line)
+            if match:
+                if block_pc is not None:
+                    blocks[block_pc] = (block_size, block_ids)
+                    block_pc = None
+                executions[int(match.group(1), 16)] += 1
+        if block_pc is not None:
+            blocks[block_pc] = (block_size, block_ids)
+        self.lines += line_count
+
+        for pc, times in executions.items():
+            size, ids = blocks.get(pc, (0, ()))
+            self.retired += size * times
+            for kind_id in ids:
+                self.counts[kind_id] += times
+
+    def count(self, path, trace_format='auto'):
+        """Stream a trace file; returns the format used"""
+        with open_trace(path) as f:
+            head = []
+            for line in f:
+                head.append(line)
+                if len(head) >= DETECT_LINES:
+                    break
+            if trace_format == 'auto':
+                trace_format = detect_format(head)
+                if trace_format is None:
+                    raise ValueError(f"Unrecognized trace format: {path}")
+
+            lines = _chain(head, f)
+            if trace_format == 'spike':
+                commits = any(SPIKE_COMMIT_RE.match(line) for line in head)
+                self.count_spike(lines, SPIKE_COMMIT_RE if commits else SPIKE_PC_RE)
+            else:
+                self.count_qemu(lines)
+        return trace_format
+
+    def statistics(self):
+        """Execution-weighted statistics in RVVAnalyzer.get_statistics() format"""
+        instruction_stats = defaultdict(int)
+        section_stats = defaultdict(int)
+        for (instruction, section), count in zip(self.index.kinds, self.counts):
+            if count:
+                instruction_stats[instruction] += count
+                section_stats[section] += count
+        return {
+            'total_instructions': self.retired,
+            'rvv_instructions': sum(self.counts),
+            'instruction_stats': dict(instruction_stats),
+            'section_stats': dict(section_stats),
+        }
+
+
+def _chain(head, rest):
+    yield from head
+    yield from rest
@@ -1,17 +1,51 @@
 #!/usr/bin/env python3
 """
 ARVVI Visualizer - Generate charts for RVV instruction statistics
+
+Static charts are drawn with matplotlib, which is imported on first use (an
+ImportError is raised then if it is missing). The HTML report needs only
+the standard library.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib
+import contextlib
+import html
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Use non-interactive backend if no display available
-matplotlib.use('Agg')
+from arvvi_matrix import ComparisonMatrix
+
+# Output formats and resolutions of saved charts
+CHART_FORMATS = ('png', 'svg', 'pdf')
+DEFAULT_DPI = 300
+PREVIEW_DPI = 72  # Fast low-resolution preview (--preview)
+
+
+def _pyplot():
+    """matplotlib.pyplot with the non-interactive Agg backend (no display needed)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
 
+def chart_dpi(dpi=None, preview=False):
+    """Resolution for saved charts: an explicit dpi, else the preview or default one"""
+    if dpi:
+        return dpi
+    return PREVIEW_DPI if preview else DEFAULT_DPI
 
-def visualize_statistics(stats, model_name='Unknown', output_dir='.'):
+
+def save_figure(fig, output_file, dpi=DEFAULT_DPI):
+    """Save a figure and close it, so batch runs do not accumulate open figures"""
+    try:
+        fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    finally:
+        _pyplot().close(fig)
+
+
+def visualize_statistics(stats, model_name='Unknown', output_dir='.', fmt='png', dpi=DEFAULT_DPI):
     """
     Generate visualization charts for RVV instruction statistics
 
@@ -19,12 +53,17 @@ def visualize_statistics(stats, model_name='Unknown', output_dir='.'):
         stats: Dictionary containing statistics from RVVAnalyzer
         model_name: Name of the model being analyzed
         output_dir: Directory to save the charts
+        fmt: Chart file format (see CHART_FORMATS)
+        dpi: Resolution of raster formats
+
+    Returns:
+        List of chart files written
     """
     instruction_stats = stats.get('instruction_stats', {})
 
     if not instruction_stats:
         print("No RVV instructions found to visualize")
-        return
+        return []
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -39,6 +78,7 @@ def visualize_statistics(stats, model_name='Unknown', output_dir='.'):
     instructions, counts = zip(*top_instructions)
 
     # Create figure with subplots
+    plt = _pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     fig.suptitle(f'RVV Instruction Analysis - {model_name}', fontsize=16, fontweight='bold')
 
@@ -89,25 +129,28 @@ def visualize_statistics(stats, model_name='Unknown', output_dir='.'):
     fig.text(0.5, 0.02, stats_text, ha='center', fontsize=10,
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.96])
+    fig.tight_layout(rect=[0, 0.05, 1, 0.96])
 
     # Save the figure
-    output_file = output_path / f'{model_name}_rvv_analysis.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = output_path / f'{model_name}_rvv_analysis.{fmt}'
+    save_figure(fig, output_file, dpi)
     print(f"\nVisualization saved to: {output_file}")
+    written = [str(output_file)]
 
     # Also create a detailed bar chart with all instructions if there are many
     if len(sorted_instructions) > top_n:
-        create_detailed_chart(sorted_instructions, model_name, output_path)
+        written.append(create_detailed_chart(sorted_instructions, model_name, output_path, fmt, dpi))
+    return written
 
 
-def create_detailed_chart(sorted_instructions, model_name, output_path):
-    """Create a detailed chart with all instructions"""
+def create_detailed_chart(sorted_instructions, model_name, output_path, fmt='png', dpi=DEFAULT_DPI):
+    """Create a detailed chart with all instructions and return its path"""
     instructions, counts = zip(*sorted_instructions)
 
     # Calculate figure height based on number of instructions
     fig_height = max(10, len(instructions) * 0.3)
 
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(12, fig_height))
     fig.suptitle(f'Complete RVV Instruction Analysis - {model_name}', fontsize=14, fontweight='bold')
 
@@ -123,20 +166,60 @@ def create_detailed_chart(sorted_instructions, model_name, output_path):
     for i, (bar, count) in enumerate(zip(bars, counts)):
         ax.text(count, i, f' {count}', va='center', fontsize=7)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    output_file = output_path / f'{model_name}_rvv_analysis_detailed.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = output_path / f'{model_name}_rvv_analysis_detailed.{fmt}'
+    save_figure(fig, output_file, dpi)
     print(f"Detailed visualization saved to: {output_file}")
+    return str(output_file)
+
+
+def _render_worker(task):
+    """Process-pool entry point for render_charts (output captured per model)"""
+    stats, model_name, output_dir, fmt, dpi = task
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        written = visualize_statistics(stats, model_name, output_dir, fmt, dpi)
+    return written, output.getvalue()
+
+
+def render_charts(charts, jobs=1, fmt='png', dpi=DEFAULT_DPI):
+    """
+    Render visualize_statistics charts for many models
+
+    With jobs > 1 the charts are drawn in a process pool (rendering is
+    CPU-bound and matplotlib is single-threaded); each model's messages are
+    printed as one block in input order.
+
+    Args:
+        charts: List of (stats, model_name, output_dir) tuples
+
+    Returns:
+        List of the chart files written for each model, in input order
+    """
+    tasks = [(stats, model_name, str(output_dir), fmt, dpi) for stats, model_name, output_dir in charts]
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs == 1:
+        return [visualize_statistics(*task) for task in tasks]
+
+    written = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for files, output in executor.map(_render_worker, tasks):
+            print(output, end='')
+            written.append(files)
+    return written
 
 
-def compare_models(stats_dict, output_dir='.'):
+def compare_models(stats_dict, output_dir='.', matrix=None, fmt='png', dpi=DEFAULT_DPI):
     """
     Compare RVV instruction usage across multiple models
 
     Args:
         stats_dict: Dictionary mapping model names to their statistics
         output_dir: Directory to save the comparison chart
+        matrix: Prebuilt ComparisonMatrix of stats_dict (built if omitted)
+        fmt: Chart file format (see CHART_FORMATS)
+        dpi: Resolution of raster formats
     """
     if len(stats_dict) < 2:
         print("Need at least 2 models for comparison")
@@ -145,33 +228,24 @@ def compare_models(stats_dict, output_dir='.'):
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Collect all unique instructions across all models
-    all_instructions = set()
-    for stats in stats_dict.values():
-        all_instructions.update(stats.get('instruction_stats', {}).keys())
-
-    # Get top instructions across all models
-    instruction_totals = {}
-    for instr in all_instructions:
-        total = sum(stats.get('instruction_stats', {}).get(instr, 0)
-                    for stats in stats_dict.values())
-        instruction_totals[instr] = total
+    if matrix is None:
+        matrix = ComparisonMatrix.from_stats(stats_dict)
 
-    # Sort and take top 15
-    top_instructions = sorted(instruction_totals.items(), key=lambda x: x[1], reverse=True)[:15]
-    top_instr_names = [instr for instr, _ in top_instructions]
+    # Top 15 instructions across all models
+    top_columns = matrix.top_instructions(15)
+    top_instr_names = [matrix.instructions[index] for index in top_columns]
+    top_counts = matrix.counts[:, top_columns]
 
     # Prepare data for grouped bar chart
-    model_names = list(stats_dict.keys())
+    model_names = matrix.models
     x = range(len(top_instr_names))
     width = 0.8 / len(model_names)
 
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(14, 8))
 
     for i, model_name in enumerate(model_names):
-        stats = stats_dict[model_name]
-        instruction_stats = stats.get('instruction_stats', {})
-        counts = [instruction_stats.get(instr, 0) for instr in top_instr_names]
+        counts = top_counts[i].tolist()
 
         offset = (i - len(model_names) / 2) * width + width / 2
         ax.bar([pos + offset for pos in x], counts, width, label=model_name)
@@ -184,14 +258,15 @@ def compare_models(stats_dict, output_dir='.'):
     ax.legend()
     ax.grid(axis='y', alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    output_file = output_path / 'model_comparison.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = output_path / f'model_comparison.{fmt}'
+    save_figure(fig, output_file, dpi)
     print(f"\nModel comparison chart saved to: {output_file}")
 
 
-def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=20):
+def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=20, matrix=None, fmt='png',
+                                             dpi=DEFAULT_DPI):
     """
     Create stacked horizontal bar chart showing instruction usage breakdown by model
 
@@ -199,6 +274,9 @@ def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=2
         stats_dict: Dictionary mapping model names to their statistics
         output_dir: Directory to save the chart
         top_n: Number of top instructions to show (default: 20)
+        matrix: Prebuilt ComparisonMatrix of stats_dict (built if omitted)
+        fmt: Chart file format (see CHART_FORMATS)
+        dpi: Resolution of raster formats
     """
     if len(stats_dict) < 1:
         print("Need at least 1 model for breakdown visualization")
@@ -207,30 +285,21 @@ def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=2
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Collect all unique instructions and calculate totals
-    instruction_totals = {}
-    instruction_by_model = {}  # {instruction: {model: count}}
-
-    for model_name, stats in stats_dict.items():
-        instruction_stats = stats.get('instruction_stats', {})
-        for instr, count in instruction_stats.items():
-            if instr not in instruction_totals:
-                instruction_totals[instr] = 0
-                instruction_by_model[instr] = {}
-            instruction_totals[instr] += count
-            instruction_by_model[instr][model_name] = count
-
-    # Sort by total count and take top N
-    sorted_instructions = sorted(instruction_totals.items(), key=lambda x: x[1], reverse=True)
-    top_instructions = sorted_instructions[:top_n]
+    if matrix is None:
+        matrix = ComparisonMatrix.from_stats(stats_dict)
 
-    # Reverse order so largest is at top
-    top_instructions = list(reversed(top_instructions))
-    top_instr_names = [instr for instr, _ in top_instructions]
-    top_instr_totals = [total for _, total in top_instructions]
+    # Top N instructions, reversed so largest is at top
+    top_columns = list(reversed(matrix.top_instructions(top_n)))
+    if not top_columns:
+        print("No RVV instructions found to visualize")
+        return
+    top_instr_names = [matrix.instructions[index] for index in top_columns]
+    top_instr_totals = matrix.instruction_totals[top_columns].tolist()
+    top_counts = matrix.counts[:, top_columns]
 
     # Prepare data for stacked bar chart
-    model_names = list(stats_dict.keys())
+    model_names = matrix.models
+    plt = _pyplot()
     colors = plt.cm.tab20(range(len(model_names)))
 
     # Create figure with more space for y-axis labels
@@ -240,10 +309,7 @@ def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=2
     left_positions = [0] * len(top_instr_names)
 
     for model_idx, model_name in enumerate(model_names):
-        model_counts = []
-        for instr in top_instr_names:
-            count = instruction_by_model[instr].get(model_name, 0)
-            model_counts.append(count)
+        model_counts = top_counts[model_idx].tolist()
 
         # Only show in legend if this model has non-zero contribution
         if sum(model_counts) > 0:
@@ -282,14 +348,269 @@ def visualize_instruction_breakdown_by_model(stats_dict, output_dir='.', top_n=2
     ax.set_axisbelow(True)
 
     # Adjust layout to prevent label overlap
-    plt.tight_layout(rect=[0, 0, 0.95, 1])
+    fig.tight_layout(rect=[0, 0, 0.95, 1])
 
-    output_file = output_path / 'instruction_breakdown_by_model.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
+    output_file = output_path / f'instruction_breakdown_by_model.{fmt}'
+    save_figure(fig, output_file, dpi)
     print(f"Instruction breakdown chart saved to: {output_file}")
 
 
+def report_data(stats_dict, title='ARVVI Report', max_functions=200):
+    """
+    Compact JSON-ready form of {model: get_statistics() dict} for the HTML report
+
+    Instruction names are interned once; each model stores its counts as a
+    flat [name index, count, ...] list. Only the max_functions most RVV-dense
+    functions of each model are kept.
+    """
+    instructions = {}
+    models = []
+    for model_name, stats in stats_dict.items():
+        counts = []
+        for name, count in stats.get('instruction_stats', {}).items():
+            counts += [instructions.setdefault(name, len(instructions)), count]
+        model = {
+            'name': model_name,
+            'total': stats.get('total_instructions', 0),
+            'rvv': stats.get('rvv_instructions', 0),
+            'instr': counts,
+        }
+        if stats.get('cost_stats'):
+            model['cycles'] = stats['cost_stats']['total_cycles']
+        if stats.get('section_stats'):
+            model['sections'] = sorted(stats['section_stats'].items(), key=lambda item: -item[1])
+        if stats.get('vtype_stats'):
+            model['vtypes'] = sorted(stats['vtype_stats'].items(), key=lambda item: -item[1])
+        functions = stats.get('function_stats')
+        if functions:
+            dense = sorted(functions.items(), key=lambda item: (-item[1]['rvv_instructions'], item[0]))
+            model['functions'] = [[name, function['total_instructions'], function['rvv_instructions']]
+                                  for name, function in dense[:max_functions]]
+            model['functionCount'] = len(functions)
+        models.append(model)
+    return {'title': title, 'instructions': list(instructions), 'models': models}
+
+
+def html_report(stats_dict, title='ARVVI Report', max_functions=200):
+    """Self-contained HTML report (inline data, CSS and JavaScript, no network)"""
+    data = json.dumps(report_data(stats_dict, title, max_functions), separators=(',', ':'))
+    # Keep the embedded JSON from closing the <script> element early
+    data = data.replace('</', '<\\/')
+    return HTML_TEMPLATE.replace('__TITLE__', html.escape(title)).replace('__DATA__', data)
+
+
+def write_html_report(stats_dict, output_file, title='ARVVI Report', max_functions=200):
+    """
+    Write an interactive HTML report for one or many models
+
+    The page has sortable and filterable model and instruction tables and
+    client-side SVG charts; one model's sections, SEW×LMUL and functions are
+    shown when it is selected (single-model reports start selected). Unlike
+    the matplotlib charts it needs no plotting library.
+
+    Returns:
+        Path of the written file
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_report(stats_dict, title, max_functions))
+    print(f"HTML report saved to: {output_file}")
+    return str(output_file)
+
+
+HTML_TEMPLATE = r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>__TITLE__</title>
+<style>
+body { font-family: system-ui, sans-serif; margin: 1.5em; color: #222; }
+h1 { font-size: 1.4em; } h2 { font-size: 1.1em; margin-top: 1.5em; }
+.controls { display: flex; gap: 1.2em; align-items: center; flex-wrap: wrap; margin: 0.8em 0; }
+input[type=search] { padding: 0.3em; width: 18em; }
+input[type=number] { width: 4em; }
+table { border-collapse: collapse; font-size: 0.9em; margin-bottom: 1em; }
+th, td { padding: 0.25em 0.7em; border-bottom: 1px solid #ddd; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+th { cursor: pointer; background: #f3f3f3; user-select: none; white-space: nowrap; }
+th.asc::after { content: " \25B2"; } th.desc::after { content: " \25BC"; }
+tr.selected td { background: #ffe9a8; }
+#models tbody tr { cursor: pointer; }
+.scroll { max-height: 28em; overflow-y: auto; display: inline-block; }
+.panels { display: flex; gap: 2em; flex-wrap: wrap; align-items: flex-start; }
+svg text { font-size: 12px; }
+.muted { color: #777; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div class="controls">
+  <input type="search" id="filter" placeholder="Filter models (substring)">
+  <label>Top <input type="number" id="top" min="1" value="20"> instructions</label>
+  <label><input type="checkbox" id="log"> Log scale</label>
+  <span id="scope" class="muted"></span>
+</div>
+<h2>Top RVV Instructions</h2>
+<div id="chart"></div>
+<div class="panels">
+  <div><h2>Models</h2><div class="scroll" id="models"></div></div>
+  <div><h2>Instructions</h2><div class="scroll" id="instructions"></div></div>
+</div>
+<div id="details"></div>
+<script type="application/json" id="arvvi-data">__DATA__</script>
+<script>
+"use strict";
+const DATA = JSON.parse(document.getElementById("arvvi-data").textContent);
+const NAMES = DATA.instructions;
+const HAS_CYCLES = DATA.models.some(m => m.cycles !== undefined);
+const state = {filter: "", selected: DATA.models.length === 1 ? 0 : null, top: 20, log: false, sort: {}};
+
+const fmt = n => n.toLocaleString("en-US");
+const pct = (a, b) => b > 0 ? a * 100 / b : 0;
+
+function el(tag, text, attrs) {
+  const node = document.createElement(tag);
+  if (text !== undefined) node.textContent = text;
+  Object.assign(node, attrs || {});
+  return node;
+}
+
+// Sortable table: columns are [label, key, formatter]; rows are objects, initially sorted by sortKey (descending)
+function table(container, id, columns, rows, sortKey, onClick) {
+  const sort = state.sort[id] || (state.sort[id] = {key: sortKey, desc: true});
+  rows.sort((a, b) => {
+    const x = a[sort.key], y = b[sort.key];
+    const order = typeof x === "string" ? x.localeCompare(y) : x - y;
+    return sort.desc ? -order : order;
+  });
+  const t = el("table"), head = t.createTHead().insertRow(), body = t.createTBody();
+  for (const [label, key] of columns) {
+    const th = el("th", label);
+    if (key === sort.key) th.className = sort.desc ? "desc" : "asc";
+    th.onclick = () => {
+      state.sort[id] = {key: key, desc: key === sort.key ? !sort.desc : typeof rows[0]?.[key] !== "string"};
+      render();
+    };
+    head.appendChild(th);
+  }
+  for (const row of rows) {
+    const tr = body.insertRow();
+    for (const [, key, format] of columns) tr.insertCell().textContent = format ? format(row[key]) : row[key];
+    if (onClick) { tr.onclick = () => onClick(row); if (row.selected) tr.className = "selected"; }
+  }
+  container.replaceChildren(t);
+}
+
+function visibleModels() {
+  const filter = state.filter.toLowerCase();
+  return DATA.models.map((m, i) => i).filter(i => DATA.models[i].name.toLowerCase().includes(filter));
+}
+
+function instructionTotals(indices) {
+  const totals = new Float64Array(NAMES.length), used = new Uint32Array(NAMES.length);
+  for (const i of indices) {
+    const counts = DATA.models[i].instr;
+    for (let k = 0; k < counts.length; k += 2) { totals[counts[k]] += counts[k + 1]; used[counts[k]]++; }
+  }
+  return {totals, used};
+}
+
+function renderChart(totals) {
+  const order = Array.from(NAMES.keys()).filter(i => totals[i] > 0).sort((a, b) => totals[b] - totals[a]);
+  const top = order.slice(0, state.top);
+  const container = document.getElementById("chart");
+  if (!top.length) { container.replaceChildren(el("p", "No RVV instructions", {className: "muted"})); return; }
+  const scale = v => state.log ? Math.log10(1 + v) : v;
+  const max = scale(totals[top[0]]), barHeight = 18, labelWidth = 110, width = 760;
+  const ns = "http://www.w3.org/2000/svg", svg = document.createElementNS(ns, "svg");
+  svg.setAttribute("width", labelWidth + width + 90);
+  svg.setAttribute("height", top.length * barHeight + 4);
+  top.forEach((i, row) => {
+    const y = row * barHeight + 2, w = max > 0 ? Math.max(1, scale(totals[i]) / max * width) : 1;
+    const label = document.createElementNS(ns, "text");
+    label.setAttribute("x", labelWidth - 6); label.setAttribute("y", y + 13);
+    label.setAttribute("text-anchor", "end"); label.textContent = NAMES[i];
+    const bar = document.createElementNS(ns, "rect");
+    bar.setAttribute("x", labelWidth); bar.setAttribute("y", y);
+    bar.setAttribute("width", w); bar.setAttribute("height", barHeight - 4);
+    bar.setAttribute("fill", `hsl(${210 + row * 130 / top.length}, 60%, 50%)`);
+    const tip = document.createElementNS(ns, "title");
+    tip.textContent = `${NAMES[i]}: ${fmt(totals[i])}`;
+    bar.appendChild(tip);
+    const value = document.createElementNS(ns, "text");
+    value.setAttribute("x", labelWidth + w + 4); value.setAttribute("y", y + 13);
+    value.textContent = fmt(totals[i]);
+    svg.append(label, bar, value);
+  });
+  container.replaceChildren(svg);
+}
+
+function renderDetails(model) {
+  const container = document.getElementById("details");
+  container.replaceChildren();
+  if (!model) return;
+  container.appendChild(el("h2", `${model.name}: ${fmt(model.rvv)} of ${fmt(model.total)} instructions are RVV ` +
+                                 `(${pct(model.rvv, model.total).toFixed(2)}%)`));
+  const panels = el("div", undefined, {className: "panels"});
+  const panel = (heading, id, columns, rows) => {
+    if (!rows) return;
+    const div = el("div"), scroll = el("div", undefined, {className: "scroll"});
+    div.append(el("h2", heading), scroll);
+    panels.appendChild(div);
+    table(scroll, id, columns, rows, "rvv");
+  };
+  panel("Sections", "sections", [["Section", "name"], ["RVV", "rvv", fmt], ["% of RVV", "share", v => v.toFixed(2)]],
+        model.sections && model.sections.map(([name, rvv]) => ({name, rvv, share: pct(rvv, model.rvv)})));
+  panel("SEW×LMUL", "vtypes", [["vtype", "name"], ["RVV", "rvv", fmt]],
+        model.vtypes && model.vtypes.map(([name, rvv]) => ({name, rvv})));
+  const shown = model.functions && model.functions.length < model.functionCount ?
+    ` (top ${model.functions.length} of ${fmt(model.functionCount)})` : "";
+  panel("Functions" + shown, "functions",
+        [["Function", "name"], ["Total", "total", fmt], ["RVV", "rvv", fmt], ["RVV %", "density", v => v.toFixed(2)]],
+        model.functions && model.functions.map(([name, total, rvv]) => ({name, total, rvv, density: pct(rvv, total)})));
+  container.appendChild(panels);
+}
+
+function render() {
+  const visible = visibleModels();
+  const selected = state.selected !== null && visible.includes(state.selected) ? state.selected : null;
+  const scope = selected === null ? visible : [selected];
+  const {totals, used} = instructionTotals(scope);
+  const rvv = scope.reduce((sum, i) => sum + DATA.models[i].rvv, 0);
+  document.getElementById("scope").textContent = selected === null ?
+    `${visible.length} of ${DATA.models.length} model(s)` : `Model: ${DATA.models[selected].name} (click again for all)`;
+
+  renderChart(totals);
+  const modelColumns = [["Model", "name"], ["Total Instr", "total", fmt], ["RVV Instr", "rvv", fmt],
+                        ["RVV %", "percent", v => v.toFixed(2)]];
+  if (HAS_CYCLES) modelColumns.push(["Est. Cycles", "cycles", v => v < 0 ? "-" : fmt(v)]);
+  table(document.getElementById("models"), "models", modelColumns,
+        visible.map(i => {
+          const m = DATA.models[i];
+          return {index: i, name: m.name, total: m.total, rvv: m.rvv, percent: pct(m.rvv, m.total),
+                  cycles: m.cycles === undefined ? -1 : m.cycles, selected: i === selected};
+        }),
+        "rvv", row => { state.selected = row.index === selected ? null : row.index; render(); });
+  table(document.getElementById("instructions"), "instructions",
+        [["Instruction", "name"], ["Count", "count", fmt], ["% of RVV", "share", v => v.toFixed(2)],
+         ["Models", "models", fmt]],
+        Array.from(NAMES.keys()).filter(i => totals[i] > 0).map(i => (
+          {name: NAMES[i], count: totals[i], share: pct(totals[i], rvv), models: used[i]})), "count");
+  renderDetails(selected === null ? null : DATA.models[selected]);
+}
+
+document.getElementById("filter").oninput = e => { state.filter = e.target.value; render(); };
+document.getElementById("top").oninput = e => { state.top = Math.max(1, parseInt(e.target.value) || 1); render(); };
+document.getElementById("log").onchange = e => { state.log = e.target.checked; render(); };
+render();
+</script>
+</body>
+</html>
+"""
+
+
 if __name__ == '__main__':
     # Example usage
     print("This module is meant to be imported by arvvi.py")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+ARVVI vtype - Decode vsetvli/vsetivli/vsetvl configurations
+
+Configurations are written the way objdump prints them, e.g. "e32,m1,ta,ma".
+The SEW×LMUL part ("e32,m1") is what vector instructions are attributed to.
+Both the objdump parser (operand text) and the native engine (encodings)
+produce the same strings.
+"""
+
+SEW_VALUES = ('e8', 'e16', 'e32', 'e64')
+LMUL_VALUES = {0: 'm1', 1: 'm2', 2: 'm4', 3: 'm8', 5: 'mf8', 6: 'mf4', 7: 'mf2'}
+UNKNOWN_VTYPE = 'unknown'
+
+_LMUL_NAMES = frozenset(LMUL_VALUES.values())
+
+
+def vtype_config(sew, lmul='m1', tail='tu', mask='mu'):
+    """Configuration string, e.g. vtype_config('e32', 'm2', 'ta', 'ma') -> 'e32,m2,ta,ma'"""
+    return f'{sew},{lmul},{tail},{mask}'
+
+
+def sew_lmul(config):
+    """SEW×LMUL part of a configuration ('e32,m1,ta,ma' -> 'e32,m1'), or 'unknown'"""
+    if config is None:
+        return UNKNOWN_VTYPE
+    return config.rsplit(',', 2)[0]
+
+
+def parse_vtype(fields):
+    """
+    Parse vtype operand fields such as ['e32', 'm1', 'ta', 'ma']
+
+    LMUL and the policies are optional (m1, tu, mu). Returns None for
+    fields objdump prints as a raw number (reserved encodings).
+    """
+    if not fields or fields[0] not in SEW_VALUES:
+        return None
+    sew, lmul, tail, mask = fields[0], 'm1', 'tu', 'mu'
+    for field in fields[1:]:
+        if field in _LMUL_NAMES:
+            lmul = field
+        elif field in ('ta', 'tu'):
+            tail = field
+        elif field in ('ma', 'mu'):
+            mask = field
+        else:
+            return None
+    return vtype_config(sew, lmul, tail, mask)
+
+
+def _avl(rd, rs1):
+    """AVL form of a register-AVL vsetvl{i}: keep the current VL, VLMAX, or the register"""
+    if rs1 in ('zero', 'x0'):
+        return 'keep' if rd in ('zero', 'x0') else 'vlmax'
+    return rs1
+
+
+def parse_vset(mnemonic, operands):
+    """
+    Decode a vset{i}vl{i} instruction from objdump operand text
+
+    Args:
+        mnemonic: 'vsetvli', 'vsetivli' or 'vsetvl'
+        operands: Operand string, e.g. 't0,a2,e32,m1,ta,ma' (spaces after the
+                  commas, as LLVM prints them, are allowed)
+
+    Returns:
+        (config, avl): configuration string (None if not known statically,
+        e.g. vsetvl) and the AVL: an int for vsetivli, 'keep' for
+        "vsetvli zero,zero", 'vlmax' for rs1=zero, else the register name
+    """
+    fields = [field.strip() for field in operands.split(',')]
+    if len(fields) < 2:
+        return None, None
+    if mnemonic == 'vsetivli':
+        try:
+            avl = int(fields[1], 0)
+        except ValueError:
+            avl = None
+        return parse_vtype(fields[2:]), avl
+    avl = _avl(fields[0], fields[1])
+    if mnemonic == 'vsetvl':
+        return None, avl
+    return parse_vtype(fields[2:]), avl
+
+
+def decode_vtypei(vtypei):
+    """Configuration string for an encoded vtype immediate (None if reserved)"""
+    vlmul = vtypei & 0x7
+    vsew = (vtypei >> 3) & 0x7
+    if vtypei >> 8 or vsew >= len(SEW_VALUES) or vlmul not in LMUL_VALUES:
+        return None
+    return vtype_config(SEW_VALUES[vsew], LMUL_VALUES[vlmul],
+                        'ta' if vtypei & 0x40 else 'tu', 'ma' if vtypei & 0x80 else 'mu')
+
+
+def decode_vset(word):
+    """Decode a vset{i}vl{i} instruction word to (config, avl) like parse_vset()"""
+    rd = (word >> 7) & 0x1f
+    rs1 = (word >> 15) & 0x1f
+    if not word >> 31:
+        # vsetvli: zimm[10:0] in bits 30:20
+        return decode_vtypei((word >> 20) & 0x7ff), _avl(f'x{rd}', f'x{rs1}')
+    if (word >> 30) == 0b11:
+        # vsetivli: zimm[9:0] in bits 29:20, uimm AVL in the rs1 field
+        return decode_vtypei((word >> 20) & 0x3ff), rs1
+    return None, _avl(f'x{rd}', f'x{rs1}')
+
+
+def is_redundant_vset(config, avl, active_config, active_avl):
+    """
+    Whether a vset{i}vl{i} re-establishes the configuration already in effect
+
+    The vtype must be unchanged and the AVL must provably give the same VL:
+    "keep VL" (vsetvli zero,zero), the same immediate, or VLMAX again. A
+    register AVL is never considered redundant since the register may have
+    changed.
+    """
+    if config is None or config != active_config:
+        return False
+    if avl == 'keep':
+        return True
+    if isinstance(avl, int) or avl == 'vlmax':
+        return avl == active_avl
+    return False
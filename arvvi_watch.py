@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+ARVVI Watch - Continuous re-analysis of a models directory (--scan DIR --watch)
+
+The directory is polled with os.stat: models are discovered like --scan, and
+an .adx whose size or mtime changed is re-analyzed once it has been quiet
+for the settle time, so the burst of writes of one build triggers a single
+analysis. An .adx that was rewritten with the same contents (a no-op build)
+is recognized by its SHA-256 and not re-analyzed.
+
+Each update rewrites the model's *_rvv_stats.json and the aggregate
+comparison file. The aggregate is rebuilt from the statistics kept in
+memory, so only the changed models are read or analyzed. It is written
+atomically, so readers never see a partial file.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+from arvvi_cache import HASH_CHUNK_SIZE
+
+DEFAULT_POLL_INTERVAL = 1.0  # Seconds between polls
+DEFAULT_SETTLE = 2.0  # Seconds an .adx must be unchanged before it is analyzed
+DEFAULT_DISCOVER_INTERVAL = 10.0  # Seconds between searches for added or removed models
+DEFAULT_AGGREGATE_NAME = 'rvv_comparison.json'
+
+
+def content_digest(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """(size, mtime) of a file, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def aggregate_json(stats_by_model, json_paths):
+    """Summary of every model plus the instruction totals across them"""
+    from arvvi_matrix import ComparisonMatrix
+    matrix = ComparisonMatrix.from_stats(stats_by_model)
+    return {
+        'models': [{'model': model, 'json_path': json_paths[model], 'total_instructions': int(total),
+                    'rvv_instructions': int(rvv), 'rvv_percent': round(float(percent), 4)}
+                   for model, total, rvv, percent in zip(matrix.models, matrix.total_instructions,
+                                                         matrix.rvv_instructions, matrix.rvv_percent)],
+        'instruction_totals': {matrix.instructions[i]: int(matrix.instruction_totals[i])
+                               for i in matrix.top_instructions(len(matrix.instructions))},
+    }
+
+
+def write_aggregate(path, stats_by_model, json_paths):
+    """
+    Write the comparison of all models: markdown (.md), an interactive
+    HTML report (.html) or a JSON summary (anything else)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    if path.suffix == '.html':
+        from arvvi_visualizer import write_html_report
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_html_report(stats_by_model, tmp_path, title='RVV Instruction Usage Comparison')
+    else:
+        if path.suffix == '.md':
+            from arvvi_compare import print_comparison_markdown
+            text = io.StringIO()
+            with contextlib.redirect_stdout(text):
+                print_comparison_markdown({model: {'model': model, 'statistics': stats}
+                                           for model, stats in stats_by_model.items()})
+            content = text.getvalue()
+        else:
+            content = json.dumps(aggregate_json(stats_by_model, json_paths), indent=2)
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+    os.replace(tmp_path, path)
+
+
+class ModelWatcher:
+    """Discovered models, their last seen .adx state and the statistics of the aggregate"""
+
+    def __init__(self, models_dir, analyzer_options, stream=False, aggregate_path=None, settle=DEFAULT_SETTLE,
+                 discover_interval=DEFAULT_DISCOVER_INTERVAL):
+        self.models_dir = Path(models_dir)
+        self.analyzer_options = analyzer_options
+        self.stream = stream
+        self.aggregate_path = aggregate_path or self.models_dir / DEFAULT_AGGREGATE_NAME
+        self.settle = settle
+        self.discover_interval = discover_interval
+        self.models = {}  # Model -> .adx path, in discovery order
+        self.seen = {}  # Model -> (file signature, time of the last unhandled change or None)
+        self.digests = {}  # Model -> SHA-256 of the analyzed .adx
+        self.stats = {}  # Model -> statistics in the aggregate
+        self.json_paths = {}
+        self._discovered_at = None
+
+    def discover(self, now):
+        """Pick up added models (analyzed once settled) and drop removed ones"""
+        from arvvi import discover_models
+        self._discovered_at = now
+        models = dict(discover_models(self.models_dir))
+        removed = [model for model in self.models if model not in models]
+        for model in removed:
+            for state in (self.seen, self.digests, self.stats, self.json_paths):
+                state.pop(model, None)
+        for model in models:
+            if model not in self.models:
+                self.seen[model] = (None, now)
+        self.models = models
+        return removed
+
+    def start(self, now=None):
+        """Initial pass: analyze every existing model right away and write the aggregate"""
+        now = time.monotonic() if now is None else now
+        self.discover(now)
+        for model in self.models:
+            self.seen[model] = (file_signature(self.models[model]), None)
+            self.refresh(model)
+        self.save_aggregate()
+        return list(self.stats)
+
+    def poll(self, now=None):
+        """
+        One watch step: re-analyze the models whose .adx changed and then
+        stayed unchanged for the settle time
+
+        Returns:
+            Models whose statistics changed (added, updated or removed)
+        """
+        now = time.monotonic() if now is None else now
+        changed = []
+        if self._discovered_at is None or now - self._discovered_at >= self.discover_interval:
+            changed.extend(self.discover(now))
+
+        for model, adx_path in self.models.items():
+            signature = file_signature(adx_path)
+            previous, changed_at = self.seen[model]
+            if signature != previous:
+                # Still being written: restart the settle timer
+                self.seen[model] = (signature, now)
+            elif changed_at is not None and now - changed_at >= self.settle:
+                self.seen[model] = (signature, None)
+                if self.refresh(model):
+                    changed.append(model)
+
+        if changed:
+            self.save_aggregate()
+        return changed
+
+    def refresh(self, model):
+        """Analyze a model if its contents changed; True if its statistics changed"""
+        from arvvi import analyze_model
+        adx_path = self.models[model]
+        if not adx_path.exists():
+            self.digests.pop(model, None)
+            self.json_paths.pop(model, None)
+            return self.stats.pop(model, None) is not None
+        try:
+            digest = content_digest(adx_path)
+        except OSError:
+            return False
+        if digest == self.digests.get(model):
+            return False
+
+        # A failed analysis (e.g. objdump on a half-written binary) returns None; the next change retries
+        result = analyze_model(model, adx_path, self.analyzer_options, stream=self.stream)
+        if result is None:
+            return False
+        self.digests[model] = digest
+        self.stats[model] = result['stats']
+        self.json_paths[model] = result['json_path']
+        return True
+
+    def save_aggregate(self):
+        # Models in discovery order
+        stats = {model: self.stats[model] for model in self.models if model in self.stats}
+        write_aggregate(self.aggregate_path, stats, self.json_paths)
+
+
+def watch_models(models_dir, analyzer_options, stream=False, aggregate_path=None, interval=DEFAULT_POLL_INTERVAL,
+                 settle=DEFAULT_SETTLE):
+    """Analyze the models directory, then keep it up to date until interrupted"""
+    watcher = ModelWatcher(models_dir, analyzer_options, stream, aggregate_path, settle)
+    analyzed = watcher.start()
+    print(f"Analyzed {len(analyzed)} model(s); aggregate: {watcher.aggregate_path}")
+    print(f"Watching {models_dir} for rebuilt .adx files (Ctrl+C to stop)\n")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.poll()
+            if changed:
+                print(f"[{time.strftime('%H:%M:%S')}] Updated {len(changed)} model(s): {', '.join(changed)}\n")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return watcher
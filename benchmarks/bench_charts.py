@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch chart rendering (scan_models --visualize)
+
+Renders the per-model charts of synthetic models through render_charts and
+reports seconds per chart, peak memory of the main process and of the
+rendering workers, and how many figures were left open.
+
+Usage:
+    python benchmarks/bench_charts.py
+    python benchmarks/bench_charts.py --models 200 --jobs 8
+    python benchmarks/bench_charts.py --models 200 --jobs 8 --preview
+    python benchmarks/bench_charts.py --format svg
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib.pyplot as plt  # noqa: E402
+from arvvi_visualizer import CHART_FORMATS, chart_dpi, render_charts  # noqa: E402
+
+MNEMONICS = ['vsetvli', 'vle8', 'vle16', 'vle32', 'vse8', 'vse16', 'vse32', 'vlse32', 'vadd', 'vsub', 'vmul',
+             'vmacc', 'vnmsac', 'vfadd', 'vfmul', 'vfmacc', 'vfredusum', 'vslidedown', 'vslideup', 'vmv',
+             'vmerge', 'vwadd', 'vnsra', 'vmseq', 'vrgather', 'vcompress', 'vredsum', 'vsll', 'vsrl', 'vand']
+
+
+def make_stats(models, instructions, seed=0):
+    rng = random.Random(seed)
+    stats = []
+    for m in range(models):
+        instruction_stats = {name: rng.randint(1, 5000) for name in rng.sample(MNEMONICS, instructions)}
+        rvv = sum(instruction_stats.values())
+        stats.append(({'total_instructions': rvv * 20, 'rvv_instructions': rvv,
+                       'instruction_stats': instruction_stats}, f'model{m:04d}'))
+    return stats
+
+
+def peak_rss_mb(who):
+    # ru_maxrss is in KB on Linux (bytes on macOS)
+    scale = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch chart rendering')
+    parser.add_argument('--models', type=int, default=40, help='Number of models to render')
+    parser.add_argument('--instructions', type=int, default=25,
+                        help='Distinct RVV instructions per model (more than 20 adds the detailed chart)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Rendering processes')
+    parser.add_argument('--format', choices=CHART_FORMATS, default='png', help='Chart format')
+    parser.add_argument('--dpi', type=int, help='Chart resolution (default: 300)')
+    parser.add_argument('--preview', action='store_true', help='Low-resolution preview charts')
+    args = parser.parse_args()
+
+    stats = make_stats(args.models, min(args.instructions, len(MNEMONICS)))
+    dpi = chart_dpi(args.dpi, args.preview)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        charts = [(model_stats, name, os.path.join(tmp_dir, name)) for model_stats, name in stats]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            written = render_charts(charts, args.jobs, args.format, dpi)
+        elapsed = time.perf_counter() - start
+        files = [path for paths in written for path in paths]
+        size = sum(os.path.getsize(path) for path in files)
+
+    print(f"Models rendered:      {args.models} ({args.format}, {dpi} dpi, {args.jobs} job(s))")
+    print(f"Charts written:       {len(files)} ({size / len(files) / 1024:.0f} KB each)")
+    print(f"Total time:           {elapsed:.2f} s")
+    print(f"Seconds per chart:    {elapsed / len(files):.3f} s")
+    print(f"Peak memory (main):   {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB")
+    if args.jobs > 1:
+        print(f"Peak memory (worker): {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB")
+    print(f"Open figures left:    {len(plt.get_fignums())}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
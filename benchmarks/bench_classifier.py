@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: RVV mnemonic classification throughput
+
+Compares the legacy per-line loop over RVV_PATTERNS against the precompiled
+RVVClassifier and reports lines/sec for each.
+
+Usage:
+    python benchmarks/bench_classifier.py
+    python benchmarks/bench_classifier.py --lines 1000000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from arvvi import RVVAnalyzer, RVVClassifier  # noqa: E402
+
+# Mnemonic mix roughly matching an IREE .adx dump (mostly scalar code)
+SCALAR_MNEMONICS = ['addi', 'ld', 'sd', 'lw', 'sw', 'auipc', 'jal', 'beq', 'bne', 'mv', 'slli', 'add']
+RVV_MNEMONICS = ['vsetvli', 'vle32', 'vse32', 'vfmacc', 'vadd', 'vslidedown', 'vnmsac', 'vmv', 'vlse8']
+
+
+def legacy_is_rvv(instruction):
+    """Original classification: try every pattern in turn"""
+    for pattern in RVVAnalyzer.RVV_PATTERNS:
+        if re.match(pattern, instruction, re.IGNORECASE):
+            return True
+    return False
+
+
+def make_mnemonics(count, rvv_ratio, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice(RVV_MNEMONICS) if rng.random() < rvv_ratio else rng.choice(SCALAR_MNEMONICS)
+            for _ in range(count)]
+
+
+def bench(func, mnemonics):
+    start = time.perf_counter()
+    hits = 0
+    for mnemonic in mnemonics:
+        if func(mnemonic):
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return elapsed, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RVV mnemonic classification')
+    parser.add_argument('--lines', type=int, default=200000, help='Number of mnemonics to classify')
+    parser.add_argument('--rvv-ratio', type=float, default=0.05, help='Fraction of RVV mnemonics')
+    args = parser.parse_args()
+
+    mnemonics = make_mnemonics(args.lines, args.rvv_ratio)
+
+    build_start = time.perf_counter()
+    classifier = RVVClassifier(RVVAnalyzer.RVV_PATTERNS)
+    build_time = time.perf_counter() - build_start
+
+    legacy_time, legacy_hits = bench(legacy_is_rvv, mnemonics)
+    fast_time, fast_hits = bench(classifier.is_rvv, mnemonics)
+    assert legacy_hits == fast_hits, f"Mismatch: legacy={legacy_hits} classifier={fast_hits}"
+
+    print(f"Mnemonics classified: {args.lines:,} ({fast_hits:,} RVV)")
+    print(f"Classifier build:     {build_time * 1000:.2f} ms")
+    print(f"Legacy pattern loop:  {args.lines / legacy_time:14,.0f} lines/sec")
+    print(f"RVVClassifier:        {args.lines / fast_time:14,.0f} lines/sec")
+    print(f"Speedup:              {legacy_time / fast_time:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: parsing, classification, JSON save and compare throughput
+
+Generates synthetic objdump -D text (no RISC-V toolchain needed) with a
+configurable size, RVV mix, section layout and function size, and measures:
+
+    classify      RVVClassifier on the corpus mnemonics (cold and memoized)
+    parse_text    RVVAnalyzer.parse_disassembly on an in-memory text
+    parse_stream  RVVAnalyzer.parse_lines on a streamed corpus of --lines lines
+    save_json     RVVAnalyzer.save_json of the parsed statistics
+    compare       arvvi_compare scan + load + matrix + markdown tables
+
+Every stage runs in a fresh process, so its peak RSS is its own. Results are
+written as JSON (-o) and can be appended to an NDJSON history file
+(--history) to track regressions over time.
+
+Large corpora are streamed: each section is a generated block of up to
+--block lines repeated as often as needed (function names repeat between
+repetitions), so 100M lines need no more memory than one block.
+
+Usage:
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --lines 10M --rvv-ratio 0.2 -o results.json
+    python benchmarks/bench_parser.py --lines 100M --stages parse_stream --history bench_history.ndjson
+    python benchmarks/bench_parser.py --sections .text:0.2,.data:0.8 --function-size 500
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from arvvi import RVVAnalyzer, RVVClassifier  # noqa: E402
+
+STAGES = ('classify', 'parse_text', 'parse_stream', 'save_json', 'compare')
+
+# (mnemonic, operands, weight): roughly the mix of an IREE .adx dump
+RVV_MIX = [
+    ('vsetvli', 'zero,a2,e32,m2,ta,ma', 10),
+    ('vsetivli', 'zero,8,e8,mf2,ta,ma', 2),
+    ('vle32.v', 'v8,(a0)', 15),
+    ('vse32.v', 'v8,(a1)', 8),
+    ('vlse8.v', 'v4,(a0),t0', 3),
+    ('vfmacc.vf', 'v8,fa0,v16', 20),
+    ('vfmul.vv', 'v8,v8,v16', 5),
+    ('vadd.vv', 'v8,v8,v12', 5),
+    ('vadd.vi', 'v8,v8,1,v0.t', 2),
+    ('vslidedown.vi', 'v12,v8,1', 6),
+    ('vnmsac.vv', 'v8,v12,v16', 4),
+    ('vmv.v.x', 'v8,zero', 5),
+    ('vredsum.vs', 'v8,v8,v12', 2),
+    ('vwadd.vv', 'v16,v8,v10', 2),
+    ('vnsra.wi', 'v8,v16,0', 2),
+    ('vmseq.vi', 'v0,v8,0', 2),
+]
+SCALAR_MIX = [
+    ('addi', 'sp,sp,-32', 20), ('ld', 'a0,8(sp)', 12), ('sd', 'ra,24(sp)', 10), ('lw', 'a5,0(a0)', 8),
+    ('sw', 'a5,4(a0)', 6), ('auipc', 'a0,0x0', 4), ('jal', 'ra,10000 <_start>', 3), ('beq', 'a0,a1,10010', 4),
+    ('bne', 'a4,a5,10020', 4), ('mv', 'a0,s0', 10), ('slli', 'a5,a5,0x2', 6), ('add', 'a0,a0,a5', 10),
+    ('li', 'a0,0', 5), ('ret', '', 2),
+]
+
+
+def parse_size(value):
+    """'200000', '200K', '10M' or '1G' -> integer"""
+    value = value.strip().upper()
+    scale = {'K': 10 ** 3, 'M': 10 ** 6, 'G': 10 ** 9}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def parse_layout(value):
+    """'.text:0.3,.data:0.7' -> [('.text', 0.3), ('.data', 0.7)] (fractions normalized)"""
+    layout = []
+    for item in value.split(','):
+        name, _, fraction = item.strip().rpartition(':')
+        layout.append((name, float(fraction)))
+    total = sum(fraction for _, fraction in layout)
+    return [(name, fraction / total) for name, fraction in layout]
+
+
+def generate_block(section, lines, rvv_ratio, function_size, rng):
+    """
+    Objdump lines of one section (without its header)
+
+    Returns:
+        (lines, is_instruction, is_rvv) where the two flag lists say which
+        lines are instructions and which of those are RVV
+    """
+    rvv_names, rvv_weights = zip(*[((m, o), w) for m, o, w in RVV_MIX])
+    scalar_names, scalar_weights = zip(*[((m, o), w) for m, o, w in SCALAR_MIX])
+    block, instruction_flags, rvv_flags = [], [], []
+    address = 0x10000 if section == '.text' else 0x100000
+    function = 0
+    remaining = 0
+    while len(block) < lines:
+        if remaining <= 0:
+            # Blank line + symbol header, as objdump prints them
+            block += ['', f'{address:016x} <{section.strip(".")}_func_{function}>:']
+            instruction_flags += [False, False]
+            rvv_flags += [False, False]
+            function += 1
+            remaining = rng.randint(function_size // 2, function_size * 3 // 2)
+            continue
+        rvv = rng.random() < rvv_ratio
+        mnemonic, operands = rng.choices(rvv_names if rvv else scalar_names,
+                                         rvv_weights if rvv else scalar_weights)[0]
+        block.append(f'{address:8x}:\t{rng.getrandbits(32):08x}          \t{mnemonic}\t{operands}')
+        instruction_flags.append(True)
+        rvv_flags.append(rvv)
+        address += 4
+        remaining -= 1
+    return block[:lines], instruction_flags[:lines], rvv_flags[:lines]
+
+
+class SyntheticCorpus:
+    """
+    Iterable synthetic objdump output of (about) a given number of lines
+
+    Each section gets lines proportional to its fraction; its generated
+    block is repeated, and the last repetition truncated, to fill them.
+    expected holds the instruction and RVV counts a parser must find.
+    """
+
+    def __init__(self, lines, rvv_ratio=0.05, layout=(('.text', 0.3), ('.data', 0.7)), function_size=200,
+                 block_lines=200000, seed=0):
+        rng = random.Random(seed)
+        self.sections = []
+        self.expected = {'lines': 3, 'total_instructions': 0, 'rvv_instructions': 0}
+        for name, fraction in layout:
+            section_lines = max(1, round(lines * fraction))
+            block, instruction_flags, rvv_flags = generate_block(
+                name, min(section_lines, block_lines), rvv_ratio, function_size, rng)
+            repeats, rest = divmod(section_lines, len(block))
+            self.sections.append((name, block, repeats, rest))
+            self.expected['lines'] += section_lines + 2
+            self.expected['total_instructions'] += repeats * sum(instruction_flags) + sum(instruction_flags[:rest])
+            self.expected['rvv_instructions'] += repeats * sum(rvv_flags) + sum(rvv_flags[:rest])
+
+    def __iter__(self):
+        yield ''
+        yield 'model.adx:     file format elf64-littleriscv'
+        yield ''
+        for name, block, repeats, rest in self.sections:
+            yield ''
+            yield f'Disassembly of section {name}:'
+            yield from itertools.chain.from_iterable(itertools.repeat(block, repeats))
+            yield from block[:rest]
+
+    def mnemonics(self):
+        """Mnemonics of one repetition of every section block"""
+        return [line.split('\t')[2].split('.')[0] for _, block, _, _ in self.sections
+                for line in block if line.count('\t') >= 2]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on Linux (bytes on macOS)
+    scale = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def make_corpus(config, lines=None):
+    return SyntheticCorpus(lines or config['lines'], config['rvv_ratio'], config['layout'],
+                           config['function_size'], config['block_lines'], config['seed'])
+
+
+def timed(func):
+    cpu, start = time.process_time(), time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start, time.process_time() - cpu
+
+
+def bench_classify(config):
+    mnemonics = make_corpus(config, min(config['lines'], config['block_lines'])).mnemonics()
+    rss = peak_rss_mb()
+    classifier = RVVClassifier(RVVAnalyzer.RVV_PATTERNS)
+    _, cold, _ = timed(lambda: [classifier._classify(m) for m in mnemonics])
+    hits, seconds, cpu = timed(lambda: sum(map(classifier.is_rvv, mnemonics)))
+    return {'mnemonics': len(mnemonics), 'rvv': hits, 'seconds': seconds, 'cpu_seconds': cpu,
+            'mnemonics_per_sec': len(mnemonics) / seconds, 'uncached_mnemonics_per_sec': len(mnemonics) / cold,
+            'setup_rss_mb': rss, 'peak_rss_mb': peak_rss_mb()}
+
+
+def _parse_result(analyzer, corpus, lines, seconds, cpu, rss):
+    assert analyzer.total_instructions == corpus.expected['total_instructions']
+    assert analyzer.rvv_instructions == corpus.expected['rvv_instructions']
+    return {'lines': lines, 'instructions': analyzer.total_instructions, 'rvv_instructions': analyzer.rvv_instructions,
+            'seconds': seconds, 'cpu_seconds': cpu, 'lines_per_sec': lines / seconds,
+            'instructions_per_sec': analyzer.total_instructions / seconds, 'setup_rss_mb': rss,
+            'peak_rss_mb': peak_rss_mb()}
+
+
+def bench_parse_text(config):
+    corpus = make_corpus(config, min(config['lines'], config['text_limit']))
+    text = '\n'.join(corpus)
+    rss = peak_rss_mb()
+    analyzer = RVVAnalyzer()
+    _, seconds, cpu = timed(lambda: analyzer.parse_disassembly(text))
+    result = _parse_result(analyzer, corpus, corpus.expected['lines'], seconds, cpu, rss)
+    result['megabytes'] = round(len(text) / 1e6, 1)
+    return result
+
+
+def bench_parse_stream(config):
+    corpus = make_corpus(config)
+    rss = peak_rss_mb()
+    analyzer = RVVAnalyzer()
+    _, seconds, cpu = timed(lambda: analyzer.parse_lines(corpus))
+    return _parse_result(analyzer, corpus, corpus.expected['lines'], seconds, cpu, rss)
+
+
+def bench_save_json(config):
+    analyzer = RVVAnalyzer()
+    analyzer.parse_lines(make_corpus(config, min(config['lines'], config['block_lines'])))
+    rss = peak_rss_mb()
+    runs = config['save_runs']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench_rvv_stats.json')
+
+        def save():
+            for _ in range(runs):
+                analyzer.save_json(path, 'bench')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, seconds, cpu = timed(save)
+        size = os.path.getsize(path)
+    return {'runs': runs, 'functions': len(analyzer.function_stats), 'bytes': size, 'seconds': seconds,
+            'cpu_seconds': cpu, 'seconds_per_save': seconds / runs, 'megabytes_per_sec': size * runs / 1e6 / seconds,
+            'setup_rss_mb': rss, 'peak_rss_mb': peak_rss_mb()}
+
+
+def bench_compare(config):
+    from arvvi_compare import build_matrix, find_stats_files, load_all_stats, print_comparison
+
+    rng = random.Random(config['seed'])
+    names = [mnemonic.split('.')[0] for mnemonic, _, _ in RVV_MIX] + [f'vext{i}' for i in range(60)]
+    models = config['models']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for m in range(models):
+            instruction_stats = {name: rng.randint(1, 100000) for name in rng.sample(names, rng.randint(5, 40))}
+            rvv = sum(instruction_stats.values())
+            path = os.path.join(tmp_dir, f'model{m}', 'OUTPUT', f'model{m}_rvv_stats.json')
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                json.dump({'model': f'model{m}', 'statistics': {
+                    'total_instructions': rvv * 20, 'rvv_instructions': rvv, 'instruction_stats': instruction_stats}}, f)
+        rss = peak_rss_mb()
+
+        def compare():
+            stats_dict = load_all_stats(find_stats_files(tmp_dir), progress=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                print_comparison(stats_dict, markdown=True, matrix=build_matrix(stats_dict))
+            return stats_dict
+
+        stats_dict, seconds, cpu = timed(compare)
+    assert len(stats_dict) == models
+    return {'models': models, 'seconds': seconds, 'cpu_seconds': cpu, 'models_per_sec': models / seconds,
+            'setup_rss_mb': rss, 'peak_rss_mb': peak_rss_mb()}
+
+
+BENCHMARKS = {
+    'classify': bench_classify,
+    'parse_text': bench_parse_text,
+    'parse_stream': bench_parse_stream,
+    'save_json': bench_save_json,
+    'compare': bench_compare,
+}
+
+
+def run_stage(stage, config):
+    """Run one stage in a fresh process (isolated peak RSS)"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(BENCHMARKS[stage], config).result()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config, stages=STAGES, verbose=True):
+    """Run the selected stages and return the results document"""
+    results = {
+        'suite': 'parser',
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'stages': {},
+    }
+    for stage in stages:
+        result = run_stage(stage, config)
+        results['stages'][stage] = {key: round(value, 4) if isinstance(value, float) else value
+                                    for key, value in result.items()}
+        if verbose:
+            print_stage(stage, result)
+    return results
+
+
+def print_stage(stage, result):
+    rate = next(f"{result[key]:14,.0f} {key.replace('_per_sec', '')}/sec" for key in
+                ('lines_per_sec', 'mnemonics_per_sec', 'megabytes_per_sec', 'models_per_sec') if key in result)
+    print(f"{stage:<14} {result['seconds']:9.3f} s  {rate}  peak RSS {result['peak_rss_mb']:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ARVVI parsing, classification, JSON save and compare')
+    parser.add_argument('--lines', type=parse_size, default=parse_size('1M'),
+                        help='Corpus size in lines for parse_stream, e.g. 1M, 10M, 100M (default: 1M)')
+    parser.add_argument('--rvv-ratio', type=float, default=0.05, help='Fraction of RVV instructions (default: 0.05)')
+    parser.add_argument('--sections', type=parse_layout, default=parse_layout('.text:0.3,.data:0.7'),
+                        metavar='NAME:FRACTION,...', help='Section layout (default: .text:0.3,.data:0.7)')
+    parser.add_argument('--function-size', type=int, default=200,
+                        help='Mean instructions per function (default: 200)')
+    parser.add_argument('--block', type=parse_size, default=parse_size('200K'),
+                        help='Generated lines per section before repeating (default: 200K)')
+    parser.add_argument('--text-limit', type=parse_size, default=parse_size('2M'),
+                        help='Largest corpus parsed as one in-memory text by parse_text (default: 2M)')
+    parser.add_argument('--save-runs', type=int, default=5, help='JSON saves timed by save_json (default: 5)')
+    parser.add_argument('--models', type=int, default=500, help='Models compared by compare (default: 500)')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f'Comma-separated stages to run (default: {",".join(STAGES)})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic corpus')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Write the results as JSON')
+    parser.add_argument('--history', metavar='FILE', help='Append the results as one line to an NDJSON file')
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (expected {', '.join(STAGES)})")
+
+    config = {'lines': args.lines, 'rvv_ratio': args.rvv_ratio, 'layout': args.sections,
+              'function_size': args.function_size, 'block_lines': args.block, 'text_limit': args.text_limit,
+              'save_runs': args.save_runs, 'models': args.models, 'seed': args.seed}
+    print(f"Synthetic corpus: {args.lines:,} lines, {args.rvv_ratio:.0%} RVV, "
+          f"{', '.join(f'{name} {fraction:.0%}' for name, fraction in args.sections)}\n")
+    results = run_suite(config, stages)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(results, separators=(',', ':')) + '\n')
+        print(f"Results appended to: {args.history}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
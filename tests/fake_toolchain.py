@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test helpers: a stand-in for riscv64-elf-objdump
+
+The fake objdump treats the "binary" as a text file that already contains
+objdump -D output and prints (a filtered view of) it, so the objdump code paths can be tested
+without a RISC-V toolchain.
+"""
+
+import os
+import sys
+
+SAMPLE_DISASSEMBLY = """
+model.adx:     file format elf64-littleriscv
+
+
+Disassembly of section .text:
+
+0000000000010000 <_start>:
+   10000:       00000517                auipc   a0,0x0
+   10004:       02010113                addi    sp,sp,32
+
+Disassembly of section .data:
+
+0000000000020000 <vector_code>:
+   20000:       0d007057                vsetvli zero,zero,e32,m2
+   20004:       02050207                vle32.v v4,(a0)
+   20008:       02058287                vle32.v v5,(a1)
+   2000c:       020282d7                vadd.vv v5,v4,v5
+   20010:       02058227                vse32.v v4,(a1)
+"""
+
+# Nested loops: headers at 0x2 (several back edges), 0x6 and 0x22 (self loop)
+LOOP_DISASSEMBLY = """
+Disassembly of section .text:
+
+0000000000000000 <kernel>:
+   0:   4501                    li      a0,0
+   2:   0d0672d7                vsetvli t0,a2,e32,m1,ta,ma
+   6:   02056207                vle32.v v4,(a0)
+   a:   02428257                vadd.vv v4,v4,v5
+   e:   15fd                    addi    a1,a1,-1
+  10:   f9fd                    bnez    a1,6 <kernel+0x6>
+  12:   0205e227                vse32.v v4,(a1)
+  16:   16fd                    addi    a3,a3,-1
+  18:   fed045e3                bgtz    a3,2 <kernel+0x2>
+  1c:   00f70363                beq     a4,a5,22 <kernel+0x22>
+  20:   b7cd                    j       2 <kernel+0x2>
+  22:   c101                    beqz    a0,22 <kernel+0x22>
+  24:   bff9                    j       2 <kernel+0x2>
+  26:   fcb54ee3                blt     a0,a1,2 <kernel+0x2>
+  2a:   8082                    ret
+"""
+
+# Fake objdump: supports -D with -j, --start-address, --stop-address and -h.
+# Set FAKE_OBJDUMP_MISALIGNED=32 to make a range that starts inside an
+# instruction decode a 32-bit bogus instruction there (default: 16-bit).
+FAKE_OBJDUMP = r'''
+import os
+import re
+import sys
+
+args = sys.argv[1:]
+path = args[-1]
+sections = [args[i + 1] for i, arg in enumerate(args) if arg == '-j']
+start, stop = 0, 1 << 64
+for arg in args:
+    if arg.startswith('--start-address='):
+        start = int(arg.split('=', 1)[1], 16)
+    if arg.startswith('--stop-address='):
+        stop = int(arg.split('=', 1)[1], 16)
+
+insn_re = re.compile(r'\s*([0-9a-f]+):\s+([0-9a-f]+)\s+\w+')
+section_re = re.compile(r'Disassembly of section (.+):')
+current = None
+layout = {}
+out = []
+with open(path) as f:
+    for line in f:
+        match = section_re.match(line)
+        if match:
+            current = match.group(1)
+            if not sections or current in sections:
+                out.append(line)
+            continue
+        match = insn_re.match(line)
+        if not match:
+            if not sections or current in sections:
+                out.append(line)
+            continue
+        address, length = int(match.group(1), 16), len(match.group(2)) // 2
+        first, end = layout.get(current, (address, address))
+        layout[current] = (first, address + length)
+        if sections and current not in sections:
+            continue
+        if address < start < address + length:
+            if os.environ.get('FAKE_OBJDUMP_MISALIGNED') == '32':
+                out.append('   %x:\t0000a503          \tlw\ta0,0(ra)\n' % start)
+            else:
+                out.append('   %x:\t0001                \tnop\n' % start)
+        if start <= address < stop:
+            out.append(line)
+
+if '-h' in args:
+    print('Sections:')
+    print('Idx Name          Size      VMA               LMA               File off  Algn')
+    for idx, (name, (first, end)) in enumerate(layout.items()):
+        print('  %d %-13s %08x  %016x  %016x  %08x  2**2' % (idx, name, end - first, first, first, 0x1000))
+        print('                  CONTENTS, ALLOC, LOAD, CODE')
+else:
+    sys.stdout.write(''.join(out))
+'''
+
+
+def write_fake_objdump(directory):
+    """Create an executable fake objdump in directory and return its path"""
+    path = os.path.join(directory, 'objdump')
+    with open(path, 'w') as f:
+        f.write(f'#!{sys.executable}\n' + FAKE_OBJDUMP)
+    os.chmod(path, 0o755)
+    return path
+
+
+def write_model(models_dir, name, disassembly=SAMPLE_DISASSEMBLY):
+    """Create models_dir/<name>/<name>.mlir and the matching OUTPUT/<name>.adx"""
+    model_dir = os.path.join(models_dir, name)
+    output_dir = os.path.join(model_dir, name, 'OUTPUT')
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(model_dir, f'{name}.mlir'), 'w') as f:
+        f.write('module {}\n')
+    adx_path = os.path.join(output_dir, f'{name}.adx')
+    with open(adx_path, 'w') as f:
+        f.write(disassembly)
+    return adx_path
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio library API (arvvi_async)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import tempfile  # noqa: E402
+import threading  # noqa: E402
+import arvvi_async  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_async import (AnalysisError, BinaryNotFoundError, ObjdumpError, ObjdumpNotFoundError,  # noqa: E402
+                         analyze, analyze_many)
+from arvvi_cache import ResultCache  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY, SAMPLE_DISASSEMBLY, write_fake_objdump, write_model  # noqa: E402
+
+
+def test_incremental_parser_matches_parse_lines():
+    """Test that batches split at arbitrary lines give the same statistics as one parse"""
+    text = SAMPLE_DISASSEMBLY + LOOP_DISASSEMBLY
+    expected = RVVAnalyzer(detailed=True, loops=True)
+    expected.parse_disassembly(text)
+
+    lines = text.split('\n')
+    analyzer = RVVAnalyzer(detailed=True, loops=True)
+    parser = analyzer.line_parser()
+    next(parser)
+    for start in range(0, len(lines), 3):
+        parser.send(lines[start:start + 3])
+    try:
+        parser.send(None)
+    except StopIteration:
+        pass
+    assert analyzer.get_statistics() == expected.get_statistics()
+
+    print("✅ Incremental parser test passed")
+
+
+def test_analyze_many():
+    """Test concurrent analysis: results in input order, equal to the blocking analyzer"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        paths = [write_model(tmp_dir, name) for name in ('bird', 'cat', 'dog')]
+        paths.append(write_model(tmp_dir, 'loops', SAMPLE_DISASSEMBLY + LOOP_DISASSEMBLY))
+
+        expected = RVVAnalyzer(objdump_path=fake_objdump, loops=True)
+        expected.analyze(paths[-1])
+
+        # Tiny chunks split lines (and objdump output) at every possible place
+        chunk_size = arvvi_async.STREAM_CHUNK_SIZE
+        arvvi_async.STREAM_CHUNK_SIZE = 7
+        try:
+            results = asyncio.run(analyze_many(paths, concurrency=2, objdump_path=fake_objdump, loops=True))
+        finally:
+            arvvi_async.STREAM_CHUNK_SIZE = chunk_size
+
+        assert [result.model for result in results] == ['bird', 'cat', 'dog', 'loops']
+        assert [result.rvv_instructions for result in results] == [5, 5, 5, 9]
+        assert results[0].total_instructions == 7 and results[0].instruction_stats['vle32'] == 2
+        assert results[-1].statistics == expected.get_statistics() and not results[-1].from_cache
+
+        # Named pairs, .data only, saved in the *_rvv_stats.json format
+        result, = asyncio.run(analyze_many([('Bird', paths[0])], objdump_path=fake_objdump, sections=['.data']))
+        assert result.model == 'Bird' and result.total_instructions == 5 and result.rvv_percentage == 100.0
+        json_path = os.path.join(tmp_dir, 'Bird_rvv_stats.json')
+        result.save_json(json_path)
+        with open(json_path) as f:
+            assert json.load(f) == {'model': 'Bird', 'statistics': result.statistics}
+
+        # The second run of an unchanged binary comes from the result cache
+        cache = ResultCache(os.path.join(tmp_dir, 'cache'))
+        first = asyncio.run(analyze(paths[0], objdump_path=fake_objdump, cache=cache))
+        second = asyncio.run(analyze(paths[0], objdump_path=fake_objdump, cache=cache))
+        assert not first.from_cache and second.from_cache
+        assert second.statistics == first.statistics
+
+        # Hashing the binary for the cache key does not run on the event loop's thread
+        hashing_threads = []
+        file_digest = cache.file_digest
+        cache.file_digest = lambda path: hashing_threads.append(threading.get_ident()) or file_digest(path)
+        asyncio.run(analyze(paths[1], objdump_path=fake_objdump, cache=cache))
+        assert hashing_threads and threading.get_ident() not in hashing_threads
+
+    print("✅ analyze_many test passed")
+
+
+def test_analysis_errors():
+    """Test that failures raise AnalysisError subclasses instead of exiting"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        path = write_model(tmp_dir, 'bird')
+        failing_objdump = os.path.join(tmp_dir, 'failing-objdump')
+        with open(failing_objdump, 'w') as f:
+            f.write(f"#!{sys.executable}\nimport sys\nsys.stderr.write('bad ELF\\n')\nsys.exit(2)\n")
+        os.chmod(failing_objdump, 0o755)
+
+        def raises(coroutine, error):
+            try:
+                asyncio.run(coroutine)
+            except error as e:
+                return e
+            raise AssertionError(f"{error.__name__} not raised")
+
+        raises(analyze(os.path.join(tmp_dir, 'missing.adx'), objdump_path=fake_objdump), BinaryNotFoundError)
+        raises(analyze(path, objdump_path=os.path.join(tmp_dir, 'no-objdump')), ObjdumpNotFoundError)
+        error = raises(analyze(path, objdump_path=failing_objdump), ObjdumpError)
+        assert error.returncode == 2 and 'bad ELF' in error.stderr and isinstance(error, AnalysisError)
+
+        # With return_exceptions the failed analysis is returned in its place
+        results = asyncio.run(analyze_many([path, os.path.join(tmp_dir, 'missing.adx'), path],
+                                           objdump_path=fake_objdump, return_exceptions=True))
+        assert results[0].rvv_instructions == 5 and results[2].rvv_instructions == 5
+        assert isinstance(results[1], BinaryNotFoundError)
+        raises(analyze_many([path, os.path.join(tmp_dir, 'missing.adx')], objdump_path=fake_objdump),
+               BinaryNotFoundError)
+
+    print("✅ Analysis error test passed")
+
+
+if __name__ == '__main__':
+    test_incremental_parser_matches_parse_lines()
+    test_analyze_many()
+    test_analysis_errors()
+    print("\n✨ All async API tests passed!")
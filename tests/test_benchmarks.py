@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the synthetic-corpus benchmark suite (benchmarks/bench_parser.py)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi and the benchmarks
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import json  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from bench_parser import STAGES, SyntheticCorpus, parse_layout, parse_size, run_suite  # noqa: E402
+
+
+def test_synthetic_corpus():
+    """Test that the generated objdump text parses to the counts the generator expects"""
+    assert parse_size('200K') == 200000 and parse_size('1.5M') == 1500000 and parse_size('42') == 42
+    assert parse_layout('.text:1,.data:3') == [('.text', 0.25), ('.data', 0.75)]
+
+    # Blocks smaller than the sections, so repetition and truncation are exercised
+    corpus = SyntheticCorpus(25000, rvv_ratio=0.3, layout=parse_layout('.text:1,.data:3'), function_size=50,
+                             block_lines=4000, seed=3)
+    lines = list(corpus)
+    assert len(lines) == corpus.expected['lines']
+
+    analyzer = RVVAnalyzer()
+    analyzer.parse_disassembly('\n'.join(lines))
+    assert analyzer.total_instructions == corpus.expected['total_instructions']
+    assert analyzer.rvv_instructions == corpus.expected['rvv_instructions']
+    assert 0.25 < analyzer.rvv_instructions / analyzer.total_instructions < 0.35
+    assert set(analyzer.section_stats) == {'.text', '.data'}
+    assert analyzer.section_stats['.data'] > 2 * analyzer.section_stats['.text']
+    assert 0 < len(analyzer.function_stats) <= 2 * 4000 // 25
+    assert analyzer.vtype_stats['e32,m2'] > analyzer.vtype_stats['e8,mf2'] > 0
+
+    print("✅ Synthetic corpus test passed")
+
+
+def test_run_suite():
+    """Test that every stage runs and reports JSON-serializable throughput and memory"""
+    config = {'lines': 20000, 'rvv_ratio': 0.05, 'layout': parse_layout('.text:0.3,.data:0.7'),
+              'function_size': 200, 'block_lines': 5000, 'text_limit': 10000, 'save_runs': 2, 'models': 20,
+              'seed': 0}
+    results = run_suite(config, STAGES, verbose=False)
+    json.dumps(results)
+    assert list(results['stages']) == list(STAGES)
+    assert results['stages']['parse_stream']['lines'] == SyntheticCorpus(
+        20000, block_lines=5000).expected['lines']
+    assert results['stages']['parse_text']['lines'] < results['stages']['parse_stream']['lines']
+    assert results['stages']['compare']['models'] == 20
+    for stage in results['stages'].values():
+        assert stage['seconds'] > 0 and stage['peak_rss_mb'] > 0
+
+    print("✅ Benchmark suite test passed")
+
+
+if __name__ == '__main__':
+    test_synthetic_corpus()
+    test_run_suite()
+    print("\n✨ All benchmark suite tests passed!")
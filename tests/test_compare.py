@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the arvvi_compare comparison matrix
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi_compare import build_matrix, find_stats_files, load_all_stats, print_comparison  # noqa: E402
+
+
+def make_stats_dict(models=50, instructions=40, seed=1):
+    rng = random.Random(seed)
+    names = [f'v{i:02d}' for i in range(instructions)]
+    stats_dict = {}
+    for m in range(models):
+        instruction_stats = {name: rng.randint(1, 1000) for name in rng.sample(names, rng.randint(0, instructions))}
+        rvv = sum(instruction_stats.values())
+        stats_dict[f'model{m}'] = {'model': f'model{m}', 'statistics': {
+            'total_instructions': rvv * 3,
+            'rvv_instructions': rvv,
+            'instruction_stats': instruction_stats,
+        }}
+    return stats_dict
+
+
+def test_matrix_matches_per_model_counts():
+    """Test that the matrix, totals and top-K agree with the per-model dictionaries"""
+    stats_dict = make_stats_dict()
+    matrix = build_matrix(stats_dict)
+    assert matrix.models == list(stats_dict)
+
+    expected_totals = {}
+    for data in stats_dict.values():
+        for name, count in data['statistics']['instruction_stats'].items():
+            expected_totals[name] = expected_totals.get(name, 0) + count
+    for row, data in enumerate(stats_dict.values()):
+        instruction_stats = data['statistics']['instruction_stats']
+        for name in expected_totals:
+            assert matrix.column(name)[row] == instruction_stats.get(name, 0)
+
+    expected_top = sorted(expected_totals, key=lambda name: (-expected_totals[name], name))
+    for k in (1, 5, 20, 40, 100):
+        top = [matrix.instructions[i] for i in matrix.top_instructions(k)]
+        assert top == expected_top[:k]
+    assert matrix.rvv_percent.round(6).tolist() == [33.333333 if data['statistics']['total_instructions'] else 0
+                                                    for data in stats_dict.values()]
+    assert matrix.column('vmissing').tolist() == [0] * len(stats_dict)
+
+    print("✅ Comparison matrix test passed")
+
+
+def test_top_instructions_tied_at_k():
+    """Test that instructions tied at the k-th total are chosen by name"""
+    # Many ties at the boundary, in an order where name order differs from column order
+    counts = {'vz': 9, **{f'v{i:02d}': 5 for i in range(40, 0, -1)}, 'va': 1}
+    matrix = build_matrix({'m': {'model': 'm', 'statistics': {
+        'total_instructions': 1000, 'rvv_instructions': sum(counts.values()), 'instruction_stats': counts}}})
+    for k in (1, 2, 3, 17, 41, 42):
+        top = [matrix.instructions[i] for i in matrix.top_instructions(k)]
+        assert top == sorted(counts, key=lambda name: (-counts[name], name))[:k], (k, top)
+
+    print("✅ Top-K tie test passed")
+
+
+def test_comparison_tables():
+    """Test the text and markdown tables rendered from the matrix"""
+    stats_dict = {
+        'a': {'statistics': {'total_instructions': 10, 'rvv_instructions': 4,
+                             'instruction_stats': {'vadd': 3, 'vle32': 1}}},
+        'b': {'statistics': {'total_instructions': 0, 'rvv_instructions': 0, 'instruction_stats': {}}},
+        'c': {'statistics': {'total_instructions': 8, 'rvv_instructions': 6,
+                             'instruction_stats': {'vle32': 5, 'vfmacc': 1}}},
+    }
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print_comparison(stats_dict, markdown=True, top_n=2)
+    text = output.getvalue()
+    assert '| a | 10 | 4 | 40.00% |' in text
+    assert '| b | 0 | 0 | 0.00% |' in text
+    assert '| **vle32** | **6** | 1 | - | 5 |' in text
+    assert '| **vadd** | **3** | 3 | - | - |' in text
+    assert 'vfmacc' not in text.split('### Top 2')[1]
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print_comparison(stats_dict)
+    rows = [line.split() for line in output.getvalue().splitlines()]
+    assert ['vle32', '6', '1', '0', '5'] in rows
+    assert ['c', '8', '6', '75.00'] in rows
+
+    print("✅ Comparison table test passed")
+
+
+def test_scan_and_concurrent_load():
+    """Test the pruned directory walk and deterministic concurrent loading"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        layout = {
+            'zoo/b/OUTPUT/b_rvv_stats.json': 'b',
+            'zoo/a/OUTPUT/a_rvv_stats.json': 'shared',
+            'zoo/c/OUTPUT/c_rvv_stats.json': 'shared',
+            'zoo/c/OUTPUT/notes.json': 'ignored',
+            'zoo/.git/x_rvv_stats.json': 'hidden',
+            'zoo/__pycache__/y_rvv_stats.json': 'pruned',
+        }
+        for relative, model in layout.items():
+            path = os.path.join(tmp_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({'model': model, 'statistics': {'instruction_stats': {}}}, f)
+        with open(os.path.join(tmp_dir, 'zoo', 'b', 'OUTPUT', 'broken_rvv_stats.json'), 'w') as f:
+            f.write('{')
+        os.symlink(os.path.join(tmp_dir, 'zoo', 'a'), os.path.join(tmp_dir, 'zoo', 'link'))
+
+        root = os.path.join(tmp_dir, 'zoo')
+        files = find_stats_files(root)
+        assert [os.path.relpath(f, root) for f in files] == [
+            'a/OUTPUT/a_rvv_stats.json', 'b/OUTPUT/b_rvv_stats.json',
+            'b/OUTPUT/broken_rvv_stats.json', 'c/OUTPUT/c_rvv_stats.json']
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            stats_dict = load_all_stats(files + [os.path.join(root, 'missing_rvv_stats.json')], jobs=4)
+        assert list(stats_dict) == ['shared', 'b', 'shared (2)']
+        assert stats_dict['shared (2)']['model'] == 'shared'
+        assert "renamed to 'shared (2)'" in stderr.getvalue()
+        assert 'File not found' in stderr.getvalue()
+
+    print("✅ Scan and concurrent load test passed")
+
+
+if __name__ == '__main__':
+    test_matrix_matches_per_model_counts()
+    test_top_instructions_tied_at_k()
+    test_comparison_tables()
+    test_scan_and_concurrent_load()
+    print("\n✨ All comparison tests passed!")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the static cycle-cost model (--cost)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_compare import rank_models  # noqa: E402
+from arvvi_cost import CostModel  # noqa: E402
+from fake_toolchain import SAMPLE_DISASSEMBLY, write_fake_objdump  # noqa: E402
+
+
+def test_cost_table_lookup():
+    """Test pattern order, LMUL scaling and table validation"""
+    model = CostModel({
+        'name': 'test-core',
+        'scalar': 1,
+        'vector': 2,
+        'instructions': {
+            'vset*': {'latency': 1, 'throughput': 1, 'lmul': False},
+            'vfdiv': {'latency': 20, 'throughput': 16},
+            'vf*': 1,
+        },
+    })
+    assert model.lookup('vsetvli') == (1.0, False)
+    assert model.lookup('vfdiv') == (16.0, True)
+    assert model.lookup('vfadd') == (1.0, True)
+    assert model.lookup('vadd') == (2.0, True)  # Unlisted RVV mnemonic
+
+    # 3 instructions at m4, 1 at mf2 (one pass), 1 unknown (LMUL=1)
+    factors = CostModel.lmul_factors({'e32,m4': 3, 'e8,mf2': 1, 'unknown': 1})
+    assert factors == (14 / 5, 27 / 5)
+    assert model.cycles('vfdiv', (4.0, 8.0)) == 64
+    assert model.cycles('vfwadd', (4.0, 8.0)) == 8  # Widening: 2×LMUL
+    assert model.cycles('vsetvli', (4.0, 8.0)) == 1
+    assert CostModel.lmul_factors({}) == (1.0, 2.0)
+
+    for table in ({'instructions': {'vadd': 'fast'}},
+                  {'metric': 'latency', 'instructions': {'vadd': 1}},
+                  {'metric': 'ipc'}):
+        try:
+            CostModel(table)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"invalid table accepted: {table}")
+
+    print("✅ Cost table lookup test passed")
+
+
+def test_cycle_estimates():
+    """Test per-model, per-function and per-section cycles from an analysis"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        binary = os.path.join(tmp_dir, 'model.adx')
+        with open(binary, 'w') as f:
+            f.write(SAMPLE_DISASSEMBLY)
+        table_path = os.path.join(tmp_dir, 'core.json')
+        with open(table_path, 'w') as f:
+            json.dump({'name': 'test-core', 'instructions': {
+                'vset*': {'latency': 1, 'throughput': 1, 'lmul': False},
+                'vle*': {'latency': 4, 'throughput': 3},
+            }}, f)
+
+        analyzer = RVVAnalyzer(objdump_path=fake_objdump, cost_model=CostModel.load(table_path))
+        analyzer.analyze(binary)
+        cost = analyzer.get_statistics()['cost_stats']
+
+    # vector_code runs at e32,m2: vle32 ×2 at 3×2, vadd/vse32 at 1×2, vsetvli 1
+    assert cost['cost_model'] == 'test-core'
+    assert cost['lmul_factor'] == 2
+    assert cost['instruction_cycles'] == {'vsetvli': 1, 'vle32': 12, 'vadd': 2, 'vse32': 2}
+    assert cost['rvv_cycles'] == 17
+    assert cost['scalar_cycles'] == 2
+    assert cost['total_cycles'] == 19
+    assert cost['function_cycles'] == {'_start': 2, 'vector_code': 17}
+    assert cost['section_cycles'] == {'.data': 17}
+
+    # Models can be ranked by the estimate
+    stats_dict = {
+        'small': {'statistics': {'cost_stats': {'total_cycles': 10, 'rvv_cycles': 5}}},
+        'none': {'statistics': {}},
+        'large': {'statistics': {'cost_stats': cost}},
+    }
+    assert list(rank_models(stats_dict, 'cycles')) == ['large', 'small', 'none']
+
+    print("✅ Cycle estimate test passed")
+
+
+LMUL_DISASSEMBLY = """
+Disassembly of section .text:
+
+0000000000010000 <narrow>:
+   10000:       0d0072d7                vsetvli t0,zero,e32,m1,ta,ma
+   10004:       02428257                vadd.vv v4,v4,v5
+   10008:       82429257                vfdiv.vv v4,v4,v5
+
+0000000000020000 <wide>:
+   20000:       0d3072d7                vsetvli t0,zero,e32,m8,ta,ma
+   20004:       82841457                vfdiv.vv v8,v8,v8
+   20008:       c2841457                vfwadd.vv v8,v8,v8
+
+0000000000030000 <prologue>:
+   30000:       02428257                vadd.vv v4,v4,v5
+"""
+
+
+def test_per_function_lmul():
+    """Test that each mnemonic is scaled by the LMUL it ran under, per function"""
+    model = CostModel({'name': 'test-core', 'instructions': {
+        'vset*': {'latency': 1, 'throughput': 1, 'lmul': False},
+        'vfdiv': {'latency': 20, 'throughput': 16},
+    }})
+    analyzer = RVVAnalyzer(cost_model=model)
+    analyzer.parse_disassembly(LMUL_DISASSEMBLY)
+    stats = analyzer.get_statistics()
+    assert stats['vtype_instruction_stats'] == {'e32,m1': {'vadd': 1, 'vfdiv': 1},
+                                                'e32,m8': {'vfdiv': 1, 'vfwadd': 1}, 'unknown': {'vadd': 1}}
+    assert stats['function_stats']['wide']['vtype_instruction_stats'] == {'e32,m8': {'vfdiv': 1, 'vfwadd': 1}}
+    cost = stats['cost_stats']
+
+    # narrow: vset 1 + vadd 1×1 + vfdiv 16×1; wide: vset 1 + vfdiv 16×8 + vfwadd 1×16 (widening: 2×LMUL)
+    # prologue runs before any vset, so its vadd uses the model average ((1 + 1 + 8 + 8 + 1) / 5 = 3.8)
+    assert cost['function_cycles'] == {'narrow': 18, 'wide': 145, 'prologue': 4}
+    assert cost['instruction_cycles'] == {'vsetvli': 2, 'vadd': 5, 'vfdiv': 144, 'vfwadd': 16}
+    assert cost['rvv_cycles'] == 167
+
+    # Statistics saved without the split fall back to the model average for every mnemonic
+    legacy = dict(stats, vtype_instruction_stats={},
+                  function_stats={name: dict(function, vtype_instruction_stats={})
+                                  for name, function in stats['function_stats'].items()})
+    legacy_cost = model.estimate(legacy)
+    assert legacy_cost['function_cycles']['narrow'] == round(1 + 3.8 + 16 * 3.8)
+    assert legacy_cost['instruction_cycles']['vfdiv'] == round(2 * 16 * 3.8)
+
+    print("✅ Per-function LMUL test passed")
+
+
+if __name__ == '__main__':
+    test_cost_table_lookup()
+    test_cycle_estimates()
+    test_per_function_lmul()
+    print("\n✨ All cost model tests passed!")
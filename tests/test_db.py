@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite results database (arvvi_db, --db)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import sqlite3  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi import scan_models  # noqa: E402
+from arvvi_compare import print_history  # noqa: E402
+from arvvi_db import ResultsDB  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY, SAMPLE_DISASSEMBLY, write_fake_objdump, write_model  # noqa: E402
+
+
+def test_scan_runs_round_trip():
+    """Test that scans recorded as runs load back as the statistics they were saved from"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        write_model(models_dir, 'bird')
+        yolo = write_model(models_dir, 'yolo')
+        db_path = os.path.join(tmp_dir, 'results.db')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = scan_models(models_dir, fake_objdump, db=db_path, run_label='nightly-1', cost_model=None)
+            with open(yolo, 'w') as f:
+                f.write(SAMPLE_DISASSEMBLY + LOOP_DISASSEMBLY)
+            second = scan_models(models_dir, fake_objdump, db=db_path, run_label='nightly-2', detailed=True)
+
+        with ResultsDB(db_path) as db:
+            runs = db.runs()
+            assert [(run[0], run[2], run[4]) for run in runs] == [(1, 'nightly-1', 2), (2, 'nightly-2', 2)]
+            assert runs[0][3] == models_dir
+
+            for run, results in [('nightly-1', first), (None, second), ('2', second)]:
+                loaded = db.load_run(run)
+                assert list(loaded) == [result['model'] for result in results]
+                for result in results:
+                    expected = dict(result['stats'])
+                    expected['function_stats'] = {
+                        name: dict(values, instruction_stats={}, vtype_instruction_stats={})
+                        for name, values in expected['function_stats'].items()}
+                    assert loaded[result['model']] == expected
+            assert 'detailed_stats' in db.load_run()['yolo']
+
+            assert db.instruction_history('vle32', 'yolo') == [
+                (1, runs[0][1], 'nightly-1', 'yolo', 2), (2, runs[1][1], 'nightly-2', 'yolo', 3)]
+            assert [row[4] for row in db.instruction_history('vadd', last=1)] == [1, 2]
+            assert [row[4] for row in db.instruction_history('vunused', 'bird')] == [0, 0]
+
+            for run in ('nightly-3', '7'):
+                try:
+                    db.load_run(run)
+                except ValueError as e:
+                    assert 'No run' in str(e)
+                else:
+                    raise AssertionError(f"run {run} loaded")
+
+        # Indexes back the history and per-run queries
+        conn = sqlite3.connect(db_path)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert {'models_run', 'models_name', 'instruction_counts_instruction'} <= indexes
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with ResultsDB(db_path) as db:
+                print_history('vle32', db.instruction_history('vle32', 'yolo'), markdown=True)
+        assert '| 2 |' in output.getvalue() and '| nightly-2 | yolo | 3 |' in output.getvalue()
+
+    print("✅ Results database round trip test passed")
+
+
+def test_failed_run_is_rolled_back():
+    """Test that a run is inserted in one transaction"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ResultsDB(os.path.join(tmp_dir, 'results.db')) as db:
+            good = {'total_instructions': 2, 'rvv_instructions': 1, 'instruction_stats': {'vadd': 1}}
+            bad = {'total_instructions': 2, 'rvv_instructions': 1, 'instruction_stats': {'vnew': 1},
+                   'function_stats': {'f': {}}}
+            try:
+                db.add_run([('a', good, None), ('b', bad, None)])
+            except KeyError:
+                pass
+            else:
+                raise AssertionError("malformed run inserted")
+            assert db.runs() == []
+            run_id = db.add_run([('a', good, None), ('c', dict(good, instruction_stats={'vnew': 4}), None)])
+            assert db.load_run(run_id)['c']['instruction_stats'] == {'vnew': 4}
+
+    print("✅ Rollback test passed")
+
+
+def test_duplicate_model_names():
+    """Test that models sharing a name in one run all load back, renamed like load_all_stats does"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ResultsDB(os.path.join(tmp_dir, 'results.db')) as db:
+            runs = [('yolo', {'total_instructions': 2 * n, 'rvv_instructions': n, 'instruction_stats': {'vadd': n}},
+                     None) for n in (1, 2, 3)]
+            db.add_run(runs + [('yolo (2)', runs[0][1], None)])
+            loaded = db.load_run()
+            assert list(loaded) == ['yolo', 'yolo (2)', 'yolo (3)', 'yolo (2) (2)']
+            assert [stats['instruction_stats'] for stats in loaded.values()] == [
+                {'vadd': 1}, {'vadd': 2}, {'vadd': 3}, {'vadd': 1}]
+
+    print("✅ Duplicate model names test passed")
+
+
+if __name__ == '__main__':
+    test_scan_runs_round_trip()
+    test_failed_run_is_rolled_back()
+    test_duplicate_model_names()
+    print("\n✨ All results database tests passed!")
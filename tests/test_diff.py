@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the baseline vs candidate regression gate (arvvi_diff)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json  # noqa: E402
+import subprocess  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi_diff import EXIT_REGRESSION, diff_stats, format_markdown  # noqa: E402
+
+ARVVI_DIFF = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'arvvi_diff.py'))
+
+
+def model_stats(instruction_stats, scalar=100, functions=None):
+    rvv = sum(instruction_stats.values())
+    stats = {'total_instructions': rvv + scalar, 'rvv_instructions': rvv, 'instruction_stats': instruction_stats}
+    if functions is not None:
+        stats['function_stats'] = {name: {'rvv_instructions': count} for name, count in functions.items()}
+    return stats
+
+
+BASELINE = {
+    'conv': model_stats({'vle32': 400, 'vfmacc': 600}, functions={'conv_kernel': 900, 'pad': 100}),
+    'copy': model_stats({'vle8': 50, 'vse8': 50}),
+    'stable': model_stats({'vadd': 10}),
+    'dropped': model_stats({'vadd': 10}),
+}
+CANDIDATE = {
+    'conv': model_stats({'vle32': 400, 'vfmacc': 570}, functions={'conv_kernel': 870, 'pad': 0, 'tail': 100}),
+    'copy': model_stats({'vle8': 60, 'vse8': 60}),
+    'stable': model_stats({'vadd': 10}),
+    'new': model_stats({'vadd': 1}),
+}
+
+
+def test_diff_deltas_and_regressions():
+    """Test model, instruction and function deltas and the threshold checks"""
+    report = diff_stats(BASELINE, CANDIDATE)
+    conv = report['models']['conv']
+    assert conv['rvv_instructions'] == {'baseline': 1000, 'candidate': 970, 'delta': -30, 'relative': -3.0}
+    assert conv['instructions'] == {'vfmacc': {'baseline': 600, 'candidate': 570, 'delta': -30, 'relative': -5.0}}
+    assert list(conv['functions']) == ['pad', 'conv_kernel']
+    # A function on one side only is listed, not treated as a drop to or from zero
+    assert conv['missing_functions'] == {} and conv['added_functions'] == {'tail': 100}
+
+    # A 3% model drop passes the default 5% threshold, the de-vectorized function does not
+    assert [(r['scope'], r['name'], r['metric']) for r in conv['regressions']] == [
+        ('function', 'pad', 'rvv_instructions')]
+    assert report['models']['copy']['status'] == 'improved'
+    assert report['models']['stable']['status'] == 'unchanged'
+    assert report['missing'] == ['dropped'] and report['added'] == ['new']
+    assert report['summary']['regressed'] == 1 and not report['passed']
+
+    # Thresholds: a 2% relative threshold flags the model count, an absolute one can on its own
+    strict = diff_stats(BASELINE, CANDIDATE, relative_threshold=2.0, allow_missing=True)
+    assert [r['metric'] for r in strict['models']['conv']['regressions'] if r['scope'] == 'model'] == [
+        'rvv_instructions']
+    absolute = diff_stats(BASELINE, CANDIDATE, relative_threshold=None, absolute_threshold=25,
+                          percent_threshold=None, allow_missing=True)
+    assert [r['name'] for r in absolute['models']['conv']['regressions']] == [None, 'pad', 'conv_kernel']
+    lenient = diff_stats(BASELINE, CANDIDATE, relative_threshold=100, percent_threshold=None, allow_missing=True,
+                         function_threshold=None)
+    assert lenient['passed']
+
+    markdown = format_markdown(report)
+    assert '**Result: ❌ FAIL**' in markdown
+    assert '| conv | pad | rvv_instructions | 100 | 0 | -100 (-100.00%) |' in markdown
+    assert '| vfmacc | 600 | 570 | -30 | 1 |' in markdown
+    assert '**Missing from candidate:** dropped' in markdown
+    assert '| conv | - | tail (100) |' in markdown
+
+    print("✅ Diff delta and regression test passed")
+
+
+def test_function_gate():
+    """Test that small, renamed and inlined functions do not fail the gate"""
+    baseline = {'net': model_stats({'vfmacc': 1000},
+                                   functions={'gemm': 900, 'helper': 2, 'pack_v1': 60, 'inlined': 38})}
+    candidate = {'net': model_stats({'vfmacc': 1000},
+                                    functions={'gemm': 860, 'helper': 1, 'pack_v2': 60, 'caller': 78})}
+    report = diff_stats(baseline, candidate)
+    net = report['models']['net']
+    # helper lost half its RVV instructions but is below --function-min-rvv; gemm dropped 4.4%
+    assert net['functions']['helper']['relative'] == -50.0 and net['regressions'] == []
+    assert net['missing_functions'] == {'pack_v1': 60, 'inlined': 38}
+    assert net['added_functions'] == {'caller': 78, 'pack_v2': 60}
+    assert net['status'] == 'changed' and report['passed']
+    assert report['summary']['missing_functions'] == 2 and report['summary']['added_functions'] == 2
+
+    strict = diff_stats(baseline, candidate, function_threshold=4)
+    assert [r['name'] for r in strict['models']['net']['regressions']] == ['gemm']
+    small = diff_stats(baseline, candidate, function_threshold=4, function_min_rvv=1)
+    assert [r['name'] for r in small['models']['net']['regressions']] == ['gemm', 'helper']
+    assert diff_stats(baseline, candidate, absolute_threshold=10, function_threshold=None)['passed']
+
+    print("✅ Function gate test passed")
+
+
+def test_diff_command_exit_status():
+    """Test directory and manifest inputs, the JSON report and the exit status"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for side, stats_dict in (('base', BASELINE), ('cand', CANDIDATE)):
+            for model, stats in stats_dict.items():
+                path = os.path.join(tmp_dir, side, model, 'OUTPUT', f'{model}_rvv_stats.json')
+                os.makedirs(os.path.dirname(path))
+                with open(path, 'w') as f:
+                    json.dump({'model': model, 'statistics': stats}, f)
+        manifest = os.path.join(tmp_dir, 'stable.txt')
+        with open(manifest, 'w') as f:
+            f.write("# baseline subset\n\nbase/stable/OUTPUT/stable_rvv_stats.json\n")
+
+        report_path = os.path.join(tmp_dir, 'diff.json')
+        result = subprocess.run([sys.executable, ARVVI_DIFF, os.path.join(tmp_dir, 'base'),
+                                 os.path.join(tmp_dir, 'cand'), '-o', report_path],
+                                capture_output=True, text=True)
+        assert result.returncode == EXIT_REGRESSION, result.stderr
+        assert '## RVV Regression Report' in result.stdout
+        with open(report_path) as f:
+            assert json.load(f)['summary']['regressions'] == 1
+
+        result = subprocess.run([sys.executable, ARVVI_DIFF, manifest, os.path.join(tmp_dir, 'cand')],
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert '**Result: ✅ PASS**' in result.stdout
+
+        result = subprocess.run([sys.executable, ARVVI_DIFF, os.path.join(tmp_dir, 'none'), manifest],
+                                capture_output=True, text=True)
+        assert result.returncode == 2
+
+        # pad (100 -> 0) is the only regression; without the function gate the run passes
+        result = subprocess.run([sys.executable, ARVVI_DIFF, os.path.join(tmp_dir, 'base'),
+                                 os.path.join(tmp_dir, 'cand'), '--allow-missing', '--no-function-gate'],
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+
+        garbled = os.path.join(tmp_dir, 'garbled.txt')
+        with open(garbled, 'wb') as f:
+            f.write(b'\xff\xfe\x00\x80binary')
+        result = subprocess.run([sys.executable, ARVVI_DIFF, garbled, manifest], capture_output=True, text=True)
+        assert result.returncode == 2 and 'Cannot read manifest' in result.stderr, result.stderr
+
+    print("✅ Diff command exit status test passed")
+
+
+if __name__ == '__main__':
+    test_diff_deltas_and_regressions()
+    test_function_gate()
+    test_diff_command_exit_status()
+    print("\n✨ All diff tests passed!")
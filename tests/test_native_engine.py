@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ARVVI native ELF engine (no objdump required)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import struct  # noqa: E402
+import tempfile  # noqa: E402
+import numpy as np  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_native import decode_vector_instruction, instruction_starts  # noqa: E402
+from arvvi_vtype import decode_vset, parse_vset  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY  # noqa: E402
+
+# Encodings taken from an assembled RVV 1.0 test file
+VSETVLI = 0x0d0672d7   # vsetvli t0, a2, e32, m1, ta, ma
+VLE32 = 0x00056207     # vle32.v v4, (a0), v0.t
+VSE16 = 0x0205d127     # vse16.v v2, (a1)
+VADD_VV = 0x02428257   # vadd.vv v4, v4, v5
+C_ADDI = 0x0505        # c.addi a0, 1
+C_RET = 0x8082         # c.ret
+
+
+def build_elf(path, sections, symbols=()):
+    """
+    Write a minimal little-endian ELF64 relocatable file
+
+    Args:
+        sections: List of (name, bytes) for PROGBITS sections
+        symbols: List of (name, section_name, offset, size)
+    """
+    names = [name for name, _ in sections] + ['.symtab', '.strtab', '.shstrtab']
+    shstrtab = b'\0'
+    name_offsets = {}
+    for name in names:
+        name_offsets[name] = len(shstrtab)
+        shstrtab += name.encode() + b'\0'
+
+    strtab = b'\0'
+    symtab = b'\0' * 24
+    section_index = {name: i + 1 for i, (name, _) in enumerate(sections)}
+    for name, section, offset, size in symbols:
+        symtab += struct.pack('<IBBHQQ', len(strtab), 0x12, 0, section_index[section], offset, size)
+        strtab += name.encode() + b'\0'
+
+    body = b''
+    layout = []
+    blobs = [data for _, data in sections] + [symtab, strtab, shstrtab]
+    for blob in blobs:
+        layout.append((64 + len(body), len(blob)))
+        body += blob + b'\0' * (-len(blob) % 8)
+
+    shoff = 64 + len(body)
+    shnum = len(blobs) + 1
+    header = b'\x7fELF' + bytes([2, 1, 1]) + b'\0' * 9
+    header += struct.pack('<HHIQQQIHHHHHH', 1, 243, 1, 0, 0, shoff, 0, 64, 0, 0, 64, shnum, shnum - 1)
+
+    strtab_index = len(sections) + 2
+    table = b'\0' * 64
+    for i, name in enumerate(names):
+        offset, size = layout[i]
+        if name == '.symtab':
+            sh_type, link, entsize = 2, strtab_index, 24
+        elif name in ('.strtab', '.shstrtab'):
+            sh_type, link, entsize = 3, 0, 0
+        else:
+            sh_type, link, entsize = 1, 0, 0
+        table += struct.pack('<IIQQQQIIQQ', name_offsets[name], sh_type, 0x6, 0, offset, size,
+                             link, 0, 8, entsize)
+
+    with open(path, 'wb') as f:
+        f.write(header + body + table)
+
+
+def words(*values):
+    """Little-endian byte string for a mix of 16-bit and 32-bit instructions"""
+    data = b''
+    for value in values:
+        data += struct.pack('<H' if value <= 0xffff else '<I', value)
+    return data
+
+
+def test_decode_vector_instruction():
+    """Test decoding of individual vector encodings"""
+    assert decode_vector_instruction(VSETVLI) == 'vsetvli'
+    assert decode_vector_instruction(VLE32) == 'vle32.v'
+    assert decode_vector_instruction(VSE16) == 'vse16.v'
+    assert decode_vector_instruction(VADD_VV) == 'vadd.vv'
+    assert decode_vector_instruction(0x9e40b157) == 'vmv2r.v'
+    assert decode_vector_instruction(0x4f001a57) == 'vfsqrt.v'
+    # Scalar instructions are not vector encodings
+    assert decode_vector_instruction(0x00000517) is None   # auipc a0, 0x0
+    assert decode_vector_instruction(0x0002a007) is None   # flw ft0, 0(t0)
+
+
+def test_decode_vset():
+    """Test that vtype decoding from encodings matches objdump operand text"""
+    assert decode_vset(VSETVLI)[0] == parse_vset('vsetvli', 't0,a2,e32,m1,ta,ma')[0] == 'e32,m1,ta,ma'
+    assert decode_vset(0x0d007057) == parse_vset('vsetvli', 'zero,zero,e32,m1,ta,ma') == ('e32,m1,ta,ma', 'keep')
+    assert decode_vset(0xcc727057) == parse_vset('vsetivli', 'zero,4,e8,mf2,ta,ma') == ('e8,mf2,ta,ma', 4)
+    assert decode_vset(0x80b572d7)[0] is None   # vsetvl t0,a0,a1: vtype in a register
+    # LLVM objdump spacing
+    assert parse_vset('vsetvli', 't0, a2, e32, m1, ta, ma') == ('e32,m1,ta,ma', 'a2')
+    assert parse_vset('vsetivli', 'zero, 4, e8, mf2, ta, ma') == ('e8,mf2,ta,ma', 4)
+
+
+def test_instruction_starts_with_compressed():
+    """Test 16/32-bit instruction boundary detection"""
+    halfwords = np.frombuffer(words(C_ADDI, VADD_VV, C_ADDI, VSETVLI, C_RET), dtype='<u2')
+    starts, is_32bit = instruction_starts(halfwords)
+    assert starts.tolist() == [0, 1, 3, 4, 6]
+    assert is_32bit.tolist() == [False, True, False, True, False]
+
+
+def test_native_engine_matches_objdump_parser():
+    """Test that the native engine produces the same statistics as parsing objdump output"""
+    disassembly = """
+Disassembly of section .text:
+
+0000000000000000 <_start>:
+   0:   0505                    addi    a0,a0,1
+   2:   0d0672d7                vsetvli t0,a2,e32,m1,ta,ma
+   6:   02428257                vadd.vv v4,v4,v5
+   a:   8082                    ret
+
+Disassembly of section .data:
+
+0000000000000000 <kernel>:
+   0:   00056207                vle32.v v4,(a0),v0.t
+   4:   0205d127                vse16.v v2,(a1)
+        ...
+"""
+    expected = RVVAnalyzer()
+    expected.parse_disassembly(disassembly)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        elf_path = os.path.join(tmp_dir, 'model.adx')
+        build_elf(elf_path, [
+            ('.text', words(C_ADDI, VSETVLI, VADD_VV, C_RET)),
+            ('.data', words(VLE32, VSE16) + b'\0' * 8),
+        ], symbols=[('_start', '.text', 0, 12), ('kernel', '.data', 0, 8)])
+
+        native = RVVAnalyzer(engine='native')
+        native.analyze(elf_path)
+        assert native.get_statistics() == expected.get_statistics()
+        assert native.section_stats == {'.text': 2, '.data': 2}
+        assert native.function_stats['kernel']['instruction_stats'] == {'vle32': 1, 'vse16': 1}
+        assert native.vtype_stats == {'e32,m1': 1, 'unknown': 2}
+        assert native.vset_configs == {'e32,m1,ta,ma': 1}
+
+        detailed = RVVAnalyzer(engine='native', detailed=True)
+        detailed.analyze(elf_path)
+        expected_detailed = RVVAnalyzer(detailed=True)
+        expected_detailed.parse_disassembly(disassembly)
+        assert detailed.get_statistics() == expected_detailed.get_statistics()
+        assert detailed.detailed_stats['vle32'] == {'vle32.v': [0, 1]}
+
+        # Section and function filters
+        data_only = RVVAnalyzer(engine='native', sections=['.data'])
+        data_only.analyze(elf_path)
+        assert data_only.instruction_stats == {'vle32': 1, 'vse16': 1}
+
+        kernel_only = RVVAnalyzer(engine='native', functions=['kern*'])
+        kernel_only.analyze(elf_path)
+        assert kernel_only.instruction_stats == {'vle32': 1, 'vse16': 1}
+        assert kernel_only.total_instructions == 2
+        assert list(kernel_only.function_stats) == ['kernel']
+
+
+def test_native_loop_detection():
+    """Test that the native engine finds the same loops as parsing objdump output"""
+    expected = RVVAnalyzer(loops=True)
+    expected.parse_disassembly(LOOP_DISASSEMBLY)
+
+    code = words(0x4501, VSETVLI, 0x02056207, VADD_VV, 0x15fd, 0xf9fd, 0x0205e227, 0x16fd,
+                 0xfed045e3, 0x00f70363, 0xb7cd, 0xc101, 0xbff9, 0xfcb54ee3, C_RET)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        elf_path = os.path.join(tmp_dir, 'model.adx')
+        build_elf(elf_path, [('.text', code)], symbols=[('kernel', '.text', 0, len(code))])
+
+        native = RVVAnalyzer(engine='native', loops=True)
+        native.analyze(elf_path)
+    assert native.get_statistics() == expected.get_statistics()
+    assert native.loop_count == 3
+
+
+if __name__ == '__main__':
+    test_decode_vector_instruction()
+    test_decode_vset()
+    test_instruction_starts_with_compressed()
+    test_native_engine_matches_objdump_parser()
+    test_native_loop_detection()
+    print("✅ All tests passed!")
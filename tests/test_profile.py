@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for arvvi_profile (--profile stage timing and counters)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi import RVVAnalyzer, scan_models  # noqa: E402
+from arvvi_profile import NULL_PROFILER, Profiler, aggregate_reports, write_profile  # noqa: E402
+from fake_toolchain import write_fake_objdump, write_model  # noqa: E402
+
+
+def test_profiler_stages_and_counters():
+    """Test that stages accumulate calls and rates use the analysis stages only"""
+    profiler = Profiler('m')
+    for _ in range(3):
+        with profiler.stage('parse'):
+            sum(range(20000))
+    with profiler.stage('json_write'):
+        pass
+    assert list(profiler.tap(['ab', 'cde'])) == ['ab', 'cde']
+    profiler.count('instructions', 10)
+
+    report = profiler.report()
+    assert list(report['stages']) == ['parse', 'json_write']
+    assert report['stages']['parse']['calls'] == 3 and report['stages']['parse']['wall_seconds'] > 0
+    assert report['counters'] == {'lines': 2, 'objdump_bytes': 5, 'instructions': 10}
+    parse_wall = report['stages']['parse']['wall_seconds']
+    assert abs(report['instructions_per_sec'] - round(10 / parse_wall, 1)) <= 0.1 * report['instructions_per_sec']
+    assert report['peak_rss_mb'] > 0
+
+    # Without the Unix-only resource module (Windows) the peak RSS reads 0
+    resource = sys.modules.get('resource')
+    sys.modules['resource'] = None
+    try:
+        assert profiler.report()['peak_rss_mb'] == 0
+    finally:
+        if resource is None:
+            del sys.modules['resource']
+        else:
+            sys.modules['resource'] = resource
+
+    # Profiling off: the same calls do nothing and the lines pass through untouched
+    lines = ['x']
+    assert NULL_PROFILER.tap(lines) is lines
+    with NULL_PROFILER.stage('parse'):
+        NULL_PROFILER.count('instructions', 1)
+    assert RVVAnalyzer().profiler is NULL_PROFILER
+
+    print("✅ Profiler stages and counters test passed")
+
+
+def test_write_profile_formats():
+    """Test the NDJSON (one line per model, then the summary) and JSON outputs"""
+    reports = [Profiler(name).report() for name in ('a', 'b')]
+    summary = aggregate_reports(reports)
+    assert summary['models'] == 2 and summary['name'] == 'total'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_profile(os.path.join(tmp_dir, 'p.ndjson'), reports, summary)
+            write_profile(os.path.join(tmp_dir, 'p.json'), reports, summary)
+        with open(os.path.join(tmp_dir, 'p.ndjson')) as f:
+            lines = [json.loads(line) for line in f]
+        with open(os.path.join(tmp_dir, 'p.json')) as f:
+            document = json.load(f)
+    assert [(line['type'], line['name']) for line in lines] == [('model', 'a'), ('model', 'b'), ('summary', 'total')]
+    assert [report['name'] for report in document['models']] == ['a', 'b'] and document['summary'] == summary
+
+    print("✅ Profile output formats test passed")
+
+
+def test_scan_profile():
+    """Test that a scan profiles each model and sums them, serial and parallel"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        for name in ['bird', 'mobilenet']:
+            write_model(models_dir, name)
+
+        for jobs, stream in [(1, False), (2, True)]:
+            profile_path = os.path.join(tmp_dir, f'profile{jobs}.ndjson')
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = scan_models(models_dir, fake_objdump, jobs=jobs, stream=stream, profile=profile_path)
+            with open(profile_path) as f:
+                lines = [json.loads(line) for line in f]
+
+            models, summary = lines[:-1], lines[-1]
+            assert [report['name'] for report in models] == ['bird', 'mobilenet']
+            assert [result['profile'] for result in results] == [
+                {key: value for key, value in report.items() if key != 'type'} for report in models]
+            analysis_stage = 'stream' if stream else 'parse'
+            for report in models:
+                assert analysis_stage in report['stages'] and 'json_write' in report['stages']
+                assert report['counters']['instructions'] == 7 and report['counters']['rvv_instructions'] == 5
+                assert report['counters']['objdump_bytes'] > 0 and report['counters']['lines'] > 7
+            assert summary['type'] == 'summary' and summary['models'] == 2 and summary['jobs'] == jobs
+            assert 'discover' in summary['stages'] and summary['counters']['instructions'] == 14
+            assert summary['elapsed_seconds'] > 0 and 'lines_per_sec' in summary
+
+        # Without --profile results carry no profile
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert 'profile' not in scan_models(models_dir, fake_objdump)[0]
+
+    print("✅ Scan profile test passed")
+
+
+if __name__ == '__main__':
+    test_profiler_stages_and_counters()
+    test_write_profile_formats()
+    test_scan_profile()
+    print("\n✨ All profile tests passed!")
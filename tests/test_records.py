@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar per-instruction record store (--records)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_records import InstructionRecords, records_path  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY, SAMPLE_DISASSEMBLY, write_fake_objdump  # noqa: E402
+
+COUNTERS = ('total_instructions', 'rvv_instructions', 'instruction_stats', 'section_stats',
+            'function_stats', 'vtype_stats', 'vtype_instruction_stats')
+
+
+def test_records_roundtrip():
+    """Test that aggregates recomputed from saved records match the analysis"""
+    analyzer = RVVAnalyzer(records=True)
+    analyzer.parse_disassembly(SAMPLE_DISASSEMBLY)
+    analyzer.parse_disassembly(LOOP_DISASSEMBLY)
+    expected = analyzer.get_statistics()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, 'bird_rvv_stats.json')
+        analyzer.save_json(json_path, 'bird')
+        path = records_path(json_path)
+        assert path == os.path.join(tmp_dir, 'bird_rvv_records.npz')
+        records = InstructionRecords.load(path)
+
+    assert len(records) == expected['total_instructions']
+    stats = records.statistics()
+    for key in COUNTERS:
+        assert stats[key] == expected[key], key
+
+    # Filters and address lookups
+    kernel = records.select(functions=['kern*'])
+    assert kernel.statistics()['instruction_stats'] == {'vsetvli': 1, 'vle32': 1, 'vadd': 1, 'vse32': 1}
+    assert records.addresses('vle32').tolist() == [0x20004, 0x20008, 0x6]
+    assert len(records.select(sections=['.data'], start=0x20008)) == 3
+
+    print("✅ Records round-trip test passed")
+
+
+def test_records_bypass_cache():
+    """Test that a cached result is not used when records are requested"""
+    from arvvi_cache import ResultCache
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        cache = ResultCache(os.path.join(tmp_dir, 'cache'))
+        binary = os.path.join(tmp_dir, 'model.adx')
+        with open(binary, 'w') as f:
+            f.write(SAMPLE_DISASSEMBLY)
+
+        RVVAnalyzer(objdump_path=fake_objdump, cache=cache).analyze(binary)
+        analyzer = RVVAnalyzer(objdump_path=fake_objdump, cache=cache, records=True, shards=4)
+        assert not analyzer.use_shards()
+        analyzer.analyze(binary)
+        assert not analyzer.from_cache
+        assert len(analyzer.records) == 7
+
+    print("✅ Records cache bypass test passed")
+
+
+if __name__ == '__main__':
+    test_records_roundtrip()
+    test_records_bypass_cache()
+    print("\n✨ All record store tests passed!")
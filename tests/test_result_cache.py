@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ARVVI result cache
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_cache import ResultCache  # noqa: E402
+from fake_toolchain import SAMPLE_DISASSEMBLY, write_fake_objdump  # noqa: E402
+
+
+def test_cache_hit_and_invalidation():
+    """Test that identical inputs hit the cache and changed inputs miss"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        cache = ResultCache(os.path.join(tmp_dir, 'cache'))
+        binary = os.path.join(tmp_dir, 'model.adx')
+        with open(binary, 'w') as f:
+            f.write(SAMPLE_DISASSEMBLY)
+
+        first = RVVAnalyzer(objdump_path=fake_objdump, cache=cache)
+        first.analyze(binary)
+        assert not first.from_cache
+
+        second = RVVAnalyzer(objdump_path=fake_objdump, cache=cache)
+        second.analyze(binary)
+        assert second.from_cache
+        assert second.get_statistics() == first.get_statistics()
+
+        # Different section selection is a different result
+        data_only = RVVAnalyzer(objdump_path=fake_objdump, sections=['.data'], cache=cache)
+        data_only.analyze(binary)
+        assert not data_only.from_cache
+
+        # Changed binary contents invalidate the entry
+        time.sleep(0.01)
+        with open(binary, 'w') as f:
+            f.write(SAMPLE_DISASSEMBLY.replace('vadd.vv', 'vsub.vv'))
+        changed = RVVAnalyzer(objdump_path=fake_objdump, cache=cache)
+        changed.analyze(binary)
+        assert not changed.from_cache
+        assert changed.instruction_stats['vsub'] == 1
+
+        assert cache.info()['entries'] == 3
+        assert cache.info()['digests'] == 1
+        assert cache.clear() == 3
+        assert cache.info()['entries'] == 0
+        assert cache.info()['digests'] == 0
+
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entries are evicted first"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(tmp_dir)
+        payload = {'instruction_stats': {'vadd': 1}, 'padding': 'x' * 200}
+        cache.put('a' * 64, payload)
+        entry_size = cache.info()['bytes']
+        cache.max_bytes = entry_size * 2
+
+        cache.put('b' * 64, payload)
+        # Make 'a' the most recently used entry
+        old = time.time() - 100
+        os.utime(cache._entry_path('b' * 64), (old, old))
+        assert cache.get('a' * 64) == payload
+
+        cache.put('c' * 64, payload)
+        assert cache.get('b' * 64) is None
+        assert cache.get('a' * 64) == payload
+        assert cache.get('c' * 64) == payload
+
+
+def test_digest_records_are_evicted():
+    """Test that digest records of binaries at new paths count against the size limit"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(os.path.join(tmp_dir, 'cache'))
+        payload = {'instruction_stats': {'vadd': 1}, 'padding': 'x' * 200}
+        cache.put('a' * 64, payload)
+        cache.max_bytes = cache.info()['bytes'] * 4
+
+        # The same binary rebuilt into a new directory every night
+        digests = set()
+        for night in range(20):
+            binary = os.path.join(tmp_dir, f'nightly-{night:02d}', 'model.adx')
+            os.makedirs(os.path.dirname(binary))
+            with open(binary, 'w') as f:
+                f.write(SAMPLE_DISASSEMBLY)
+            digests.add(cache.file_digest(binary))
+            os.utime(cache._entry_path('a' * 64))
+            time.sleep(0.01)
+        assert len(digests) == 1
+
+        info = cache.info()
+        assert info['bytes'] <= cache.max_bytes
+        assert 0 < info['digests'] < 20
+        # The most recently used files survive
+        assert cache.get('a' * 64) == payload
+        record_count = info['digests']
+        cache.file_digest(binary)
+        assert cache.info()['digests'] == record_count
+
+
+if __name__ == '__main__':
+    test_cache_hit_and_invalidation()
+    test_cache_lru_eviction()
+    test_digest_records_are_evicted()
+    print("✅ All tests passed!")
@@ -11,7 +11,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 import subprocess  # noqa: E402
 import shutil  # noqa: E402
+import tempfile  # noqa: E402
 from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_opcodes import operand_category  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY, SAMPLE_DISASSEMBLY, write_fake_objdump  # noqa: E402
 
 # Check if RISC-V toolchain is available
 HAS_RISCV_TOOLCHAIN = (shutil.which('riscv64-elf-as') is not None and
@@ -47,6 +50,26 @@ def test_rvv_instruction_detection():
     assert analyzer._is_rvv_instruction('ld') is False
 
 
+def test_classifier_matches_pattern_list():
+    """Test the precompiled classifier against the raw RVV_PATTERNS loop"""
+    import re
+
+    def legacy_is_rvv(instruction):
+        return any(re.match(p, instruction, re.IGNORECASE) for p in RVVAnalyzer.RVV_PATTERNS)
+
+    classifier = RVVAnalyzer().classifier
+    mnemonics = [
+        'vadd', 'VADD', 'vadd.vv', 'vle8', 'vle32', 'vle', 'vle32ff', 'vlse64', 'vsuxe16',
+        'vlxei8', 'vsetvli', 'vmv', 'vmv1r', 'vfrsqrt7', 'vrgatherei16', 'vaddx', 'add',
+        'ld', 'vnot', '', ' vadd', 'vsetvl',
+    ]
+    for mnemonic in mnemonics:
+        expected = legacy_is_rvv(mnemonic)
+        # Classify twice to exercise the memo cache
+        assert classifier.is_rvv(mnemonic) is expected, mnemonic
+        assert classifier.is_rvv(mnemonic) is expected, mnemonic
+
+
 def test_disassembly_parsing():
     """Test objdump output parsing"""
     analyzer = RVVAnalyzer()
@@ -111,6 +134,240 @@ Disassembly of section .rodata:
     assert analyzer.section_stats['.rodata'] == 1
 
 
+def test_streaming_matches_in_memory():
+    """Test that streaming objdump output gives the same results as the in-memory path"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        dump_file = os.path.join(tmp_dir, 'model.adx')
+        with open(dump_file, 'w') as f:
+            f.write(SAMPLE_DISASSEMBLY)
+
+        in_memory = RVVAnalyzer(objdump_path=fake_objdump)
+        in_memory.analyze(dump_file)
+
+        streamed = RVVAnalyzer(objdump_path=fake_objdump)
+        streamed.analyze(dump_file, stream=True)
+
+    assert streamed.get_statistics() == in_memory.get_statistics()
+    assert streamed.rvv_instructions == 5
+    assert streamed.section_stats['.data'] == 5
+
+
+def test_sharded_analysis_matches_single_pass():
+    """Test that address-range shards neither drop nor double-count boundary instructions"""
+    # Compressed instructions put most 4-byte shard boundaries inside an instruction
+    disassembly = """
+Disassembly of section .text:
+   10000:       00000517                auipc   a0,0x0
+   10004:       02010113                addi    sp,sp,32
+
+Disassembly of section .data:
+
+0000000000020000 <add_kernel>:
+   20000:       4501                    li      a0,0
+   20002:       02050207                vle32.v v4,(a0)
+   20006:       020282d7                vadd.vv v5,v4,v5
+   2000a:       8082                    ret
+
+000000000002000c <copy_kernel>:
+   2000c:       0d007057                vsetvli zero,zero,e32,m2
+   20010:       02058227                vse32.v v4,(a1)
+   20014:       4501                    li      a0,0
+   20016:       02058287                vle32.v v5,(a1)
+"""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        dump_file = os.path.join(tmp_dir, 'model.adx')
+        with open(dump_file, 'w') as f:
+            f.write(disassembly)
+
+        single = RVVAnalyzer(objdump_path=fake_objdump)
+        single.analyze(dump_file)
+        assert single.total_instructions == 10
+        assert single.rvv_instructions == 5
+        assert single.function_stats['copy_kernel']['rvv_instructions'] == 3
+        assert single.vtype_stats == {'unknown': 2, 'e32,m2': 2}
+
+        # 16-bit bogus decode resynchronizes; 32-bit bogus decode forces a re-run
+        for misaligned in ('16', '32'):
+            os.environ['FAKE_OBJDUMP_MISALIGNED'] = misaligned
+            try:
+                sharded = RVVAnalyzer(objdump_path=fake_objdump, shards=16)
+                sharded.MIN_SHARD_BYTES = 4
+                sharded.analyze(dump_file)
+            finally:
+                del os.environ['FAKE_OBJDUMP_MISALIGNED']
+            assert sharded.get_statistics() == single.get_statistics(), misaligned
+
+        # Detailed counters survive boundary fix-up too
+        single = RVVAnalyzer(objdump_path=fake_objdump, detailed=True)
+        single.analyze(dump_file)
+        sharded = RVVAnalyzer(objdump_path=fake_objdump, shards=16, detailed=True)
+        sharded.MIN_SHARD_BYTES = 4
+        sharded.analyze(dump_file)
+        assert sharded.get_statistics() == single.get_statistics()
+
+
+def test_function_attribution():
+    """Test per-function statistics and glob/regex function filters"""
+    disassembly = """
+Disassembly of section .text:
+
+0000000000010000 <main>:
+   10000:       00000517                auipc   a0,0x0
+   10004:       02010113                addi    sp,sp,32
+
+0000000000010008 <conv2d_3x3>:
+   10008:       0d007057                vsetvli zero,zero,e32,m2
+   1000c:       02050207                vle32.v v4,(a0)
+   10010:       02058227                vse32.v v4,(a1)
+
+Disassembly of section .data:
+
+0000000000020000 <matmul_f32>:
+   20000:       02010113                addi    sp,sp,32
+   20004:       020282d7                vadd.vv v5,v4,v5
+
+0000000000020008 <matmul_f32+0x8>:
+   20008:       02058287                vle32.v v5,(a1)
+"""
+    analyzer = RVVAnalyzer()
+    analyzer.parse_disassembly(disassembly)
+
+    assert analyzer.function_stats['main']['total_instructions'] == 2
+    assert analyzer.function_stats['main']['rvv_instructions'] == 0
+    assert analyzer.function_stats['conv2d_3x3']['instruction_stats'] == {'vsetvli': 1, 'vle32': 1, 'vse32': 1}
+    # "<symbol+0x...>:" continuation headers stay in the same function
+    assert analyzer.function_stats['matmul_f32']['total_instructions'] == 3
+    assert [name for name, _ in analyzer.top_functions(2)] == ['conv2d_3x3', 'matmul_f32']
+
+    stats = analyzer.get_statistics()['function_stats']
+    assert stats['matmul_f32']['instruction_stats'] == {'vadd': 1, 'vle32': 1}
+
+    # Globs and regexes are applied while parsing (single objdump run)
+    filtered = RVVAnalyzer(objdump_path='objdump', functions=['conv*', 're:^mat'])
+    assert filtered.objdump_command('model.adx') == ['objdump', '-D', 'model.adx']
+    filtered.parse_disassembly(disassembly)
+    assert set(filtered.function_stats) == {'conv2d_3x3', 'matmul_f32'}
+    assert filtered.total_instructions == 6
+    assert filtered.rvv_instructions == 5
+
+    # A single plain name is still filtered by objdump
+    single = RVVAnalyzer(functions=['main'])
+    assert '--disassemble=main' in single.objdump_command('model.adx')
+
+
+def test_vtype_tracking():
+    """Test SEW×LMUL attribution and redundant vsetvli detection"""
+    disassembly = """
+Disassembly of section .text:
+
+0000000000010000 <kernel>:
+   10000:       0d0672d7                vsetvli t0,a2,e32,m1,ta,ma
+   10004:       02050207                vle32.v v4,(a0)
+   10008:       0d0672d7                vsetvli t0,a2,e32,m1,ta,ma
+   1000c:       0d007057                vsetvli zero,zero,e32,m1,ta,ma
+   10010:       020282d7                vadd.vv v5,v4,v5
+   10014:       cc727057                vsetivli zero,4,e8,mf2,ta,ma
+   10018:       cc727057                vsetivli zero,4,e8,mf2,ta,ma
+   1001c:       02058227                vse8.v v4,(a1)
+   10020:       80b572d7                vsetvl t0,a0,a1
+   10024:       02058227                vse8.v v4,(a1)
+
+0000000000010028 <next>:
+   10028:       02058227                vse8.v v4,(a1)
+"""
+    analyzer = RVVAnalyzer()
+    analyzer.parse_disassembly(disassembly)
+
+    # The configuration does not carry over into the next function
+    assert analyzer.vtype_stats == {'e32,m1': 2, 'e8,mf2': 1, 'unknown': 2}
+    assert analyzer.vset_configs == {'e32,m1,ta,ma': 3, 'e8,mf2,ta,ma': 2}
+    assert analyzer.avl_immediates == {4: 2}
+    assert analyzer.vset_count == 6
+    # vsetvli zero,zero with the same vtype and the repeated vsetivli; a
+    # register AVL may change between two identical vsetvli
+    assert analyzer.redundant_vsets == 2
+
+    stats = analyzer.get_statistics()
+    assert stats['vset_stats']['avl_immediates'] == {'4': 2}
+    merged = RVVAnalyzer()
+    merged.merge_statistics(stats)
+    assert merged.get_statistics() == stats
+
+    # LLVM objdump puts a space after each operand comma
+    spaced = RVVAnalyzer()
+    spaced.parse_disassembly(disassembly.replace(',', ', '))
+    assert spaced.get_statistics() == stats
+
+
+def test_detailed_mode():
+    """Test full-mnemonic, operand-category and masking breakdown"""
+    disassembly = """
+Disassembly of section .text:
+   10000:       0d0672d7                vsetvli t0,a2,e32,m1,ta,ma
+   10004:       00056207                vle32.v v4,(a0),v0.t
+   10008:       02428257                vadd.vv v4,v4,v5
+   1000c:       0245c257                vadd.vx v4,v4,a1
+   10010:       0040b257                vadd.vi v4,v4,1,v0.t
+   10014:       5c428257                vmerge.vvm v4,v4,v5,v0
+   10018:       9245d257                vfmul.vf v4,v4,fa1
+   1001c:       c642a257                vwadd.vv v4,v4,v5
+   10020:       b2403257                vnsrl.wi v4,v4,0
+   10024:       0205d127                vse16.v v2,(a1)
+"""
+    coarse = RVVAnalyzer()
+    coarse.parse_disassembly(disassembly)
+    assert 'detailed_stats' not in coarse.get_statistics()
+
+    analyzer = RVVAnalyzer(detailed=True)
+    analyzer.parse_disassembly(disassembly)
+
+    # Coarse counts are unchanged by detailed mode
+    assert analyzer.instruction_stats == coarse.instruction_stats
+    assert analyzer.instruction_stats['vadd'] == 3
+
+    detailed = analyzer.get_statistics()['detailed_stats']
+    assert detailed['mnemonics']['vadd'] == {'vadd.vv': [1, 0], 'vadd.vx': [1, 0], 'vadd.vi': [0, 1]}
+    assert detailed['mnemonics']['vle32'] == {'vle32.v': [0, 1]}
+    # The v0 operand of vmerge is not a mask
+    assert detailed['mnemonics']['vmerge'] == {'vmerge.vvm': [1, 0]}
+    assert detailed['categories'] == {'OPCFG': 1, 'LOAD': 1, 'STORE': 1, 'OPIVV': 2, 'OPIVX': 1,
+                                      'OPIVI': 2, 'OPFVF': 1, 'OPMVV': 1}
+    # Pre-1.0 spellings share the category of vcpop.m
+    for mnemonic in ('vcpop.m', 'vpopc.m', 'vmpopc.m'):
+        assert operand_category(mnemonic) == 'OPMVV', mnemonic
+    assert detailed['masked'] == 2
+    assert detailed['widening'] == 1
+    assert detailed['narrowing'] == 1
+
+    merged = RVVAnalyzer(detailed=True)
+    merged.merge_statistics(analyzer.get_statistics())
+    assert merged.get_statistics() == analyzer.get_statistics()
+
+
+def test_loop_detection():
+    """Test back-edge loop detection, nesting depth and loop-weighted counts"""
+    analyzer = RVVAnalyzer(loops=True, loop_weight=10)
+    analyzer.parse_disassembly(LOOP_DISASSEMBLY)
+
+    # Loops headed at 0x2 (four back edges), 0x6 and 0x22 (self loop)
+    assert analyzer.loop_count == 3
+    assert dict(analyzer.loop_depths) == {0: [2, 0], 1: [8, 2], 2: [5, 2]}
+
+    loop_stats = analyzer.get_statistics()['loop_stats']
+    assert loop_stats['weighted_instructions'] == 2 + 80 + 500
+    assert loop_stats['weighted_rvv_instructions'] == 20 + 200
+
+    merged = RVVAnalyzer(loops=True)
+    merged.merge_statistics(analyzer.get_statistics())
+    assert merged.get_statistics() == analyzer.get_statistics()
+
+    # Loop mode never shards: a loop may cross a shard boundary
+    assert not RVVAnalyzer(loops=True, shards=4).use_shards()
+
+
 def test_comprehensive_assembly_file():
     """Test complete pipeline with actual assembly file (requires RISC-V toolchain)"""
     if not HAS_RISCV_TOOLCHAIN:
@@ -210,7 +467,14 @@ def test_comprehensive_assembly_file():
 
 if __name__ == '__main__':
     test_rvv_instruction_detection()
+    test_classifier_matches_pattern_list()
     test_disassembly_parsing()
     test_section_parsing()
+    test_streaming_matches_in_memory()
+    test_sharded_analysis_matches_single_pass()
+    test_function_attribution()
+    test_vtype_tracking()
+    test_detailed_mode()
+    test_loop_detection()
     test_comprehensive_assembly_file()
     print("✅ All tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ARVVI batch analysis (scan_models)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi import scan_models  # noqa: E402
+from fake_toolchain import write_fake_objdump, write_model  # noqa: E402
+
+
+def test_parallel_scan_matches_serial():
+    """Test that --jobs N gives the same results, in the same order, as a serial scan"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        for name in ['yolov5n', 'bird', 'mobilenet']:
+            write_model(models_dir, name)
+        # Model with a .mlir but no compiled .adx is reported as skipped
+        os.makedirs(os.path.join(models_dir, 'broken'))
+        with open(os.path.join(models_dir, 'broken', 'broken.mlir'), 'w') as f:
+            f.write('module {}\n')
+
+        serial = scan_models(models_dir, fake_objdump)
+        parallel = scan_models(models_dir, fake_objdump, jobs=3)
+
+        assert [r['model'] for r in serial] == ['bird', 'mobilenet', 'yolov5n']
+        assert parallel == serial
+
+        with open(parallel[0]['json_path']) as f:
+            data = json.load(f)
+        assert data['model'] == 'bird'
+        assert data['statistics']['rvv_instructions'] == 5
+
+
+def test_failing_model_does_not_stop_scan():
+    """Test that a model objdump fails on is skipped the same way by serial and parallel scans"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        failing_objdump = os.path.join(tmp_dir, 'failing-objdump')
+        with open(failing_objdump, 'w') as f:
+            f.write(f"#!{sys.executable}\nimport os, sys\n"
+                    f"if 'corrupt' in sys.argv[-1]:\n    sys.exit('not in a recognized format')\n"
+                    f"os.execv({fake_objdump!r}, [{fake_objdump!r}] + sys.argv[1:])\n")
+        os.chmod(failing_objdump, 0o755)
+        models_dir = os.path.join(tmp_dir, 'models')
+        for name in ['bird', 'corrupt', 'yolov5n']:
+            write_model(models_dir, name)
+
+        for jobs in (1, 2):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                results = scan_models(models_dir, failing_objdump, jobs=jobs)
+            assert [r['model'] for r in results] == ['bird', 'yolov5n'], jobs
+            assert 'Error analyzing corrupt: objdump failed' in output.getvalue(), output.getvalue()
+            assert 'Skipped:              1' in output.getvalue()
+
+
+if __name__ == '__main__':
+    test_parallel_scan_matches_serial()
+    test_failing_model_does_not_stop_scan()
+    print("✅ All tests passed!")
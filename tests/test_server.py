@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local analysis service (arvvi_server.py) and its client
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import socket  # noqa: E402
+import tempfile  # noqa: E402
+import threading  # noqa: E402
+import urllib.error  # noqa: E402
+import urllib.request  # noqa: E402
+from arvvi_client import ServiceUnavailable, post_job, run, save_result, server_status  # noqa: E402
+from arvvi_server import AnalysisService, JobError, init_worker, make_server, run_job  # noqa: E402
+from fake_toolchain import write_fake_objdump, write_model  # noqa: E402
+
+
+def free_address():
+    """host:port where nothing is listening"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return f'127.0.0.1:{s.getsockname()[1]}'
+
+
+def test_server_jobs():
+    """Test analyze, compare and diff jobs over HTTP and the status counters"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        paths = [write_model(models_dir, name) for name in ('bird', 'cat')]
+
+        service = AnalysisService(jobs=2, cache_size=1 << 20, cache_dir=os.path.join(tmp_dir, 'cache'),
+                                  objdump_path=fake_objdump)
+        server = make_server(service, port=0)
+        address = f'127.0.0.1:{server.server_port}'
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for path in paths:
+                json_path = path.replace('.adx', '_rvv_stats.json')
+                result = post_job('analyze', {'path': path, 'cost': True}, address)
+                save_result(result, json_path)
+                assert result['statistics']['rvv_instructions'] == 5
+                # Both models are the same bytes, so the second one is a cache hit
+                assert result['from_cache'] == (path != paths[0])
+                assert 'cost_stats' in result['statistics']
+                with open(json_path) as f:
+                    assert json.load(f)['statistics'] == result['statistics']
+            assert post_job('analyze', {'path': paths[0], 'model': 'Bird'}, address)['model'] == 'Bird'
+
+            compared = post_job('compare', {'scan': models_dir, 'top': 2}, address)
+            assert [model['model'] for model in compared['models']] == ['bird', 'cat']
+            assert compared['top_instructions'][0] == {'instruction': 'vle32', 'total': 4, 'counts': [2, 2]}
+
+            report = post_job('diff', {'baseline': models_dir, 'candidate': models_dir, 'markdown': True}, address)
+            assert report['passed'] and report['summary']['unchanged'] == 2 and 'PASS' in report['markdown']
+
+            for kind, params, message in [('analyze', {'path': os.path.join(tmp_dir, 'missing.adx')}, 'not found'),
+                                          ('analyze', {'path': paths[0], 'colour': 'red'}, 'colour'),
+                                          # Jobs can neither pick the program run nor a file to write
+                                          ('analyze', {'path': paths[0], 'objdump_path': '/bin/sh'}, 'objdump_path'),
+                                          ('analyze', {'path': paths[0], 'output': json_path}, 'output'),
+                                          ('compare', {}, "'scan' or 'files'"),
+                                          ('vectorize', {}, 'unknown job')]:
+                try:
+                    post_job(kind, params, address)
+                except JobError as e:
+                    assert message in str(e), e
+                else:
+                    raise AssertionError(f"{kind} {params} did not fail")
+
+            # Only JSON bodies are accepted (a cross-origin form post cannot send one)
+            for content_type in ('text/plain', 'application/x-www-form-urlencoded', None):
+                request = urllib.request.Request(f'http://{address}/analyze', data=json.dumps({'path': paths[0]}).encode())
+                if content_type:
+                    request.add_header('Content-Type', content_type)
+                try:
+                    urllib.request.urlopen(request)
+                except urllib.error.HTTPError as e:
+                    assert e.code == 415, e
+                else:
+                    raise AssertionError(f"{content_type} body accepted")
+
+            status = server_status(address)
+            assert status['workers'] == 2 and status['queue_depth'] == 0 and status['running'] == 0
+            assert status['jobs']['analyze'] == {'completed': 3, 'failed': 4}
+            assert status['completed'] == 5 and status['failed'] == 5
+            assert status['jobs_per_sec'] > 0 and status['mean_job_seconds'] > 0
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+
+    print("✅ Server jobs test passed")
+
+
+def test_client_fallback():
+    """Test that the client runs a job in-process when no server is listening"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        path = write_model(tmp_dir, 'bird')
+        params = {'path': path, 'sections': ['.data']}
+        address = free_address()
+
+        try:
+            run('analyze', params, address, fallback=False, objdump_path=fake_objdump)
+        except ServiceUnavailable:
+            pass
+        else:
+            raise AssertionError("ServiceUnavailable not raised")
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            result = run('analyze', params, address, cache_size=None, objdump_path=fake_objdump)
+        assert 'running the job in-process' in stderr.getvalue()
+        init_worker(objdump_path=fake_objdump)
+        assert result == run_job('analyze', params)
+        assert result['statistics']['total_instructions'] == 5
+
+    print("✅ Client fallback test passed")
+
+
+if __name__ == '__main__':
+    test_server_jobs()
+    test_client_fallback()
+    print("\n✨ All server tests passed!")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for instruction-mix similarity and clustering (arvvi_compare --similarity)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math  # noqa: E402
+import random  # noqa: E402
+from arvvi_matrix import ComparisonMatrix  # noqa: E402
+from arvvi_similarity import pairwise_distances, similarity_report  # noqa: E402
+
+# Three families of instruction mixes
+FAMILIES = {
+    'conv': {'vfmacc': 60, 'vle32': 25, 'vse32': 5, 'vsetvli': 10},
+    'matmul': {'vfmul': 40, 'vfredusum': 30, 'vle32': 20, 'vsetvli': 10},
+    'copy': {'vle8': 45, 'vse8': 45, 'vsetvli': 10},
+}
+
+
+def family_stats(seed=7):
+    rng = random.Random(seed)
+    stats = {}
+    for family, mix in FAMILIES.items():
+        for i in range(4):
+            stats[f'{family}{i}'] = {'instruction_stats': {name: count * 10 + rng.randint(0, 30)
+                                                           for name, count in mix.items()}}
+    stats['scalar_only'] = {'instruction_stats': {}}
+    return stats
+
+
+def reference_js(p, q):
+    total_p, total_q = sum(p.values()), sum(q.values())
+    divergence = 0.0
+    for name in set(p) | set(q):
+        a, b = p.get(name, 0) / total_p, q.get(name, 0) / total_q
+        m = (a + b) / 2
+        divergence += 0.5 * (a * math.log2(a / m) if a else 0) + 0.5 * (b * math.log2(b / m) if b else 0)
+    return math.sqrt(divergence)
+
+
+def test_distances():
+    """Test cosine and Jensen-Shannon distances against direct formulas"""
+    stats = family_stats()
+    del stats['scalar_only']
+    matrix = ComparisonMatrix.from_stats(stats)
+    mixes = [s['instruction_stats'] for s in stats.values()]
+
+    js = pairwise_distances(matrix.counts, 'js')
+    cosine = pairwise_distances(matrix.counts, 'cosine')
+    for i in range(len(mixes)):
+        for j in range(len(mixes)):
+            assert abs(js[i, j] - reference_js(mixes[i], mixes[j])) < 1e-9
+            dot = sum(mixes[i].get(name, 0) * count for name, count in mixes[j].items())
+            norms = math.sqrt(sum(c * c for c in mixes[i].values())) * math.sqrt(sum(c * c for c in mixes[j].values()))
+            assert abs(cosine[i, j] - (1 - dot / norms)) < 1e-9
+
+    # Identical mixes are at distance 0, disjoint ones at 1
+    matrix = ComparisonMatrix.from_stats({'a': {'instruction_stats': {'vadd': 2}},
+                                          'b': {'instruction_stats': {'vadd': 5}},
+                                          'c': {'instruction_stats': {'vle8': 1}}})
+    for metric in ('cosine', 'js'):
+        distances = pairwise_distances(matrix.counts, metric)
+        assert abs(distances[0, 1]) < 1e-12 and abs(distances[0, 2] - 1) < 1e-12
+
+    print("✅ Distance test passed")
+
+
+def test_neighbours_and_clusters():
+    """Test that neighbours and clusters recover the model families"""
+    matrix = ComparisonMatrix.from_stats(family_stats())
+    for metric in ('cosine', 'js'):
+        report = similarity_report(matrix, metric, neighbours=3, clusters=3)
+        assert report['excluded'] == ['scalar_only']
+        assert report['models'] == 12
+        for model, neighbours in report['neighbours'].items():
+            assert [name.rstrip('0123456789') for name, _ in neighbours] == [model.rstrip('0123456789')] * 3
+            distances = [distance for _, distance in neighbours]
+            assert distances == sorted(distances)
+
+        groups = sorted(sorted(cluster['members']) for cluster in report['clusters'])
+        assert groups == [[f'{family}{i}' for i in range(4)] for family in sorted(FAMILIES)]
+        for cluster in report['clusters']:
+            assert cluster['representative'] in cluster['members']
+
+    print("✅ Neighbour and cluster test passed")
+
+
+def test_identical_mixes():
+    """Test that asking for more clusters than distinct instruction mixes does not fail"""
+    stats = {f'copy{i}': {'total_instructions': 20, 'rvv_instructions': 10,
+                          'instruction_stats': {'vle32': 4, 'vfmacc': 6}} for i in range(4)}
+    stats['other'] = {'total_instructions': 20, 'rvv_instructions': 10, 'instruction_stats': {'vse8': 10}}
+    for metric in ('cosine', 'js'):
+        for models, clusters in ((['copy0', 'copy1', 'copy2', 'copy3'], 3), (list(stats), 4)):
+            matrix = ComparisonMatrix.from_stats({model: stats[model] for model in models})
+            report = similarity_report(matrix, metric, clusters=clusters)
+            groups = sorted(sorted(cluster['members']) for cluster in report['clusters'])
+            expected = [['copy0', 'copy1', 'copy2', 'copy3']] + ([['other']] if 'other' in models else [])
+            assert groups == expected, (metric, groups)
+
+    print("✅ Identical mixes test passed")
+
+
+if __name__ == '__main__':
+    test_distances()
+    test_neighbours_and_clusters()
+    test_identical_mixes()
+    print("\n✨ All similarity tests passed!")
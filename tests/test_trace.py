@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for execution-weighted analysis from simulator traces (--trace)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gzip  # noqa: E402
+import io  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi import RVVAnalyzer  # noqa: E402
+from arvvi_trace import detect_format  # noqa: E402
+from fake_toolchain import SAMPLE_DISASSEMBLY, write_fake_objdump  # noqa: E402
+
+# vector_code in SAMPLE_DISASSEMBLY, executed three times after _start
+EXECUTED = [0x10000, 0x10004] + [0x20000, 0x20004, 0x20008, 0x2000c, 0x20010] * 3
+
+
+def spike_trace(offset=0):
+    """Spike log with both -l instruction lines and --log-commits lines"""
+    lines = []
+    for pc in EXECUTED:
+        lines.append(f'core   0: 0x{pc + offset:016x} (0x00000013) addi    zero, zero, 0\n')
+        lines.append(f'core   0: 3 0x{pc + offset:016x} (0x00000013) x0  0x0000000000000000\n')
+    return ''.join(lines)
+
+
+def qemu_trace():
+    """QEMU -d in_asm,exec,nochain log: two translation blocks, the loop body runs 3 times"""
+    return (
+        '----------------\n'
+        'IN: _start\n'
+        '0x00010000:  00000517          auipc                   a0,0\n'
+        '0x00010004:  02010113          addi                    sp,sp,32\n'
+        '\n'
+        'Trace 0: 0x7f0000000000 [00000000/0000000000010000/00000000/00000000] _start\n'
+        '----------------\n'
+        'IN: vector_code\n'
+        '0x00020000:  0d007057          vsetvli                 zero,zero,e32,m2,tu,mu\n'
+        '0x00020004:  02050207          vle32.v                 v4,(a0)\n'
+        '0x00020008:  02058287          vle32.v                 v5,(a1)\n'
+        '0x0002000c:  020282d7          vadd.vv                 v5,v4,v5\n'
+        '0x00020010:  02058227          vse32.v                 v4,(a1)\n'
+        '\n'
+        'Trace 0: 0x7f0000000100 [00000000/0000000000020000/00000000/00000000] vector_code\n'
+        'Trace 0: 0x7f0000000100 [00000000/0000000000020000/00000000/00000000] vector_code\n'
+        'Trace 0: 0x7f0000000100 [00000000/0000000000020000/00000000/00000000] vector_code\n'
+    )
+
+
+def analyze_trace(tmp_dir, trace_text, name, compress=False, **kwargs):
+    fake_objdump = write_fake_objdump(tmp_dir)
+    binary = os.path.join(tmp_dir, 'model.adx')
+    with open(binary, 'w') as f:
+        f.write(SAMPLE_DISASSEMBLY)
+    trace_path = os.path.join(tmp_dir, name)
+    with (gzip.open(trace_path, 'wt') if compress else open(trace_path, 'w')) as f:
+        f.write(trace_text)
+
+    functions = kwargs.pop('functions', None)
+    analyzer = RVVAnalyzer(objdump_path=fake_objdump, functions=functions)
+    analyzer.analyze_trace(binary, trace_path, **kwargs)
+    return analyzer.get_statistics()
+
+
+def check_weighted(stats, total=17):
+    assert stats['total_instructions'] == total
+    assert stats['rvv_instructions'] == 15
+    assert stats['instruction_stats'] == {'vsetvli': 3, 'vle32': 6, 'vadd': 3, 'vse32': 3}
+    assert stats['section_stats'] == {'.data': 15}
+
+
+def test_spike_trace():
+    """Test that Spike commit logs weight instructions by execution count"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats = analyze_trace(tmp_dir, spike_trace(), 'spike.log')
+        check_weighted(stats)
+        assert stats['trace_stats']['format'] == 'spike'
+        assert stats['trace_stats']['indexed_rvv_pcs'] == 5
+
+    # gzip-compressed trace, code relocated at runtime
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats = analyze_trace(tmp_dir, spike_trace(offset=0x80000000), 'spike.log.gz', compress=True,
+                              offset=0x80000000)
+        check_weighted(stats)
+
+    print("✅ Spike trace test passed")
+
+
+def test_qemu_trace():
+    """Test that QEMU translation blocks are weighted by their executions"""
+    assert detect_format(qemu_trace().splitlines()) == 'qemu'
+    assert detect_format(spike_trace().splitlines()) == 'spike'
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats = analyze_trace(tmp_dir, qemu_trace(), 'qemu.log')
+        check_weighted(stats)
+        assert stats['trace_stats']['format'] == 'qemu'
+
+    # With a function filter, only the selected function's executions count
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats = analyze_trace(tmp_dir, qemu_trace(), 'qemu.log', functions=['vector_*'])
+        check_weighted(stats, total=15)
+
+    print("✅ QEMU trace test passed")
+
+
+def test_stdin_trace():
+    """Test that a trace read from stdin ('-') leaves stdin open"""
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(spike_trace())
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fake_objdump = write_fake_objdump(tmp_dir)
+            binary = os.path.join(tmp_dir, 'model.adx')
+            with open(binary, 'w') as f:
+                f.write(SAMPLE_DISASSEMBLY)
+            analyzer = RVVAnalyzer(objdump_path=fake_objdump)
+            analyzer.analyze_trace(binary, '-')
+        check_weighted(analyzer.get_statistics())
+        assert not sys.stdin.closed
+        assert sys.stdin.read() == ''
+    finally:
+        sys.stdin = stdin
+
+    print("✅ stdin trace test passed")
+
+
+if __name__ == '__main__':
+    test_spike_trace()
+    test_qemu_trace()
+    test_stdin_trace()
+    print("\n✨ All trace tests passed!")
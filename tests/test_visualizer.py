@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for arvvi_visualizer: batch chart rendering and the HTML report
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import re  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi_visualizer import PREVIEW_DPI, chart_dpi, render_charts, write_html_report  # noqa: E402
+
+try:
+    import matplotlib.pyplot as plt
+    HAS_MATPLOTLIB = True
+except ImportError:
+    HAS_MATPLOTLIB = False
+
+
+def test_render_charts_batch():
+    """Test that batch rendering writes every chart in order and closes all figures"""
+    if not HAS_MATPLOTLIB:
+        print("⏭️  Skipping: matplotlib not available")
+        return
+
+    assert chart_dpi(None, preview=True) == PREVIEW_DPI and chart_dpi(150, preview=True) == 150
+    wide = {f'v{i:02d}': i + 1 for i in range(22)}  # More than 20 instructions adds the detailed chart
+    charts_stats = [({'total_instructions': 100, 'rvv_instructions': 10, 'instruction_stats': {'vadd': 10}}, 'small'),
+                    ({'total_instructions': 900, 'rvv_instructions': 253, 'instruction_stats': wide}, 'wide'),
+                    ({'total_instructions': 5, 'rvv_instructions': 0, 'instruction_stats': {}}, 'scalar')]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        charts = [(stats, name, os.path.join(tmp_dir, name)) for stats, name in charts_stats]
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            written = render_charts(charts, jobs=2, fmt='svg', dpi=PREVIEW_DPI)
+        assert [[os.path.relpath(path, tmp_dir) for path in paths] for paths in written] == [
+            ['small/small_rvv_analysis.svg'],
+            ['wide/wide_rvv_analysis.svg', 'wide/wide_rvv_analysis_detailed.svg'],
+            []]
+        assert all(os.path.getsize(path) > 0 for paths in written for path in paths)
+        text = output.getvalue()
+        assert text.index('small_rvv_analysis') < text.index('wide_rvv_analysis') < text.index('No RVV')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            render_charts(charts[:1], jobs=1, fmt='png', dpi=PREVIEW_DPI)
+        assert os.path.exists(os.path.join(tmp_dir, 'small', 'small_rvv_analysis.png'))
+        assert plt.get_fignums() == []
+
+    print("✅ Batch chart rendering test passed")
+
+
+def test_html_report():
+    """Test that the HTML report embeds compact, escaped statistics and needs no matplotlib"""
+    stats_dict = {
+        'yolo</script>': {'total_instructions': 10, 'rvv_instructions': 4,
+                          'instruction_stats': {'vadd': 3, 'vle32': 1},
+                          'section_stats': {'.text': 1, '.data': 3}, 'vtype_stats': {'e32m1': 4},
+                          'function_stats': {f'f{i}': {'total_instructions': 2, 'rvv_instructions': i}
+                                             for i in range(5)},
+                          'cost_stats': {'total_cycles': 42}},
+        'bird': {'total_instructions': 8, 'rvv_instructions': 6, 'instruction_stats': {'vle32': 5, 'vfmacc': 1}},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = write_html_report(stats_dict, os.path.join(tmp_dir, 'out', 'report.html'), title='A & B',
+                                     max_functions=3)
+        with open(path, encoding='utf-8') as f:
+            page = f.read()
+
+    assert '<title>A &amp; B</title>' in page
+    assert 'http://' not in page.replace('http://www.w3.org/2000/svg', '') and 'https://' not in page
+    embedded = re.search(r'<script type="application/json" id="arvvi-data">(.*?)</script>', page, re.S).group(1)
+    assert '</script>' not in embedded
+    data = json.loads(embedded)
+    assert data['instructions'] == ['vadd', 'vle32', 'vfmacc']
+    yolo, bird = data['models']
+    assert yolo['name'] == 'yolo</script>' and yolo['instr'] == [0, 3, 1, 1] and yolo['cycles'] == 42
+    assert yolo['sections'] == [['.data', 3], ['.text', 1]]
+    assert yolo['functions'] == [['f4', 2, 4], ['f3', 2, 3], ['f2', 2, 2]] and yolo['functionCount'] == 5
+    assert bird == {'name': 'bird', 'total': 8, 'rvv': 6, 'instr': [1, 5, 2, 1]}
+
+    print("✅ HTML report test passed")
+
+
+if __name__ == '__main__':
+    test_render_charts_batch()
+    test_html_report()
+    print("\n✨ All visualizer tests passed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for watch mode (arvvi_watch, --scan DIR --watch)
+"""
+
+import sys
+import os
+
+# Add parent directory to path for importing arvvi
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+from arvvi_watch import ModelWatcher  # noqa: E402
+from fake_toolchain import LOOP_DISASSEMBLY, SAMPLE_DISASSEMBLY, write_fake_objdump, write_model  # noqa: E402
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_watch_reanalyzes_changed_models():
+    """Test debouncing, content-change detection and the incremental aggregate"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        bird = write_model(models_dir, 'bird')
+        write_model(models_dir, 'cat')
+        aggregate = os.path.join(tmp_dir, 'comparison.json')
+
+        watcher = ModelWatcher(models_dir, {'objdump_path': fake_objdump}, aggregate_path=aggregate, settle=2.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert watcher.start(now=0.0) == ['bird', 'cat']
+            summary = load(aggregate)
+            assert [model['model'] for model in summary['models']] == ['bird', 'cat']
+            assert summary['instruction_totals']['vle32'] == 4
+            assert watcher.poll(now=1.0) == []
+
+            # A rebuild: the new contents are analyzed only after the writes settle
+            with open(bird, 'w') as f:
+                f.write(SAMPLE_DISASSEMBLY + LOOP_DISASSEMBLY)
+            os.utime(bird, ns=(1, 1))
+            assert watcher.poll(now=2.0) == []
+            assert watcher.poll(now=3.0) == []
+            assert watcher.poll(now=4.0) == ['bird']
+            assert load(bird.replace('.adx', '_rvv_stats.json'))['statistics']['rvv_instructions'] == 9
+            assert [model['rvv_instructions'] for model in load(aggregate)['models']] == [9, 5]
+            assert watcher.poll(now=10.0) == []
+
+            # Same contents rewritten (a no-op build): not re-analyzed
+            os.utime(bird, ns=(2, 2))
+            watcher.poll(now=11.0)
+            assert watcher.poll(now=20.0) == []
+
+            # Added and removed models are picked up at the next discovery
+            write_model(models_dir, 'ant')
+            shutil.rmtree(os.path.join(models_dir, 'cat'))
+            assert watcher.poll(now=30.0) == ['cat']
+            assert [model['model'] for model in load(aggregate)['models']] == ['bird']
+            assert watcher.poll(now=31.0) == []
+            assert watcher.poll(now=33.0) == ['ant']
+            assert [model['model'] for model in load(aggregate)['models']] == ['ant', 'bird']
+
+    print("✅ Watch mode test passed")
+
+
+def test_watch_markdown_aggregate():
+    """Test that a .md aggregate holds the arvvi_compare markdown tables"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_objdump = write_fake_objdump(tmp_dir)
+        models_dir = os.path.join(tmp_dir, 'models')
+        write_model(models_dir, 'bird')
+        aggregate = os.path.join(tmp_dir, 'comparison.md')
+        with contextlib.redirect_stdout(io.StringIO()):
+            ModelWatcher(models_dir, {'objdump_path': fake_objdump}, aggregate_path=aggregate).start()
+        with open(aggregate) as f:
+            text = f.read()
+        assert '| bird | 7 | 5 | 71.43% |' in text
+        assert '.comparison.md.tmp' not in os.listdir(tmp_dir)
+
+    print("✅ Markdown aggregate test passed")
+
+
+if __name__ == '__main__':
+    test_watch_reanalyzes_changed_models()
+    test_watch_markdown_aggregate()
+    print("\n✨ All watch mode tests passed!")